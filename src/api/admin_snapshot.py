@@ -0,0 +1,306 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Keeps the slow parts of the Admin console snapshot ready in memory and tells browsers when they change.
+# What to read first: Start at AdminSnapshotService.snapshot(), then run_once() and publish().
+# Inputs: Section builders (freshness scan, log tail, trace summaries) and change events from the app.
+# Outputs: Cached section values plus change notifications for the /admin/stream SSE endpoint.
+# Safety notes: Builders run only on the background thread; a failing builder keeps serving its last good value (or its placeholder).
+# ============================
+# ============================================================================
+# HybridRAG -- Admin Snapshot Service (src/api/admin_snapshot.py)
+# ============================================================================
+# WHAT: A small cache of named snapshot sections, each kept current on its
+#       own cadence or when an app event says it changed.
+# WHY:  GET /admin/data rebuilt everything per request inside an async
+#       handler -- including a source-tree walk for freshness, log globbing
+#       and tailing, and trace formatting -- while every open Admin tab
+#       polled it on a timer.
+# HOW:  Each SnapshotSection has a builder, an optional refresh interval,
+#       the events that invalidate it ("index_started", "index_finished",
+#       "query_completed") and an optional cheap change_token() (a directory
+#       stat, a trace id) checked every tick -- a new daily log file changes
+#       the logs directory mtime, so rotation is picked up the same way.  A daemon thread rebuilds dirty,
+#       due or changed sections; snapshot() only reads the cache.  A section
+#       that was never built or whose token moved is handed to the thread,
+#       and snapshot() waits at most wait_s for it before serving the last
+#       good value or the section's placeholder.  When a section's value
+#       changes, subscribers (one per SSE connection) are woken on their
+#       own event loop.
+# USAGE:
+#   service = AdminSnapshotService([SnapshotSection("freshness", build, 300)])
+#   service.start()
+#   publish_admin_event("index_finished")     # from anywhere in the app
+#   cached = service.snapshot(wait_s=2.0)     # never walks the tree inline
+# ============================================================================
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_NO_TOKEN = object()
+
+
+@dataclass
+class SnapshotSection:
+    """One independently refreshed part of the Admin snapshot."""
+
+    name: str
+    build: Callable[[], Any]
+    interval_s: float = 0.0
+    events: tuple[str, ...] = ()
+    change_token: Optional[Callable[[], Any]] = None
+    placeholder: Optional[Callable[[], Any]] = None
+
+
+class AdminSnapshotSubscription:
+    """Change notifications for one async consumer (an SSE connection)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._changed: set[str] = set()
+
+    def notify(self, names: Iterable[str]) -> None:
+        """Thread-safe: record changed section names and wake the consumer."""
+        self._loop.call_soon_threadsafe(self._mark, tuple(names))
+
+    def _mark(self, names: tuple[str, ...]) -> None:
+        self._changed.update(names)
+        self._event.set()
+
+    async def wait(self, timeout: float) -> set[str]:
+        """Changed section names since the last call ({} after a timeout)."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        changed, self._changed = self._changed, set()
+        return changed
+
+
+class AdminSnapshotService:
+    """Cache of Admin snapshot sections maintained by a background thread."""
+
+    def __init__(self, sections: Iterable[SnapshotSection], *, tick_s: float = 1.0) -> None:
+        self._sections = {section.name: section for section in sections}
+        self.tick_s = max(0.05, float(tick_s))
+        self._lock = threading.RLock()
+        self._attempted = threading.Condition(self._lock)
+        self._attempts = {name: 0 for name in self._sections}
+        self._values: dict[str, Any] = {}
+        self._tokens: dict[str, Any] = {}
+        self._built_at: dict[str, float] = {}
+        self._dirty: set[str] = set()
+        self._subscribers: set[AdminSnapshotSubscription] = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.version = 0
+        self.builds = {name: 0 for name in self._sections}
+        self.errors = {name: "" for name in self._sections}
+
+    # -- Reads -----------------------------------------------------------
+
+    def snapshot(self, wait_s: float = 0.0) -> dict[str, Any]:
+        """
+        Current section values; nothing is built on the caller's thread.
+
+        Sections never built before and sections whose cheap change token
+        moved are marked dirty for the worker, and the call waits up to
+        wait_s for its attempt.  A section still missing after that (or
+        whose first build failed) is served as its placeholder (None if
+        it has none).
+        """
+        pending = [
+            name for name, section in self._sections.items()
+            if name not in self._values or (
+                section.change_token is not None
+                and self._token(section) != self._tokens.get(name)
+            )
+        ]
+        with self._attempted:
+            if pending:
+                before = {name: self._attempts[name] for name in pending}
+                self._dirty.update(pending)
+                self._wake.set()
+                self._attempted.wait_for(
+                    lambda: all(self._attempts[name] > before[name] for name in pending),
+                    timeout=max(0.0, float(wait_s)),
+                )
+            values = dict(self._values)
+        for name, section in self._sections.items():
+            if name not in values:
+                values[name] = section.placeholder() if section.placeholder else None
+        return values
+
+    # -- Change signals --------------------------------------------------
+
+    def publish(self, event: str) -> list[str]:
+        """Mark every section listening for `event` dirty; wake the worker."""
+        names = [name for name, section in self._sections.items() if event in section.events]
+        if names:
+            with self._lock:
+                self._dirty.update(names)
+            self._wake.set()
+        return names
+
+    def refresh(self, *names: str) -> list[str]:
+        """Rebuild the named sections (all if none) now; return those that changed."""
+        targets = names or tuple(self._sections)
+        return [name for name in targets if name in self._sections and self._build(name)]
+
+    def put(self, name: str, value: Any) -> bool:
+        """Store a value computed elsewhere (e.g. a forced freshness recheck)."""
+        return self._store(name, value)
+
+    # -- Background worker -----------------------------------------------
+
+    def run_once(self, now: Optional[float] = None) -> list[str]:
+        """Rebuild dirty, due and token-changed sections; return those that changed."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        changed = []
+        for name, section in self._sections.items():
+            due = name in dirty or name not in self._values
+            if not due and section.interval_s > 0:
+                due = now - self._built_at.get(name, 0.0) >= section.interval_s
+            if not due and section.change_token is not None:
+                due = self._token(section) != self._tokens.get(name)
+            if due and self._build(name):
+                changed.append(name)
+        return changed
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="admin-snapshot", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as exc:  # keep the worker alive
+                logger.warning("Admin snapshot refresh failed: %s", exc)
+            self._wake.wait(self.tick_s)
+            self._wake.clear()
+
+    # -- Subscribers -----------------------------------------------------
+
+    def subscribe(self) -> AdminSnapshotSubscription:
+        subscription = AdminSnapshotSubscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: AdminSnapshotSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    # -- Internals -------------------------------------------------------
+
+    def _token(self, section: SnapshotSection) -> Any:
+        try:
+            return section.change_token()
+        except Exception:
+            return _NO_TOKEN
+
+    def _build(self, name: str) -> bool:
+        section = self._sections[name]
+        token = self._token(section) if section.change_token is not None else None
+        try:
+            value = section.build()
+        except Exception as exc:
+            # Keep serving the last good value (or the placeholder).
+            with self._attempted:
+                self.errors[name] = f"{type(exc).__name__}: {exc}"
+                self._built_at[name] = time.monotonic()
+                self._attempts[name] += 1
+                self._attempted.notify_all()
+            logger.warning("Admin snapshot section %s failed: %s", name, exc)
+            return False
+        with self._lock:
+            self.errors[name] = ""
+            self._tokens[name] = token
+            self._built_at[name] = time.monotonic()
+            self.builds[name] += 1
+        changed = self._store(name, value)
+        with self._attempted:
+            self._attempts[name] += 1
+            self._attempted.notify_all()
+        return changed
+
+    def _store(self, name: str, value: Any) -> bool:
+        with self._lock:
+            if name in self._values and self._values[name] == value:
+                return False
+            self._values[name] = value
+            self.version += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.notify((name,))
+            except RuntimeError:  # its event loop is gone
+                self.unsubscribe(subscription)
+        return True
+
+
+_SERVICE: Optional[AdminSnapshotService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_admin_snapshot_service(
+    factory: Optional[Callable[[], AdminSnapshotService]] = None,
+) -> Optional[AdminSnapshotService]:
+    """Process-wide service; created by `factory` on first use if given."""
+    global _SERVICE
+    if _SERVICE is None and factory is not None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = factory()
+    return _SERVICE
+
+
+def reset_admin_snapshot_service() -> None:
+    """Stop and drop the process-wide service (server shutdown, tests)."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        service, _SERVICE = _SERVICE, None
+    if service is not None:
+        service.stop()
+
+
+def publish_admin_event(event: str) -> None:
+    """Tell the Admin snapshot that something changed; no-op if not running."""
+    service = _SERVICE
+    if service is not None:
+        service.publish(event)
@@ -1,9 +1,9 @@
 # === NON-PROGRAMMER GUIDE ===
 # Purpose: Implements the content freshness part of the application runtime.
-# What to read first: Start at build_content_freshness_snapshot(), then read the small file-walk helpers.
+# What to read first: Start at build_content_freshness_snapshot(); the tree bookkeeping is in src/core/source_tree_summary.py.
 # Inputs: Source-folder paths, latest index-run timestamps, and indexer file filters.
 # Outputs: A cached freshness/drift snapshot for operator-facing API/browser surfaces.
-# Safety notes: This module only reads metadata (directory walk + mtimes); it does not open file contents.
+# Safety notes: This module only reads metadata (directory listings + mtimes); it does not open file contents.
 # ============================
 
 from __future__ import annotations
@@ -11,15 +11,18 @@ from __future__ import annotations
 import os
 import threading
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Iterable, Optional
 
+from src.core.source_tree_summary import get_source_tree_summary
+
 
 _CACHE_LOCK = threading.Lock()
 _CACHE_KEY = None
 _CACHE_VALUE = None
 _CACHE_TS = 0.0
 _CACHE_TTL_SECONDS = 30.0
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 def clear_content_freshness_cache() -> None:
@@ -43,6 +46,10 @@ def _parse_iso8601(value: str) -> Optional[datetime]:
         return None
 
 
+def _epoch_ns(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
 def _iso_or_none(value: Optional[datetime]) -> Optional[str]:
     if value is None:
         return None
@@ -79,8 +86,15 @@ def build_content_freshness_snapshot(
     supported_extensions: Optional[Iterable[str]] = None,
     excluded_dirs: Optional[Iterable[str]] = None,
     warn_after_hours: int = 24,
+    summary_path: str = "",
 ) -> dict[str, object]:
-    """Build a cached operator-facing freshness/drift snapshot."""
+    """
+    Build a cached operator-facing freshness/drift snapshot.
+
+    The source tree is read through a SourceTreeSummary, which re-lists
+    only directories that changed since the last check; summary_path
+    persists it across restarts (memory-only when empty).
+    """
     supported = _normalized_extensions(supported_extensions)
     excluded = _normalized_excluded_dirs(excluded_dirs)
     cache_key = (
@@ -91,6 +105,7 @@ def build_content_freshness_snapshot(
         tuple(sorted(supported or set())),
         tuple(sorted(excluded)),
         int(max(1, warn_after_hours)),
+        str(summary_path or ""),
     )
     now_ts = time.time()
     with _CACHE_LOCK:
@@ -111,28 +126,20 @@ def build_content_freshness_snapshot(
     files_newer_than_index = 0
 
     if source_exists:
-        for root, dirs, files in os.walk(source_path):
-            dirs[:] = [
-                dirname
-                for dirname in dirs
-                if dirname.lower() not in excluded
-            ]
-            for filename in files:
-                full_path = os.path.join(root, filename)
-                ext = os.path.splitext(filename)[1].lower()
-                if supported is not None and ext not in supported:
-                    continue
-                try:
-                    stat_result = os.stat(full_path)
-                except OSError:
-                    continue
-                file_dt = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
-                total_indexable_files += 1
-                if latest_source_dt is None or file_dt > latest_source_dt:
-                    latest_source_dt = file_dt
-                    latest_source_path = full_path
-                if latest_index_dt is None or file_dt > latest_index_dt:
-                    files_newer_than_index += 1
+        summary = get_source_tree_summary(
+            source_path,
+            supported_extensions=supported,
+            excluded_dirs=excluded,
+            store_path=summary_path,
+        )
+        summary.refresh()
+        total_indexable_files = summary.total_files
+        newest_ns, latest_source_path = summary.newest()
+        if latest_source_path:
+            latest_source_dt = datetime.fromtimestamp(newest_ns / 1e9, tz=timezone.utc)
+        files_newer_than_index = summary.count_newer_than(
+            None if latest_index_dt is None else _epoch_ns(latest_index_dt)
+        )
 
     freshness_age_hours = None
     if latest_index_dt is not None:
@@ -1937,6 +1937,27 @@ def build_admin_console_html() -> str:
           </tbody>
         </table>
       </article>
+      <article class="panel wide">
+        <div class="panel-head">
+          <h2>Query stage latency</h2>
+          <span class="panel-note" id="stage-latency-note">No traced queries yet.</span>
+        </div>
+        <table>
+          <thead>
+            <tr>
+              <th>Stage</th>
+              <th>p50 ms</th>
+              <th>p95 ms</th>
+              <th>p99 ms</th>
+              <th>Max ms</th>
+              <th>Count</th>
+            </tr>
+          </thead>
+          <tbody id="stage-latency-table">
+            <tr><td colspan="6" class="empty">Loading...</td></tr>
+          </tbody>
+        </table>
+      </article>
       <article class="panel wide">
         <div class="panel-head">
           <h2>Latest retrieval trace</h2>
@@ -2199,6 +2220,33 @@ def build_admin_console_html() -> str:
       `).join("");
     }}
 
+    function renderStageLatencyRows(snapshot) {{
+      const target = document.getElementById("stage-latency-table");
+      const stages = Array.isArray(snapshot?.stages) ? snapshot.stages : [];
+      if (snapshot && snapshot.enabled === false) {{
+        text("stage-latency-note", "Stage timing disabled (HYBRIDRAG_QUERY_SPANS=0).");
+      }} else {{
+        text(
+          "stage-latency-note",
+          `${{snapshot?.queries ?? 0}} queries timed / window ${{snapshot?.window ?? 0}} / also at GET /metrics`
+        );
+      }}
+      if (!stages.length) {{
+        target.innerHTML = '<tr><td colspan="6" class="empty">No traced queries yet.</td></tr>';
+        return;
+      }}
+      target.innerHTML = stages.map((item) => `
+        <tr>
+          <td>${{escapeHtml(item.stage)}}</td>
+          <td>${{escapeHtml(Number(item.p50_ms).toFixed(1))}}</td>
+          <td>${{escapeHtml(Number(item.p95_ms).toFixed(1))}}</td>
+          <td>${{escapeHtml(Number(item.p99_ms).toFixed(1))}}</td>
+          <td>${{escapeHtml(Number(item.max_ms).toFixed(1))}}</td>
+          <td>${{escapeHtml(String(item.count ?? "-"))}}</td>
+        </tr>
+      `).join("");
+    }}
+
     function renderAlertRows(summary) {{
       const target = document.getElementById("alerts-table");
       const items = Array.isArray(summary?.items) ? summary.items : [];
@@ -2603,6 +2651,7 @@ def build_admin_console_html() -> str:
       await refreshAdminThreadHistory(selectedAdminThreadId);
       renderOperatorLogRows(operatorLogs);
       renderIndexReportRows(operatorLogs?.index_reports || []);
+      renderStageLatencyRows(snapshot.stage_latency);
       renderNetworkRows(dashboard.network.entries || []);
       renderTraceList(recentTraces);
       if (selectedTraceId && recentTraces.some((item) => item.trace_id === selectedTraceId)) {{
@@ -2621,9 +2670,14 @@ def build_admin_console_html() -> str:
       logout.style.display = auth.auth_required ? "inline-flex" : "none";
     }}
 
+    let adminSnapshot = null;
+    let adminStream = null;
+    let adminPollTimer = null;
+
     async function refreshAdminConsole() {{
       try {{
         const snapshot = await fetchJson("/admin/data");
+        adminSnapshot = snapshot;
         await renderAdminConsole(snapshot);
       }} catch (error) {{
         text("banner-pill", "Refresh failed");
@@ -2631,6 +2685,40 @@ def build_admin_console_html() -> str:
       }}
     }}
 
+    function startAdminPolling() {{
+      if (adminPollTimer === null) {{
+        adminPollTimer = window.setInterval(refreshAdminConsole, AUTO_REFRESH_MS);
+      }}
+    }}
+
+    function connectAdminStream() {{
+      // The server pushes the full snapshot once, then only changed
+      // sections.  Fall back to polling if the stream is unavailable.
+      if (!window.EventSource) {{
+        refreshAdminConsole();
+        startAdminPolling();
+        return;
+      }}
+      adminStream = new EventSource("/admin/stream");
+      adminStream.addEventListener("snapshot", async (event) => {{
+        adminSnapshot = JSON.parse(event.data);
+        await renderAdminConsole(adminSnapshot);
+      }});
+      adminStream.addEventListener("delta", async (event) => {{
+        if (!adminSnapshot) {{
+          return;
+        }}
+        adminSnapshot = Object.assign({{}}, adminSnapshot, JSON.parse(event.data));
+        await renderAdminConsole(adminSnapshot);
+      }});
+      adminStream.addEventListener("error", () => {{
+        adminStream.close();
+        adminStream = null;
+        refreshAdminConsole();
+        startAdminPolling();
+      }});
+    }}
+
     document.getElementById("refresh-button").addEventListener("click", refreshAdminConsole);
     document.getElementById("start-index-button").addEventListener("click", startAdminIndexing);
     document.getElementById("reindex-stale-button").addEventListener("click", reindexIfStale);
@@ -2669,8 +2757,7 @@ def build_admin_console_html() -> str:
       }}
     }});
 
-    refreshAdminConsole();
-    window.setInterval(refreshAdminConsole, AUTO_REFRESH_MS);
+    connectAdminStream();
   </script>
 </body>
 </html>
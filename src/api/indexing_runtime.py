@@ -1,6 +1,6 @@
 # === NON-PROGRAMMER GUIDE ===
-# Purpose: Shares the background indexing-launch logic between manual and scheduled triggers.
-# What to read first: Start at start_background_indexing(), then read the small callback helper.
+# Purpose: Shares the background indexing-launch logic between manual, scheduled and watch-driven triggers.
+# What to read first: Start at start_background_indexing(), then start_index_watch() and the small callback helper.
 # Inputs: App state plus a validated source folder.
 # Outputs: Starts a daemon indexing worker and updates shared progress counters.
 # Safety notes: This module does not validate auth or request paths; callers handle that boundary.
@@ -14,6 +14,7 @@ import threading
 import time
 from typing import Any, Callable
 
+from src.api.admin_snapshot import publish_admin_event
 from src.core.indexer import IndexingProgressCallback
 
 
@@ -119,6 +120,7 @@ def start_background_indexing(
                 )
             if on_complete is not None:
                 on_complete(success, error_message)
+            publish_admin_event("index_finished")
 
     thread = threading.Thread(target=_run_indexing, daemon=True)
     state.indexing_thread = thread
@@ -128,4 +130,124 @@ def start_background_indexing(
             trigger=trigger,
             source_folder=source_folder,
         )
+    publish_admin_event("index_started")
     return True
+
+
+def index_watch_enabled() -> bool:
+    """HYBRIDRAG_INDEX_WATCH=1 turns on change-driven incremental indexing."""
+    return (os.environ.get("HYBRIDRAG_INDEX_WATCH", "") or "").strip().lower() in (
+        "1", "true", "yes", "on",
+    )
+
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = (os.environ.get(name, "") or "").strip()
+    try:
+        return max(0.1, float(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def start_index_watch(state: Any, source_folder: str) -> Any:
+    """
+    Start the watch daemon for `source_folder`; returns it (None if unusable).
+
+    Batches take the shared indexing lock like any other run: while a
+    full run is active the batch is kept and retried, so the two never
+    write at the same time.
+    """
+    from src.core.chunker import Chunker
+    from src.core.indexer import Indexer
+    from src.core.indexing import IndexCancelled
+    from src.core.indexing.watch import (
+        ChangeBatcher,
+        IndexWatchDaemon,
+        apply_changes,
+        make_watcher,
+    )
+    from src.core.source_tree_summary import (
+        get_source_tree_summary,
+        source_tree_summary_path,
+    )
+
+    if not source_folder or not os.path.isdir(source_folder):
+        logger.warning("[WARN] Index watch disabled: source folder not found: %s", source_folder)
+        return None
+    config = state.config
+    indexing_cfg = getattr(config, "indexing", None)
+    excluded = list(getattr(indexing_cfg, "excluded_dirs", []) or [])
+    watcher = make_watcher(
+        source_folder,
+        excluded,
+        backend=os.environ.get("HYBRIDRAG_INDEX_WATCH_BACKEND", "auto"),
+        poll_s=_env_seconds("HYBRIDRAG_INDEX_WATCH_POLL_SECONDS", 10.0),
+    )
+    # The content-freshness summary is fed from the same change stream.
+    freshness = get_source_tree_summary(
+        source_folder,
+        list(getattr(indexing_cfg, "supported_extensions", []) or []),
+        excluded,
+        source_tree_summary_path(str(getattr(config.paths, "database", "") or "")),
+    )
+    indexer_box: list = []
+
+    def _run_batch(paths: list, rescan: bool) -> bool:
+        with state.indexing_lock:
+            if state.indexing_active:
+                return False
+            state.indexing_active = True
+            state.indexing_stop_event.clear()
+        try:
+            if not indexer_box:
+                indexer_box.append(Indexer(
+                    config, state.vector_store, state.embedder, Chunker(config.chunking),
+                ))
+            indexer = indexer_box[0]
+            if rescan:
+                logger.info("[WARN] Index watch lost events; re-checking %s", source_folder)
+                indexer.index_folder(source_folder, stop_flag=state.indexing_stop_event)
+            result = apply_changes(indexer, paths, stop_flag=state.indexing_stop_event)
+            logger.info(
+                "[OK] Index watch batch: %d paths, %d indexed, %d unchanged, %d sources deleted",
+                result["paths"], result["files_indexed"],
+                result["files_unchanged"], result["sources_deleted"],
+            )
+        except IndexCancelled:
+            return False
+        finally:
+            with state.indexing_lock:
+                state.indexing_active = False
+        for path in paths:
+            freshness.mark_changed(path)
+        if rescan:
+            freshness.refresh(full=True)
+        publish_admin_event("index_finished")
+        return True
+
+    daemon = IndexWatchDaemon(
+        watcher,
+        _run_batch,
+        batcher=ChangeBatcher(
+            quiet_s=_env_seconds("HYBRIDRAG_INDEX_WATCH_QUIET_SECONDS", 2.0),
+        ),
+    )
+    daemon.start()
+    daemon.freshness_summary = freshness
+    freshness.events_complete = watcher.backend == "inotify"
+    logger.info("[OK] Index watch (%s) started for %s", watcher.backend, source_folder)
+    return daemon
+
+
+def stop_index_watch(state: Any) -> None:
+    """Shutdown: cancel an in-flight watch batch and stop the daemon."""
+    daemon = getattr(state, "index_watch", None)
+    if daemon is None:
+        return
+    if state.indexing_active:
+        state.indexing_stop_event.set()
+    daemon.stop()
+    summary = getattr(daemon, "freshness_summary", None)
+    if summary is not None:
+        summary.events_complete = False
+    state.index_watch = None
@@ -95,6 +95,8 @@ class QueryActivityEntry(BaseModel):
     answer_preview: Optional[str] = None
     source_paths: List[str]
     denied_hits: int
+    coalesced: bool = False
+    coalesced_with: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -104,6 +106,7 @@ class QueryActivitySummary(BaseModel):
     recent_queries: int
     total_completed: int
     total_failed: int
+    total_coalesced: int = 0
     last_completed_at: Optional[str] = None
     last_error_at: Optional[str] = None
 
@@ -113,6 +116,7 @@ class QueryActivityResponse(BaseModel):
     active_queries: int
     total_completed: int
     total_failed: int
+    total_coalesced: int = 0
     active: List[QueryActivityEntry]
     recent: List[QueryActivityEntry]
 
@@ -247,6 +251,42 @@ class IndexScheduleSnapshotResponse(BaseModel):
     total_failed: int
 
 
+class StartupStepTiming(BaseModel):
+    """Wall time of one startup step (boot, API lifespan, GUI launch)."""
+    phase: str
+    name: str
+    start_ms: float
+    duration_ms: float
+    status: str
+
+
+class StartupImportTiming(BaseModel):
+    """Cumulative time of one top-level import made during startup."""
+    module: str
+    ms: float
+    new_modules: int
+    step: str
+
+
+class StartupPhaseTiming(BaseModel):
+    """Total wall time of one startup phase."""
+    name: str
+    duration_ms: float
+    complete: bool
+
+
+class StartupProfileSnapshot(BaseModel):
+    """Where this process spent its startup time."""
+    started_at: str
+    total_ms: float
+    phases: List[StartupPhaseTiming] = Field(default_factory=list)
+    steps: List[StartupStepTiming] = Field(default_factory=list)
+    imports: List[StartupImportTiming] = Field(default_factory=list)
+    imports_recorded: int = 0
+    import_capture: bool = True
+    import_hook_active: bool = False
+
+
 class StatusResponse(BaseModel):
     """GET /status response."""
     status: str
@@ -266,6 +306,7 @@ class StatusResponse(BaseModel):
     network_audit: NetworkAuditSummary
     latest_index_run: Optional[LatestIndexRunSummary] = None
     index_schedule: IndexScheduleSnapshotResponse
+    startup: Optional[StartupProfileSnapshot] = None
 
 
 class DashboardSnapshotResponse(BaseModel):
@@ -432,6 +473,27 @@ class HealthResponse(BaseModel):
     version: str
 
 
+class ReadinessCheck(BaseModel):
+    """One startup component or probe tracked by GET /ready."""
+    name: str
+    kind: str
+    critical: bool
+    status: str
+    detail: str = ""
+    elapsed_ms: float = 0.0
+
+
+class ReadinessResponse(BaseModel):
+    """GET /ready response (HTTP 503 until every critical check passes)."""
+    ready: bool
+    status: str
+    started_at: str
+    ready_at: Optional[str] = None
+    uptime_ms: float
+    pending: List[str] = Field(default_factory=list)
+    checks: List[ReadinessCheck] = Field(default_factory=list)
+
+
 class IndexStatusResponse(BaseModel):
     """GET /index/status response."""
     indexing_active: bool
@@ -549,6 +611,26 @@ class AdminSecurityActivityResponse(BaseModel):
     entries: List[AdminSecurityActivityEntryResponse]
 
 
+class QueryStageLatency(BaseModel):
+    """Rolling latency of one query pipeline stage."""
+    stage: str
+    count: int
+    window_count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_ms: float
+
+
+class QueryStageLatencySnapshot(BaseModel):
+    """Per-stage query latency over the last `window` traced queries."""
+    enabled: bool
+    window: int
+    queries: int
+    stages: List[QueryStageLatency]
+
+
 class AdminConsoleSnapshotResponse(BaseModel):
     """Aggregated operator-facing snapshot for the Admin web console."""
     dashboard: DashboardSnapshotResponse
@@ -563,6 +645,7 @@ class AdminConsoleSnapshotResponse(BaseModel):
     operator_logs: AdminOperatorLogSnapshotResponse
     latest_query_trace: AdminQueryTraceResponse
     recent_query_traces: List[AdminQueryTraceSummaryResponse]
+    stage_latency: Optional[QueryStageLatencySnapshot] = None
 
 
 class AdminIndexControlResponse(BaseModel):
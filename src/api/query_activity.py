@@ -8,6 +8,8 @@ from collections import deque
 from datetime import datetime
 from typing import Any, Optional
 
+from src.api.admin_snapshot import publish_admin_event
+
 
 def _now_iso() -> str:
     return datetime.now().astimezone().isoformat(timespec="seconds")
@@ -94,6 +96,7 @@ class QueryActivityTracker:
         self._recent: deque[dict[str, Any]] = deque(maxlen=self.max_entries)
         self._total_completed = 0
         self._total_failed = 0
+        self._total_coalesced = 0
         self._last_completed_at: Optional[str] = None
         self._last_error_at: Optional[str] = None
 
@@ -110,6 +113,7 @@ class QueryActivityTracker:
             self._recent.clear()
             self._total_completed = 0
             self._total_failed = 0
+            self._total_coalesced = 0
             self._last_completed_at = None
             self._last_error_at = None
 
@@ -126,8 +130,10 @@ class QueryActivityTracker:
         allowed_doc_tags: list[str],
         document_policy_source: str,
         thread_id: Optional[str] = None,
+        query_id: Optional[str] = None,
+        coalesced_with: Optional[str] = None,
     ) -> QueryActivityHandle:
-        query_id = uuid.uuid4().hex[:12]
+        query_id = str(query_id or "").strip() or uuid.uuid4().hex[:12]
         entry = {
             "query_id": query_id,
             "question_text": _compact_text(question),
@@ -151,10 +157,14 @@ class QueryActivityTracker:
             "answer_preview": None,
             "source_paths": [],
             "denied_hits": 0,
+            "coalesced": bool(coalesced_with),
+            "coalesced_with": str(coalesced_with or "").strip() or None,
             "error": None,
         }
         with self._lock:
             self._active[query_id] = entry
+            if coalesced_with:
+                self._total_coalesced += 1
         return QueryActivityHandle(self, query_id, time.monotonic())
 
     def set_thread_context(
@@ -241,6 +251,7 @@ class QueryActivityTracker:
                 "recent_queries": len(self._recent),
                 "total_completed": self._total_completed,
                 "total_failed": self._total_failed,
+                "total_coalesced": self._total_coalesced,
                 "last_completed_at": self._last_completed_at,
                 "last_error_at": self._last_error_at,
             }
@@ -253,6 +264,7 @@ class QueryActivityTracker:
                 "active_queries": len(active),
                 "total_completed": self._total_completed,
                 "total_failed": self._total_failed,
+                "total_coalesced": self._total_coalesced,
                 "active": active,
                 "recent": recent,
             }
@@ -294,3 +306,4 @@ class QueryActivityTracker:
             else:
                 self._total_completed += 1
                 self._last_completed_at = completed_at
+        publish_admin_event("query_completed")
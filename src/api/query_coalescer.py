@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from src.core.access_tags import normalize_access_tags
+
+
+def _now_iso() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def build_coalesce_key(
+    question: str,
+    *,
+    transport: str,
+    mode: str,
+    model: str,
+    allowed_doc_tags: Any,
+) -> tuple:
+    """Identity of a query for in-flight coalescing.
+
+    Two requests share one execution only when the normalized question,
+    transport, mode, model and access-tag set all match, so a follower can
+    never see evidence its own document policy would have filtered out.
+    """
+    return (
+        " ".join(str(question or "").lower().split()),
+        str(transport or "sync"),
+        str(mode or ""),
+        str(model or ""),
+        tuple(sorted(normalize_access_tags(allowed_doc_tags))),
+    )
+
+
+class CoalescedQuery:
+    """One leader execution that identical concurrent requests attach to.
+
+    The leader publishes stream events and a final result/error; followers
+    replay events from the start and block until more arrive, so every
+    SSE client sees the complete token stream regardless of when it joined.
+    """
+
+    def __init__(
+        self,
+        key: tuple,
+        on_done: Optional[Callable[["CoalescedQuery"], None]] = None,
+    ) -> None:
+        self.key = key
+        self.leader_query_id = uuid.uuid4().hex[:12]
+        self._on_done = on_done
+        self._condition = threading.Condition()
+        self._events: list[dict[str, Any]] = []
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        self._followers = 0
+        self._subscribers = 0
+        self._reserved = 0
+        self._ever_subscribed = False
+
+    @property
+    def done(self) -> bool:
+        with self._condition:
+            return self._done
+
+    @property
+    def followers(self) -> int:
+        with self._condition:
+            return self._followers
+
+    @property
+    def abandoned(self) -> bool:
+        """True once every stream subscriber has disconnected."""
+        with self._condition:
+            return self._abandoned_locked()
+
+    def _abandoned_locked(self) -> bool:
+        # Followers that joined but have not started iter_events() yet
+        # hold a reservation, so the stream is not cut off under them.
+        return self._ever_subscribed and self._subscribers <= 0 and self._reserved <= 0
+
+    def try_add_follower(self, subscribe: bool = False) -> bool:
+        """Attach a follower unless the flight finished or was abandoned.
+
+        subscribe=True reserves a stream subscription that the follower's
+        iter_events(reserved=True) call takes over.
+        """
+        with self._condition:
+            if self._done or self._abandoned_locked():
+                return False
+            self._followers += 1
+            if subscribe:
+                self._reserved += 1
+            return True
+
+    def release_reservation(self) -> None:
+        """Drop a subscribe=True reservation that iter_events() never took over.
+
+        Stream followers that bail out before reading (error response,
+        body never iterated) call this so the flight can still be abandoned.
+        """
+        with self._condition:
+            self._reserved = max(0, self._reserved - 1)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        with self._condition:
+            if self._done:
+                return
+            self._events.append(event)
+            self._condition.notify_all()
+
+    def finish_result(self, result: Any) -> None:
+        self._finish(result=result, error=None)
+
+    def finish_error(self, error: BaseException) -> None:
+        self._finish(result=None, error=error)
+
+    def finish_if_abandoned(self) -> bool:
+        """Finish (with no result) only if no subscriber is left; True if so.
+
+        The check and the finish happen under one lock, so a follower
+        either joins before (and keeps the stream alive) or is refused.
+        """
+        return self._finish(result=None, error=None, only_if_abandoned=True)
+
+    def run(self, fn: Callable[[], Any]) -> Any:
+        """Execute the leader work and publish its outcome to followers."""
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.finish_error(exc)
+            raise
+        self.finish_result(result)
+        return result
+
+    def wait_result(self, timeout: Optional[float] = None) -> Any:
+        """Block until the leader finishes; re-raise the leader's error."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._done, timeout=timeout):
+                raise TimeoutError("Coalesced query did not finish in time")
+            if self._error is not None:
+                raise self._error
+            return self._result
+
+    def iter_events(self, reserved: bool = False) -> Iterator[dict[str, Any]]:
+        """Yield every published event in order until the leader finishes.
+
+        reserved=True takes over the subscription try_add_follower() made.
+        """
+        index = 0
+        with self._condition:
+            self._subscribers += 1
+            if reserved:
+                self._reserved = max(0, self._reserved - 1)
+            self._ever_subscribed = True
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._done or index < len(self._events)
+                    )
+                    pending = self._events[index:]
+                    finished = self._done
+                    error = self._error
+                index += len(pending)
+                for event in pending:
+                    yield event
+                if finished and index >= len(self._events):
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            with self._condition:
+                self._subscribers = max(0, self._subscribers - 1)
+
+    def _finish(
+        self,
+        *,
+        result: Any,
+        error: Optional[BaseException],
+        only_if_abandoned: bool = False,
+    ) -> bool:
+        with self._condition:
+            if self._done:
+                return False
+            if only_if_abandoned and not self._abandoned_locked():
+                return False
+            self._done = True
+            self._result = result
+            self._error = error
+            self._condition.notify_all()
+        if self._on_done is not None:
+            self._on_done(self)
+        return True
+
+
+class QueryCoalescer:
+    """Thread-safe registry of in-flight queries keyed by build_coalesce_key()."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = bool(enabled)
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple, CoalescedQuery] = {}
+        self._total_leaders = 0
+        self._total_coalesced = 0
+        self._max_followers_seen = 0
+        self._last_coalesced_at: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "QueryCoalescer":
+        raw = (os.environ.get("HYBRIDRAG_QUERY_COALESCE") or "").strip().lower()
+        return cls(enabled=raw not in {"0", "false", "no", "off"})
+
+    def reset(self) -> None:
+        with self._lock:
+            self._inflight.clear()
+            self._total_leaders = 0
+            self._total_coalesced = 0
+            self._max_followers_seen = 0
+            self._last_coalesced_at = None
+
+    def join(self, key: tuple, subscribe: bool = False) -> tuple[CoalescedQuery, bool]:
+        """Return (flight, is_leader) for a query key.
+
+        When coalescing is disabled every caller becomes the leader of a
+        private flight that is never registered for others to join.  A
+        finished or abandoned flight is never joined; the caller leads a
+        new one.  Stream followers pass subscribe=True (see
+        CoalescedQuery.try_add_follower).
+        """
+        with self._lock:
+            if not self.enabled:
+                self._total_leaders += 1
+                return CoalescedQuery(key), True
+            flight = self._inflight.get(key)
+            if flight is not None and flight.try_add_follower(subscribe):
+                self._total_coalesced += 1
+                self._max_followers_seen = max(self._max_followers_seen, flight.followers)
+                self._last_coalesced_at = _now_iso()
+                return flight, False
+            flight = CoalescedQuery(key, on_done=self._discard)
+            self._inflight[key] = flight
+            self._total_leaders += 1
+            return flight, True
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "inflight_queries": len(self._inflight),
+                "total_leaders": self._total_leaders,
+                "total_coalesced": self._total_coalesced,
+                "max_followers_seen": self._max_followers_seen,
+                "last_coalesced_at": self._last_coalesced_at,
+            }
+
+    def _discard(self, flight: CoalescedQuery) -> None:
+        with self._lock:
+            if self._inflight.get(flight.key) is flight:
+                del self._inflight[flight.key]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def _now_iso() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+class ReadinessTracker:
+    """Thread-safe view of startup components and probes for GET /ready.
+
+    Components (vector store, embedder, LLM router, query engine) and
+    probes (Ollama reachability, embedding dimension, reranker) are both
+    recorded as checks.  The service is ready once every critical check is
+    "ok"; non-critical failures only mark it "degraded".
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._started_at = _now_iso()
+        self._checks: Dict[str, Dict[str, Any]] = {}
+        self._ready_at: Optional[str] = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = time.perf_counter()
+            self._started_at = _now_iso()
+            self._checks = {}
+            self._ready_at = None
+
+    def expect(self, name: str, kind: str, critical: bool = True) -> None:
+        """Register a check as pending before it starts."""
+        with self._lock:
+            self._checks[name] = {
+                "name": name,
+                "kind": kind,
+                "critical": critical,
+                "status": "pending",
+                "detail": "",
+                "elapsed_ms": 0.0,
+            }
+
+    def record(self, outcome: Any, kind: str = "") -> None:
+        """Store a finished check (a boot_probes.ProbeOutcome or lookalike)."""
+        with self._lock:
+            previous = self._checks.get(outcome.name, {})
+            self._checks[outcome.name] = {
+                "name": outcome.name,
+                "kind": kind or previous.get("kind", "probe"),
+                "critical": bool(outcome.critical),
+                "status": str(outcome.status),
+                "detail": str(outcome.detail or ""),
+                "elapsed_ms": float(outcome.elapsed_ms or 0.0),
+            }
+            if self._ready_at is None and self._state_locked()[0]:
+                self._ready_at = _now_iso()
+
+    def _state_locked(self) -> tuple:
+        checks = list(self._checks.values())
+        critical = [c for c in checks if c["critical"]]
+        if any(c["status"] == "failed" for c in critical):
+            return False, "failed"
+        if not checks or any(c["status"] == "pending" for c in critical):
+            return False, "starting"
+        if any(c["status"] == "failed" for c in checks):
+            return True, "degraded"
+        return True, "ready"
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._state_locked()[0]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            ready, status = self._state_locked()
+            checks: List[Dict[str, Any]] = [dict(c) for c in self._checks.values()]
+            return {
+                "ready": ready,
+                "status": status,
+                "started_at": self._started_at,
+                "ready_at": self._ready_at,
+                "uptime_ms": round((time.perf_counter() - self._started) * 1000, 1),
+                "pending": [c["name"] for c in checks if c["status"] == "pending"],
+                "checks": checks,
+            }
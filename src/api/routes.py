@@ -21,9 +21,10 @@
 #
 # ENDPOINTS:
 #   GET  /health         Fast health check (no pipeline deps)
-#   GET  /status         Database stats and mode info
+#   GET  /ready          Startup readiness (503 until critical checks pass)
+#   GET  /status         Database stats, mode info and startup timings
 #   GET  /auth/context   Resolved auth and request identity context
-#   GET  /activity/queries  Active + recent query activity
+#   GET  /activity/queries  Active + recent query activity (incl. coalesced)
 #   GET  /activity/query-queue Shared query queue status and capacity
 #   GET  /activity/network  Recent network-gate audit activity
 #   GET  /config         Current configuration (read-only, no secrets)
@@ -40,6 +41,7 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import sqlite3
@@ -52,8 +54,9 @@ from pathlib import Path
 from collections import deque
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, StreamingResponse
-from starlette.concurrency import iterate_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from src.api.models import (
     QueryRequest,
@@ -84,7 +87,9 @@ from src.api.models import (
     IndexScheduleSnapshotResponse,
     LatestIndexRunSummary,
     NetworkAuditSummary,
+    StartupProfileSnapshot,
     HealthResponse,
+    ReadinessResponse,
     IndexRequest,
     IndexStartResponse,
     IndexStatusResponse,
@@ -95,6 +100,12 @@ from src.api.models import (
     StreamEvent,
     AdminQueryTraceResponse,
     AdminQueryTraceSummaryResponse,
+    QueryStageLatencySnapshot,
+)
+from src.api.admin_snapshot import (
+    AdminSnapshotService,
+    SnapshotSection,
+    get_admin_snapshot_service,
 )
 from src.api.content_freshness import (
     build_content_freshness_snapshot,
@@ -126,9 +137,12 @@ from src.api.browser_session import (
 )
 from src.api.network_activity import build_network_activity_snapshot
 from src.api.query_activity import QueryActivityTracker
+from src.api.query_coalescer import QueryCoalescer, build_coalesce_key
 from src.api.query_queue import QueryQueueFullError, QueryQueueTracker
 from src.api.query_threads import ConversationThreadStore, conversation_history_db_path
 from src.core.access_tags import default_document_tags, document_tag_rules
+from src.core.query_spans import get_stage_latency_stats
+from src.core.source_tree_summary import source_tree_summary_path
 from src.core.query_trace import format_query_trace_text
 from src.core.request_access import (
     reset_request_access_context,
@@ -264,6 +278,29 @@ def _query_queue_tracker() -> QueryQueueTracker:
     return tracker
 
 
+def _query_coalescer() -> QueryCoalescer:
+    """Get or lazily create the shared in-flight query coalescer."""
+    s = _state()
+    coalescer = getattr(s, "query_coalescer", None)
+    if coalescer is None:
+        coalescer = QueryCoalescer.from_env()
+        s.query_coalescer = coalescer
+    return coalescer
+
+
+def _query_coalesce_key(s, context, question: str, transport: str) -> tuple:
+    """Key identical in-flight queries by text, mode, model and access tags."""
+    mode = str(getattr(s.config, "mode", "") or "")
+    section = getattr(s.config, "api" if mode == "online" else "ollama", None)
+    return build_coalesce_key(
+        question,
+        transport=transport,
+        mode=mode,
+        model=str(getattr(section, "model", "") or ""),
+        allowed_doc_tags=context.allowed_doc_tags,
+    )
+
+
 def _conversation_thread_store() -> ConversationThreadStore:
     """Get or lazily create the persistent conversation-history store."""
     s = _state()
@@ -481,6 +518,7 @@ def _build_status_response() -> StatusResponse:
         )
 
     from src.core.network_gate import get_gate
+    from src.core.startup_profile import get_startup_profile
 
     gate_summary = get_gate().get_audit_summary()
     indexing = _build_indexing_snapshot(s)
@@ -514,6 +552,7 @@ def _build_status_response() -> StatusResponse:
         ),
         latest_index_run=latest_index_run,
         index_schedule=index_schedule,
+        startup=StartupProfileSnapshot(**get_startup_profile().snapshot()),
     )
 
 
@@ -866,6 +905,7 @@ def _build_admin_content_freshness_response() -> AdminContentFreshnessResponse:
             supported_extensions=list(getattr(indexing_cfg, "supported_extensions", []) or []),
             excluded_dirs=list(getattr(indexing_cfg, "excluded_dirs", []) or []),
             warn_after_hours=warn_after_hours,
+            summary_path=source_tree_summary_path(db_path) if db_path else "",
         )
     )
 
@@ -873,7 +913,9 @@ def _build_admin_content_freshness_response() -> AdminContentFreshnessResponse:
 def _refresh_admin_content_freshness_response() -> AdminContentFreshnessResponse:
     """Force a fresh source-tree scan for the operator freshness snapshot."""
     clear_content_freshness_cache()
-    return _build_admin_content_freshness_response()
+    freshness = _build_admin_content_freshness_response()
+    _admin_snapshot_service().put("freshness", freshness)
+    return freshness
 
 
 def _build_admin_storage_protection_response() -> AdminStorageProtectionResponse:
@@ -1008,18 +1050,126 @@ def _build_operator_log_snapshot(
     )
 
 
+# Admin snapshot sections that are too slow to rebuild per request.  They
+# are kept by the AdminSnapshotService (src/api/admin_snapshot.py) and
+# refreshed on their own cadence or when an app event marks them dirty.
+# Everything else in the snapshot is read from in-memory state per request.
+ADMIN_FRESHNESS_REFRESH_S = 60.0
+ADMIN_OPERATOR_LOG_REFRESH_S = 15.0
+ADMIN_STREAM_LIVE_INTERVAL_S = 5.0
+# /admin/stream rebuilds only ADMIN_STREAM_LIVE_SECTIONS on its timer and
+# the full snapshot when a cached section changes, or at this interval to
+# pick up config and policy edits that publish no event.
+ADMIN_STREAM_FULL_REFRESH_S = 60.0
+ADMIN_STREAM_LIVE_SECTIONS = ("dashboard", "alerts", "stage_latency")
+# How long a snapshot read waits for the worker to build a missing or
+# changed section before serving the last good value or a placeholder.
+ADMIN_SNAPSHOT_WAIT_S = 2.0
+
+
+def _operator_log_change_token():
+    """Logs directory mtime: changes when a daily log or index report appears."""
+    try:
+        return _logs_dir_path().stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _admin_freshness_placeholder() -> AdminContentFreshnessResponse:
+    """Served until the first freshness scan finishes (no alerts raised)."""
+    paths_cfg = getattr(getattr(_state(), "config", None), "paths", None)
+    return AdminContentFreshnessResponse(
+        source_folder=str(getattr(paths_cfg, "source_folder", "") or ""),
+        source_exists=True,
+        total_indexable_files=0,
+        files_newer_than_index=0,
+        warn_after_hours=24,
+        stale=False,
+        summary="Freshness scan in progress.",
+    )
+
+
+def _build_admin_query_trace_section() -> dict:
+    return {
+        "latest_query_trace": _build_admin_query_trace_response(),
+        "recent_query_traces": _build_recent_admin_query_trace_summaries(),
+    }
+
+
+def _admin_query_trace_change_token():
+    """Identity of the engine's trace buffers plus the newest trace id."""
+    query_engine = getattr(_state(), "query_engine", None)
+    latest = getattr(query_engine, "last_query_trace", None)
+    recent = getattr(query_engine, "recent_query_traces", None)
+    newest = recent[-1] if recent else None
+    return (
+        id(query_engine),
+        id(latest),
+        id(recent),
+        len(recent or ()),
+        str(newest.get("trace_id", "") or "") if isinstance(newest, dict) else "",
+    )
+
+
+def _create_admin_snapshot_service() -> AdminSnapshotService:
+    return AdminSnapshotService(
+        [
+            SnapshotSection(
+                "freshness",
+                lambda: _build_admin_content_freshness_response(),
+                interval_s=ADMIN_FRESHNESS_REFRESH_S,
+                events=("index_started", "index_finished"),
+                placeholder=_admin_freshness_placeholder,
+            ),
+            SnapshotSection(
+                "operator_logs",
+                lambda: _build_operator_log_snapshot(),
+                interval_s=ADMIN_OPERATOR_LOG_REFRESH_S,
+                events=("index_finished", "query_completed"),
+                change_token=_operator_log_change_token,
+                placeholder=lambda: AdminOperatorLogSnapshotResponse(
+                    app_log_entries=[], index_reports=[],
+                ),
+            ),
+            SnapshotSection(
+                "query_traces",
+                _build_admin_query_trace_section,
+                events=("query_completed",),
+                change_token=_admin_query_trace_change_token,
+                placeholder=lambda: {
+                    "latest_query_trace": _build_admin_query_trace_response({}),
+                    "recent_query_traces": [],
+                },
+            ),
+        ]
+    )
+
+
+def _admin_snapshot_service() -> AdminSnapshotService:
+    """Get or lazily create the shared Admin snapshot service."""
+    return get_admin_snapshot_service(_create_admin_snapshot_service)
+
+
 def _build_admin_console_snapshot(
     request: Request,
     *,
     network_limit: int = 20,
 ) -> AdminConsoleSnapshotResponse:
-    """Build the aggregated snapshot used by the Admin browser console."""
+    """
+    Build the aggregated snapshot used by the Admin browser console.
+
+    Blocking (it may wait on the snapshot worker): call it from the
+    threadpool, never directly on the event loop.
+    """
+    service = _admin_snapshot_service()
+    service.start()  # no-op once the lifespan started it
+    cached = service.snapshot(wait_s=ADMIN_SNAPSHOT_WAIT_S)
     dashboard = _build_dashboard_snapshot(request, network_limit=network_limit)
     config = _build_config_response()
     runtime_safety = _build_admin_runtime_safety_response(request)
     access_policy = _build_admin_access_policy_review_response()
     index_schedule = _build_admin_index_schedule_response()
-    freshness = _build_admin_content_freshness_response()
+    freshness = cached["freshness"]
     storage_protection = _build_admin_storage_protection_response()
     security_activity = _build_admin_security_activity_response()
     alerts = _build_admin_alert_summary_response(
@@ -1041,10 +1191,97 @@ def _build_admin_console_snapshot(
         storage_protection=storage_protection,
         alerts=alerts,
         security_activity=security_activity,
-        operator_logs=_build_operator_log_snapshot(),
-        latest_query_trace=_build_admin_query_trace_response(),
-        recent_query_traces=_build_recent_admin_query_trace_summaries(),
+        operator_logs=cached["operator_logs"],
+        stage_latency=QueryStageLatencySnapshot(**get_stage_latency_stats().snapshot()),
+        **cached["query_traces"],
+    )
+
+
+def _build_admin_live_sections(
+    request: Request,
+    base: AdminConsoleSnapshotResponse,
+    *,
+    network_limit: int = 20,
+) -> AdminConsoleSnapshotResponse:
+    """Refresh the live sections of `base`; the rest are carried over."""
+    dashboard = _build_dashboard_snapshot(request, network_limit=network_limit)
+    alerts = _build_admin_alert_summary_response(
+        dashboard_status=dashboard.status,
+        runtime_safety=base.runtime_safety,
+        index_schedule=base.index_schedule,
+        freshness=base.freshness,
+        security_activity=base.security_activity,
+        access_policy=base.access_policy,
+        storage_protection=base.storage_protection,
     )
+    return base.model_copy(update={
+        "dashboard": dashboard,
+        "alerts": alerts,
+        "stage_latency": QueryStageLatencySnapshot(**get_stage_latency_stats().snapshot()),
+    })
+
+
+async def _admin_console_event_stream(
+    request: Request,
+    *,
+    network_limit: int = 20,
+    live_interval_s: float = ADMIN_STREAM_LIVE_INTERVAL_S,
+    full_refresh_s: float = ADMIN_STREAM_FULL_REFRESH_S,
+    max_events: int | None = None,
+):
+    """
+    SSE body for /admin/stream.
+
+      event: snapshot -- data is the full AdminConsoleSnapshotResponse JSON
+      event: delta    -- data holds only the top-level keys that changed
+
+    Every live_interval_s only the live sections (active queries, indexing
+    progress, alerts, stage latency) are rebuilt.  The full snapshot is
+    rebuilt when the snapshot service reports a changed section, or every
+    full_refresh_s.  Builds run in the threadpool, never on the event loop.
+    Sends a comment line as keepalive when nothing changed.
+    """
+    service = _admin_snapshot_service()
+    subscription = service.subscribe()
+    try:
+        snapshot = await run_in_threadpool(
+            _build_admin_console_snapshot, request, network_limit=network_limit,
+        )
+        previous = snapshot.model_dump(mode="json")
+        yield "event: snapshot\ndata: {}\n\n".format(json.dumps(previous))
+        sent = 1
+        full_due = time.monotonic() + full_refresh_s
+        while max_events is None or sent < max_events:
+            if await request.is_disconnected():
+                break
+            changed = await subscription.wait(live_interval_s)
+            if changed or time.monotonic() >= full_due:
+                snapshot = await run_in_threadpool(
+                    _build_admin_console_snapshot, request, network_limit=network_limit,
+                )
+                current = snapshot.model_dump(mode="json")
+                full_due = time.monotonic() + full_refresh_s
+            else:
+                snapshot = await run_in_threadpool(
+                    _build_admin_live_sections, request, snapshot,
+                    network_limit=network_limit,
+                )
+                current = dict(previous)
+                current.update(snapshot.model_dump(
+                    mode="json", include=set(ADMIN_STREAM_LIVE_SECTIONS),
+                ))
+            delta = {
+                key: value for key, value in current.items()
+                if previous.get(key) != value
+            }
+            previous = current
+            if delta:
+                yield "event: delta\ndata: {}\n\n".format(json.dumps(delta))
+                sent += 1
+            else:
+                yield ": keepalive\n\n"
+    finally:
+        service.unsubscribe(subscription)
 
 
 def _request_admin_index_stop() -> AdminIndexControlResponse:
@@ -1147,12 +1384,52 @@ async def health():
     """Fast health check. Returns 200 if the server process is alive.
 
     This endpoint has zero dependencies -- it does not check the database,
-    embedder, or LLM.  Use GET /status for a deeper readiness check.
-    Useful for load balancer health probes and uptime monitors.
+    embedder, or LLM.  Use GET /ready to know whether the pipeline can
+    serve queries yet.  Useful for liveness probes and uptime monitors.
     """
     return HealthResponse(status="ok", version=_version())
 
 
+# -------------------------------------------------------------------
+# GET /ready
+# -------------------------------------------------------------------
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def ready():
+    """Startup readiness: components built and critical probes passed.
+
+    Returns 200 once the vector store, embedder, LLM router and query
+    engine exist and the Ollama / embedding-dimension probes succeeded
+    (a failed reranker probe only reports "degraded").  Returns 503 with
+    the same body while checks are pending or after one failed, so load
+    balancers can hold traffic and operators can watch startup progress.
+    """
+    body = ReadinessResponse(**_state().readiness.snapshot())
+    if not body.ready:
+        return JSONResponse(status_code=503, content=body.model_dump())
+    return body
+
+
+# -------------------------------------------------------------------
+# GET /metrics
+# -------------------------------------------------------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage query latency in Prometheus text format.
+
+    One summary series per pipeline stage (classify, retrieval,
+    context_trim, llm_ttft, grounding_verify, ...) with p50/p95/p99
+    over the recent query window plus cumulative _sum and _count.
+    """
+    return PlainTextResponse(
+        get_stage_latency_stats().prometheus_text(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # -------------------------------------------------------------------
 # GET /status
 # -------------------------------------------------------------------
@@ -1259,6 +1536,51 @@ async def get_config():
     return _build_config_response()
 
 
+def _follower_query_result(result, context):
+    """
+    A coalesced follower's copy of the leader's result.
+
+    Shallow copy, so the error fallback in /query can set answer without
+    touching the leader's object.  The retrieval access_control trace is
+    re-stamped with the follower's own identity; evidence is unchanged
+    because the coalesce key already requires the same access tags.
+    """
+    follower = copy.copy(result)
+    trace = getattr(result, "debug_trace", None)
+    retrieval = trace.get("retrieval") if isinstance(trace, dict) else None
+    if not isinstance(retrieval, dict):
+        return follower
+    access_control = dict(retrieval.get("access_control") or {})
+    own = _request_retrieval_access_context(context)
+    for field in ("actor", "actor_source", "actor_role", "document_policy_source"):
+        access_control[field] = own[field]
+    follower.debug_trace = dict(
+        trace, retrieval=dict(retrieval, access_control=access_control),
+    )
+    return follower
+
+
+def _record_query_cost_event(s, result) -> None:
+    """Emit one cost-tracker event for a completed API query."""
+    try:
+        from src.core.cost_tracker import get_cost_tracker
+        tracker = get_cost_tracker()
+        model = getattr(
+            getattr(s.config, "ollama" if result.mode == "offline" else "api", None),
+            "model", "",
+        ) or ""
+        tracker.record(
+            tokens_in=result.tokens_in,
+            tokens_out=result.tokens_out,
+            model=model,
+            mode=result.mode,
+            profile="api",
+            latency_ms=result.latency_ms,
+        )
+    except Exception as e:
+        logger.debug("Cost event emit failed: %s", e)
+
+
 # -------------------------------------------------------------------
 # POST /query
 # -------------------------------------------------------------------
@@ -1287,11 +1609,18 @@ async def query(req: QueryRequest, request: Request):
         "allowed_doc_tags": list(context.allowed_doc_tags),
         "document_policy_source": context.document_policy_source,
     }
+    # Identical concurrent questions share one leader execution; followers
+    # skip the queue and wait for the leader's result.
+    flight, is_leader = _query_coalescer().join(
+        _query_coalesce_key(s, context, effective_question, "sync")
+    )
     queue = _query_queue_tracker()
-    try:
-        await asyncio.to_thread(queue.acquire)
-    except QueryQueueFullError:
-        raise HTTPException(status_code=503, detail="Query queue is full. Retry later.")
+    if is_leader:
+        try:
+            await asyncio.to_thread(queue.acquire)
+        except QueryQueueFullError as exc:
+            flight.finish_error(exc)
+            raise HTTPException(status_code=503, detail="Query queue is full. Retry later.")
     activity = _query_activity_tracker().start(
         question=req.question,
         mode=str(getattr(s.config, "mode", "")),
@@ -1303,6 +1632,8 @@ async def query(req: QueryRequest, request: Request):
         allowed_doc_tags=list(context.allowed_doc_tags),
         document_policy_source=context.document_policy_source,
         thread_id=thread_id,
+        query_id=flight.leader_query_id if is_leader else None,
+        coalesced_with=None if is_leader else flight.leader_query_id,
     )
 
     # Timeout: prevent hung LLM calls from blocking indefinitely.
@@ -1321,11 +1652,23 @@ async def query(req: QueryRequest, request: Request):
         )
     access_token = set_request_access_context(_request_retrieval_access_context(context))
     try:
-        result = await asyncio.wait_for(
-            asyncio.to_thread(s.query_engine.query, effective_question),
-            timeout=timeout_sec,
-        )
-    except asyncio.TimeoutError:
+        if is_leader:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(
+                    flight.run,
+                    lambda: s.query_engine.query(effective_question),
+                ),
+                timeout=timeout_sec,
+            )
+        else:
+            result = _follower_query_result(await asyncio.wait_for(
+                asyncio.to_thread(flight.wait_result, timeout_sec),
+                timeout=timeout_sec,
+            ), context)
+    except QueryQueueFullError:
+        activity.finish_error("query_queue_full", mode=str(getattr(s.config, "mode", "")))
+        raise HTTPException(status_code=503, detail="Query queue is full. Retry later.")
+    except (asyncio.TimeoutError, TimeoutError):
         saved_thread_id, saved_turn_index = _record_failed_conversation_turn(
             thread_id=thread_id,
             question=req.question,
@@ -1359,26 +1702,13 @@ async def query(req: QueryRequest, request: Request):
         raise HTTPException(status_code=502, detail="Query execution failed")
     finally:
         reset_request_access_context(access_token)
-        queue.release()
+        if is_leader:
+            queue.release()
 
-    # Record cost event for PM dashboard (mirrors GUI query_panel behavior)
-    try:
-        from src.core.cost_tracker import get_cost_tracker
-        tracker = get_cost_tracker()
-        model = getattr(
-            getattr(s.config, "ollama" if result.mode == "offline" else "api", None),
-            "model", "",
-        ) or ""
-        tracker.record(
-            tokens_in=result.tokens_in,
-            tokens_out=result.tokens_out,
-            model=model,
-            mode=result.mode,
-            profile="api",
-            latency_ms=result.latency_ms,
-        )
-    except Exception as e:
-        logger.debug("Cost event emit failed: %s", e)
+    # Record cost event for PM dashboard (mirrors GUI query_panel behavior).
+    # Coalesced followers spent no tokens, so only the leader records.
+    if is_leader:
+        _record_query_cost_event(s, result)
 
     # Degrade gracefully when backend query fails: keep endpoint usable
     # and return a structured response with the error populated.
@@ -1415,6 +1745,39 @@ async def query(req: QueryRequest, request: Request):
     )
 
 
+def _pump_coalesced_stream(s, flight, queue, question: str, context) -> None:
+    """Drive the leader's query_stream() and publish each chunk to the flight.
+
+    Runs on its own thread so one client disconnecting does not cut off the
+    followers; stops early once every subscriber has gone away (checked
+    atomically with join, so no follower attaches to a stream being cut).
+    """
+    access_token = set_request_access_context(_request_retrieval_access_context(context))
+    stream_iter = None
+    try:
+        final_result = None
+        stream_iter = iter(s.query_engine.query_stream(question))
+        for chunk in stream_iter:
+            flight.publish(chunk)
+            if chunk.get("done") and chunk.get("result"):
+                final_result = chunk.get("result")
+            if flight.finish_if_abandoned():
+                break
+        flight.finish_result(final_result)
+    except Exception as exc:
+        flight.finish_error(exc)
+    finally:
+        flight.finish_error(RuntimeError("stream_pump_stopped"))
+        close = getattr(stream_iter, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+        reset_request_access_context(access_token)
+        queue.release()
+
+
 # -------------------------------------------------------------------
 # POST /query/stream  (Server-Sent Events)
 # -------------------------------------------------------------------
@@ -1446,11 +1809,19 @@ async def query_stream(req: QueryRequest, request: Request):
         "allowed_doc_tags": list(context.allowed_doc_tags),
         "document_policy_source": context.document_policy_source,
     }
+    # Identical concurrent streams share one leader generation; the leader's
+    # events are fanned out so every SSE client replays the full stream.
+    flight, is_leader = _query_coalescer().join(
+        _query_coalesce_key(s, context, effective_question, "stream"),
+        subscribe=True,
+    )
     queue = _query_queue_tracker()
-    try:
-        await asyncio.to_thread(queue.acquire)
-    except QueryQueueFullError:
-        raise HTTPException(status_code=503, detail="Query queue is full. Retry later.")
+    if is_leader:
+        try:
+            await asyncio.to_thread(queue.acquire)
+        except QueryQueueFullError as exc:
+            flight.finish_error(exc)
+            raise HTTPException(status_code=503, detail="Query queue is full. Retry later.")
     activity = _query_activity_tracker().start(
         question=req.question,
         mode=str(getattr(s.config, "mode", "")),
@@ -1462,6 +1833,8 @@ async def query_stream(req: QueryRequest, request: Request):
         allowed_doc_tags=list(context.allowed_doc_tags),
         document_policy_source=context.document_policy_source,
         thread_id=thread_id,
+        query_id=flight.leader_query_id if is_leader else None,
+        coalesced_with=None if is_leader else flight.leader_query_id,
     )
 
     if not hasattr(s.query_engine, "query_stream"):
@@ -1469,22 +1842,38 @@ async def query_stream(req: QueryRequest, request: Request):
             "streaming_not_supported",
             mode=str(getattr(s.config, "mode", "")),
         )
+        if is_leader:
+            flight.finish_error(RuntimeError("streaming_not_supported"))
+            queue.release()
+        else:
+            flight.release_reservation()
         raise HTTPException(status_code=501, detail="Streaming not supported")
 
+    if is_leader:
+        threading.Thread(
+            target=_pump_coalesced_stream,
+            args=(s, flight, queue, effective_question, context),
+            daemon=True,
+            name="hybridrag-query-stream",
+        ).start()
+
+    # A follower's reservation passes to iter_events() on the first read;
+    # if the body is never iterated the background task gives it back.
+    reservation = {"held": not is_leader}
+
+    def _release_unused_reservation():
+        if reservation["held"]:
+            reservation["held"] = False
+            flight.release_reservation()
+
     def _generate():
         final_result = None
         persisted_thread_id = None
         persisted_turn_index = None
-        stream_iter = iter(s.query_engine.query_stream(effective_question))
+        reserved = reservation["held"]
+        reservation["held"] = False
         try:
-            while True:
-                access_token = set_request_access_context(_request_retrieval_access_context(context))
-                try:
-                    chunk = next(stream_iter)
-                except StopIteration:
-                    break
-                finally:
-                    reset_request_access_context(access_token)
+            for chunk in flight.iter_events(reserved=reserved):
                 if "phase" in chunk:
                     yield "event: phase\ndata: {}\n\n".format(chunk["phase"])
                 elif "token" in chunk:
@@ -1493,6 +1882,8 @@ async def query_stream(req: QueryRequest, request: Request):
                     )
                 elif chunk.get("done"):
                     result = chunk.get("result")
+                    if result and not is_leader:
+                        result = _follower_query_result(result, context)
                     if result:
                         final_result = result
                         if persisted_thread_id is None:
@@ -1557,8 +1948,6 @@ async def query_stream(req: QueryRequest, request: Request):
             )
             logger.error("Streaming query failed: %s", e, exc_info=True)
             yield "event: error\ndata: Internal server error\n\n"
-        finally:
-            queue.release()
 
     return StreamingResponse(
         iterate_in_threadpool(_generate()),
@@ -1567,6 +1956,7 @@ async def query_stream(req: QueryRequest, request: Request):
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
         },
+        background=BackgroundTask(_release_unused_reservation),
     )
 
 
@@ -16,7 +16,11 @@
 #       backend for future web frontends.
 # HOW:  Uses FastAPI's async lifespan context manager to initialize
 #       heavy components (embedder, vector store) on startup and clean
-#       them up on shutdown.  Routes are in routes.py; models in models.py.
+#       them up on shutdown.  Independent components are built side by
+#       side; network probes (Ollama, embedding dimension, reranker) run
+#       in the background under one deadline and report through GET /ready
+#       (GET /health is liveness only).  Routes are in routes.py; models
+#       in models.py.
 # USAGE:
 #   python -m src.api.server                    # Start on port 8000
 #   python -m src.api.server --port 9000        # Custom port
@@ -37,8 +41,6 @@ import logging
 from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI
-
 logger = logging.getLogger(__name__)
 
 # Ensure project root is on the path so imports work
@@ -46,26 +48,53 @@ _project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
-from src.core.config import load_config, Config
-from src.core.config_authority import set_runtime_active_mode
-from src.core.vector_store import VectorStore
-from src.core.embedder import Embedder
-from src.core.llm_router import LLMRouter
-from src.core.grounded_query_engine import GroundedQueryEngine
-from src.api.index_schedule import IndexScheduleTracker, maybe_launch_scheduled_index
-from src.api.indexing_runtime import start_background_indexing
-from src.api.auth_audit import AuthAuditTracker
-from src.api.query_activity import QueryActivityTracker
-from src.api.query_queue import QueryQueueTracker
-from src.api.query_threads import ConversationThreadStore
-from src.security.shared_deployment_auth import (
-    resolve_deployment_mode,
-    shared_api_auth_required,
-)
-from src.api.storage_protection import (
-    enforce_storage_protection,
-    harden_configured_storage_paths,
-)
+from src.core.startup_profile import get_startup_profile
+
+# The imports below are most of the API's cold-start cost; time them so
+# /status can show which one is slow.
+_import_phase = get_startup_profile().phase("api_imports")
+try:
+    _import_phase.step("fastapi")
+
+    from fastapi import FastAPI
+
+    _import_phase.step("pipeline_modules")
+
+    from src.core.config import load_config, Config
+    from src.core.config_authority import set_runtime_active_mode
+    from src.core.vector_store import VectorStore
+    from src.core.embedder import Embedder
+    from src.core.llm_router import LLMRouter
+    from src.core.grounded_query_engine import GroundedQueryEngine
+    from src.core.indexing.watch import IndexWatchDaemon
+    from src.api.index_schedule import IndexScheduleTracker, maybe_launch_scheduled_index
+    from src.api.indexing_runtime import (
+        index_watch_enabled,
+        start_background_indexing,
+        start_index_watch,
+        stop_index_watch,
+    )
+    from src.api.auth_audit import AuthAuditTracker
+    from src.api.admin_snapshot import reset_admin_snapshot_service
+    from src.api.query_activity import QueryActivityTracker
+    from src.api.query_queue import QueryQueueTracker
+    from src.api.query_coalescer import QueryCoalescer
+    from src.api.query_threads import ConversationThreadStore
+    from src.api.readiness import ReadinessTracker
+    from src.core.boot_probes import BootProbe, ProbeOutcome, boot_deadline_s, start_boot_probes
+    from src.core.ollama_reranker import deferred_reranker_probe
+    from src.security.shared_deployment_auth import (
+        resolve_deployment_mode,
+        shared_api_auth_required,
+    )
+    from src.api.storage_protection import (
+        enforce_storage_protection,
+        harden_configured_storage_paths,
+    )
+except BaseException:
+    # Close the phase so the import hook does not outlive a failed import.
+    _import_phase.finish("error")
+    raise
 
 
 # -------------------------------------------------------------------
@@ -73,6 +102,42 @@ from src.api.storage_protection import (
 # -------------------------------------------------------------------
 APP_VERSION = "3.1.0"
 
+# How long the lifespan waits for the network probes (Ollama, embedding
+# dimension, reranker) before it starts serving; HYBRIDRAG_BOOT_DEADLINE_S
+# overrides.  Probes still running after this update GET /ready later.
+API_PROBE_DEADLINE_S = 1.0
+
+# A failed critical probe (Ollama not up yet, embedder not answering) is
+# retried in the background, starting at API_PROBE_RETRY_S and doubling up
+# to API_PROBE_RETRY_MAX_S, so GET /ready recovers without a restart.
+API_PROBE_RETRY_S = 2.0
+API_PROBE_RETRY_MAX_S = 60.0
+
+# Longest the lifespan waits for the vector store, embedder and LLM router
+# to be built; HYBRIDRAG_COMPONENT_DEADLINE_S overrides.
+API_COMPONENT_DEADLINE_DEFAULT_S = 120.0
+
+# How often the background job re-counts chunks/sources to verify the
+# trigger-maintained corpus counters; HYBRIDRAG_STATS_RECONCILE_SECONDS
+# overrides, 0 disables.
+STATS_RECONCILE_DEFAULT_S = 3600
+
+
+def stats_reconcile_interval_s() -> float:
+    raw = os.environ.get("HYBRIDRAG_STATS_RECONCILE_SECONDS", "")
+    try:
+        return max(0.0, float(raw)) if raw.strip() else float(STATS_RECONCILE_DEFAULT_S)
+    except ValueError:
+        return float(STATS_RECONCILE_DEFAULT_S)
+
+
+def component_deadline_s() -> float:
+    raw = os.environ.get("HYBRIDRAG_COMPONENT_DEADLINE_S", "")
+    try:
+        return max(0.0, float(raw)) if raw.strip() else API_COMPONENT_DEADLINE_DEFAULT_S
+    except ValueError:
+        return API_COMPONENT_DEADLINE_DEFAULT_S
+
 
 # -------------------------------------------------------------------
 # Shared state (populated during lifespan)
@@ -87,7 +152,9 @@ class AppState:
     query_activity: Optional[QueryActivityTracker] = None
     auth_audit: Optional[AuthAuditTracker] = None
     query_queue: Optional[QueryQueueTracker] = None
+    query_coalescer: Optional[QueryCoalescer] = None
     conversation_threads: Optional[ConversationThreadStore] = None
+    readiness: ReadinessTracker = ReadinessTracker()
     deployment_mode: str = "development"
 
     # Indexing state (background thread)
@@ -98,6 +165,10 @@ class AppState:
     index_schedule: Optional[IndexScheduleTracker] = None
     index_schedule_thread: Optional[threading.Thread] = None
     index_schedule_stop_event: threading.Event = threading.Event()
+    stats_reconcile_thread: Optional[threading.Thread] = None
+    stats_reconcile_stop_event: threading.Event = threading.Event()
+    probe_retry_stop_event: threading.Event = threading.Event()
+    index_watch: Optional[IndexWatchDaemon] = None
     index_progress: dict = {
         "files_processed": 0,
         "files_total": 0,
@@ -125,55 +196,21 @@ def _run_index_schedule_loop() -> None:
         )
 
 
-# -------------------------------------------------------------------
-# Lifespan: startup and shutdown
-# -------------------------------------------------------------------
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Initialize RAG pipeline on startup, clean up on shutdown."""
-    # -- Startup --
-    logger.info("[OK] Loading configuration...")
-    state.config = load_config(_project_root)
-    set_runtime_active_mode(state.config.mode)
+def _run_stats_reconcile_loop(interval_s: float) -> None:
+    """Periodically verify the maintained corpus counters (not mid-index)."""
+    while not state.stats_reconcile_stop_event.wait(interval_s):
+        if state.indexing_active or state.vector_store is None:
+            continue
+        try:
+            state.vector_store.reconcile_stats()
+        except Exception as e:
+            logger.warning("[WARN] Corpus stats reconciliation failed: %s", e)
 
-    # Deployment mode guard for API auth token policy.
-    deployment_mode = resolve_deployment_mode(state.config)
-    if deployment_mode == "production" and not shared_api_auth_required():
-        raise RuntimeError(
-            "Production API Auth Guard is enabled, but no shared API token is configured. "
-            "Set HYBRIDRAG_API_AUTH_TOKEN or store the shared token in Credential Manager before starting the API server."
-        )
-    if deployment_mode == "development" and not shared_api_auth_required():
-        logger.warning(
-            "[WARN] Shared API auth token is not set (development mode). "
-            "Protected endpoints are open."
-        )
-    state.deployment_mode = deployment_mode
-    enforce_storage_protection(state.config.paths.database)
-    state.query_activity = QueryActivityTracker.from_env()
-    state.query_activity.reset()
-    state.auth_audit = AuthAuditTracker.from_env()
-    state.auth_audit.reset()
-    state.query_queue = QueryQueueTracker.from_env()
-    state.query_queue.reset()
-    state.conversation_threads = ConversationThreadStore.from_database_path(
-        state.config.paths.database
-    )
-    state.index_schedule = IndexScheduleTracker.from_env(state.config.paths.source_folder)
-    state.index_schedule_stop_event.clear()
-    if state.index_schedule.enabled:
-        logger.info(
-            "[OK] Scheduled indexing enabled every %ss for %s",
-            state.index_schedule.interval_seconds,
-            state.index_schedule.source_folder,
-        )
-        schedule_thread = threading.Thread(target=_run_index_schedule_loop, daemon=True)
-        state.index_schedule_thread = schedule_thread
-        schedule_thread.start()
-    else:
-        state.index_schedule_thread = None
 
-    logger.info("[OK] Connecting to vector store...")
+# -------------------------------------------------------------------
+# Startup components and readiness probes
+# -------------------------------------------------------------------
+def _init_vector_store() -> None:
     state.vector_store = VectorStore(
         state.config.paths.database,
         state.config.embedding.dimension,
@@ -181,33 +218,217 @@ async def lifespan(app: FastAPI):
     state.vector_store.connect()
     harden_configured_storage_paths(state.config.paths.database)
 
-    logger.info("[OK] Loading embedding model...")
+
+def _init_embedder() -> None:
     state.embedder = Embedder(
         state.config.embedding.model_name,
         dimension=state.config.embedding.dimension,
     )
 
-    logger.info("[OK] Initializing LLM router...")
+
+def _init_llm_router() -> None:
     state.llm_router = LLMRouter(state.config)
 
-    logger.info("[OK] Building query engine...")
-    state.query_engine = GroundedQueryEngine(
-        state.config,
-        state.vector_store,
-        state.embedder,
-        state.llm_router,
-    )
+
+def _probe_ollama() -> str:
+    router = state.llm_router
+    if not router.ollama.is_available():
+        raise RuntimeError(f"Ollama is not reachable at {router.ollama.base_url}")
+    return router.ollama.base_url
+
+
+def _probe_embedding_dimension() -> str:
+    """Embed a probe string; the store was opened with the config dimension."""
+    detected = state.embedder.probe_dimension()
+    configured = state.config.embedding.dimension
+    if configured and detected != configured:
+        raise RuntimeError(
+            f"Embedding model {state.embedder.model_name} returns {detected} dims "
+            f"but the index is configured for {configured}"
+        )
+    return f"{detected} dims"
+
+
+def _probe_reranker() -> str:
+    from src.core.ollama_reranker import load_ollama_reranker
+
+    reranker = load_ollama_reranker(state.config)
+    if reranker is None:
+        raise RuntimeError("Ollama reranker unavailable; running without reranker")
+    state.query_engine.retriever.attach_reranker(reranker)
+    return reranker.model
+
+
+def _warm_llm_prefix() -> None:
+    """Pre-evaluate the engine's stable prompt prefix (warmup thread, best effort)."""
+    try:
+        state.llm_router.warm_prefix(state.query_engine._stable_prompt_prefix())
+    except Exception as e:
+        logger.debug("LLM prefix warmup failed: %s", e)
+
+
+def _readiness_probes() -> list:
+    """Network checks that used to run inline during startup."""
+    probes = [
+        BootProbe("ollama", _probe_ollama),
+        BootProbe("embedding_dimension", _probe_embedding_dimension),
+    ]
+    retrieval = getattr(state.config, "retrieval", None)
+    if getattr(retrieval, "reranker_enabled", False):
+        probes.append(BootProbe("reranker", _probe_reranker, critical=False))
+    return probes
+
+
+# -------------------------------------------------------------------
+# Lifespan: startup and shutdown
+# -------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize RAG pipeline on startup, clean up on shutdown."""
+    # -- Startup --
+    with get_startup_profile().phase("api") as startup:
+        startup.step("config")
+        state.readiness = ReadinessTracker()
+        logger.info("[OK] Loading configuration...")
+        state.config = load_config(_project_root)
+        set_runtime_active_mode(state.config.mode)
+
+        # Deployment mode guard for API auth token policy.
+        deployment_mode = resolve_deployment_mode(state.config)
+        if deployment_mode == "production" and not shared_api_auth_required():
+            raise RuntimeError(
+                "Production API Auth Guard is enabled, but no shared API token is configured. "
+                "Set HYBRIDRAG_API_AUTH_TOKEN or store the shared token in Credential Manager before starting the API server."
+            )
+        if deployment_mode == "development" and not shared_api_auth_required():
+            logger.warning(
+                "[WARN] Shared API auth token is not set (development mode). "
+                "Protected endpoints are open."
+            )
+        state.deployment_mode = deployment_mode
+        enforce_storage_protection(state.config.paths.database)
+        startup.step("trackers")
+        state.query_activity = QueryActivityTracker.from_env()
+        state.query_activity.reset()
+        state.auth_audit = AuthAuditTracker.from_env()
+        state.auth_audit.reset()
+        state.query_queue = QueryQueueTracker.from_env()
+        state.query_queue.reset()
+        state.query_coalescer = QueryCoalescer.from_env()
+        state.query_coalescer.reset()
+        state.conversation_threads = ConversationThreadStore.from_database_path(
+            state.config.paths.database
+        )
+        state.index_schedule = IndexScheduleTracker.from_env(state.config.paths.source_folder)
+        state.index_schedule_stop_event.clear()
+        if state.index_schedule.enabled:
+            logger.info(
+                "[OK] Scheduled indexing enabled every %ss for %s",
+                state.index_schedule.interval_seconds,
+                state.index_schedule.source_folder,
+            )
+            schedule_thread = threading.Thread(target=_run_index_schedule_loop, daemon=True)
+            state.index_schedule_thread = schedule_thread
+            schedule_thread.start()
+        else:
+            state.index_schedule_thread = None
+
+        # Vector store, embedder and LLM router do not depend on each
+        # other: build them side by side, then the query engine on top.
+        startup.step("components")
+        logger.info("[OK] Connecting to vector store, loading embedder, initializing LLM router...")
+        components = start_boot_probes(
+            [
+                BootProbe("vector_store", _init_vector_store),
+                BootProbe("embedder", _init_embedder),
+                BootProbe("llm_router", _init_llm_router),
+            ],
+            on_done=lambda outcome: state.readiness.record(outcome, kind="component"),
+        )
+        if not components.wait(timeout=component_deadline_s()):
+            raise RuntimeError(
+                "Startup components did not finish within {:.0f}s: {}".format(
+                    component_deadline_s(), ", ".join(components.pending()),
+                )
+            )
+        for outcome in components.outcomes.values():
+            if outcome.error is not None:
+                raise outcome.error
+
+        startup.step("query_engine")
+        logger.info("[OK] Building query engine...")
+        state.readiness.expect("query_engine", "component")
+        with deferred_reranker_probe():
+            state.query_engine = GroundedQueryEngine(
+                state.config,
+                state.vector_store,
+                state.embedder,
+                state.llm_router,
+            )
+        state.readiness.record(
+            ProbeOutcome("query_engine", status="ok"), kind="component",
+        )
+        # Warm the shared grounding prefix on Ollama so the first query
+        # only pays prompt eval for its own context. Off the startup path.
+        threading.Thread(
+            target=_warm_llm_prefix, name="ollama-warmup", daemon=True,
+        ).start()
+
+        state.stats_reconcile_stop_event.clear()
+        reconcile_s = stats_reconcile_interval_s()
+        if reconcile_s > 0:
+            reconcile_thread = threading.Thread(
+                target=_run_stats_reconcile_loop, args=(reconcile_s,), daemon=True,
+            )
+            state.stats_reconcile_thread = reconcile_thread
+            reconcile_thread.start()
+        else:
+            state.stats_reconcile_thread = None
+
+        if index_watch_enabled():
+            state.index_watch = start_index_watch(state, state.config.paths.source_folder)
+
+        # Admin console sections (freshness scan, log tail, traces) are
+        # rebuilt in the background so /admin/data and /admin/stream only
+        # read a cached snapshot.
+        _admin_snapshot_service().start()
+
+        # Network health checks no longer hold up startup: they share one
+        # deadline and whatever is still running keeps going in the
+        # background, updating GET /ready when it finishes.
+        startup.step("probes")
+        probes = _readiness_probes()
+        for probe in probes:
+            state.readiness.expect(probe.name, "probe", critical=probe.critical)
+        state.probe_retry_stop_event.clear()
+        run = start_boot_probes(
+            probes, on_done=lambda outcome: state.readiness.record(outcome, kind="probe"),
+            retry_s=API_PROBE_RETRY_S, retry_max_s=API_PROBE_RETRY_MAX_S,
+            stop_event=state.probe_retry_stop_event,
+        )
+        if not run.wait(timeout=boot_deadline_s(API_PROBE_DEADLINE_S)):
+            logger.info(
+                "[OK] Startup probes still running in background: %s",
+                ", ".join(run.pending()),
+            )
 
     logger.info("[OK] FastAPI server ready.")
     yield
 
     # -- Shutdown --
     logger.info("[OK] Shutting down...")
+    state.probe_retry_stop_event.set()
     schedule_thread = state.index_schedule_thread
     if schedule_thread and schedule_thread.is_alive():
         logger.info("[OK] Stopping scheduled index loop...")
         state.index_schedule_stop_event.set()
         schedule_thread.join(timeout=5.0)
+    reconcile_thread = state.stats_reconcile_thread
+    if reconcile_thread and reconcile_thread.is_alive():
+        state.stats_reconcile_stop_event.set()
+        reconcile_thread.join(timeout=5.0)
+    reset_admin_snapshot_service()
+    stop_index_watch(state)
     thread = state.indexing_thread
     if thread and thread.is_alive():
         logger.info("[OK] Signaling indexing thread to stop...")
@@ -245,11 +466,17 @@ app = FastAPI(
 # -------------------------------------------------------------------
 # Register routes
 # -------------------------------------------------------------------
-from src.api.routes import router  # noqa: E402
-from src.api.web_dashboard import router as web_dashboard_router  # noqa: E402
-
-app.include_router(router)
-app.include_router(web_dashboard_router)
+try:
+    _import_phase.step("routes")
+    from src.api.routes import router, _admin_snapshot_service  # noqa: E402
+    from src.api.web_dashboard import router as web_dashboard_router  # noqa: E402
+
+    app.include_router(router)
+    app.include_router(web_dashboard_router)
+except BaseException:
+    _import_phase.finish("error")
+    raise
+_import_phase.finish()
 
 
 # -------------------------------------------------------------------
@@ -5,7 +5,8 @@ import time
 from collections import deque
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.api.auth_identity import (
     api_token_matches,
@@ -37,6 +38,7 @@ from src.api.models import (
     DashboardSnapshotResponse,
 )
 from src.api.routes import (
+    _admin_console_event_stream,
     _build_admin_console_snapshot,
     _build_admin_query_trace_response_by_id,
     _build_dashboard_snapshot,
@@ -259,7 +261,20 @@ async def admin_console(request: Request):
 async def admin_console_data(request: Request):
     """Return the aggregated operator-facing snapshot for the Admin web console."""
     _require_admin_console_access(request)
-    return _build_admin_console_snapshot(request, network_limit=20)
+    return await run_in_threadpool(
+        _build_admin_console_snapshot, request, network_limit=20,
+    )
+
+
+@router.get("/admin/stream")
+async def admin_console_stream(request: Request):
+    """Push the Admin snapshot, then only its changed sections, as SSE."""
+    _require_admin_console_access(request)
+    return StreamingResponse(
+        _admin_console_event_stream(request, network_limit=20),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/admin/index/stop", response_model=AdminIndexControlResponse)
@@ -56,7 +56,7 @@ from __future__ import annotations
 
 import logging
 import os
-import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -208,6 +208,16 @@ def boot_hybridrag(config_path=None) -> BootResult:
     Returns:
         BootResult with all status information.
     """
+    from src.core.startup_profile import get_startup_profile
+
+    # Each "Step N" below also opens a timed step in the startup profile
+    # (shown in /status and rag-diag) so slow boots can be broken down.
+    with get_startup_profile().phase("boot") as phase:
+        return _run_boot_pipeline(config_path, phase)
+
+
+def _run_boot_pipeline(config_path, phase) -> BootResult:
+    """Body of boot_hybridrag(); `phase` times each step."""
     _boot_step("boot_hybridrag() entered")
     result = BootResult(
         boot_timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -215,6 +225,7 @@ def boot_hybridrag(config_path=None) -> BootResult:
 
     # === STEP 1: Load Configuration ===
     _boot_step("Step 1: loading config...")
+    phase.step("config")
     try:
         config = load_config(config_path)
         _sanitize_boot_ollama_base_url(config)
@@ -227,6 +238,7 @@ def boot_hybridrag(config_path=None) -> BootResult:
 
     # === STEP 2: Resolve Credentials ===
     _boot_step("Step 2: resolving credentials...")
+    phase.step("credentials")
     try:
         from src.security.credentials import resolve_credentials
         creds = resolve_credentials(config, use_cache=False)
@@ -252,6 +264,7 @@ def boot_hybridrag(config_path=None) -> BootResult:
     # It reads the mode from config and the endpoint from credentials
     # to build the access control policy.
     _boot_step("Step 2.5: configuring network gate...")
+    phase.step("network_gate")
     try:
         from src.core.network_gate import configure_gate
 
@@ -295,8 +308,80 @@ def boot_hybridrag(config_path=None) -> BootResult:
         result.warnings.append(f"Network gate configuration failed: {e}")
         _boot_step("Step 2.5 WARNING: {}".format(e))
 
+    # === STEP 3-4.5: Backend probes + API client ===
+    # The Ollama and vLLM checks do not depend on each other or on the API
+    # client, so they run in background threads while Step 3 builds the
+    # client. Boot then waits ONCE, up to the global boot deadline
+    # (HYBRIDRAG_BOOT_DEADLINE_S, default 2s), instead of paying each
+    # probe's timeout in turn.
+    from src.core.boot_probes import BootProbe, boot_deadline_s, start_boot_probes
+
+    vllm_cfg = config.get("vllm", {}) if isinstance(config, dict) else {}
+    vllm_enabled = bool(vllm_cfg.get("enabled", False))
+    vllm_url = vllm_cfg.get("base_url", "http://localhost:8000").rstrip("/")
+
+    def _check_ollama():
+        """Plain-English: Succeeds when the local Ollama server answers."""
+        import urllib.request
+        from src.core.network_gate import get_gate
+        ollama_host = _sanitize_boot_ollama_base_url(config)
+        get_gate().check_allowed(
+            ollama_host, "ollama_boot_check", "boot",
+        )
+        # Use the lightweight root health endpoint here instead of
+        # /api/tags. The tags route can exceed the boot deadline
+        # on cold local workstations even when Ollama is healthy.
+        # ProxyHandler({}) bypasses managed-network proxy for loopback.
+        # Without this, transparent proxy intercepts 127.0.0.1.
+        opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({})
+        )
+        req = urllib.request.Request(
+            ollama_host, method="GET",
+        )
+        with opener.open(req, timeout=3) as response:
+            if response.status != 200:
+                raise RuntimeError("Ollama responded but with unexpected status")
+
+    def _check_vllm():
+        """Plain-English: Succeeds when the vLLM server's /health answers."""
+        import urllib.request
+        from src.core.network_gate import get_gate
+        get_gate().check_allowed(
+            f"{vllm_url}/health", "vllm_boot_check", "boot",
+        )
+        # ProxyHandler({}) bypasses managed-network proxy for loopback,
+        # matching the Ollama boot check above.
+        opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({})
+        )
+        req = urllib.request.Request(f"{vllm_url}/health", method="GET")
+        with opener.open(req, timeout=3) as response:
+            if response.status != 200:
+                raise RuntimeError("vLLM responded with unexpected status")
+
+    def _late_probe_result(outcome):
+        """Update the result when a probe finishes after boot returned."""
+        if outcome.name == "ollama" and result.offline_probe_pending:
+            result.offline_available = outcome.status == "ok"
+            result.offline_probe_pending = False
+            logger.info("BOOT Step 4: late Ollama check %s", outcome.status)
+
+    probes = [BootProbe("ollama", _check_ollama)]
+    if vllm_enabled:
+        logger.info("BOOT Step 4.5: Checking vLLM...")
+        probes.append(BootProbe("vllm", _check_vllm, critical=False))
+    else:
+        logger.info("BOOT Step 4.5: vLLM disabled in config, skipping")
+    deadline = boot_deadline_s()
+    probe_deadline = time.monotonic() + deadline
+    _boot_step("Step 4: probing Ollama{} in background ({:g}s deadline)...".format(
+        " + vLLM" if vllm_enabled else "", deadline))
+    probe_run = start_boot_probes(probes)
+
     # === STEP 3: Build API Client (Online Mode) ===
     _boot_step("Step 3: building API client...")
+    phase.step("api_client")
     if result.credentials and result.credentials.is_online_ready:
         try:
             from src.core.api_client_factory import ApiClientFactory
@@ -327,100 +412,55 @@ def boot_hybridrag(config_path=None) -> BootResult:
         result.warnings.append("Skipping API client -- credentials incomplete")
         _boot_step("Step 3 skipped (no credentials)")
 
-    # === STEP 4: Check Ollama (non-blocking) ===
-    # Ollama is localhost -- responds in <50ms when running. Run the check
-    # in a daemon thread with a short join timeout so boot is not blocked
-    # for 3s if Ollama is down or slow to respond.
-    _boot_step("Step 4: checking Ollama (2s timeout)...")
-
-    ollama_probe = {"available": False, "warning": ""}
-
-    def _check_ollama():
-        """Plain-English: This function handles check ollama."""
-        try:
-            import urllib.request
-            import urllib.error
-            from src.core.network_gate import get_gate
-            ollama_host = _sanitize_boot_ollama_base_url(config)
-            get_gate().check_allowed(
-                ollama_host, "ollama_boot_check", "boot",
-            )
-            # Use the lightweight root health endpoint here instead of
-            # /api/tags. The tags route can exceed the 2s boot join window
-            # on cold local workstations even when Ollama is healthy.
-            # ProxyHandler({}) bypasses managed-network proxy for loopback.
-            # Without this, transparent proxy intercepts 127.0.0.1.
-            opener = urllib.request.build_opener(
-                urllib.request.ProxyHandler({})
-            )
-            req = urllib.request.Request(
-                ollama_host, method="GET",
-            )
-            with opener.open(req, timeout=3) as response:
-                if response.status == 200:
-                    ollama_probe["available"] = True
-                    logger.info("BOOT Step 4: Ollama is running")
-                else:
-                    ollama_probe["warning"] = (
-                        "Ollama responded but with unexpected status"
-                    )
-        except Exception:
-            ollama_probe["warning"] = (
-                "Ollama is not running -- offline mode unavailable"
-            )
-            logger.info("BOOT Step 4: Ollama not reachable")
-
-    ollama_thread = threading.Thread(target=_check_ollama, daemon=True)
-    ollama_thread.start()
-    ollama_thread.join(timeout=2.0)
+    # === STEP 4: Collect probe results (bounded by the boot deadline) ===
+    phase.step("probe_wait")
+    probe_run.wait(timeout=max(0.0, probe_deadline - time.monotonic()))
 
-    if ollama_thread.is_alive():
+    ollama = probe_run.outcomes["ollama"]
+    if ollama.status == "pending":
         # Ollama check did not complete in time. Do NOT assume available
         # -- an optimistic True here masks real failures and causes the
         # first offline query to crash instead of showing a clear message.
-        # Status bar CBIT will detect Ollama within 30s and update.
+        # The late result updates this BootResult, and the status bar
+        # CBIT will detect Ollama within 30s either way.
         result.offline_probe_pending = True
         result.warnings.append(
-            "Ollama health check timed out (2s). "
-            "Offline mode will activate when Ollama responds."
+            "Ollama health check timed out ({:g}s). "
+            "Offline mode will activate when Ollama responds.".format(deadline)
         )
         logger.info("BOOT Step 4: Ollama check timed out, NOT assuming available")
+    elif ollama.status == "ok":
+        result.offline_available = True
+        logger.info("BOOT Step 4: Ollama is running")
     else:
-        result.offline_available = bool(ollama_probe["available"])
-        if ollama_probe["warning"]:
-            result.warnings.append(ollama_probe["warning"])
-
-    # === STEP 4.5: Check vLLM (if enabled) ===
-    vllm_cfg = config.get("vllm", {}) if isinstance(config, dict) else {}
-    if vllm_cfg.get("enabled", False):
-        logger.info("BOOT Step 4.5: Checking vLLM...")
-        vllm_url = vllm_cfg.get("base_url", "http://localhost:8000").rstrip("/")
-        try:
-            import urllib.request
-            from src.core.network_gate import get_gate
-            get_gate().check_allowed(
-                f"{vllm_url}/health", "vllm_boot_check", "boot",
+        if "unexpected status" in ollama.detail:
+            result.warnings.append("Ollama responded but with unexpected status")
+        else:
+            result.warnings.append("Ollama is not running -- offline mode unavailable")
+        logger.info("BOOT Step 4: Ollama not reachable")
+
+    vllm = probe_run.outcomes.get("vllm")
+    if vllm is not None:
+        if vllm.status == "ok":
+            logger.info("[OK] vLLM available at %s", vllm_url)
+        elif vllm.status == "pending":
+            result.warnings.append(
+                "vLLM check still running at " + vllm_url + " (Ollama fallback until it answers)"
             )
-            # ProxyHandler({}) bypasses managed-network proxy for loopback,
-            # matching the Ollama boot check pattern above.
-            opener = urllib.request.build_opener(
-                urllib.request.ProxyHandler({})
+        elif "unexpected status" in vllm.detail:
+            result.warnings.append(
+                "vLLM responded with unexpected status (Ollama fallback)"
             )
-            req = urllib.request.Request(f"{vllm_url}/health", method="GET")
-            with opener.open(req, timeout=3) as response:
-                if response.status == 200:
-                    logger.info("[OK] vLLM available at %s", vllm_url)
-                else:
-                    result.warnings.append(
-                        "vLLM responded with unexpected status (Ollama fallback)"
-                    )
-        except Exception:
+        else:
             result.warnings.append(
                 "[WARN] vLLM not running at " + vllm_url + " (Ollama fallback)"
             )
             logger.info("BOOT Step 4.5: vLLM not reachable, Ollama fallback active")
-    else:
-        logger.info("BOOT Step 4.5: vLLM disabled in config, skipping")
+
+    if ollama.status == "pending":
+        # Registered only now so it cannot race the handling above; runs
+        # immediately if the probe finished in the meantime.
+        probe_run.add_done_callback("ollama", _late_probe_result)
 
     _boot_step("Step 4 done (offline={})".format(result.offline_available))
 
@@ -0,0 +1,213 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Runs independent startup health probes at the same time, under one deadline.
+# What to read first: Start at start_boot_probes() and ProbeRun.wait().
+# Inputs: A list of BootProbe(name, func, critical) objects.
+# Outputs: A ProbeRun whose outcomes fill in as each probe finishes.
+# Safety notes: Update small sections at a time and run relevant tests after edits.
+# ============================
+# ============================================================================
+# HybridRAG -- Boot Probes (src/core/boot_probes.py)
+# ============================================================================
+# WHAT: A tiny runner for startup checks such as "is Ollama up?", "is vLLM
+#       up?", "does the embedding model return the configured dimension?"
+#       and "can the reranker be reached?".
+# WHY:  These checks used to run one after another, each with its own
+#       timeout, so a slow Ollama or vLLM could add several seconds to boot
+#       even though none of them depend on each other.
+# HOW:  Every probe runs in its own daemon thread.  The caller waits once,
+#       up to a global deadline, and then moves on.  Probes that have not
+#       finished stay "pending" and keep running in the background; when
+#       they finish, their outcome is filled in and their callbacks run so
+#       readiness state can be updated late.  Daemon threads (not a pool)
+#       so a probe stuck on a dead socket never blocks interpreter exit.
+# USAGE:
+#   run = start_boot_probes([
+#       BootProbe("ollama", check_ollama),
+#       BootProbe("vllm", check_vllm, critical=False),
+#   ], on_done=update_readiness)
+#   run.wait(boot_deadline_s())
+#   run.outcomes["ollama"].status   # "ok" | "failed" | "pending"
+#
+#   With retry_s > 0, a critical probe that fails keeps retrying in its
+#   thread with exponential backoff (capped at retry_max_s) until it passes
+#   or stop_event is set; a late pass updates the outcome and calls on_done
+#   again, so a service that comes up after the API is picked up.
+# ============================================================================
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOOT_DEADLINE_S = 2.0
+
+
+def boot_deadline_s(default: float = DEFAULT_BOOT_DEADLINE_S) -> float:
+    """Global startup probe deadline (HYBRIDRAG_BOOT_DEADLINE_S overrides)."""
+    raw = (os.environ.get("HYBRIDRAG_BOOT_DEADLINE_S") or "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return max(0.0, value)
+
+
+@dataclass
+class BootProbe:
+    """
+    One independent startup check.
+
+    func() returns a short detail string (or any value) on success and
+    raises on failure.  critical=False marks checks whose failure only
+    degrades the service (e.g. the reranker) instead of blocking it.
+    """
+    name: str
+    func: Callable[[], Any]
+    critical: bool = True
+
+
+@dataclass
+class ProbeOutcome:
+    """Live result of one probe; updated in place when it finishes."""
+    name: str
+    critical: bool = True
+    status: str = "pending"
+    detail: str = ""
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "critical": self.critical,
+            "status": self.status,
+            "detail": self.detail,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+class ProbeRun:
+    """Handle on a set of probes started together."""
+
+    def __init__(self, outcomes: Dict[str, ProbeOutcome]) -> None:
+        self.outcomes = outcomes
+        self._condition = threading.Condition()
+        self._remaining = len(outcomes)
+        self._callbacks: Dict[str, List[Callable[[ProbeOutcome], None]]] = {}
+
+    def _complete(self, outcome: ProbeOutcome, status: str) -> None:
+        with self._condition:
+            outcome.status = status
+            callbacks = self._callbacks.pop(outcome.name, [])
+        # Callbacks run before waiters are released, so whatever they
+        # update (readiness, BootResult) is current once wait() returns.
+        for callback in callbacks:
+            _call_safely(callback, outcome)
+        with self._condition:
+            self._remaining -= 1
+            self._condition.notify_all()
+
+    def add_done_callback(self, name: str, callback: Callable[[ProbeOutcome], None]) -> None:
+        """Call `callback(outcome)` when probe `name` finishes (now, if it already has)."""
+        with self._condition:
+            outcome = self.outcomes[name]
+            if outcome.status == "pending":
+                self._callbacks.setdefault(name, []).append(callback)
+                return
+        _call_safely(callback, outcome)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every probe finished or `timeout` passed; True if all done."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._remaining <= 0, timeout)
+
+    def pending(self) -> List[str]:
+        return [name for name, o in self.outcomes.items() if o.status == "pending"]
+
+
+def _call_safely(callback: Callable[[ProbeOutcome], None], outcome: ProbeOutcome) -> None:
+    try:
+        callback(outcome)
+    except Exception as exc:
+        logger.warning("[BOOT:PROBE] %s callback failed: %s", outcome.name, exc)
+
+
+def start_boot_probes(
+    probes: Iterable[BootProbe],
+    on_done: Optional[Callable[[ProbeOutcome], None]] = None,
+    *,
+    retry_s: float = 0.0,
+    retry_max_s: float = 60.0,
+    stop_event: Optional[threading.Event] = None,
+) -> ProbeRun:
+    """Start every probe concurrently and return immediately.
+
+    on_done(outcome) is called from the probe's thread as each one
+    finishes, including after the caller has stopped waiting.  With
+    retry_s > 0, failed critical probes are retried in the background
+    and on_done is called again when one passes.
+    """
+    probes = list(probes)
+    run = ProbeRun({p.name: ProbeOutcome(p.name, critical=p.critical) for p in probes})
+    if on_done is not None:
+        for name in run.outcomes:
+            run._callbacks[name] = [on_done]
+
+    def _run(probe: BootProbe) -> None:
+        outcome = run.outcomes[probe.name]
+        t0 = time.perf_counter()
+        try:
+            value = probe.func()
+            outcome.value = value
+            outcome.detail = value if isinstance(value, str) else ""
+            status = "ok"
+        except Exception as exc:
+            outcome.error = exc
+            outcome.detail = f"{type(exc).__name__}: {exc}"
+            status = "failed"
+        outcome.elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info(
+            "[BOOT:PROBE] %s %s in %.0f ms%s",
+            probe.name, status, outcome.elapsed_ms,
+            f" ({outcome.detail})" if status == "failed" else "",
+        )
+        run._complete(outcome, status)
+        if status == "failed" and probe.critical and retry_s > 0:
+            _retry_until_ok(probe, outcome)
+
+    def _retry_until_ok(probe: BootProbe, outcome: ProbeOutcome) -> None:
+        delay = retry_s
+        stop = stop_event or threading.Event()
+        while not stop.wait(delay):
+            t0 = time.perf_counter()
+            try:
+                value = probe.func()
+            except Exception as exc:
+                with run._condition:
+                    outcome.error = exc
+                    outcome.detail = f"{type(exc).__name__}: {exc}"
+                delay = min(delay * 2, max(retry_s, retry_max_s))
+                continue
+            with run._condition:
+                outcome.value = value
+                outcome.detail = value if isinstance(value, str) else ""
+                outcome.error = None
+                outcome.elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+                outcome.status = "ok"
+            logger.info("[BOOT:PROBE] %s ok on retry", probe.name)
+            if on_done is not None:
+                _call_safely(on_done, outcome)
+            return
+
+    for probe in probes:
+        threading.Thread(
+            target=_run, args=(probe,), name=f"boot-probe-{probe.name}", daemon=True,
+        ).start()
+    return run
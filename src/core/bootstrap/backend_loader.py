@@ -35,6 +35,7 @@ from __future__ import annotations
 import os
 import time
 import logging
+import threading
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any, List, Callable, Dict
@@ -179,11 +180,6 @@ class BackendLoader:
         # Surfaces in "Backend Init Errors" so operators get a clear prompt.
         self._check_ollama_model_match(bundle.router, bundle.init_errors)
 
-        # Warmups (best effort, do not block readiness)
-        stage("Warming up model...")
-        self._warm_offline(bundle.router)
-        self._warm_online(self.boot_result)
-
         # Assemble QueryEngine/Indexer
         stage("QueryEngine...")
         t_qe = time.perf_counter()
@@ -193,6 +189,13 @@ class BackendLoader:
             bundle.indexer = Indexer(self.config, bundle.store, bundle.embedder, chunker)
         bundle.timings_ms["assemble"] = (time.perf_counter() - t_qe) * 1000
 
+        # Warmups (best effort, do not block readiness). Runs after
+        # assembly so the offline warmup can pre-evaluate the engine's
+        # stable prompt prefix, not just load weights.
+        stage("Warming up model...")
+        self._warm_offline(bundle.router, bundle.query_engine)
+        self._warm_online(self.boot_result)
+
         bundle.timings_ms["total"] = (time.perf_counter() - t_all) * 1000
         stage("Ready")
         return bundle
@@ -206,26 +209,27 @@ class BackendLoader:
             errors.append(f"{label}: {e}")
             return None
 
-    def _warm_offline(self, router: Any) -> None:
+    def _warm_offline(self, router: Any, query_engine: Any = None) -> None:
         # Warm Ollama weights into memory so first demo query is fast.
+        # With an engine, the stable grounding prefix is evaluated too so
+        # the first query only pays prompt-eval for its own context.
+        # Prefix eval can take minutes on CPU hosts, so it runs on a
+        # daemon thread and load() returns without waiting for it.
         """Plain-English: This function handles warm offline."""
+        threading.Thread(
+            target=self._warm_offline_now, args=(router, query_engine),
+            name="ollama-warmup", daemon=True,
+        ).start()
+
+    def _warm_offline_now(self, router: Any, query_engine: Any = None) -> None:
+        """Plain-English: Runs the Ollama warmup request (on the warmup thread)."""
         try:
-            if not router or not getattr(router, "ollama", None):
+            if not router or not hasattr(router, "warm_prefix"):
                 return
-            if not router.ollama.is_available():
-                return
-            cfg = self.config
-            router.ollama._client.post(
-                f"{router.ollama.base_url}/api/generate",
-                json={
-                    "model": cfg.ollama.model,
-                    "prompt": "hi",
-                    "stream": False,
-                    "keep_alive": getattr(cfg.ollama, "keep_alive", -1),
-                    "options": router.ollama._build_options(),
-                },
-                timeout=20,
-            )
+            prefix = ""
+            if query_engine is not None and hasattr(query_engine, "_stable_prompt_prefix"):
+                prefix = query_engine._stable_prompt_prefix()
+            router.warm_prefix(prefix or "hi")
         except Exception:
             return
 
@@ -241,6 +241,11 @@ class VLLMConfig:
     timeout_seconds: int = 120
     context_window: int = 16384
     enabled: bool = False
+    # Micro-batching window for concurrent generations (0 = off).
+    # Requests sharing the grounded system prompt are released together
+    # so vLLM's prefix cache is reused. See vllm_batcher.py.
+    batch_window_ms: int = 0
+    max_batch_size: int = 8
 
     def __post_init__(self) -> None:
         """Plain-English: Applies defaults, validation, and value cleanup right after object creation."""
@@ -416,6 +421,8 @@ class IndexingConfig:
     """
     max_chars_per_file: int = 5_000_000   # Clamp files larger than this (safety)
     block_chars: int = 500_000             # Process text in blocks of this size
+    stream_parsers: bool = True            # Index parse_iter() parsers segment by segment
+    archive_members: bool = True           # Index archive members as "archive.zip!/member" sources
 
     # Which file types the indexer will attempt to parse
     # Must match registry.py -- every registered extension should be here
@@ -0,0 +1,263 @@
+# ============================================================================
+# context_packer.py -- Token-budgeted packing of retrieved context
+# ============================================================================
+#
+# WHAT: Fits the retriever's context blocks into the model's prompt budget.
+#       Every block's token count is computed once (cached per chunk by a
+#       content digest and model family; whole-context counts are never
+#       cached), blocks are packed greedily in relevance order
+#       (a block that does not fit is skipped, smaller later ones may
+#       still fit), and the chunker's 200-char overlap between adjacent
+#       chunks of the same file is removed so it is not paid for twice.
+#
+# WHY:  The old trimmer estimated len/4, re-joined the remaining chunks on
+#       every iteration (quadratic) and stopped at the first block that did
+#       not fit. On phi4-mini's 4096-token window that left evidence out.
+#
+# TOKENS: No tokenizer files are loaded (tiktoken fetches its BPE tables
+#       over the network on first use, which offline installs forbid).
+#       estimate_tokens() splits text into words, digit groups and
+#       punctuation and charges each word by the typical subword length of
+#       the model family's vocabulary. It errs slightly high on purpose.
+#
+# INTERNET ACCESS: NONE
+# ============================================================================
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Average characters per subword token for alphabetic runs, by vocabulary.
+# ~100k+ vocabularies (GPT-4/4o, phi-3/4, llama-3, qwen) keep most English
+# words whole; 32k sentencepiece vocabularies (llama-2, mistral) split more.
+_FAMILY_WORD_CHARS = {
+    "large_vocab": 6,
+    "small_vocab": 4,
+}
+_SMALL_VOCAB_MARKERS = ("mistral", "mixtral", "llama2", "llama-2", "gemma:2b", "tinyllama")
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\n+|[^\sA-Za-z\d]")
+_HEADER_RE = re.compile(
+    r"^\[Source\s+\d+\]\s*(?P<path>.*?)\s*\(chunk\s+(?P<chunk>\d+),\s*score=[\d.]+\)\s*\n"
+)
+_SECTION_RE = re.compile(r"^\[SECTION\][^\n]*\n")
+_MIN_OVERLAP_CHARS = 32
+
+
+def resolve_context_model_name(config) -> str:
+    """Model whose tokenizer the context is packed for (mode-aware)."""
+    if getattr(config, "mode", "") == "online":
+        api_cfg = getattr(config, "api", None)
+        return str(
+            getattr(api_cfg, "model", "") or getattr(api_cfg, "deployment", "") or ""
+        )
+    return str(getattr(getattr(config, "ollama", None), "model", "") or "")
+
+
+def model_family(model_name: str) -> str:
+    """Map a model/deployment name onto a tokenizer family key."""
+    name = str(model_name or "").lower()
+    if any(marker in name for marker in _SMALL_VOCAB_MARKERS):
+        return "small_vocab"
+    return "large_vocab"
+
+
+def _count_tokens(text: str, family: str) -> int:
+    word_chars = _FAMILY_WORD_CHARS.get(family, 4)
+    total = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // word_chars
+        else:
+            total += 1
+    return total
+
+
+# Per-block counts keyed by a 16-byte digest of the block, so the cache
+# holds no chunk text and its size stays bounded by entry count alone.
+_BLOCK_CACHE_SIZE = 8192
+_block_cache: "OrderedDict[tuple[bytes, str], int]" = OrderedDict()
+_block_cache_lock = threading.Lock()
+
+
+def _block_tokens(block: str, family: str) -> int:
+    """Token count of one retrieved block, memoized across queries."""
+    if not block:
+        return 0
+    key = (hashlib.blake2b(block.encode("utf-8", "surrogatepass"), digest_size=16).digest(), family)
+    with _block_cache_lock:
+        cached = _block_cache.get(key)
+        if cached is not None:
+            _block_cache.move_to_end(key)
+            return cached
+    count = _count_tokens(block, family)
+    with _block_cache_lock:
+        _block_cache[key] = count
+        if len(_block_cache) > _BLOCK_CACHE_SIZE:
+            _block_cache.popitem(last=False)
+    return count
+
+
+def estimate_tokens(text: str, model_name: str = "") -> int:
+    """Approximate prompt tokens for text under the given model's tokenizer."""
+    if not text:
+        return 0
+    return _count_tokens(text, model_family(model_name))
+
+
+@dataclass
+class ContextPack:
+    """Packed context plus the accounting reported in the query trace."""
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+    budget_tokens: int
+    chunks_before: int
+    chunks_kept: int
+    overlap_chars_removed: int = 0
+    truncated: bool = False
+
+    @property
+    def trimmed(self) -> bool:
+        return self.chunks_kept < self.chunks_before or self.truncated
+
+
+def _split_header(block: str) -> tuple[str, str, int | None, str]:
+    """Return (header, source_path, chunk_index, body) for one context block."""
+    match = _HEADER_RE.match(block)
+    if not match:
+        return "", "", None, block
+    return (
+        block[: match.end()],
+        match.group("path"),
+        int(match.group("chunk")),
+        block[match.end():],
+    )
+
+
+def _overlap_len(left: str, right: str, max_chars: int) -> int:
+    """Length of the longest suffix of left that starts right (>= minimum)."""
+    upper = min(len(left), len(right), max_chars)
+    for size in range(upper, _MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _strip_overlap(body: str, prev_body: str | None, next_body: str | None,
+                   max_chars: int) -> tuple[str, int]:
+    """Drop text this chunk shares with its kept neighbours in the same file."""
+    removed = 0
+    if prev_body is not None:
+        section = _SECTION_RE.match(body)
+        head = section.group(0) if section else ""
+        rest = body[len(head):]
+        size = _overlap_len(prev_body.rstrip(), rest, max_chars)
+        if size:
+            body = head + rest[size:].lstrip()
+            removed += size
+    if next_body is not None:
+        section = _SECTION_RE.match(next_body)
+        nxt = next_body[section.end():] if section else next_body
+        size = _overlap_len(body.rstrip(), nxt, max_chars)
+        if size:
+            body = body.rstrip()[:-size].rstrip()
+            removed += size
+    return body, removed
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, model_name: str) -> str:
+    """Cut text at a sentence boundary so it fits in max_tokens."""
+    total = estimate_tokens(text, model_name)
+    if total <= max_tokens:
+        return text
+    # Binary search on characters; the count grows with the prefix. Uses
+    # the uncached counter so probe prefixes do not evict real blocks.
+    family = model_family(model_name)
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _count_tokens(text[:mid], family) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    last_period = cut.rfind(". ")
+    if last_period > lo // 2:
+        return cut[: last_period + 1]
+    return cut
+
+
+def pack_context(
+    context: str,
+    max_tokens: int,
+    *,
+    model_name: str = "",
+    overlap_chars: int = 200,
+) -> ContextPack:
+    """
+    Pack retriever context blocks into max_tokens.
+
+    Blocks are considered in relevance order (the order build_context()
+    emits) and kept in that order. Overlap with an adjacent chunk of the
+    same source that is also kept is removed before the block is costed.
+    If not even the top block fits, it is truncated at a sentence boundary.
+    """
+    blocks = context.split(CONTEXT_SEPARATOR) if context else []
+    family = model_family(model_name)
+    sep_tokens = estimate_tokens(CONTEXT_SEPARATOR, model_name)
+    block_tokens = [_block_tokens(block, family) for block in blocks]
+    tokens_before = sum(block_tokens) + sep_tokens * max(len(blocks) - 1, 0)
+
+    parsed = [_split_header(block) for block in blocks]
+    kept: dict[int, str] = {}
+    by_position: dict[tuple[str, int], int] = {}
+    used = 0
+    removed_total = 0
+    max_overlap = max(int(overlap_chars or 0), 0) * 2
+
+    for idx, (header, path, chunk_index, body) in enumerate(parsed):
+        removed = 0
+        if chunk_index is not None and max_overlap:
+            prev_idx = by_position.get((path, chunk_index - 1))
+            next_idx = by_position.get((path, chunk_index + 1))
+            body, removed = _strip_overlap(
+                body,
+                _split_header(kept[prev_idx])[3] if prev_idx is not None else None,
+                _split_header(kept[next_idx])[3] if next_idx is not None else None,
+                max_overlap,
+            )
+        block = header + body if removed else blocks[idx]
+        cost = _block_tokens(block, family) if removed else block_tokens[idx]
+        cost += sep_tokens if kept else 0
+        if used + cost > max_tokens:
+            continue
+        kept[idx] = block
+        used += cost
+        removed_total += removed
+        if chunk_index is not None:
+            by_position[(path, chunk_index)] = idx
+
+    truncated = False
+    if not kept and blocks:
+        kept[0] = _truncate_to_tokens(blocks[0], max_tokens, model_name)
+        truncated = True
+
+    text = CONTEXT_SEPARATOR.join(kept[idx] for idx in sorted(kept))
+    return ContextPack(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(text, model_name),
+        budget_tokens=int(max_tokens),
+        chunks_before=len(blocks),
+        chunks_kept=len(kept),
+        overlap_chars_removed=removed_total,
+        truncated=truncated,
+    )
@@ -0,0 +1,195 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Keeps chunk and source counts up to date inside SQLite so status pages can read them instantly.
+# What to read first: Start at ensure_corpus_stats_schema(), then count_corpus() and rebuild_corpus_stats().
+# Inputs: The chunks table (via triggers) and an open SQLite connection.
+# Outputs: corpus_stats / corpus_source_counts tables and plain count dictionaries.
+# Safety notes: Counters only ever change inside the same transaction as the chunk rows they describe.
+# ============================
+# ============================================================================
+# HybridRAG -- Maintained Corpus Statistics (src/core/corpus_stats.py)
+# ============================================================================
+# WHAT: Two small tables kept current by triggers on `chunks`:
+#         corpus_stats(name, value)              -- chunk_count, source_count
+#         corpus_source_counts(source_path, chunks)
+# WHY:  VectorStore.get_stats() ran COUNT(*) and COUNT(DISTINCT source_path)
+#       over the whole chunks table, holding the store lock, on every
+#       /status, /dashboard/data and /admin/data poll.  On a multi-million
+#       row index those are full scans every few seconds.
+# HOW:  AFTER INSERT / DELETE / UPDATE OF source_path triggers on chunks
+#       adjust the per-source row and chunk_count; triggers on
+#       corpus_source_counts adjust source_count when a source appears or
+#       disappears.  Every writer -- the indexer, repair tools, a raw
+#       sqlite3 shell -- is covered, and the counts commit or roll back
+#       with the rows.  INSERT OR IGNORE duplicates fire nothing.
+#       count_corpus() is the slow ground truth; compare_corpus_stats()
+#       checks the counters against it and VectorStore.reconcile_stats()
+#       rebuilds them on drift.
+# USAGE:
+#   ensure_corpus_stats_schema(conn)        # once, from VectorStore._init_schema
+#   read_corpus_stats(conn)                 # O(1)
+#   compare_corpus_stats(read_only_conn)    # background reconciliation
+# ============================================================================
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+COUNTER_NAMES = ("chunk_count", "source_count")
+
+_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_chunk_ai
+    AFTER INSERT ON chunks
+    BEGIN
+        INSERT INTO corpus_source_counts (source_path, chunks)
+            SELECT NEW.source_path, 0
+            WHERE NOT EXISTS (
+                SELECT 1 FROM corpus_source_counts WHERE source_path = NEW.source_path
+            );
+        UPDATE corpus_source_counts SET chunks = chunks + 1
+            WHERE source_path = NEW.source_path;
+        UPDATE corpus_stats SET value = value + 1 WHERE name = 'chunk_count';
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_chunk_ad
+    AFTER DELETE ON chunks
+    BEGIN
+        UPDATE corpus_source_counts SET chunks = chunks - 1
+            WHERE source_path = OLD.source_path;
+        DELETE FROM corpus_source_counts
+            WHERE source_path = OLD.source_path AND chunks <= 0;
+        UPDATE corpus_stats SET value = value - 1 WHERE name = 'chunk_count';
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_chunk_au
+    AFTER UPDATE OF source_path ON chunks
+    WHEN OLD.source_path IS NOT NEW.source_path
+    BEGIN
+        UPDATE corpus_source_counts SET chunks = chunks - 1
+            WHERE source_path = OLD.source_path;
+        DELETE FROM corpus_source_counts
+            WHERE source_path = OLD.source_path AND chunks <= 0;
+        INSERT INTO corpus_source_counts (source_path, chunks)
+            SELECT NEW.source_path, 0
+            WHERE NOT EXISTS (
+                SELECT 1 FROM corpus_source_counts WHERE source_path = NEW.source_path
+            );
+        UPDATE corpus_source_counts SET chunks = chunks + 1
+            WHERE source_path = NEW.source_path;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_source_ai
+    AFTER INSERT ON corpus_source_counts
+    BEGIN
+        UPDATE corpus_stats SET value = value + 1 WHERE name = 'source_count';
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_source_ad
+    AFTER DELETE ON corpus_source_counts
+    BEGIN
+        UPDATE corpus_stats SET value = value - 1 WHERE name = 'source_count';
+    END;
+    """,
+)
+
+
+def ensure_corpus_stats_schema(conn) -> None:
+    """
+    Create the counter tables and triggers if missing.
+
+    On a database indexed before this existed the counters are seeded
+    with one full count; after that they are maintained by the triggers.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS corpus_stats (
+            name        TEXT PRIMARY KEY,
+            value       INTEGER NOT NULL DEFAULT 0,
+            updated_at  TEXT NOT NULL DEFAULT ''
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS corpus_source_counts (
+            source_path TEXT PRIMARY KEY,
+            chunks      INTEGER NOT NULL DEFAULT 0
+        );
+        """
+    )
+    seeded = conn.execute("SELECT COUNT(*) FROM corpus_stats").fetchone()[0]
+    for trigger_sql in _TRIGGERS:
+        conn.execute(trigger_sql)
+    if not seeded:
+        rebuild_corpus_stats(conn)
+    conn.commit()
+
+
+def read_corpus_stats(conn) -> Dict[str, int]:
+    """Maintained counters: {"chunk_count": n, "source_count": m}."""
+    counts = {name: 0 for name in COUNTER_NAMES}
+    for name, value in conn.execute(
+        "SELECT name, value FROM corpus_stats"
+    ).fetchall():
+        if name in counts:
+            counts[name] = int(value)
+    return counts
+
+
+def count_corpus(conn) -> Dict[str, int]:
+    """Ground truth by full scan (what get_stats() used to run per poll)."""
+    chunks = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    sources = conn.execute(
+        "SELECT COUNT(DISTINCT source_path) FROM chunks"
+    ).fetchone()[0]
+    return {"chunk_count": int(chunks or 0), "source_count": int(sources or 0)}
+
+
+def rebuild_corpus_stats(conn) -> Dict[str, int]:
+    """Recompute both tables from chunks.  Caller commits."""
+    conn.execute("DELETE FROM corpus_source_counts")
+    conn.execute(
+        "INSERT INTO corpus_source_counts (source_path, chunks) "
+        "SELECT source_path, COUNT(*) FROM chunks GROUP BY source_path"
+    )
+    counts = count_corpus(conn)
+    now = datetime.now(timezone.utc).isoformat()
+    for name in COUNTER_NAMES:
+        conn.execute(
+            "INSERT INTO corpus_stats (name, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value, "
+            "updated_at = excluded.updated_at",
+            (name, counts[name], now),
+        )
+    return counts
+
+
+def compare_corpus_stats(conn) -> Dict[str, Any]:
+    """
+    Counters vs. a full count, read in one transaction.
+
+    Run this on a separate read connection: under WAL it sees one
+    consistent snapshot and does not block the writer.
+    """
+    conn.execute("BEGIN")
+    try:
+        maintained = read_corpus_stats(conn)
+        actual = count_corpus(conn)
+    finally:
+        conn.execute("COMMIT")
+    drift = {
+        name: actual[name] - maintained[name]
+        for name in COUNTER_NAMES if actual[name] != maintained[name]
+    }
+    return {
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "maintained": maintained,
+        "actual": actual,
+        "drift": drift,
+        "ok": not drift,
+    }
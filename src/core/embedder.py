@@ -135,7 +135,7 @@ class Embedder:
                 note="dimension from config (no probe)",
             )
         else:
-            self.dimension = self._detect_dimension()
+            self.dimension = self.probe_dimension()
 
     def _validate_host(self) -> None:
         """
@@ -182,7 +182,7 @@ class Embedder:
                 f"Verify Ollama is running: ollama serve"
             )
 
-    def _detect_dimension(self) -> int:
+    def probe_dimension(self) -> int:
         """
         Embed a test string to discover the model's output dimension.
 
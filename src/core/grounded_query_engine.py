@@ -51,7 +51,7 @@
 # NETWORK ACCESS: NONE (NLI model runs locally after first download)
 #
 # DEPENDENCIES: hallucination_guard/ package (already in src/core/)
-#               NLI verifier is DORMANT (sentence-transformers retired)
+#               NLI verifier runs only when a local ONNX model is present
 #
 # LINE BUDGET: Target <300 lines (well under 500 limit)
 # ============================================================================
@@ -64,13 +64,16 @@ from dataclasses import dataclass
 from .query_engine import (
     QueryEngine, QueryResult, _retrieval_access_denied,
     _decompose_query, _filter_low_relevance_chunks, _multi_query_retrieve,
-    _attempt_corrective_retrieval,
+    _attempt_corrective_retrieval, _qe_stable_prompt_prefix,
 )
 from .query_mode import apply_query_mode_to_engine
 from .config import Config
 from .vector_store import VectorStore
 from .embedder import Embedder
 from .llm_router import LLMRouter
+from .source_tokens import SourceTokenIndex, token_ids
+from .stream_grounding import StreamingGroundingGate
+from .query_spans import query_span, record_span, timed_stage, traced_query
 from .query_trace import (
     attach_result_trace,
     minimal_retrieval_trace,
@@ -157,6 +160,12 @@ class GroundedQueryEngineGuardMixin:
         """
         return _gqe_build_grounded_prompt(self, user_query, context, hits)
 
+    def _stable_prompt_prefix(self) -> str:
+        """Instruction text shared by every grounded prompt (KV-cache prefix)."""
+        return _qe_stable_prompt_prefix(
+            lambda q, c: self._build_grounded_prompt(q, c, [])
+        )
+
     def _verify_response(
         self, response_text: str, hits: list
     ) -> tuple:
@@ -164,9 +173,9 @@ class GroundedQueryEngineGuardMixin:
         return _gqe_verify_response(self, response_text, hits)
 
     @staticmethod
-    def _fallback_score(claims, source_texts, threshold):
+    def _fallback_score(claims, source_texts, threshold, source_index=None):
         """Plain-English: Produces a backup confidence score when full grounding metrics are unavailable."""
-        return _gqe_fallback_score(claims, source_texts, threshold)
+        return _gqe_fallback_score(claims, source_texts, threshold, source_index=source_index)
 
     def _no_evidence_result(self, start_time: float) -> GroundedQueryResult:
         """Return result when no search results found."""
@@ -264,6 +273,7 @@ class GroundedQueryEngine(GroundedQueryEngineGuardMixin, QueryEngine):
     # query() -- synchronous guarded path
     # ------------------------------------------------------------------
 
+    @traced_query("grounded")
     def query(self, user_query: str) -> GroundedQueryResult:
         """Execute a guarded query. Falls through to base QueryEngine
         when guard is disabled."""
@@ -421,7 +431,8 @@ class GroundedQueryEngine(GroundedQueryEngineGuardMixin, QueryEngine):
                 user_query, context_after_trim, search_results)
             prompt_preview = prompt
 
-            llm_response = self.llm_router.query(prompt)
+            with query_span("llm_generation"):
+                llm_response = self.llm_router.query(prompt)
             if not llm_response:
                 result = self._make_error_result(
                     start_time, "LLM call failed", sources,
@@ -512,6 +523,7 @@ class GroundedQueryEngine(GroundedQueryEngineGuardMixin, QueryEngine):
             )
             return result
 
+    @traced_query("grounded")
     def query_stream(
         self, user_query: str
     ) -> Generator[Dict[str, Any], None, None]:
@@ -519,9 +531,10 @@ class GroundedQueryEngine(GroundedQueryEngineGuardMixin, QueryEngine):
         Stream a guarded query response.
 
         IMPORTANT:
-            Guarded streaming intentionally buffers the raw model stream,
-            verifies grounding, then emits only the post-guard answer.
-            This prevents unverified tokens from being shown in real time.
+            Raw model tokens are never shown directly.  Each sentence is
+            checked against the sources as soon as it is complete and only
+            released if it passes (see stream_grounding.py); the full
+            answer is still verified at the end and decides the result.
         """
         yield from _gqe_query_stream(self, user_query)
 
@@ -678,11 +691,28 @@ def _gqe_query_stream(
         tokens_in = tokens_out = 0
         model = ""
         llm_latency_ms = 0.0
+        backend_metrics = None
         saw_done = False
         stream_error = ""
+        # Release each sentence as soon as it checks out against the
+        # sources instead of holding the whole answer until the end.
+        gate = StreamingGroundingGate(
+            _gqe_stream_sentence_checker(engine, search_results),
+            engine.guard_action,
+        )
+        first_verified_ms = None
+        gen_start = time.perf_counter()
         for chunk in engine.llm_router.query_stream(prompt):
             if "token" in chunk:
+                if not full_text:
+                    record_span("llm_ttft", (time.perf_counter() - gen_start) * 1000)
                 full_text.append(chunk["token"])
+                released = gate.feed(chunk["token"])
+                if released:
+                    if first_verified_ms is None:
+                        first_verified_ms = (time.perf_counter() - gen_start) * 1000
+                        record_span("verified_ttft", first_verified_ms)
+                    yield {"token": released}
             elif "error" in chunk:
                 stream_error = str(chunk.get("error", "")).strip()
             elif chunk.get("done"):
@@ -691,6 +721,8 @@ def _gqe_query_stream(
                 tokens_out = chunk.get("tokens_out", 0)
                 model = chunk.get("model", "")
                 llm_latency_ms = chunk.get("latency_ms", 0.0)
+                backend_metrics = chunk.get("backend_metrics")
+        record_span("llm_generation", (time.perf_counter() - gen_start) * 1000)
 
         raw_answer = "".join(full_text)
         if not saw_done and not raw_answer.strip() and not stream_error:
@@ -701,6 +733,12 @@ def _gqe_query_stream(
                 tokens_out = fallback.tokens_out
                 model = fallback.model
                 llm_latency_ms = fallback.latency_ms
+                backend_metrics = getattr(fallback, "backend_metrics", None)
+                released = gate.feed(raw_answer)
+                if released:
+                    first_verified_ms = (time.perf_counter() - gen_start) * 1000
+                    record_span("verified_ttft", first_verified_ms)
+                    yield {"token": released}
         if not raw_answer:
             reason = stream_error
             if not reason:
@@ -732,13 +770,29 @@ def _gqe_query_stream(
             yield {"done": True, "result": result}
             return
 
+        released = gate.finish()
+        if released:
+            if first_verified_ms is None:
+                first_verified_ms = (time.perf_counter() - gen_start) * 1000
+                record_span("verified_ttft", first_verified_ms)
+            yield {"token": released}
+
+        # The full-answer verdict still decides the result.  Emit whatever
+        # of it was not streamed yet (held sentences once the answer passes,
+        # or the block message when nothing was released); if it diverges
+        # from what was streamed, the done event's answer replaces it.
         score, details = engine._verify_response(raw_answer, search_results)
         answer, blocked = engine._apply_guard_action(raw_answer, score, details)
 
-        if answer:
-            words = answer.split()
-            for i, word in enumerate(words):
-                yield {"token": word + (" " if i < len(words) - 1 else "")}
+        streamed = gate.released_text
+        if answer and answer.startswith(streamed) and len(answer) > len(streamed):
+            yield {"token": answer[len(streamed):]}
+        elif answer and not streamed.strip():
+            yield {"token": answer}
+        stream_gate = gate.stats()
+        stream_gate["first_verified_token_ms"] = (
+            round(first_verified_ms, 2) if first_verified_ms is not None else None
+        )
 
         from .llm_router import LLMResponse
 
@@ -748,6 +802,7 @@ def _gqe_query_stream(
             tokens_out=tokens_out,
             model=model,
             latency_ms=llm_latency_ms,
+            backend_metrics=backend_metrics,
         )
         elapsed_ms = (time.time() - start_time) * 1000
 
@@ -783,6 +838,7 @@ def _gqe_query_stream(
                 "safe": score >= engine.guard_threshold,
                 "blocked": blocked,
                 "details": copy.deepcopy(details),
+                "stream_gate": stream_gate,
             },
         )
         engine._log_grounded_result(
@@ -813,7 +869,33 @@ def _gqe_query_stream(
         )
         yield {"done": True, "result": result}
 
-def _gqe_fallback_score(claims, source_texts, threshold):
+def _gqe_source_index(engine, hits: list) -> SourceTokenIndex:
+    """Token-ID index of the retrieved hits for the fallback scorer.
+
+    Uses the IDs VectorStore saved at index time; hits without stored IDs
+    (older index, or not from the store) are tokenized from their text.
+    """
+    keys = [
+        (str(getattr(hit, "source_path", "") or ""), int(getattr(hit, "chunk_index", -1) or 0))
+        for hit in hits
+    ]
+    stored = {}
+    store = getattr(engine, "vector_store", None)
+    lookup = getattr(store, "get_chunk_token_ids", None)
+    if callable(lookup) and keys:
+        try:
+            stored = lookup(keys)
+        except Exception:
+            stored = {}
+        if not isinstance(stored, dict):
+            stored = {}
+    return SourceTokenIndex([
+        stored[key] if key in stored else token_ids(getattr(hit, "text", "") or "")
+        for key, hit in zip(keys, hits)
+    ])
+
+
+def _gqe_fallback_score(claims, source_texts, threshold, source_index=None):
     """Token-overlap claim-vs-source scoring when NLI model is not loaded.
 
     Scores each claim by the fraction of its content tokens that appear
@@ -831,33 +913,10 @@ def _gqe_fallback_score(claims, source_texts, threshold):
     if not claims:
         return 1.0, {"method": "fallback_no_claims"}
 
-    # Build a set of all content tokens from source texts (once)
-    _STOP = {
-        "the", "a", "an", "is", "are", "was", "were", "be", "been",
-        "being", "have", "has", "had", "do", "does", "did", "will",
-        "would", "could", "should", "may", "might", "shall", "can",
-        "to", "of", "in", "for", "on", "with", "at", "by", "from",
-        "as", "into", "through", "during", "before", "after", "and",
-        "but", "or", "nor", "not", "no", "so", "if", "than", "that",
-        "this", "these", "those", "it", "its", "they", "them", "their",
-        "we", "our", "you", "your", "he", "she", "his", "her",
-    }
-    import re as _re
-
-    def _tokenize(text):
-        """Split text into content tokens, handling 28VDC -> [28, vdc]."""
-        tokens = []
-        for raw in _re.findall(r"[A-Za-z0-9][\w\-\.]*", (text or "").lower()):
-            # Split on digit-letter boundaries (e.g. 28vdc -> 28, vdc)
-            parts = _re.findall(r"[a-z]+|[0-9]+", raw)
-            for p in parts:
-                if len(p) >= 2 and p not in _STOP:
-                    tokens.append(p)
-        return tokens
-
-    source_tokens = set()
-    for src in source_texts:
-        source_tokens.update(_tokenize(src))
+    # Token IDs of the sources: normally the IDs stored at index time
+    # (see _gqe_source_index), else tokenized here from the texts.
+    if source_index is None:
+        source_index = SourceTokenIndex.from_texts(source_texts)
 
     supported = 0
     trivial_count = 0
@@ -877,14 +936,13 @@ def _gqe_fallback_score(claims, source_texts, threshold):
             supported += 1
             claim_details.append({"claim": text[:80], "verdict": "OPEN_KNOWLEDGE"})
             continue
-        claim_tokens = _tokenize(text)
-        if not claim_tokens:
+        match = source_index.score_claim(text)
+        if not match["tokens"]:
             # No scorable tokens (e.g. all stopwords) -- exclude from denominator
             trivial_count += 1
             claim_details.append({"claim": text[:80], "verdict": "NO_TOKENS"})
             continue
-        hits = sum(1 for tok in claim_tokens if tok in source_tokens)
-        overlap = hits / len(claim_tokens)
+        overlap = match["overlap"]
         verdict = "SUPPORTED" if overlap >= 0.30 else "UNSUPPORTED"
         if verdict == "SUPPORTED":
             supported += 1
@@ -892,8 +950,10 @@ def _gqe_fallback_score(claims, source_texts, threshold):
             "claim": text[:80],
             "verdict": verdict,
             "overlap": round(overlap, 2),
-            "tokens": len(claim_tokens),
-            "hits": hits,
+            "tokens": match["tokens"],
+            "hits": match["hits"],
+            # Which retrieved chunk covers most of the claim (-1: none).
+            "source_index": match["source_index"],
         })
 
     verifiable = len(claims) - trivial_count
@@ -1130,6 +1190,7 @@ def _gqe_stream_open_knowledge_fallback(
             yield event
 
 
+@timed_stage("prompt_build")
 def _gqe_build_grounded_prompt(engine, user_query: str, context: str, hits: list) -> str:
     allow_open = bool(getattr(engine, "allow_open_knowledge", False))
 
@@ -1269,6 +1330,34 @@ def _gqe_build_open_knowledge_prompt(
     return system_part + "\n\nContext:\n" + user_part
 
 
+def _gqe_stream_sentence_checker(engine, hits: list):
+    """Cheap per-sentence support check for StreamingGroundingGate.
+
+    Uses the token-overlap scorer with the source token index built once
+    for the whole stream; a sentence passes when none of its claims is
+    UNSUPPORTED.
+    """
+    extract_claims = getattr(engine, "_extract_claims", None)
+    if extract_claims is None:
+        from .hallucination_guard.claim_extractor import ClaimExtractor
+
+        extract_claims = ClaimExtractor.extract_claims
+    source_texts = [getattr(hit, "text", "") or "" for hit in hits]
+    source_index = _gqe_source_index(engine, hits)
+
+    def _is_supported(sentence: str) -> bool:
+        claims = extract_claims(sentence)
+        if not claims:
+            return True
+        _, details = _gqe_fallback_score(
+            claims, source_texts, engine.guard_threshold, source_index=source_index,
+        )
+        return all(c.get("verdict") != "UNSUPPORTED" for c in details.get("claims", []))
+
+    return _is_supported
+
+
+@timed_stage("grounding_verify")
 def _gqe_verify_response(engine, response_text: str, hits: list) -> tuple:
     if not engine._guard_available:
         return 1.0, {"method": "bypass", "reason": "guard_not_loaded"}
@@ -1287,11 +1376,7 @@ def _gqe_verify_response(engine, response_text: str, hits: list) -> tuple:
 
             if not isinstance(engine._nli_verifier, NLIVerifier):
                 engine._nli_verifier = NLIVerifier()
-            results = engine._nli_verifier.verify_batch_with_earlyexit(
-                claims,
-                source_texts,
-                engine.guard_threshold,
-            )
+            results = engine._nli_verifier.verify_batch(claims, source_texts)
             supported = sum(
                 1 for result in results
                 if result.verdict.value == "SUPPORTED"
@@ -1299,8 +1384,9 @@ def _gqe_verify_response(engine, response_text: str, hits: list) -> tuple:
             total = len(results)
             score = supported / total if total > 0 else 0.0
             details = {
-                "method": "nli_batch_earlyexit",
+                "method": "nli_batch",
                 "total_claims": total,
+                "nli_throughput": engine._nli_verifier.throughput(),
                 "supported": supported,
                 "claims": [
                     {
@@ -1317,6 +1403,7 @@ def _gqe_verify_response(engine, response_text: str, hits: list) -> tuple:
             claims,
             source_texts,
             engine.guard_threshold,
+            source_index=_gqe_source_index(engine, hits),
         )
     except Exception as exc:
         engine.guard_logger.warning("verify_error", error=str(exc))
@@ -30,10 +30,10 @@ DATE: 2026-02-14
 NOTE (2026-02-24):
     HuggingFace/sentence-transformers has been RETIRED from HybridRAG3.
     Embeddings are now served by Ollama (nomic-embed-text).
-    The NLI verifier still requires sentence-transformers for CrossEncoder,
-    but it degrades gracefully when the package is not installed --
+    The NLI verifier now runs an ONNX export of the cross-encoder via
+    nli_runtime.py (onnxruntime + tokenizers, both optional).  Without
+    those packages or a local model it degrades gracefully --
     all claims return UNSUPPORTED verdict instead of crashing.
-    The NLI feature is dormant until a non-HF alternative is implemented.
 """
 
 import os
@@ -247,6 +247,7 @@ class GuardConfig:
     # --- Processing Limits ---
     max_claims_per_response: int = 50          # Cap claims to prevent runaway
     nli_batch_size: int = 16                   # NLI model batch size
+    nli_cache_size: int = 4096                 # Cached (claim, chunk) verdicts
     timeout_seconds: int = 30                  # Max verification time
 
     # --- Logging & Audit ---
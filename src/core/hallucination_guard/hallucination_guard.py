@@ -155,10 +155,14 @@ class HallucinationGuard:
             claims = claims[:self.config.max_claims_per_response]
 
         # -- LAYER 2b: NLI verification of each claim --
+        # All non-trivial claims go through the model in one batch.
+        factual = [c["text"] for c in claims if not c["is_trivial"]]
+        verified = iter(self.nli.verify_batch(factual, source_chunks)
+                        if factual else [])
         claim_results = []
         for claim in claims:
             if claim["is_trivial"]:
-                # Skip NLI for non-factual sentences (save ~12ms each)
+                # Skip NLI for non-factual sentences
                 cr = ClaimResult(
                     claim_text=claim["text"],
                     verdict=ClaimVerdict.TRIVIAL,
@@ -166,9 +170,8 @@ class HallucinationGuard:
                     explanation="Non-factual sentence",
                 )
             else:
-                # Run NLI: does any chunk support/contradict this?
-                cr = self.nli.verify_claim_against_chunks(
-                    claim["text"], source_chunks)
+                # NLI verdict: does any chunk support/contradict this?
+                cr = next(verified)
                 # Attach source file info if the LLM cited a chunk
                 if claim["cited_chunks"] and source_files:
                     for cn in claim["cited_chunks"]:
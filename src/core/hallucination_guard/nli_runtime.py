@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Runs the NLI model on CPU in length-bucketed batches and caches its verdicts.
+# What to read first: Start at NLIRuntime.predict(), then OnnxNLIRuntime and VerdictCache.
+# Inputs: (premise, hypothesis) text pairs; a local ONNX model folder in the model cache.
+# Outputs: One row of [contradiction, entailment, neutral] logits per pair.
+# Safety notes: Never downloads anything; without a local model the NLI layer stays off.
+# ============================
+"""
+nli_runtime.py -- Layer 2b runtime: batched local NLI inference
+================================================================
+
+PURPOSE:
+    The NLI cross-encoder used to run through sentence-transformers,
+    which was retired (Session 15), leaving NLIVerifier dormant.  This
+    module gives it a small runtime interface instead:
+
+        runtime.predict(pairs) -> numpy array, shape (len(pairs), 3)
+
+    Rows are raw logits in guard_types label order
+    (NLI_LABEL_CONTRADICTION, NLI_LABEL_ENTAILMENT, NLI_LABEL_NEUTRAL).
+
+BATCHING:
+    A response's claims are scored in ONE predict() call covering every
+    (chunk, claim) pair.  Pairs are tokenized, sorted by length and
+    grouped into length buckets (16, 32, 64, ... tokens) so a batch is
+    only padded to its bucket width, not to the longest pair overall.
+    Short claims against short chunks no longer pay for 512-token padding.
+
+RUNTIMES:
+    OnnxNLIRuntime -- the real model, exported to ONNX and run with
+                      onnxruntime's CPU provider.  Reads
+                      <model_cache_dir>/nli_onnx/{model.onnx,tokenizer.json}
+                      (plus optional config.json for the label order).
+                      onnxruntime and tokenizers are optional; if either
+                      is missing load() returns False.
+    TinyNLIRuntime -- a NumPy stand-in with the same tensor interface
+                      (hashed word ids, padded input_ids/attention_mask).
+                      It scores hypothesis-word coverage in the premise
+                      and calls a missing number a contradiction.  It is
+                      for tests and diagnostics, not for real verification.
+
+CACHE:
+    VerdictCache keeps logits per (claim hash, chunk id) so re-verifying
+    the same answer against the same chunks (regenerate, stream + final
+    check, repeated queries) skips the model entirely.
+
+AUTHOR: Jeremy (AI-assisted development)
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .guard_types import (
+    NLI_LABEL_CONTRADICTION, NLI_LABEL_ENTAILMENT, NLI_LABEL_NEUTRAL,
+)
+
+logger = logging.getLogger("hallucination_guard.nli")
+
+# Bucket widths in tokens.  The last one is the model's max_length.
+LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512)
+
+ONNX_MODEL_DIRNAME = "nli_onnx"
+
+_LABEL_NAMES = {
+    NLI_LABEL_CONTRADICTION: "contradiction",
+    NLI_LABEL_ENTAILMENT: "entailment",
+    NLI_LABEL_NEUTRAL: "neutral",
+}
+
+
+def bucket_width(length, buckets=LENGTH_BUCKETS):
+    """Smallest bucket that fits `length` tokens (the largest if none do)."""
+    for width in buckets:
+        if length <= width:
+            return width
+    return buckets[-1]
+
+
+def iter_length_buckets(encoded, batch_size, pad_id=0, buckets=LENGTH_BUCKETS):
+    """
+    Group token-id lists into padded batches of similar length.
+
+    Yields (indices, input_ids, attention_mask) where indices are the
+    positions of the batch rows in `encoded`, and both arrays have shape
+    (rows, bucket_width).  Sequences longer than the last bucket are cut.
+    """
+    max_len = buckets[-1]
+    batch_size = max(1, int(batch_size))
+    groups = OrderedDict()
+    for i in sorted(range(len(encoded)), key=lambda k: len(encoded[k])):
+        groups.setdefault(bucket_width(len(encoded[i]), buckets), []).append(i)
+
+    for width, members in groups.items():
+        for start in range(0, len(members), batch_size):
+            idx = members[start:start + batch_size]
+            input_ids = np.full((len(idx), width), pad_id, dtype=np.int64)
+            mask = np.zeros((len(idx), width), dtype=np.int64)
+            for row, i in enumerate(idx):
+                ids = encoded[i][:max_len]
+                input_ids[row, :len(ids)] = ids
+                mask[row, :len(ids)] = 1
+            yield idx, input_ids, mask
+
+
+class NLIRuntime:
+    """
+    Base class: tokenize pairs, bucket them, run _forward() per batch.
+
+    Subclasses implement encode_pairs() and _forward().  predict() keeps
+    the CrossEncoder call signature so older callers (rag-diag probes)
+    work unchanged.
+    """
+
+    name = "base"
+    pad_id = 0
+
+    def __init__(self, batch_size=16):
+        self.batch_size = batch_size
+        self.forward_calls = 0
+
+    def load(self):
+        return True
+
+    def encode_pairs(self, pairs):
+        raise NotImplementedError
+
+    def _forward(self, input_ids, attention_mask):
+        raise NotImplementedError
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False):
+        """Return logits of shape (len(pairs), 3) for (premise, hypothesis) pairs."""
+        pairs = list(pairs)
+        logits = np.zeros((len(pairs), 3), dtype=np.float32)
+        if not pairs:
+            return logits
+        encoded = self.encode_pairs(pairs)
+        for idx, input_ids, mask in iter_length_buckets(
+                encoded, batch_size or self.batch_size, self.pad_id):
+            self.forward_calls += 1
+            logits[idx] = self._forward(input_ids, mask)
+        return logits
+
+
+class OnnxNLIRuntime(NLIRuntime):
+    """The exported cross-encoder, run by onnxruntime on CPU."""
+
+    name = "onnx"
+
+    def __init__(self, model_dir, batch_size=16):
+        super().__init__(batch_size)
+        self.model_dir = Path(model_dir)
+        self.session = None
+        self.tokenizer = None
+        self._input_names = ()
+
+    def load(self):
+        model_path = self.model_dir / "model.onnx"
+        tokenizer_path = self.model_dir / "tokenizer.json"
+        if not (model_path.exists() and tokenizer_path.exists()):
+            logger.error(
+                "NLI model not found in %s (need model.onnx + tokenizer.json). "
+                "Export the cross-encoder to ONNX on a connected machine and "
+                "copy the folder into the model cache.", self.model_dir)
+            return False
+        try:
+            import onnxruntime as ort  # optional dependency
+            from tokenizers import Tokenizer  # optional dependency
+        except ImportError as e:
+            logger.error("NLI runtime unavailable: %s", e)
+            return False
+
+        if not self._labels_match():
+            return False
+
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=LENGTH_BUCKETS[-1])
+        self.tokenizer.no_padding()
+        pad_id = self.tokenizer.token_to_id("[PAD]")
+        self.pad_id = 0 if pad_id is None else pad_id
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = tuple(i.name for i in self.session.get_inputs())
+        return True
+
+    def _labels_match(self):
+        """Check config.json's label order against guard_types, if present."""
+        config_path = self.model_dir / "config.json"
+        if not config_path.exists():
+            return True
+        try:
+            id2label = json.loads(
+                config_path.read_text(encoding="utf-8")).get("id2label") or {}
+        except (OSError, ValueError):
+            return True
+        for idx, expected in _LABEL_NAMES.items():
+            actual = str(id2label.get(str(idx), id2label.get(idx, ""))).lower()
+            if expected not in actual:
+                logger.error(
+                    "NLI label mismatch at index %d: expected '%s', got '%s'. "
+                    "Update guard_types.py NLI_LABEL_* constants to match.",
+                    idx, expected, actual)
+                return False
+        return True
+
+    def encode_pairs(self, pairs):
+        return [enc.ids for enc in self.tokenizer.encode_batch(
+            [(premise, hypothesis) for premise, hypothesis in pairs])]
+
+    def _forward(self, input_ids, attention_mask):
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        feeds = {k: v for k, v in feeds.items() if k in self._input_names}
+        return self.session.run(None, feeds)[0]
+
+
+class TinyNLIRuntime(NLIRuntime):
+    """
+    NumPy stand-in for tests: same tensors in, same logits shape out.
+
+    Token ids: 1 = [CLS], 2 = [SEP], words hash into [3, 2048), numbers
+    into [2048, 4096).  A hypothesis is entailed when its words all occur
+    in the premise and contradicted when it cites a number the premise
+    does not contain while the premise states numbers and shares at
+    least half of the hypothesis' words.
+    """
+
+    name = "tiny"
+    pad_id = 0
+    CLS, SEP = 1, 2
+    _WORD_BASE, _NUM_BASE, _VOCAB = 3, 2048, 4096
+    _TOKEN_RE = re.compile(r"[a-z]+|[0-9]+(?:\.[0-9]+)?")
+
+    def _ids(self, text):
+        out = []
+        for tok in self._TOKEN_RE.findall((text or "").lower()):
+            h = zlib.crc32(tok.encode("utf-8"))
+            if tok[0].isdigit():
+                out.append(self._NUM_BASE + h % (self._VOCAB - self._NUM_BASE))
+            elif len(tok) >= 3:
+                out.append(self._WORD_BASE + h % (self._NUM_BASE - self._WORD_BASE))
+        return out
+
+    def encode_pairs(self, pairs):
+        return [
+            [self.CLS] + self._ids(premise) + [self.SEP]
+            + self._ids(hypothesis) + [self.SEP]
+            for premise, hypothesis in pairs
+        ]
+
+    def _forward(self, input_ids, attention_mask):
+        content = (input_ids > self.SEP) & (attention_mask > 0)
+        segment = np.cumsum(input_ids == self.SEP, axis=1)
+        premise = content & (segment == 0)
+        hypothesis = content & (segment == 1)
+        number = input_ids >= self._NUM_BASE
+
+        # found[b, j]: hypothesis token j also appears in the premise.
+        same = input_ids[:, :, None] == input_ids[:, None, :]
+        found = (same & premise[:, None, :]).any(axis=2) & hypothesis
+
+        n_hyp = np.maximum(hypothesis.sum(axis=1), 1)
+        coverage = found.sum(axis=1) / n_hyp
+        words = hypothesis & ~number
+        word_coverage = (found & words).sum(axis=1) / np.maximum(words.sum(axis=1), 1)
+        missing_number = (hypothesis & number & ~found).any(axis=1)
+        premise_has_number = (premise & number).any(axis=1)
+        # Only a premise about the same thing can contradict a number.
+        conflict = missing_number & premise_has_number & (word_coverage >= 0.5)
+
+        logits = np.zeros((input_ids.shape[0], 3), dtype=np.float32)
+        logits[:, NLI_LABEL_CONTRADICTION] = np.where(conflict, 4.0, -2.0)
+        logits[:, NLI_LABEL_ENTAILMENT] = 6.0 * coverage - 3.0
+        logits[:, NLI_LABEL_NEUTRAL] = 0.5
+        return logits
+
+
+def text_key(text):
+    """Short stable hash used for claim hashes and chunk ids."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+class VerdictCache:
+    """LRU of NLI logits keyed by (claim hash, chunk id).
+
+    Shared by every query through the engine's verifier, so reads and
+    writes (which reorder and evict) are serialized by one lock.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max(0, int(max_entries))
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._rows)
+
+    def get(self, claim_text, chunk_text):
+        key = (text_key(claim_text), text_key(chunk_text))
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return row
+
+    def put(self, claim_text, chunk_text, logits):
+        if self.max_entries == 0:
+            return
+        key = (text_key(claim_text), text_key(chunk_text))
+        row = np.asarray(logits, dtype=np.float32)
+        with self._lock:
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_entries:
+                self._rows.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
@@ -46,27 +46,35 @@ THE MODEL: cross-encoder/nli-deberta-v3-base
     - Accuracy: 90.04% on MNLI benchmark
     - License:  MIT (no commercial restrictions)
 
+RUNTIME (nli_runtime.py):
+    The cross-encoder runs as an ONNX export on onnxruntime's CPU
+    provider.  All (chunk, claim) pairs for one response go through the
+    model in ONE predict() call, padded per length bucket, and every
+    pair's logits are cached by (claim hash, chunk id).
+
 NETWORK ACCESS:
-    - First run: Downloads from huggingface.co (~440MB)
-    - After that: 100% OFFLINE from local cache
-    - KILL SWITCH: Set env HALLUCINATION_GUARD_OFFLINE=1 to block downloads
+    - None.  The model is read from <model_cache_dir>/nli_onnx/.
+    - Missing model or runtime -> load_model() returns False and the
+      guard falls back to token-overlap scoring.
 
 AUTHOR: Jeremy (AI-assisted development)
 VERSION: 1.0.0
 DATE: 2026-02-14
 """
 
-import os
 import time
 import logging
 from pathlib import Path
 
+import numpy as np
+
 # Import shared types from this package
 from .guard_types import (
     ClaimVerdict, ClaimResult, GuardConfig,
     NLI_MODEL_NAME, NLI_LABEL_CONTRADICTION,
-    NLI_LABEL_ENTAILMENT, NLI_LABEL_NEUTRAL,
+    NLI_LABEL_ENTAILMENT,
 )
+from .nli_runtime import ONNX_MODEL_DIRNAME, OnnxNLIRuntime, VerdictCache
 
 
 class NLIVerifier:
@@ -76,107 +84,66 @@ class NLIVerifier:
     LIFECYCLE:
         1. Create instance:  verifier = NLIVerifier(config)
         2. Load model:       verifier.load_model()  (lazy, called on first use)
-        3. Verify claims:    result = verifier.verify_claim_against_chunks(...)
+        3. Verify claims:    results = verifier.verify_batch(claims, chunks)
+                             (or verify_claim_against_chunks() for one claim)
 
     The model is loaded ONCE and reused for all subsequent verifications
-    in the same session. Typically adds ~3s startup, then ~12ms per check.
+    in the same session.  Pass runtime= to use a different NLIRuntime
+    (tests use TinyNLIRuntime).
     """
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, runtime=None):
         """
         Initialize the NLI verifier.
 
         PARAMETERS:
-            config: GuardConfig -- Settings (model name, cache dir, batch size)
-                    If None, uses default GuardConfig with env var overrides.
+            config:  GuardConfig -- Settings (model name, cache dir, batch size)
+                     If None, uses default GuardConfig with env var overrides.
+            runtime: NLIRuntime  -- Optional pre-built runtime; default is
+                     the ONNX export under <model_cache_dir>/nli_onnx/.
         """
         self.config = config or GuardConfig()
-        self.model = None                  # The CrossEncoder model (loaded lazily)
+        self.model = runtime               # NLIRuntime (loaded lazily)
         self.logger = logging.getLogger("hallucination_guard.nli")
         self._model_loaded = False         # Flag to avoid reloading
+        self.cache = VerdictCache(self.config.nli_cache_size)
+        self.pairs_scored = 0              # Pairs run through the model
+        self.forward_seconds = 0.0         # Time spent inside predict()
 
     def load_model(self):
         """
-        Load the NLI cross-encoder model. Lazy-loaded on first use.
+        Load the NLI runtime. Lazy-loaded on first use.
 
-        FIRST RUN: Downloads ~440MB from huggingface.co (needs internet)
-        SUBSEQUENT RUNS: Loads from local cache (100% offline)
+        Uses the runtime passed to __init__ if any, otherwise the ONNX
+        export in <model_cache_dir>/nli_onnx/.  Nothing is downloaded.
 
         RETURNS:
             bool -- True if model loaded successfully, False if failed
 
         FAILURE CASES:
-            - sentence-transformers not installed -> ImportError message
-            - Offline mode + no cache -> Error message with instructions
-            - Download fails -> Error message with network troubleshooting
+            - onnxruntime / tokenizers not installed -> logged, False
+            - model.onnx or tokenizer.json missing   -> logged, False
+            - label order differs from guard_types   -> logged, False
         """
         # Don't reload if already loaded
         if self._model_loaded:
             return True
 
-        # In offline mode, verify the cache exists before trying to load
-        if self.config.offline_mode:
-            cache_path = Path(self.config.model_cache_dir) / "nli_model"
-            if not cache_path.exists():
-                self.logger.error(
-                    "OFFLINE MODE: NLI model not in cache. "
-                    "Download first with HALLUCINATION_GUARD_OFFLINE=0"
-                )
-                return False
+        if self.model is None:
+            self.model = OnnxNLIRuntime(
+                Path(self.config.model_cache_dir) / ONNX_MODEL_DIRNAME,
+                batch_size=self.config.nli_batch_size,
+            )
 
         try:
-            # RETIRED (Session 15): sentence-transformers was removed.
-            # This import will fail, and the except block below handles it
-            # gracefully. NLI verifier is dormant until reimplemented
-            # with an Ollama-served model. Feature disabled by default.
-            from sentence_transformers import CrossEncoder  # RETIRED dep
-
-            self.logger.info(
-                f"Loading NLI model: {self.config.nli_model_name}")
             start = time.time()
-
-            # Ensure cache directory exists
-            os.makedirs(self.config.model_cache_dir, exist_ok=True)
-
-            # Load the cross-encoder. max_length=512 matches the model's
-            # training config (DeBERTa-v3-base was trained on 512 tokens).
-            self.model = CrossEncoder(
-                self.config.nli_model_name, max_length=512)
-
-            elapsed = time.time() - start
-            self.logger.info(f"NLI model loaded in {elapsed:.1f}s")
-
-            # Validate NLI label ordering matches our hardcoded indices.
-            # Different NLI models use different label orderings -- if someone
-            # swaps the model via HALLUCINATION_GUARD_MODEL, we must verify.
-            id2label = getattr(self.model.model.config, "id2label", None)
-            if id2label:
-                expected = {
-                    NLI_LABEL_CONTRADICTION: "contradiction",
-                    NLI_LABEL_ENTAILMENT: "entailment",
-                    NLI_LABEL_NEUTRAL: "neutral",
-                }
-                for idx, expected_label in expected.items():
-                    actual = id2label.get(idx, "").lower()
-                    if expected_label not in actual:
-                        self.logger.error(
-                            f"NLI label mismatch at index {idx}: "
-                            f"expected '{expected_label}', got '{actual}'. "
-                            f"Model {self.config.nli_model_name} uses a "
-                            f"different label ordering. Update guard_types.py "
-                            f"NLI_LABEL_* constants to match."
-                        )
-                        return False
-
+            if not self.model.load():
+                return False
+            self.logger.info(
+                f"NLI runtime '{self.model.name}' loaded in "
+                f"{time.time() - start:.1f}s")
             self._model_loaded = True
             return True
-
-        except ImportError:
-            self.logger.error(
-                "NLI verifier unavailable: sentence-transformers retired "
-                "(Session 15). Feature dormant until Ollama-based NLI is implemented."
-            )
-            return False
         except Exception as e:
             self.logger.error(f"Failed to load NLI model: {e}")
             return False
@@ -237,85 +204,119 @@ class NLIVerifier:
                                        threshold=0.80,
                                        early_pass=5, early_fail=3):
         """
-        Verify a batch of claims with early-exit optimization.
+        Verify a batch of claims (kept for existing callers).
 
-        EARLY-EXIT LOGIC:
-            - If the first `early_pass` claims ALL score > 0.90,
-              skip the rest and return a high score (statistically safe).
-            - If the first `early_fail` claims ALL score < 0.30,
-              block immediately without checking the rest.
-            - Otherwise, check all claims normally.
+        This used to score claims one by one and stop early after a run
+        of passes or failures.  verify_batch() now scores every claim in
+        a single batched forward pass, so there is nothing left to skip:
+        every claim gets a real verdict.  threshold / early_pass /
+        early_fail are accepted and ignored.
 
-        This saves 50-80% of inference time for obvious cases (well-
-        grounded answers or completely fabricated ones).
+        RETURNS:
+            list[ClaimResult] -- Verification results for each claim
+        """
+        return self.verify_batch(claims, chunks)
+
+    def _check_chunks(self, claim_text, chunks, top_k):
+        """The chunks one claim is checked against (top_k, then pruned)."""
+        # Limit chunks for performance
+        check_chunks = chunks[:top_k] if len(chunks) > top_k else chunks
+
+        # -- OPTIMIZATION: Chunk pruning by keyword overlap --
+        # Instead of checking ALL chunks, find the 2-3 most relevant
+        # ones per claim using word overlap. This cuts inference passes
+        # from (claims x all_chunks) to (claims x 2-3), which is the
+        # single biggest speedup available (3-5x faster).
+        prune_keep = min(top_k, max(3, len(check_chunks)))
+        if len(check_chunks) > prune_keep:
+            check_chunks = self._prune_chunks(claim_text, check_chunks,
+                                              keep=prune_keep)
+        return check_chunks
+
+    def verify_batch(self, claims, chunks, top_k=5):
+        """
+        Verify many claims against source chunks in one model call.
+
+        ALGORITHM:
+            1. Per claim, pick its chunks with _check_chunks() (pruning)
+            2. Look up each (claim, chunk) pair in the verdict cache
+            3. Run ALL uncached pairs through runtime.predict() at once;
+               the runtime pads them per length bucket
+            4. Apply the decision logic per claim (see _decide())
 
         PARAMETERS:
-            claims:      list[str]    -- Sentences to verify
-            chunks:      list[str]    -- Source chunks to check against
-            threshold:   float        -- Grounding threshold (0.80)
-            early_pass:  int          -- Claims to check before fast-pass
-            early_fail:  int          -- Claims to check before fast-fail
+            claims: list[str | dict] -- Claims (dicts use their "text")
+            chunks: list[str]        -- Source document chunks
+            top_k:  int              -- Max chunks per claim (default 5)
 
         RETURNS:
-            list[ClaimResult] -- Verification results for each claim
+            list[ClaimResult] -- One result per claim, in order
         """
-        all_results = []
-        consecutive_pass = 0
-        consecutive_fail = 0
-
-        for i, claim in enumerate(claims):
-            result = self.verify_claim_against_chunks(claim, chunks)
-            all_results.append(result)
-
-            # Track consecutive pass/fail for early-exit
-            if result.verdict == ClaimVerdict.SUPPORTED:
-                consecutive_pass += 1
-                consecutive_fail = 0
-            else:
-                consecutive_fail += 1
-                consecutive_pass = 0
-
-            # EARLY-EXIT: All early claims passed -> skip rest
-            if (consecutive_pass >= early_pass
-                    and i + 1 >= early_pass
-                    and len(claims) > early_pass + 2):
-                remaining = len(claims) - i - 1
-                self.logger.info(
-                    f"Early-exit PASS: {consecutive_pass} consecutive "
-                    f"supported claims. Skipping {remaining} remaining."
-                )
-                # Mark remaining as not-checked (lower confidence signals
-                # these were NOT actually verified by the NLI model).
-                for j in range(i + 1, len(claims)):
-                    all_results.append(ClaimResult(
-                        claim_text=claims[j],
-                        verdict=ClaimVerdict.SUPPORTED,
-                        confidence=0.50,
-                        explanation="Early-exit: NOT verified -- assumed "
-                                    "supported based on prior consecutive passes",
-                    ))
-                break
-
-            # EARLY-EXIT: All early claims failed -> stop
-            if (consecutive_fail >= early_fail
-                    and i + 1 >= early_fail
-                    and len(claims) > early_fail + 2):
-                remaining = len(claims) - i - 1
-                self.logger.info(
-                    f"Early-exit FAIL: {consecutive_fail} consecutive "
-                    f"unsupported claims. Skipping {remaining} remaining."
+        texts = [c.get("text", "") if isinstance(c, dict) else str(c)
+                 for c in claims]
+
+        # Guard: can't verify without the model
+        if not self._model_loaded and not self.load_model():
+            return [self._unverified(t, "NLI model not available")
+                    for t in texts]
+
+        # Guard: can't verify without chunks
+        if not chunks:
+            return [self._unverified(t, "No source chunks provided")
+                    for t in texts]
+
+        per_claim = []      # (check_chunks, rows) per claim
+        pending = []        # (claim index, chunk index) for uncached pairs
+        for ci, text in enumerate(texts):
+            check_chunks = self._check_chunks(text, chunks, top_k)
+            rows = [self.cache.get(text, chunk) for chunk in check_chunks]
+            pending.extend((ci, k) for k, row in enumerate(rows) if row is None)
+            per_claim.append((check_chunks, rows))
+
+        if pending:
+            # Build pairs: (premise=chunk, hypothesis=claim)
+            # NLI convention: premise is the "ground truth", hypothesis is tested
+            pairs = [(per_claim[ci][0][k], texts[ci]) for ci, k in pending]
+            try:
+                start = time.perf_counter()
+                scores = self.model.predict(
+                    pairs,
+                    batch_size=self.config.nli_batch_size,
+                    show_progress_bar=False,
                 )
-                for j in range(i + 1, len(claims)):
-                    all_results.append(ClaimResult(
-                        claim_text=claims[j],
-                        verdict=ClaimVerdict.UNSUPPORTED,
-                        confidence=0.0,
-                        explanation="Early-exit: assumed unsupported "
-                                    "based on prior consecutive failures",
-                    ))
-                break
-
-        return all_results
+                self.forward_seconds += time.perf_counter() - start
+                self.pairs_scored += len(pairs)
+            except Exception as e:
+                self.logger.error(f"NLI verification failed: {e}")
+                return [self._unverified(t, f"NLI error: {str(e)}")
+                        for t in texts]
+            for (ci, k), (chunk, text), row in zip(pending, pairs, scores):
+                per_claim[ci][1][k] = row
+                self.cache.put(text, chunk, row)
+
+        return [self._decide(text, check_chunks, rows)
+                for text, (check_chunks, rows) in zip(texts, per_claim)]
+
+    def throughput(self):
+        """Pairs scored, model time and pairs/s so far, plus cache counts."""
+        secs = self.forward_seconds
+        return {
+            "runtime": getattr(self.model, "name", "none"),
+            "pairs_scored": self.pairs_scored,
+            "forward_seconds": round(secs, 4),
+            "pairs_per_s": round(self.pairs_scored / secs, 1) if secs > 0 else 0.0,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+    @staticmethod
+    def _unverified(claim_text, explanation):
+        return ClaimResult(
+            claim_text=claim_text,
+            verdict=ClaimVerdict.UNSUPPORTED,
+            confidence=0.0,
+            explanation=explanation,
+        )
 
     def _softmax(self, scores):
         """
@@ -353,18 +354,7 @@ class NLIVerifier:
             1. Take the claim and pair it with each source chunk:
                (chunk=premise, claim=hypothesis) -- "Does this chunk support this claim?"
             2. Run all pairs through the NLI model in one batch
-            3. For each pair, get entailment and contradiction scores
-            4. Find the chunk with highest entailment (best support)
-            5. Find the chunk with highest contradiction (worst conflict)
-            6. Decision logic (safety-conservative):
-                 - contradiction > 0.70  ->  CONTRADICTED (source conflicts)
-                 - entailment > 0.50     ->  SUPPORTED (source backs it up)
-                 - otherwise             ->  UNSUPPORTED (no source confirms)
-
-        WHY CONTRADICTION CHECK FIRST:
-            In safety-critical work, a contradiction is more dangerous than a miss.
-            If source says "10 MHz" and LLM says "50 MHz", we MUST catch
-            that even if another chunk partially supports the claim.
+            3. Decide with _decide()
 
         PARAMETERS:
             claim_text: str       -- The sentence to verify
@@ -374,126 +364,90 @@ class NLIVerifier:
         RETURNS:
             ClaimResult with verdict, confidence, best_source, explanation
         """
-        # Guard: can't verify without the model
-        if not self._model_loaded:
-            if not self.load_model():
-                return ClaimResult(
-                    claim_text=claim_text,
-                    verdict=ClaimVerdict.UNSUPPORTED,
-                    confidence=0.0,
-                    explanation="NLI model not available",
-                )
-
-        # Guard: can't verify without chunks
-        if not chunks:
-            return ClaimResult(
-                claim_text=claim_text,
-                verdict=ClaimVerdict.UNSUPPORTED,
-                confidence=0.0,
-                explanation="No source chunks provided",
-            )
-
-        # Limit chunks for performance (NLI is ~12ms per pair)
-        check_chunks = chunks[:top_k] if len(chunks) > top_k else chunks
-
-        # -- OPTIMIZATION: Chunk pruning by keyword overlap --
-        # Instead of checking ALL chunks, find the 2-3 most relevant
-        # ones per claim using word overlap. This cuts inference passes
-        # from (claims x all_chunks) to (claims x 2-3), which is the
-        # single biggest speedup available (3-5x faster).
-        prune_keep = min(top_k, max(3, len(check_chunks)))
-        if len(check_chunks) > prune_keep:
-            check_chunks = self._prune_chunks(claim_text, check_chunks,
-                                              keep=prune_keep)
-
-        # Build pairs: (premise=chunk, hypothesis=claim)
-        # NLI convention: premise is the "ground truth", hypothesis is tested
-        pairs = [(chunk, claim_text) for chunk in check_chunks]
+        return self.verify_batch([claim_text], chunks, top_k=top_k)[0]
 
-        try:
-            # Run all pairs through the model in one batch
-            scores = self.model.predict(
-                pairs,
-                batch_size=self.config.nli_batch_size,
-                show_progress_bar=False,
-            )
+    def _decide(self, claim_text, check_chunks, scores):
+        """
+        Turn one claim's per-chunk logits into a ClaimResult.
 
-            # Track the best entailment and worst contradiction across all chunks
-            best_ent_score = -1.0
-            best_ent_idx = -1
-            worst_con_score = -1.0
-            worst_con_idx = -1
-
-            for i, score_row in enumerate(scores):
-                probs = self._softmax(score_row)
-                ent = probs[NLI_LABEL_ENTAILMENT]
-                con = probs[NLI_LABEL_CONTRADICTION]
-
-                if ent > best_ent_score:
-                    best_ent_score = ent
-                    best_ent_idx = i
-                if con > worst_con_score:
-                    worst_con_score = con
-                    worst_con_idx = i
-
-            # -- Decision logic --
-            # Priority: Contradiction > Entailment > Neutral
-            # In safety-critical work: false positive (flag good claim) is MUCH cheaper
-            # than false negative (pass bad claim through to user)
-
-            # CHECK 1: Is any chunk contradicting this claim?
-            if worst_con_score > 0.70:
-                raw = scores[worst_con_idx]
-                return ClaimResult(
-                    claim_text=claim_text,
-                    verdict=ClaimVerdict.CONTRADICTED,
-                    confidence=worst_con_score,
-                    best_source=check_chunks[worst_con_idx][:200],
-                    nli_scores=(raw.tolist() if hasattr(raw, 'tolist')
-                                else list(raw)),
-                    explanation=(
-                        f"CONTRADICTED by chunk {worst_con_idx + 1} "
-                        f"(confidence: {worst_con_score:.2f}). "
-                        f"Source directly conflicts with this claim."
-                    ),
-                )
+        For each pair, get entailment and contradiction scores; find the
+        chunk with highest entailment (best support) and the chunk with
+        highest contradiction (worst conflict).  Decision logic
+        (safety-conservative):
+             - contradiction > 0.70  ->  CONTRADICTED (source conflicts)
+             - entailment > 0.50     ->  SUPPORTED (source backs it up)
+             - otherwise             ->  UNSUPPORTED (no source confirms)
 
-            # CHECK 2: Does any chunk support this claim?
-            if best_ent_score > 0.50:
-                raw = scores[best_ent_idx]
-                return ClaimResult(
-                    claim_text=claim_text,
-                    verdict=ClaimVerdict.SUPPORTED,
-                    confidence=best_ent_score,
-                    best_source=check_chunks[best_ent_idx][:200],
-                    nli_scores=(raw.tolist() if hasattr(raw, 'tolist')
-                                else list(raw)),
-                    explanation=(
-                        f"SUPPORTED by chunk {best_ent_idx + 1} "
-                        f"(confidence: {best_ent_score:.2f})."
-                    ),
-                )
-
-            # CHECK 3: No chunk confirms or denies -- UNSUPPORTED
-            # This claim may come from the LLM's training data (parametric
-            # knowledge) rather than the retrieved documents.
+        WHY CONTRADICTION CHECK FIRST:
+            In safety-critical work, a contradiction is more dangerous than a miss.
+            If source says "10 MHz" and LLM says "50 MHz", we MUST catch
+            that even if another chunk partially supports the claim.
+        """
+        # Track the best entailment and worst contradiction across all chunks
+        best_ent_score = -1.0
+        best_ent_idx = -1
+        worst_con_score = -1.0
+        worst_con_idx = -1
+
+        for i, score_row in enumerate(scores):
+            probs = self._softmax(score_row)
+            ent = probs[NLI_LABEL_ENTAILMENT]
+            con = probs[NLI_LABEL_CONTRADICTION]
+
+            if ent > best_ent_score:
+                best_ent_score = ent
+                best_ent_idx = i
+            if con > worst_con_score:
+                worst_con_score = con
+                worst_con_idx = i
+
+        # -- Decision logic --
+        # Priority: Contradiction > Entailment > Neutral
+        # In safety-critical work: false positive (flag good claim) is MUCH cheaper
+        # than false negative (pass bad claim through to user)
+
+        # CHECK 1: Is any chunk contradicting this claim?
+        if worst_con_score > 0.70:
+            raw = scores[worst_con_idx]
             return ClaimResult(
                 claim_text=claim_text,
-                verdict=ClaimVerdict.UNSUPPORTED,
-                confidence=max(best_ent_score, worst_con_score),
+                verdict=ClaimVerdict.CONTRADICTED,
+                confidence=worst_con_score,
+                best_source=check_chunks[worst_con_idx][:200],
+                nli_scores=np.asarray(raw, dtype=float).tolist(),
                 explanation=(
-                    f"UNSUPPORTED: No chunk confirms or denies. "
-                    f"Best entailment: {best_ent_score:.2f}, "
-                    f"best contradiction: {worst_con_score:.2f}. "
-                    f"May be parametric knowledge from LLM training data."
+                    f"CONTRADICTED by chunk {worst_con_idx + 1} "
+                    f"(confidence: {worst_con_score:.2f}). "
+                    f"Source directly conflicts with this claim."
                 ),
             )
 
-        except Exception as e:
-            self.logger.error(f"NLI verification failed: {e}")
+        # CHECK 2: Does any chunk support this claim?
+        if best_ent_score > 0.50:
+            raw = scores[best_ent_idx]
             return ClaimResult(
                 claim_text=claim_text,
-                verdict=ClaimVerdict.UNSUPPORTED,
-                confidence=0.0,
-                explanation=f"NLI error: {str(e)}",
+                verdict=ClaimVerdict.SUPPORTED,
+                confidence=best_ent_score,
+                best_source=check_chunks[best_ent_idx][:200],
+                nli_scores=np.asarray(raw, dtype=float).tolist(),
+                explanation=(
+                    f"SUPPORTED by chunk {best_ent_idx + 1} "
+                    f"(confidence: {best_ent_score:.2f})."
+                ),
             )
+
+        # CHECK 3: No chunk confirms or denies -- UNSUPPORTED
+        # This claim may come from the LLM's training data (parametric
+        # knowledge) rather than the retrieved documents.
+        return ClaimResult(
+            claim_text=claim_text,
+            verdict=ClaimVerdict.UNSUPPORTED,
+            confidence=max(best_ent_score, worst_con_score),
+            explanation=(
+                f"UNSUPPORTED: No chunk confirms or denies. "
+                f"Best entailment: {best_ent_score:.2f}, "
+                f"best contradiction: {worst_con_score:.2f}. "
+                f"May be parametric knowledge from LLM training data."
+            ),
+        )
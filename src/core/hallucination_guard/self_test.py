@@ -28,9 +28,9 @@ TESTS:
     [5/7] Response construct. -- Flag/block/strip/warn modes
     [6/7] GuardResult         -- Data class integrity
     [7/7] NLI model           -- Entailment and contradiction detection
-                                 (SKIP if sentence-transformers not installed)
+                                 (SKIP if no local ONNX NLI model)
 
-NETWORK ACCESS: None, unless NLI model needs downloading for test 7.
+NETWORK ACCESS: None.
 
 AUTHOR: Jeremy (AI-assisted development)
 VERSION: 1.0.0
@@ -51,7 +51,7 @@ def run_self_test():
 
     Each test is independent -- a failure in one doesn't prevent
     the others from running. Test 7 (NLI model) is optional and
-    skipped gracefully if sentence-transformers isn't installed.
+    skipped gracefully if the NLI runtime or model isn't available.
     """
     print("=" * 60)
     print("HALLUCINATION GUARD -- Self-Test")
@@ -157,8 +157,8 @@ def run_self_test():
     # ------------------------------------------------------------------
     # Test 7: NLI Model (Optional)
     # ------------------------------------------------------------------
-    # This test requires sentence-transformers to be installed and the
-    # NLI model to be available (downloaded or cached). If either is
+    # This test requires onnxruntime + tokenizers to be installed and the
+    # ONNX NLI model to be in the model cache. If either is
     # missing, the test is skipped gracefully.
     print("\n[7/7] NLI model...")
     try:
@@ -193,7 +193,7 @@ def run_self_test():
         else:
             print("  [SKIP] Model not available")
     except ImportError:
-        print("  [SKIP] sentence-transformers not installed")
+        print("  [SKIP] NLI runtime not installed")
     except Exception as e:
         print(f"  [SKIP] {e}")
 
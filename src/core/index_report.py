@@ -111,6 +111,10 @@ def populate_from_parse_details(
     record.chars_extracted = text_len
     record.parser_used = parse_details.get("parser", "")
     record.quality_score = int(parse_details.get("quality_score", -1))
+    # Parser errors that still left text (e.g. a stream that failed
+    # part-way) stay on the record so the report shows them.
+    if parse_details.get("error"):
+        record.error_msg = str(parse_details["error"])
 
     # OCR details (from pdf_parser.py)
     ocr = parse_details.get("ocr_fallback", {})
@@ -23,6 +23,7 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import time
@@ -39,6 +40,7 @@ from .chunker import Chunker, ChunkerConfig
 from .embedder import Embedder
 from .chunk_ids import make_chunk_id
 from .file_validator import FileValidator
+from .indexing.archive_members import index_archive_members
 from .indexing.cancel import IndexCancelled
 from .index_report import FileRecord, populate_from_parse_details, write_report
 from .ocr_cleanup import clean_ocr_text, score_text_quality
@@ -112,7 +114,15 @@ class Indexer:
         self.gc_between_files = bool(getattr(perf_cfg, "gc_between_files", True))
         self.gc_between_blocks = bool(getattr(perf_cfg, "gc_between_blocks", True))
 
+        # Parsers with parse_iter() are indexed segment by segment
+        # (see _process_streamed_file); False forces whole-text parsing.
+        self.stream_parsers = bool(getattr(idx_cfg, "stream_parsers", True))
+        # Archive members are indexed as their own sources
+        # ("archive.zip!/member.pdf"); False keeps one blob per archive.
+        self.archive_members = bool(getattr(idx_cfg, "archive_members", True))
+
         from src.parsers.registry import REGISTRY
+        self._parser_registry = REGISTRY
         cfg_exts = getattr(idx_cfg, "supported_extensions", None)
         self._supported_extensions = set(cfg_exts) if cfg_exts else set(REGISTRY.supported_extensions())
 
@@ -361,6 +371,9 @@ class Indexer:
             logger.info("BLOCKED: %s -- %s", file_path.name, preflight_reason)
             return 0, "preflight: {}".format(preflight_reason), False, {}
 
+        if self.archive_members and self._parser_name(file_path) == "ArchiveParser":
+            return index_archive_members(self, file_path, stop_flag)
+
         self._raise_if_cancelled(stop_flag, f"before hash check: {file_path.name}")
         current_hash = self._compute_file_hash(file_path)
         stored_hash = self.vector_store.get_file_hash(str(file_path))
@@ -377,6 +390,10 @@ class Indexer:
             was_reindex = True
 
         self._raise_if_cancelled(stop_flag, f"before parse: {file_path.name}")
+        if self.stream_parsers and self._parser_registry.supports_streaming(file_path.suffix.lower()):
+            return self._process_streamed_file(
+                file_path, current_hash, was_reindex, stop_flag,
+            )
         text, parse_details = self._process_file_with_retry(
             file_path, stop_flag=stop_flag
         )
@@ -404,6 +421,34 @@ class Indexer:
             )
             text = text[: self.max_chars_per_file]
 
+        chunks_added, _ = self._index_blocks(
+            self._iter_text_blocks(text), file_path, current_hash, stop_flag,
+        )
+
+        if chunks_added == 0:
+            return 0, "no chunks produced", was_reindex, parse_details
+
+        if getattr(self.vector_store, "conn", None) is not None:
+            upsert_source_quality_records(
+                self.vector_store.conn,
+                [assess_source_quality(str(file_path), text[:8000])],
+            )
+
+        if self.gc_between_files:
+            gc.collect()
+        return chunks_added, None, was_reindex, parse_details
+
+    def _index_blocks(
+        self, blocks, file_path: Path, current_hash: str,
+        stop_flag: Optional[Any] = None, source_path: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """
+        Chunk, embed and store each text block. Returns (chunks_added, chars).
+
+        source_path overrides the stored source (archive members are stored
+        as "archive.zip!/member"); mtime and access tags come from file_path.
+        """
+        source = source_path or str(file_path)
         try:
             file_mtime_ns = file_path.stat().st_mtime_ns
         except Exception:
@@ -412,7 +457,7 @@ class Indexer:
 
         chunks_added = 0
         char_offset = 0
-        for block in self._iter_text_blocks(text):
+        for block in blocks:
             self._raise_if_cancelled(stop_flag, f"during chunk loop: {file_path.name}")
             if not block.strip():
                 char_offset += len(block)
@@ -430,7 +475,7 @@ class Indexer:
                 chunk_start = char_offset + chunk_offsets[i]
                 chunk_end = chunk_start + len(chunk_text)
                 cid = make_chunk_id(
-                    file_path=str(file_path),
+                    file_path=source,
                     file_mtime_ns=file_mtime_ns,
                     chunk_start=chunk_start,
                     chunk_end=chunk_end,
@@ -439,7 +484,7 @@ class Indexer:
                 chunk_ids.append(cid)
                 metadata_list.append(
                     ChunkMetadata(
-                        source_path=str(file_path),
+                        source_path=source,
                         chunk_index=chunks_added + i,
                         text_length=len(chunk_text),
                         created_at=datetime.now(timezone.utc).isoformat(),
@@ -457,19 +502,91 @@ class Indexer:
             if self.gc_between_blocks:
                 gc.collect()
 
+        return chunks_added, char_offset
+
+    def _process_streamed_file(
+        self, file_path: Path, current_hash: str, was_reindex: bool,
+        stop_flag: Optional[Any] = None,
+    ) -> Tuple[int, Optional[str], bool, Dict[str, Any]]:
+        """
+        Index a file whose parser implements parse_iter().
+
+        Segments (pages, sheets, messages, records) are grouped into
+        blocks of block_chars and each block is cleaned, chunked, embedded
+        and stored before more of the file is read, so memory stays near
+        one block however large the file is. Reading stops once
+        max_chars_per_file characters were taken. There is no parse retry
+        here: blocks already stored cannot be re-parsed safely, and
+        streaming parsers record their own errors in the details. When
+        one fails part-way, the blocks it did yield stay indexed and the
+        error travels in the details, as with whole-text parsing.
+        """
+        parse_details: Dict[str, Any] = {
+            "file": str(file_path),
+            "extension": file_path.suffix.lower(),
+            "parser": "unknown",
+            "mode": "stream",
+        }
+        stream = {"segments": 0, "chars": 0, "clamped": False}
+        parse_details["stream"] = stream
+        blocks = _iter_segment_blocks(
+            self._iter_file_segments(file_path, parse_details),
+            self.block_chars, self.max_chars_per_file, stream,
+        )
+        cleaned = (clean_ocr_text(block) for block in blocks)
+        first = next((block for block in cleaned if block.strip()), None)
+        if first is None:
+            return (0, _build_no_text_reason(file_path, parse_details),
+                    False, parse_details)
+
+        parse_details["quality_score"] = score_text_quality(first)
+        if not self._validate_text(first):
+            blocks.close()
+            logger.warning(
+                "[WARN] %s -- text looks like binary garbage, skipping",
+                file_path.name,
+            )
+            return 0, "binary garbage detected", False, parse_details
+
+        chunks_added, chars = self._index_blocks(
+            itertools.chain([first], cleaned), file_path, current_hash, stop_flag,
+        )
+        parse_details["chars_after_cleanup"] = chars
+        if parse_details.get("error"):
+            logger.warning(
+                "[WARN] %s -- parser failed mid-stream after %d segments (%s)",
+                file_path.name, stream["segments"], parse_details["error"],
+            )
+        if stream["clamped"]:
+            logger.warning(
+                "[WARN] Clamping %s at %s chars (streamed)",
+                file_path.name, "{:,}".format(self.max_chars_per_file),
+            )
+
         if chunks_added == 0:
             return 0, "no chunks produced", was_reindex, parse_details
 
         if getattr(self.vector_store, "conn", None) is not None:
             upsert_source_quality_records(
                 self.vector_store.conn,
-                [assess_source_quality(str(file_path), text[:8000])],
+                [assess_source_quality(str(file_path), first[:8000])],
             )
 
         if self.gc_between_files:
             gc.collect()
         return chunks_added, None, was_reindex, parse_details
 
+    def _iter_file_segments(self, file_path: Path, details: Dict[str, Any]):
+        """Yield TextSegments from the routing parser, recording parser errors."""
+        try:
+            from ..parsers.text_parser import TextParser
+            yield from TextParser().parse_iter(str(file_path), details)
+        except ImportError:
+            details["error"] = "IMPORT_ERROR: parser stack unavailable"
+        except Exception as e:
+            logger.warning("[WARN] Parser error on %s: %s", file_path.name, e)
+            details["error"] = f"RUNTIME_ERROR: {type(e).__name__}: {e}"
+
     def _process_file_with_retry(
         self, file_path: Path, max_retries: int = 3,
         stop_flag: Optional[Any] = None,
@@ -564,6 +681,10 @@ class Indexer:
                 details.setdefault("error", "FALLBACK_READ_FAILED")
                 return "", details
 
+    def _parser_name(self, file_path: Path) -> str:
+        info = self._parser_registry.get(file_path.suffix.lower())
+        return info.name if info is not None else ""
+
     def _validate_text(self, text: str) -> bool:
         """Delegate to FileValidator. See file_validator.py for details."""
         return self._file_validator.validate_text(text)
@@ -577,11 +698,7 @@ class Indexer:
         n = len(text)
         start = 0
         while start < n:
-            end = min(start + self.block_chars, n)
-            if end < n:
-                nl = text.rfind("\n", start, end)
-                if nl != -1 and nl > start + 10_000:
-                    end = nl
+            end = _block_end(text, start, self.block_chars)
             yield text[start:end]
             start = end
 
@@ -621,6 +738,47 @@ def _locate_chunk_offsets(block: str, chunks: List[str]) -> List[int]:
     return offsets
 
 
+def _block_end(text: str, start: int, block_chars: int) -> int:
+    """End of the block starting at start: block_chars on, backed up to a newline."""
+    n = len(text)
+    end = min(start + block_chars, n)
+    if end < n:
+        nl = text.rfind("\n", start, end)
+        if nl != -1 and nl > start + 10_000:
+            end = nl
+    return end
+
+
+def _iter_segment_blocks(segments, block_chars: int, max_chars: int,
+                         stats: Dict[str, Any]):
+    """Group streamed parser segments into text blocks of about block_chars.
+
+    Segments are joined with newlines, the way parse_with_details() joins
+    them, and a segment larger than a block is split like any other
+    text. Stops pulling segments once max_chars characters were taken
+    (stats["clamped"] is set), so the parser never reads past the clamp.
+    """
+    pending = ""
+    taken = 0
+    for segment in segments:
+        text = segment.text if stats["segments"] == 0 else "\n" + segment.text
+        stats["segments"] += 1
+        if taken + len(text) >= max_chars:
+            stats["clamped"] = taken + len(text) > max_chars
+            text = text[: max_chars - taken]
+        taken += len(text)
+        stats["chars"] = taken
+        pending += text
+        while len(pending) >= block_chars:
+            end = _block_end(pending, 0, block_chars)
+            yield pending[:end]
+            pending = pending[end:]
+        if taken >= max_chars:
+            break
+    if pending:
+        yield pending
+
+
 def _build_no_text_reason(file_path: Path, details: Dict[str, Any]) -> str:
     """Build a compact, operator-friendly skip reason for empty extraction."""
     parser_name = details.get("parser") or "unknown_parser"
@@ -0,0 +1,141 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Indexes the files inside an archive as separate, individually hashed sources.
+# What to read first: Start at index_archive_members().
+# Inputs: An Indexer (for chunk/embed/store) and the archive path.
+# Outputs: Chunks stored under "archive.zip!/member" source paths.
+# Safety notes: Update small sections at a time and run relevant tests after edits.
+# ============================
+# ============================================================================
+# Archive member indexing (src/core/indexing/archive_members.py)
+#
+# A .zip/.tar/.gz used to be indexed as one text blob attributed to the
+# archive, so results cited "bundle.zip" and any change to the archive
+# re-parsed and re-embedded every member. Here each member becomes its own
+# source ("bundle.zip!/specs/radar.pdf") whose file_hash is
+#
+#     "<archive size:mtime_ns>#sha256:<member content hash>"
+#
+# The first half lets an untouched archive be skipped without opening it.
+# The second half lets a changed archive skip the members whose bytes did
+# not change: they are not parsed or embedded again, only re-stamped with
+# the new archive fingerprint. Members that disappeared are deleted, unless
+# the archive could not be read, in which case nothing is removed.
+# ============================================================================
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..ocr_cleanup import clean_ocr_text
+from ..source_quality import assess_source_quality, upsert_source_quality_records
+
+logger = logging.getLogger(__name__)
+
+
+def index_archive_members(
+    indexer, file_path: Path, stop_flag: Optional[Any] = None,
+) -> Tuple[int, Optional[str], bool, Dict[str, Any]]:
+    """
+    Index one archive member by member.
+
+    Returns (chunks_added, skip_reason, was_reindex, details), the same
+    shape as Indexer._process_single_file().
+    """
+    from src.parsers.archive_parser import (
+        MEMBER_SEPARATOR, ArchiveParser, member_source_path,
+    )
+
+    archive = str(file_path)
+    store = indexer.vector_store
+    indexer._raise_if_cancelled(stop_flag, f"before hash check: {file_path.name}")
+    archive_hash = indexer._compute_file_hash(file_path)
+    stored = store.get_source_hashes(archive + MEMBER_SEPARATOR)
+    if stored and all(h.startswith(archive_hash + "#") for h in stored.values()):
+        return 0, "unchanged (hash match)", False, {}
+
+    was_reindex = False
+    if store.get_file_hash(archive):
+        # Chunks from before per-member indexing (one blob per archive).
+        deleted = store.delete_chunks_by_source(archive)
+        logger.info(
+            "RE-INDEX: %s split into member sources (deleted %d old chunks)",
+            file_path.name, deleted,
+        )
+        was_reindex = True
+
+    def _unchanged(member_name: str, digest: str) -> bool:
+        source = member_source_path(archive, member_name)
+        return stored.get(source, "").endswith("#sha256:" + digest)
+
+    indexer._raise_if_cancelled(stop_flag, f"before parse: {file_path.name}")
+    details: Dict[str, Any] = {
+        "file": archive,
+        "extension": file_path.suffix.lower(),
+        "parser": "ArchiveParser",
+        "mode": "archive_members",
+    }
+    members = ArchiveParser().parse_members(archive, details, skip=_unchanged)
+
+    chunks_added = 0
+    unchanged = 0
+    quality_records = []
+    seen = set()
+    for member in members:
+        source = member_source_path(archive, member.name)
+        seen.add(source)
+        member_hash = f"{archive_hash}#sha256:{member.sha256}"
+        if member.status == "unchanged":
+            store.update_file_hash(source, member_hash)
+            unchanged += 1
+            continue
+        if source in stored:
+            store.delete_chunks_by_source(source)
+            was_reindex = True
+        if member.status != "parsed":
+            continue
+        text = clean_ocr_text(member.text)
+        if not indexer._validate_text(text):
+            details["members_garbage"] = details.get("members_garbage", 0) + 1
+            continue
+        text = text[: indexer.max_chars_per_file]
+        added, _ = indexer._index_blocks(
+            indexer._iter_text_blocks(text), file_path, member_hash, stop_flag,
+            source_path=source,
+        )
+        chunks_added += added
+        if added:
+            quality_records.append(assess_source_quality(source, text[:8000]))
+
+    if quality_records and getattr(store, "conn", None) is not None:
+        upsert_source_quality_records(store.conn, quality_records)
+
+    if details.get("error"):
+        # A locked or half-copied archive lists no members; that says nothing
+        # about which members are gone, so keep the stored ones. Their hashes
+        # still carry the old archive fingerprint, so the next run retries.
+        err_token = str(details["error"]).split(":")[0][:64]
+        logger.warning(
+            "[WARN] %s -- archive extraction failed, stored members kept: %s",
+            file_path.name, details["error"],
+        )
+        return (chunks_added,
+                f"archive extraction failed ({details['extension']}, ArchiveParser, {err_token})",
+                was_reindex, details)
+
+    removed = sorted(set(stored) - seen)
+    for source in removed:
+        store.delete_chunks_by_source(source)
+    if removed:
+        details["members_removed"] = len(removed)
+        was_reindex = True
+
+    if chunks_added:
+        return chunks_added, None, was_reindex, details
+    if unchanged:
+        return 0, "unchanged (hash match)", was_reindex, details
+    if not any(member.status == "parsed" for member in members):
+        from ..indexer import _build_no_text_reason
+        return 0, _build_no_text_reason(file_path, details), False, details
+    return 0, "no chunks produced", was_reindex, details
@@ -0,0 +1,561 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Watches the source folder and re-indexes only the files that were created, changed or deleted.
+# What to read first: Start at IndexWatchDaemon.run_once(), then apply_changes() and the two watchers.
+# Inputs: Filesystem change notices (inotify on Linux, folder polling elsewhere) and an Indexer.
+# Outputs: Updated chunks for changed files, removed chunks for deleted ones, and batch counters.
+# Safety notes: Uses the same Indexer hash checks as a full run; deletes only sources under the watched folder.
+# ============================
+# ============================================================================
+# Incremental indexing from filesystem changes (src/core/indexing/watch.py)
+#
+# A scheduled run re-discovers the whole source folder every interval, so
+# a new document waits up to an interval and every run pays a full walk.
+# In watch mode:
+#
+#   InotifyWatcher  -- Linux inotify via libc (no extra package).  One
+#                      watch per directory; blocks in select() while idle.
+#   PollingWatcher  -- fallback for other platforms and network shares
+#                      inotify cannot see.  Each poll stats directories
+#                      only and re-lists those whose mtime moved; every
+#                      full_poll_s it also stats files to catch in-place
+#                      edits (which leave the folder mtime alone).
+#   ChangeBatcher   -- debounces bursts (a copy of 500 files, an editor's
+#                      save-rename dance) into one batch once the folder
+#                      has been quiet for quiet_s, or after max_wait_s.
+#   apply_changes() -- decides per path from its CURRENT state: an
+#                      existing file goes through Indexer.index_file()
+#                      (which skips unchanged hashes and replaces changed
+#                      files), a new folder is walked, and a missing path
+#                      is removed with delete_chunks_by_source() together
+#                      with any archive members ("x.zip!/...") or files
+#                      below it (a folder that was moved away).
+#
+# A watcher that loses events (inotify queue overflow) asks for a rescan;
+# the daemon then runs Indexer.index_folder(), whose hash checks make it a
+# walk rather than a re-embed.
+# ============================================================================
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .cancel import IndexCancelled
+
+logger = logging.getLogger(__name__)
+
+QUIET_SECONDS = 2.0
+MAX_WAIT_SECONDS = 30.0
+POLL_SECONDS = 10.0
+FULL_POLL_SECONDS = 600.0
+
+# Folder mtimes this close to the last listing are re-listed next poll;
+# FAT and some SMB servers only keep 2-second mtimes.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+# ---------------------------------------------------------------------------
+# Debounce
+# ---------------------------------------------------------------------------
+
+class ChangeBatcher:
+    """Collect changed paths until the folder has been quiet for a moment."""
+
+    def __init__(self, quiet_s: float = QUIET_SECONDS, max_wait_s: float = MAX_WAIT_SECONDS):
+        self.quiet_s = float(quiet_s)
+        self.max_wait_s = float(max_wait_s)
+        self._paths: Set[str] = set()
+        self._rescan = False
+        self._first_at: Optional[float] = None
+        self._last_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, paths: Iterable[str], *, rescan: bool = False, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            before = len(self._paths), self._rescan
+            self._paths.update(str(p) for p in paths)
+            self._rescan = self._rescan or rescan
+            if (len(self._paths), self._rescan) == before:
+                return
+            if self._first_at is None:
+                self._first_at = now
+            self._last_at = now
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._paths)
+
+    def ready(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._first_at is None:
+                return False
+            return (
+                now - self._last_at >= self.quiet_s
+                or now - self._first_at >= self.max_wait_s
+            )
+
+    def wait_hint(self, idle_s: float, now: Optional[float] = None) -> float:
+        """How long the watcher may block before the batch could be due."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._first_at is None:
+                return idle_s
+            due = min(self._last_at + self.quiet_s, self._first_at + self.max_wait_s)
+        return max(0.0, min(idle_s, due - now))
+
+    def drain(self) -> tuple[List[str], bool]:
+        with self._lock:
+            paths, rescan = sorted(self._paths), self._rescan
+            self._paths, self._rescan = set(), False
+            self._first_at = self._last_at = None
+        return paths, rescan
+
+
+# ---------------------------------------------------------------------------
+# Watchers
+# ---------------------------------------------------------------------------
+
+class _Watcher:
+    """poll(timeout) -> (changed paths, rescan needed)."""
+
+    backend = "none"
+
+    def __init__(self, root: str, excluded_dirs: Iterable[str] = ()):
+        self.root = str(root)
+        self.excluded = {str(name).lower() for name in excluded_dirs}
+
+    def start(self) -> None:
+        pass
+
+    def poll(self, timeout: float) -> tuple[List[str], bool]:
+        raise NotImplementedError
+
+    def interrupt(self) -> None:
+        """Wake a blocked poll() so the daemon can stop promptly."""
+
+    def close(self) -> None:
+        pass
+
+    def _walk_dirs(self, top: str):
+        for dirpath, dirs, _files in os.walk(top):
+            dirs[:] = [d for d in dirs if d.lower() not in self.excluded]
+            yield dirpath
+
+
+class InotifyWatcher(_Watcher):
+    """Linux inotify watches on every folder below root."""
+
+    backend = "inotify"
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (
+        IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, root: str, excluded_dirs: Iterable[str] = ()):
+        super().__init__(root, excluded_dirs)
+        self._libc = None
+        self._fd = -1
+        self._wd_paths: Dict[int, str] = {}
+        self._overflow = False
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return False
+        try:
+            return hasattr(ctypes.CDLL(libc_name), "inotify_init1")
+        except OSError:
+            return False
+
+    def start(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for dirpath in self._walk_dirs(self.root):
+            self._add_watch(dirpath)
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), ctypes.c_uint32(self.WATCH_MASK),
+        )
+        if wd < 0:
+            # Usually fs.inotify.max_user_watches; the next rescan covers it.
+            logger.warning("[WARN] Cannot watch %s (errno %d)", path, ctypes.get_errno())
+            self._overflow = True
+            return
+        self._wd_paths[wd] = path
+
+    def poll(self, timeout: float) -> tuple[List[str], bool]:
+        changed: Set[str] = set()
+        readable, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        while readable:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            self._parse(data, changed)
+            readable, _, _ = select.select([self._fd], [], [], 0)
+        rescan, self._overflow = self._overflow, False
+        return sorted(changed), rescan
+
+    def _parse(self, data: bytes, changed: Set[str]) -> None:
+        offset = 0
+        while offset + self._HEADER.size <= len(data):
+            wd, mask, _cookie, length = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                self._overflow = True
+                continue
+            base = self._wd_paths.get(wd)
+            if mask & self.IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                continue
+            if base is None:
+                continue
+            if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                # The parent's DELETE / MOVED_FROM event names the change.
+                # A folder moved inside the tree was re-watched under its
+                # new path (same wd), so keep that mapping.
+                if not os.path.isdir(base):
+                    self._wd_paths.pop(wd, None)
+                continue
+            if mask & self.IN_CREATE and not mask & self.IN_ISDIR:
+                # A file being copied in is still half-written; its
+                # IN_CLOSE_WRITE (or IN_MOVED_TO) reports it once complete.
+                continue
+            path = os.path.join(base, name) if name else base
+            if mask & self.IN_ISDIR:
+                if name.lower() in self.excluded:
+                    continue
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    # Files copied in before the watch existed are found
+                    # when apply_changes() walks the new folder.
+                    for dirpath in self._walk_dirs(path):
+                        self._add_watch(dirpath)
+            changed.add(path)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._wd_paths.clear()
+
+
+class PollingWatcher(_Watcher):
+    """Folder-mtime polling; file stats only on the periodic full pass."""
+
+    backend = "polling"
+
+    def __init__(
+        self,
+        root: str,
+        excluded_dirs: Iterable[str] = (),
+        *,
+        interval_s: float = POLL_SECONDS,
+        full_poll_s: float = FULL_POLL_SECONDS,
+    ):
+        super().__init__(root, excluded_dirs)
+        self.interval_s = float(interval_s)
+        self.full_poll_s = float(full_poll_s)
+        # folder -> (mtime_ns, listed_at_ns, {name: (is_dir, size, mtime_ns)})
+        self._dirs: Dict[str, tuple] = {}
+        self._last_full = 0.0
+        self._last_poll = 0.0
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        for dirpath in self._walk_dirs(self.root):
+            self._list(dirpath)
+        self._last_full = self._last_poll = time.monotonic()
+
+    def _list(self, path: str) -> Optional[Dict[str, tuple]]:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            listed_at = time.time_ns()
+            entries = {}
+            with os.scandir(path) as listing:
+                for entry in listing:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir:
+                            if entry.name.lower() in self.excluded:
+                                continue
+                            entries[entry.name] = (True, 0, 0)
+                        else:
+                            st = entry.stat()
+                            entries[entry.name] = (False, st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            self._dirs.pop(path, None)
+            return None
+        self._dirs[path] = (mtime_ns, listed_at, entries)
+        return entries
+
+    def poll(self, timeout: float) -> tuple[List[str], bool]:
+        due = self._last_poll + self.interval_s - time.monotonic()
+        if due > 0:
+            self._stop.wait(min(max(0.0, timeout), due))
+            if time.monotonic() < self._last_poll + self.interval_s:
+                return [], False
+        self._last_poll = time.monotonic()
+        full = self._last_poll - self._last_full >= self.full_poll_s
+        if full:
+            self._last_full = self._last_poll
+        changed: Set[str] = set()
+        for path in list(self._dirs):
+            if path not in self._dirs:
+                continue  # dropped with a removed parent
+            self._check(path, full, changed)
+        return sorted(changed), False
+
+    def _check(self, path: str, full: bool, changed: Set[str]) -> None:
+        mtime_ns, listed_at, old = self._dirs[path]
+        try:
+            current = os.stat(path).st_mtime_ns
+        except OSError:
+            for known in [p for p in self._dirs if p == path or p.startswith(path + os.sep)]:
+                del self._dirs[known]
+            changed.add(path)
+            return
+        if not (full or current != mtime_ns or current >= listed_at - _RACY_WINDOW_NS):
+            return
+        new = self._list(path)
+        if new is None:
+            changed.add(path)
+            return
+        for name in set(old) | set(new):
+            before, after = old.get(name), new.get(name)
+            if before == after:
+                continue
+            child = os.path.join(path, name)
+            changed.add(child)
+            if after is not None and after[0] and before is None:
+                for dirpath in self._walk_dirs(child):
+                    self._list(dirpath)
+            elif before is not None and before[0] and after is None:
+                for known in [p for p in self._dirs if p == child or p.startswith(child + os.sep)]:
+                    del self._dirs[known]
+
+    def interrupt(self) -> None:
+        self._stop.set()
+
+
+def make_watcher(
+    root: str,
+    excluded_dirs: Iterable[str] = (),
+    *,
+    backend: str = "auto",
+    poll_s: float = POLL_SECONDS,
+    full_poll_s: float = FULL_POLL_SECONDS,
+) -> _Watcher:
+    """inotify when available (and not disabled), else polling."""
+    backend = (backend or "auto").strip().lower()
+    if backend in ("auto", "inotify") and InotifyWatcher.available():
+        return InotifyWatcher(root, excluded_dirs)
+    if backend == "inotify":
+        logger.warning("[WARN] inotify is not available here; using folder polling.")
+    return PollingWatcher(root, excluded_dirs, interval_s=poll_s, full_poll_s=full_poll_s)
+
+
+# ---------------------------------------------------------------------------
+# Applying a batch
+# ---------------------------------------------------------------------------
+
+def _indexable(indexer, path: Path) -> bool:
+    return (
+        path.suffix.lower() in indexer._supported_extensions
+        and not indexer._is_excluded(path)
+    )
+
+
+def _delete_source_tree(vector_store, path: str) -> int:
+    """Remove a source plus archive members and files below a removed folder."""
+    deleted = vector_store.delete_chunks_by_source(path)
+    for prefix in (path + "!/", path.rstrip("/\\") + os.sep):
+        for source in vector_store.get_source_hashes(prefix):
+            deleted += vector_store.delete_chunks_by_source(source)
+    return deleted
+
+
+def apply_changes(
+    indexer,
+    paths: Iterable[str],
+    stop_flag: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Bring the index in line with the current state of each changed path."""
+    result = {
+        "paths": 0, "files_indexed": 0, "files_unchanged": 0,
+        "files_skipped": 0, "sources_deleted": 0, "chunks_deleted": 0,
+        "chunks_added": 0, "errors": [],
+    }
+    files: Dict[str, Path] = {}
+    for raw in paths:
+        result["paths"] += 1
+        path = Path(raw)
+        if path.is_file():
+            if _indexable(indexer, path):
+                files[str(path)] = path
+        elif path.is_dir():
+            if indexer._is_excluded(path):
+                continue
+            for child in path.rglob("*"):
+                if child.is_file() and _indexable(indexer, child):
+                    files[str(child)] = child
+        else:
+            removed = _delete_source_tree(indexer.vector_store, str(path))
+            if removed:
+                result["sources_deleted"] += 1
+                result["chunks_deleted"] += removed
+
+    for key in sorted(files):
+        if stop_flag is not None and stop_flag.is_set():
+            raise IndexCancelled("Cancelled during incremental batch")
+        try:
+            outcome = indexer.index_file(key)
+        except FileNotFoundError:
+            # Gone again since the batch was drained.
+            result["chunks_deleted"] += _delete_source_tree(indexer.vector_store, key)
+            continue
+        except Exception as exc:
+            result["errors"].append("{}: {}: {}".format(key, type(exc).__name__, exc))
+            logger.error("[FAIL] Incremental index %s: %s", key, exc)
+            continue
+        if outcome.get("indexed"):
+            result["files_indexed"] += 1
+            result["chunks_added"] += int(outcome.get("chunks_added", 0) or 0)
+        elif str(outcome.get("skipped_reason") or "").startswith("unchanged"):
+            result["files_unchanged"] += 1
+        else:
+            result["files_skipped"] += 1
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class IndexWatchDaemon:
+    """
+    Watch loop: collect changes, debounce, apply one batch at a time.
+
+    run_batch(paths, rescan) does the indexing work; the API passes a
+    function that takes the shared indexing lock so watch batches and
+    full runs never overlap.  It returns False to mean "busy, keep the
+    batch and retry later".
+    """
+
+    def __init__(
+        self,
+        watcher: _Watcher,
+        run_batch: Callable[[List[str], bool], bool],
+        *,
+        batcher: Optional[ChangeBatcher] = None,
+        idle_wait_s: float = 5.0,
+    ):
+        self.watcher = watcher
+        self.run_batch = run_batch
+        self.batcher = batcher if batcher is not None else ChangeBatcher()
+        self.idle_wait_s = float(idle_wait_s)
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.paths_seen = 0
+        self.last_batch_at = ""
+        self.last_error = ""
+
+    def run_once(self, timeout: Optional[float] = None) -> bool:
+        """One watch step; True if a batch was applied."""
+        wait = self.batcher.wait_hint(self.idle_wait_s) if timeout is None else timeout
+        paths, rescan = self.watcher.poll(wait)
+        if paths or rescan:
+            self.paths_seen += len(paths)
+            self.batcher.add(paths, rescan=rescan)
+        if not self.batcher.ready():
+            return False
+        paths, rescan = self.batcher.drain()
+        try:
+            applied = self.run_batch(paths, rescan)
+        except Exception as exc:
+            self.last_error = "{}: {}".format(type(exc).__name__, exc)
+            logger.error("[FAIL] Watch batch failed: %s", exc)
+            applied = True
+        if not applied:
+            self.batcher.add(paths, rescan=rescan)
+            return False
+        self.batches += 1
+        self.last_batch_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        return True
+
+    def _run(self) -> None:
+        try:
+            # Setting up watches walks the whole tree (the polling backend
+            # also stats every file), so it happens here, not in start().
+            try:
+                self.watcher.start()
+            except Exception as exc:
+                self.last_error = "{}: {}".format(type(exc).__name__, exc)
+                logger.error("[FAIL] Index watch could not start: %s", exc)
+                return
+            while not self.stop_event.is_set():
+                self.run_once()
+        finally:
+            self.watcher.close()
+
+    def start(self) -> None:
+        """Start the watch thread; returns without waiting for the tree walk."""
+        self.thread = threading.Thread(target=self._run, name="index-watch", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self.stop_event.set()
+        self.watcher.interrupt()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        else:
+            self.watcher.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.watcher.backend,
+            "root": self.watcher.root,
+            "pending_paths": len(self.batcher),
+            "batches": self.batches,
+            "paths_seen": self.paths_seen,
+            "last_batch_at": self.last_batch_at or None,
+            "last_error": self.last_error,
+        }
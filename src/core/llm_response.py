@@ -10,7 +10,7 @@
 import os
 import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +37,9 @@ class LLMResponse:
     tokens_out: int        # How many tokens the AI generated
     model: str             # Which model answered (e.g., "phi4-mini")
     latency_ms: float      # How long the call took in milliseconds
+    # Backend-reported timing breakdown when available (Ollama: load,
+    # prompt-eval and generation time). See ollama_router._ollama_metrics.
+    backend_metrics: Optional[Dict[str, Any]] = None
 
 
 # ============================================================================
@@ -251,6 +251,21 @@ class LLMRouter:
                 )
             return result
 
+    def warm_prefix(self, prefix: str) -> Optional[Dict[str, Any]]:
+        """Pre-evaluate a stable prompt prefix on the local Ollama backend.
+
+        Online APIs and vLLM manage their own prefix caches, so this is a
+        no-op (None) outside Ollama-served offline mode, and when Ollama
+        is not reachable. Used by both the GUI and the API boot warmups.
+        """
+        if self.config.mode == "online":
+            return None
+        if self.vllm and self.vllm.is_available():
+            return None
+        if not self.ollama.is_available():
+            return None
+        return self.ollama.warm_prefix(prefix)
+
     def query_stream(
         self,
         prompt: str,
@@ -312,7 +327,7 @@ class LLMRouter:
                 pass
         if hasattr(self, "vllm") and self.vllm and hasattr(self.vllm, "_client"):
             try:
-                self.vllm._client.close()
+                self.vllm.close()
             except Exception:
                 pass
         if hasattr(self, "api") and self.api and hasattr(self.api, "client"):
@@ -337,6 +352,7 @@ class LLMRouter:
             "ollama_available": self.ollama.is_available(),
             "vllm_enabled": self.vllm is not None,
             "vllm_available": self.vllm.is_available() if self.vllm else False,
+            "vllm_batching": self.vllm.batch_stats() if self.vllm else None,
             "api_configured": (self.config.mode == "online" and api_present),
             "api_present": api_present,
             "sdk_available": _openai_sdk_available(),
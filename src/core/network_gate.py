@@ -48,10 +48,19 @@
 #   If allowed, returns silently and logs the access.
 #
 # AUDIT TRAIL:
-#   Every connection attempt (allowed AND denied) is logged with:
-#     - timestamp, URL, purpose, mode, result (ALLOW/DENY)
+#   Every connection attempt (allowed AND denied) is counted per
+#   (result, reason, host, purpose, caller). Detail entries with
+#   timestamp, URL, purpose, mode and result are kept for every DENY
+#   and for the first and then every 100th repeat of each ALLOW, so
+#   per-pair reranker calls do not flood the log.
 #   This creates an auditable record for security review.
 #
+# PERFORMANCE:
+#   configure() compiles the policy once into an endpoint table and a
+#   path-prefix trie per (scheme, host, port). Decisions are cached per
+#   URL until the next configure(), so the hot path is a dict lookup
+#   plus a per-thread counter bump -- no URL parsing and no lock.
+#
 # INTERNET ACCESS: NONE (this module is the gatekeeper, not a consumer)
 # ===========================================================================
 
@@ -61,8 +70,9 @@ import os
 import time
 import logging
 import threading
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 from enum import Enum
 
@@ -174,6 +184,238 @@ def _effective_port(scheme: str, port) -> int:
     return _DEFAULT_PORTS.get(scheme, 0)
 
 
+def _split_url(url: str) -> Tuple[str, str, int, str]:
+    """
+    Parse a URL into (scheme, host, port, path), all normalized.
+
+    An unparseable port comes back as -1, which matches no allowlist
+    entry, so a malformed URL is denied rather than raising ValueError.
+    """
+    try:
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        scheme = (parsed.scheme or "").lower()
+    except Exception:
+        return "", "", -1, "/"
+    try:
+        port = _effective_port(scheme, parsed.port)
+    except ValueError:
+        port = -1
+    return scheme, host, port, parsed.path or "/"
+
+
+# Cached decisions per compiled policy. Distinct URLs are few in practice
+# (one per endpoint), so hitting the cap means something unusual is
+# generating URLs; starting over is cheaper than tracking recency.
+_DECISION_CACHE_MAX = 4096
+
+# ALLOW detail entries are kept for the first check of each
+# (reason, host, purpose, caller) and then every Nth repeat.
+_AUDIT_DETAIL_EVERY = 100
+
+_TRIE_END = object()
+
+
+class _PathPrefixTrie:
+    """
+    Path-prefix rules for one (scheme, host, port) origin.
+
+    A rule path P allows the exact path P and anything under P + "/",
+    so "/api" allows "/api" and "/api/v1" but NOT "/api2" (path
+    boundary check). Paths are split on "/" and walked segment by
+    segment, so a lookup costs one dict hop per segment no matter how
+    many prefixes share the host.
+    """
+
+    __slots__ = ("_root", "_exact")
+
+    def __init__(self):
+        """Plain-English: Sets up the _PathPrefixTrie object and prepares state used by its methods."""
+        self._root: dict = {}
+        self._exact: set = set()
+
+    def add(self, path: str) -> None:
+        """Allow ``path`` and everything below it."""
+        self._exact.add(path)
+        node = self._root
+        for segment in path.rstrip("/").split("/"):
+            node = node.setdefault(segment, {})
+        node[_TRIE_END] = True
+
+    def matches(self, path: str) -> bool:
+        """True if ``path`` equals a rule or sits strictly below one."""
+        if path in self._exact:
+            return True
+        node = self._root
+        # The last segment is skipped: a rule must be followed by "/".
+        for segment in path.split("/")[:-1]:
+            node = node.get(segment)
+            if node is None:
+                return False
+            if _TRIE_END in node:
+                return True
+        return False
+
+
+class _GateDecision(NamedTuple):
+    """Outcome of one policy lookup, cached per URL."""
+    host: str
+    allowed: bool
+    reason: str          # audit reason code, e.g. "allowed_prefix"
+    block_mode: str = ""     # mode name reported by NetworkBlockedError
+    block_detail: str = ""   # human-readable explanation for a DENY
+
+
+class _CompiledPolicy:
+    """
+    The gate's allow/deny tables, built once per configure() call.
+
+    The gate swaps in a whole new policy object on reconfigure, which
+    also throws away every cached decision -- a reader holding the old
+    object simply finishes its check against the old rules.
+    """
+
+    def __init__(
+        self,
+        mode: NetworkMode,
+        allowed_hosts: List[str],
+        endpoints: List[Tuple[str, str, int]],
+        prefixes: List[str],
+    ):
+        """Plain-English: Sets up the _CompiledPolicy object and prepares state used by its methods."""
+        self.mode = mode
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.endpoints = frozenset(endpoints)
+        self.prefix_tries: Dict[Tuple[str, str, int], _PathPrefixTrie] = {}
+        for prefix in prefixes:
+            p_scheme, p_host, p_port, p_path = _split_url(prefix)
+            if not p_host or p_port < 0:
+                continue
+            trie = self.prefix_tries.setdefault((p_scheme, p_host, p_port), _PathPrefixTrie())
+            trie.add(p_path)
+        self.decisions: Dict[str, _GateDecision] = {}
+
+    def decide(self, url: str) -> _GateDecision:
+        """Look up (or compute and cache) the decision for ``url``."""
+        decision = self.decisions.get(url)
+        if decision is None:
+            decision = self._evaluate(url)
+            if len(self.decisions) >= _DECISION_CACHE_MAX:
+                self.decisions.clear()
+            self.decisions[url] = decision
+        return decision
+
+    def _evaluate(self, url: str) -> _GateDecision:
+        """Apply the policy rules to one URL (uncached)."""
+        scheme, host, port, path = _split_url(url)
+
+        # -- ADMIN mode: allow everything (with warning) --
+        if self.mode == NetworkMode.ADMIN:
+            return _GateDecision(host, True, "admin_mode")
+
+        # -- Reject non-HTTP(S) schemes --
+        # Only http and https are valid for our use case.
+        # ftp://, file://, data://, etc. are always blocked.
+        # (Admin mode is exempt -- it needs ftp/etc for maintenance.)
+        if scheme and scheme not in ("http", "https"):
+            return _GateDecision(
+                host, False, f"blocked_scheme_{scheme}",
+                self.mode.value,
+                f"Only http:// and https:// are allowed. Got: {scheme}://",
+            )
+
+        # -- Check if it's localhost --
+        is_localhost = host in _LOCALHOST_HOSTS
+
+        # -- OFFLINE mode: localhost only --
+        if self.mode == NetworkMode.OFFLINE:
+            if is_localhost:
+                return _GateDecision(host, True, "localhost_allowed")
+            return _GateDecision(
+                host, False, "offline_blocks_internet", "offline",
+                f"Offline mode blocks all internet access. "
+                f"Host '{host}' is not localhost. "
+                f"Switch to online mode with: rag-mode-online",
+            )
+
+        # -- ONLINE mode: localhost + configured endpoints --
+        if self.mode == NetworkMode.ONLINE:
+            if is_localhost:
+                return _GateDecision(host, True, "localhost_allowed")
+
+            # Allowed endpoints: scheme + host + port must all match.
+            if (scheme, host, port) in self.endpoints:
+                return _GateDecision(host, True, "allowed_endpoint")
+
+            # Allowed URL prefixes.
+            # SECURITY: naive startswith() allows bypass via host
+            # confusion (e.g. good.example.com.evil.com passes for
+            # good.example.com). The prefixes were parsed at configure
+            # time and keyed by scheme + hostname + port, so only the
+            # path prefix is left to check here.
+            trie = self.prefix_tries.get((scheme, host, port))
+            if trie is not None and trie.matches(path):
+                return _GateDecision(host, True, "allowed_prefix")
+
+            # Not in any allowlist
+            return _GateDecision(
+                host, False, "host_not_in_allowlist", "online",
+                f"Host '{host}' is not in the allowed endpoints list. "
+                f"Allowed: {', '.join(self.allowed_hosts) or '(none configured)'}. "
+                f"Configure api.endpoint in config/config.yaml or use "
+                f"api.allowed_endpoint_prefixes to add more allowed destinations.",
+            )
+
+        # -- Unknown mode: fail closed --
+        return _GateDecision(
+            host, False, "unknown_mode", str(self.mode),
+            "Unknown network mode -- blocking all connections (fail-closed).",
+        )
+
+
+_COUNTER_STRIPES = 16
+
+
+class _AuditCounters:
+    """
+    Check counts per (allowed, reason, host, purpose, caller).
+
+    Keys are spread over a fixed set of lock stripes by hash, so checks
+    for different keys rarely share a lock and every key's count is exact
+    and global (the sampling in _record needs "first ALLOW" to mean first
+    across all threads). Memory is bounded by the number of distinct keys,
+    however many short-lived threads call in.
+    """
+
+    def __init__(self):
+        """Plain-English: Sets up the _AuditCounters object and prepares state used by its methods."""
+        self._locks = [threading.Lock() for _ in range(_COUNTER_STRIPES)]
+        self._stripes: List[Dict[tuple, int]] = [{} for _ in range(_COUNTER_STRIPES)]
+
+    def increment(self, key: tuple) -> int:
+        """Count one check for ``key``; returns its count since clear()."""
+        i = hash(key) % _COUNTER_STRIPES
+        stripe = self._stripes[i]
+        with self._locks[i]:
+            count = stripe.get(key, 0) + 1
+            stripe[key] = count
+        return count
+
+    def totals(self) -> Dict[tuple, int]:
+        """Counts since the last clear(), across all stripes."""
+        merged: Dict[tuple, int] = {}
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                merged.update(stripe)
+        return merged
+
+    def clear(self) -> None:
+        """Start counting from zero again."""
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                stripe.clear()
+
+
 # ---------------------------------------------------------------------------
 # NETWORK GATE (Singleton)
 # ---------------------------------------------------------------------------
@@ -201,8 +443,10 @@ class NetworkGate:
         self._allowed_hosts: List[str] = []
         self._allowed_endpoints: List[Tuple[str, str, int]] = []
         self._allowed_prefixes: List[str] = []
-        from collections import deque
+        self._policy = _CompiledPolicy(self._mode, [], [], [])
+        # Sampled detail entries; the counters below see every check.
         self._audit_log: deque = deque(maxlen=1000)
+        self._audit_counts = _AuditCounters()
 
     # -- MODE MANAGEMENT --
 
@@ -290,6 +534,15 @@ class NetworkGate:
         # Adding the host to _allowed_hosts would allow ALL paths on
         # that host, defeating the purpose of prefix-level control.
 
+        # Compile and swap in one assignment; this also drops every
+        # decision cached under the previous policy.
+        self._policy = _CompiledPolicy(
+            self._mode,
+            self._allowed_hosts,
+            self._allowed_endpoints,
+            self._allowed_prefixes,
+        )
+
         logger.info(
             "NETWORK GATE configured: mode=%s, allowed_hosts=%s",
             self._mode.value,
@@ -322,116 +575,22 @@ class NetworkGate:
         Returns:
             None (silently) if the connection is allowed.
         """
-        # Parse the URL to extract the hostname
-        try:
-            parsed = urlparse(url)
-            host = (parsed.hostname or "").lower()
-            scheme = (parsed.scheme or "").lower()
-        except Exception:
-            host = ""
-            scheme = ""
-
-        # -- ADMIN mode: allow everything (with warning) --
-        if self._mode == NetworkMode.ADMIN:
-            self._log_access(url, host, purpose, caller, True, "admin_mode")
-            logger.warning(
-                "NETWORK GATE [ADMIN]: Allowing %s to %s (purpose: %s)",
-                caller or "unknown", host, purpose,
-            )
-            return
-
-        # -- Reject non-HTTP(S) schemes --
-        # Only http and https are valid for our use case.
-        # ftp://, file://, data://, etc. are always blocked.
-        # (Admin mode is exempt -- it needs ftp/etc for maintenance.)
-        if scheme and scheme not in ("http", "https"):
-            self._log_access(url, host, purpose, caller, False, f"blocked_scheme_{scheme}")
-            raise NetworkBlockedError(
-                url=url,
-                mode=self._mode.value,
-                reason=f"Only http:// and https:// are allowed. Got: {scheme}://",
-            )
-
-        # -- Check if it's localhost --
-        is_localhost = host in _LOCALHOST_HOSTS
-
-        # -- OFFLINE mode: localhost only --
-        if self._mode == NetworkMode.OFFLINE:
-            if is_localhost:
-                self._log_access(url, host, purpose, caller, True, "localhost_allowed")
-                return
-            else:
-                self._log_access(url, host, purpose, caller, False, "offline_blocks_internet")
-                raise NetworkBlockedError(
-                    url=url,
-                    mode="offline",
-                    reason=(
-                        f"Offline mode blocks all internet access. "
-                        f"Host '{host}' is not localhost. "
-                        f"Switch to online mode with: rag-mode-online"
-                    ),
+        policy = self._policy
+        decision = policy.decide(url)
+        self._log_access(url, decision.host, purpose, caller, decision.allowed, decision.reason)
+
+        if decision.allowed:
+            if policy.mode == NetworkMode.ADMIN:
+                logger.warning(
+                    "NETWORK GATE [ADMIN]: Allowing %s to %s (purpose: %s)",
+                    caller or "unknown", decision.host, purpose,
                 )
+            return
 
-        # -- ONLINE mode: localhost + configured endpoints --
-        if self._mode == NetworkMode.ONLINE:
-            if is_localhost:
-                self._log_access(url, host, purpose, caller, True, "localhost_allowed")
-                return
-
-            # Check against allowed endpoints (scheme + host + port must match)
-            req_port = _effective_port(scheme, parsed.port)
-            for ep_scheme, ep_host, ep_port in self._allowed_endpoints:
-                if host == ep_host and scheme == ep_scheme and req_port == ep_port:
-                    self._log_access(url, host, purpose, caller, True, "allowed_endpoint")
-                    return
-
-            # Check against allowed URL prefixes.
-            # SECURITY: naive startswith() allows bypass via host
-            # confusion (e.g. good.example.com.evil.com passes for
-            # good.example.com).  Parse both URLs and compare scheme +
-            # hostname + port explicitly, then check the path prefix.
-            for prefix in self._allowed_prefixes:
-                try:
-                    p_parsed = urlparse(prefix)
-                    p_host = (p_parsed.hostname or "").lower()
-                    p_scheme = (p_parsed.scheme or "").lower()
-                    p_port = _effective_port(p_scheme, p_parsed.port)
-                    p_path = p_parsed.path or "/"
-
-                    if scheme != p_scheme:
-                        continue
-                    if host != p_host:
-                        continue
-                    if _effective_port(scheme, parsed.port) != p_port:
-                        continue
-                    req_path = parsed.path or "/"
-                    # Path boundary check: /api must NOT match /api2.
-                    # Allow only exact match or prefix followed by '/'.
-                    if req_path == p_path or req_path.startswith(p_path.rstrip("/") + "/"):
-                        self._log_access(url, host, purpose, caller, True, "allowed_prefix")
-                        return
-                except Exception:
-                    continue
-
-            # Not in any allowlist
-            self._log_access(url, host, purpose, caller, False, "host_not_in_allowlist")
-            raise NetworkBlockedError(
-                url=url,
-                mode="online",
-                reason=(
-                    f"Host '{host}' is not in the allowed endpoints list. "
-                    f"Allowed: {', '.join(self._allowed_hosts) or '(none configured)'}. "
-                    f"Configure api.endpoint in config/config.yaml or use "
-                    f"api.allowed_endpoint_prefixes to add more allowed destinations."
-                ),
-            )
-
-        # -- Unknown mode: fail closed --
-        self._log_access(url, host, purpose, caller, False, "unknown_mode")
         raise NetworkBlockedError(
             url=url,
-            mode=str(self._mode),
-            reason="Unknown network mode -- blocking all connections (fail-closed).",
+            mode=decision.block_mode,
+            reason=decision.block_detail,
         )
 
     def is_allowed(self, url: str) -> bool:
@@ -471,7 +630,17 @@ class NetworkGate:
         allowed: bool,
         reason: str,
     ) -> None:
-        """Record an access attempt in the audit log."""
+        """
+        Count an access attempt and keep a detail entry when sampled.
+
+        Every DENY keeps its detail entry and logger warning. A repeated
+        ALLOW (the reranker checks once per document pair) only bumps
+        its counter, apart from the first and every Nth occurrence.
+        """
+        seen = self._audit_counts.increment((allowed, reason, host, purpose, caller))
+        if allowed and seen != 1 and seen % _AUDIT_DETAIL_EVERY:
+            return
+
         entry = NetworkAuditEntry(
             timestamp=time.time(),
             url=url,
@@ -492,7 +661,7 @@ class NetworkGate:
             logger.warning("NET %s: %s -> %s (%s)", "DENY", caller, host, reason)
 
     def get_audit_log(self, last_n: int = 50) -> List[NetworkAuditEntry]:
-        """Get the most recent audit log entries."""
+        """Get the most recent (sampled) audit log entries."""
         # deque does not support slicing -- convert to list first
         entries = list(self._audit_log)
         return entries[-last_n:]
@@ -508,14 +677,18 @@ class NetworkGate:
             denied: Number of denied connections
             allowed_hosts: List of configured allowed hosts
             unique_hosts_contacted: Set of hosts that were actually contacted
+
+        Counts come from the per-key counters, so they include checks
+        whose detail entry was not sampled into the audit log.
         """
-        allowed_count = sum(1 for e in self._audit_log if e.allowed)
-        denied_count = sum(1 for e in self._audit_log if not e.allowed)
-        unique_hosts = set(e.host for e in self._audit_log if e.allowed)
+        totals = self._audit_counts.totals()
+        allowed_count = sum(n for key, n in totals.items() if key[0])
+        denied_count = sum(n for key, n in totals.items() if not key[0])
+        unique_hosts = set(key[2] for key in totals if key[0])
 
         return {
             "mode": self._mode.value,
-            "total_checks": len(self._audit_log),
+            "total_checks": allowed_count + denied_count,
             "allowed": allowed_count,
             "denied": denied_count,
             "allowed_hosts": list(self._allowed_hosts),
@@ -523,9 +696,10 @@ class NetworkGate:
         }
 
     def clear_audit_log(self) -> int:
-        """Clear the audit log. Returns number of entries cleared."""
+        """Clear the audit log and counters. Returns number of entries cleared."""
         count = len(self._audit_log)
         self._audit_log.clear()
+        self._audit_counts.clear()
         return count
 
     # -- STATUS / DISPLAY --
@@ -22,6 +22,9 @@
 #   - CPU (toaster): ~2s per pair, 20 pairs = ~10s with 4 threads
 #   - GPU (BEAST):   ~0.2s per pair, 20 pairs = ~1s with 4 threads
 #   - Prompt is kept short (max 800 chars of doc) to minimize latency
+#   - When the reranker shares the generation model, it sends the same
+#     keep_alive and num_ctx so Ollama does not reload the model (and
+#     drop the cached grounding prefix) between rerank and generation
 #
 # SAFETY:
 #   - Reranker is opt-in (reranker_enabled=False by default)
@@ -31,9 +34,11 @@
 
 from __future__ import annotations
 
+import contextvars
 import logging
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 import httpx
 
@@ -63,11 +68,28 @@ class OllamaReranker:
     the retriever maps through sigmoid to get 0-1 probabilities.
     """
 
-    def __init__(self, base_url, model, timeout=15, max_workers=4):
+    def __init__(self, base_url, model, timeout=15, max_workers=4,
+                 keep_alive=None, num_ctx=0):
         self.base_url = base_url
         self.model = model
         self.timeout = timeout
         self.max_workers = max_workers
+        self.keep_alive = keep_alive
+        self.num_ctx = int(num_ctx or 0)
+
+    def _payload(self, prompt):
+        options = {"temperature": 0.0, "num_predict": 8}
+        if self.num_ctx > 0:
+            options["num_ctx"] = self.num_ctx
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": options,
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
 
     def predict(self, pairs):
         """Score a list of (query, doc_text) pairs.
@@ -98,15 +120,7 @@ class OllamaReranker:
                 ) as client:
                     resp = client.post(
                         f"{self.base_url}/api/generate",
-                        json={
-                            "model": self.model,
-                            "prompt": prompt,
-                            "stream": False,
-                            "options": {
-                                "temperature": 0.0,
-                                "num_predict": 8,
-                            },
-                        },
+                        json=self._payload(prompt),
                     )
                     resp.raise_for_status()
                     text = resp.json().get("response", "0")
@@ -134,12 +148,35 @@ class OllamaReranker:
         return scores
 
 
+# Set while the API server builds its query engine: the reachability check
+# below is then skipped and done by a background startup probe instead,
+# which attaches the reranker via Retriever.attach_reranker() when it passes.
+_DEFER_PROBE = contextvars.ContextVar("ollama_reranker_defer_probe", default=False)
+
+
+@contextmanager
+def deferred_reranker_probe():
+    """Within this block, load_ollama_reranker() returns None without probing."""
+    token = _DEFER_PROBE.set(True)
+    try:
+        yield
+    finally:
+        _DEFER_PROBE.reset(token)
+
+
+def reranker_probe_deferred() -> bool:
+    return _DEFER_PROBE.get()
+
+
 def load_ollama_reranker(config):
     """Create an OllamaReranker from the live config, or None if unavailable.
 
     Checks that Ollama is reachable before returning a reranker instance.
     Returns None if the server is down (retriever falls back to no reranking).
     """
+    if reranker_probe_deferred():
+        logger.info("Reranker probe deferred to background startup check")
+        return None
     ollama_cfg = getattr(config, "ollama", None)
     if ollama_cfg is None:
         logger.warning("No ollama config -- reranker unavailable")
@@ -170,5 +207,14 @@ def load_ollama_reranker(config):
         logger.warning("Ollama unreachable -- reranker unavailable: %s", e)
         return None
 
+    # Same model as generation -> match its load parameters; a different
+    # num_ctx would make Ollama reload the model on every switch.
+    shared = {}
+    if model == getattr(ollama_cfg, "model", None):
+        shared = {
+            "keep_alive": getattr(ollama_cfg, "keep_alive", -1),
+            "num_ctx": getattr(ollama_cfg, "context_window", 0) or 0,
+        }
+
     logger.info("[OK] Ollama reranker loaded (model=%s)", model)
-    return OllamaReranker(base_url=base_url, model=model)
+    return OllamaReranker(base_url=base_url, model=model, **shared)
@@ -9,6 +9,16 @@
 # This router uses raw httpx because Ollama has a simple REST API
 # and doesn't need the openai SDK.
 #
+# KV-CACHE REUSE:
+#   Ollama keeps the evaluated prompt of the previous request and skips
+#   re-evaluating the longest shared token prefix -- but only while the
+#   model stays loaded with identical options (a num_ctx change forces a
+#   reload). Every request built here therefore goes through
+#   _generate_payload() so keep_alive and options never drift, and
+#   warm_prefix() can pre-evaluate the stable grounding instructions.
+#   Per-query prompt-eval vs generation timings are returned in
+#   LLMResponse.backend_metrics (see _ollama_metrics()).
+#
 # INTERNET ACCESS: NONE (localhost only)
 # ============================================================================
 
@@ -55,6 +65,49 @@ def _build_ollama_request_timeout(config: Config, prompt: str) -> Any:
     )
 
 
+# The boot warmup used a fixed 20 s post before prefix warming existed;
+# it is best effort, so it must not inherit the long query read timeouts.
+WARM_PREFIX_TIMEOUT_S = 20.0
+
+
+def _ollama_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert Ollama's nanosecond timing fields into a millisecond breakdown.
+
+    prompt_eval_* covers tokens Ollama actually evaluated; tokens served
+    from the KV cache are not counted, so a warm prefix shows up as a
+    small prompt_eval_count and prompt_eval_ms.
+    """
+    def _ms(key: str) -> float:
+        try:
+            return round(float(data.get(key, 0) or 0) / 1_000_000.0, 2)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _count(key: str) -> int:
+        try:
+            return int(data.get(key, 0) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    metrics = {
+        "load_ms": _ms("load_duration"),
+        "prompt_eval_count": _count("prompt_eval_count"),
+        "prompt_eval_ms": _ms("prompt_eval_duration"),
+        "eval_count": _count("eval_count"),
+        "eval_ms": _ms("eval_duration"),
+        "total_ms": _ms("total_duration"),
+    }
+    metrics["prompt_tokens_per_s"] = (
+        round(metrics["prompt_eval_count"] * 1000.0 / metrics["prompt_eval_ms"], 2)
+        if metrics["prompt_eval_ms"] > 0 else 0.0
+    )
+    metrics["eval_tokens_per_s"] = (
+        round(metrics["eval_count"] * 1000.0 / metrics["eval_ms"], 2)
+        if metrics["eval_ms"] > 0 else 0.0
+    )
+    return metrics
+
+
 class OllamaRouter:
     """Route queries to local Ollama server (offline mode)."""
 
@@ -99,6 +152,63 @@ class OllamaRouter:
         """
         return build_ollama_generation_options(self.config)
 
+    def _keep_alive(self):
+        """keep_alive value sent with every request (-1 = keep loaded)."""
+        value = getattr(self.config.ollama, "keep_alive", -1)
+        if isinstance(value, str):
+            value = value.strip()
+            return int(value) if value.lstrip("-").isdigit() else (value or -1)
+        return -1 if value is None else value
+
+    def _generate_payload(self, model_name: str, prompt: str, stream: bool,
+                          **option_overrides) -> Dict[str, Any]:
+        """One /api/generate body; identical keep_alive/options keep the KV cache."""
+        options = self._build_options()
+        options.update(option_overrides)
+        return {
+            "model": model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self._keep_alive(),
+            "options": options,
+        }
+
+    def warm_prefix(
+        self, prefix: str, timeout: float = WARM_PREFIX_TIMEOUT_S,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pre-evaluate a stable prompt prefix so the next query reuses it.
+
+        Loads the model with the same options/keep_alive as real queries
+        and generates a single token. Returns the backend metrics, or None
+        when Ollama is unreachable or slower than `timeout` seconds (best
+        effort, never raises).
+        """
+        if not str(prefix or "").strip():
+            return None
+        try:
+            get_gate().check_allowed(
+                f"{self.base_url}/api/generate",
+                "ollama_warm_prefix", "ollama_router",
+            )
+            model_name = self._resolve_model_name(self.config.ollama.model)
+            resp = self._client.post(
+                f"{self.base_url}/api/generate",
+                json=self._generate_payload(model_name, prefix, False, num_predict=1),
+                timeout=timeout,
+            )
+            resp.raise_for_status()
+            metrics = _ollama_metrics(resp.json())
+        except (NetworkBlockedError, Exception) as e:
+            self.logger.warning("ollama_warm_prefix_failed", error=str(e))
+            return None
+        self.logger.info(
+            "ollama_warm_prefix",
+            prompt_eval_count=metrics["prompt_eval_count"],
+            prompt_eval_ms=metrics["prompt_eval_ms"],
+        )
+        return metrics
+
     def _available_models(self) -> list[str]:
         """Query /api/tags with short cache to avoid repeated roundtrips."""
         now = time.time()
@@ -185,13 +295,7 @@ class OllamaRouter:
             return None
 
         def _post_generate(selected_model: str):
-            payload = {
-                "model": selected_model,
-                "prompt": prompt,
-                "stream": False,
-                "keep_alive": getattr(self.config.ollama, "keep_alive", -1),
-                "options": self._build_options(),
-            }
+            payload = self._generate_payload(selected_model, prompt, False)
             response = self._client.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
@@ -217,6 +321,7 @@ class OllamaRouter:
             prompt_eval_count = data.get("prompt_eval_count", 0)
             eval_count = data.get("eval_count", 0)
             latency_ms = (time.time() - start_time) * 1000
+            metrics = _ollama_metrics(data)
 
             self.logger.info(
                 "ollama_query_success",
@@ -224,6 +329,8 @@ class OllamaRouter:
                 tokens_in=prompt_eval_count,
                 tokens_out=eval_count,
                 latency_ms=latency_ms,
+                prompt_eval_ms=metrics["prompt_eval_ms"],
+                eval_ms=metrics["eval_ms"],
             )
 
             return LLMResponse(
@@ -232,6 +339,7 @@ class OllamaRouter:
                 tokens_out=eval_count,
                 model=model_name,
                 latency_ms=latency_ms,
+                backend_metrics=metrics,
             )
 
         except httpx.HTTPError as e:
@@ -279,13 +387,7 @@ class OllamaRouter:
                 return
             refreshed = False
             while True:
-                payload = {
-                    "model": model_name,
-                    "prompt": prompt,
-                    "stream": True,
-                    "keep_alive": getattr(self.config.ollama, "keep_alive", -1),
-                    "options": self._build_options(),
-                }
+                payload = self._generate_payload(model_name, prompt, True)
                 try:
                     with self._client.stream(
                         "POST",
@@ -296,6 +398,7 @@ class OllamaRouter:
                         response.raise_for_status()
                         tokens_in = 0
                         tokens_out = 0
+                        metrics = {}
                         watcher_stop = threading.Event()
                         watcher = None
                         if cancel_event is not None:
@@ -327,6 +430,7 @@ class OllamaRouter:
                                 if chunk.get("done", False):
                                     tokens_in = chunk.get("prompt_eval_count", 0)
                                     tokens_out = chunk.get("eval_count", 0)
+                                    metrics = _ollama_metrics(chunk)
                                     break
                         finally:
                             watcher_stop.set()
@@ -356,6 +460,7 @@ class OllamaRouter:
                 "tokens_out": tokens_out,
                 "model": model_name,
                 "latency_ms": latency_ms,
+                "backend_metrics": metrics,
             }
 
         except httpx.HTTPError as e:
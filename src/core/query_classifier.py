@@ -68,6 +68,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Tuple
 
+from .query_spans import timed_stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -314,6 +316,7 @@ class QueryClassifier:
         self._injection_patterns = _INJECTION_PATTERNS
         self._unanswerable_patterns = _UNANSWERABLE_PATTERNS
 
+    @timed_stage("classify")
     def classify(self, query: str) -> ClassificationResult:
         """
         Classify a query into one of the five QueryType categories.
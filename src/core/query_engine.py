@@ -38,12 +38,14 @@
 #   Offline mode: localhost only (Ollama)
 # ============================================================================
 
+import os
 import re
 import time
 from typing import Optional, Dict, Any, Generator
 from dataclasses import dataclass
 
 from .config import Config
+from .context_packer import estimate_tokens, pack_context, resolve_context_model_name
 from .vector_store import VectorStore
 from .retriever import Retriever
 from .embedder import Embedder
@@ -51,6 +53,7 @@ from .llm_router import LLMRouter, LLMResponse
 from .query_classifier import QueryClassifier
 from .query_expander import QueryExpander
 from .query_mode import apply_query_mode_to_engine
+from .query_spans import query_span, record_span, timed_stage, traced_query
 from .query_trace import (
     attach_result_trace,
     minimal_retrieval_trace,
@@ -107,6 +110,7 @@ class QueryEnginePromptMixin:
         """Keep stateful helpers aligned with the live config object."""
         _qe_sync_runtime_components(self, sync_guard_policy=sync_guard_policy)
 
+    @timed_stage("prompt_build")
     def _build_prompt(self, user_query: str, context: str) -> str:
         """
         Build the full prompt for the LLM.
@@ -217,6 +221,15 @@ class QueryEnginePromptMixin:
             "Answer:"
         )
 
+    def _stable_prompt_prefix(self) -> str:
+        """Instruction text shared by every prompt this engine builds.
+
+        Backends with prefix/KV caching (Ollama, vLLM) only reuse work
+        when this text is byte-identical across queries, so per-query
+        values must never appear before it.
+        """
+        return _qe_stable_prompt_prefix(self._build_prompt)
+
     def _allow_open_knowledge(self) -> bool:
         """Runtime toggle for development troubleshooting mode."""
         return bool(getattr(self, "allow_open_knowledge", False))
@@ -270,6 +283,7 @@ class QueryEngine(QueryEnginePromptMixin):
         self.last_query_trace = None
         apply_query_mode_to_engine(self)
 
+    @traced_query("base")
     def query(self, user_query: str) -> QueryResult:
         """
         Execute a query and return an answer plus metadata.
@@ -476,7 +490,8 @@ class QueryEngine(QueryEnginePromptMixin):
             #   Offline mode -> Ollama on localhost (free, no internet)
             #   Online mode  -> Azure/OpenAI API (cloud, costs money)
             # The caller never knows which backend answered.
-            llm_response = self.llm_router.query(prompt_preview)
+            with query_span("llm_generation"):
+                llm_response = self.llm_router.query(prompt_preview)
 
             if not llm_response:
                 reason = (getattr(self.llm_router, "last_error", "") or "").strip()
@@ -601,6 +616,7 @@ class QueryEngine(QueryEnginePromptMixin):
         return _multi_query_retrieve(
             self.retriever, sub_queries, classification=classification)
 
+    @traced_query("base")
     def query_stream(self, user_query: str) -> Generator[Dict[str, Any], None, None]:
         """
         Stream a query response token-by-token.
@@ -771,11 +787,15 @@ class QueryEngine(QueryEnginePromptMixin):
             tokens_out = 0
             model = ""
             llm_latency_ms = 0.0
+            backend_metrics = None
             saw_done = False
             stream_error = ""
 
+            gen_start = time.perf_counter()
             for chunk in self.llm_router.query_stream(prompt_preview):
                 if "token" in chunk:
+                    if not full_text:
+                        record_span("llm_ttft", (time.perf_counter() - gen_start) * 1000)
                     full_text.append(chunk["token"])
                     yield {"token": chunk["token"]}
                 elif "error" in chunk:
@@ -786,6 +806,8 @@ class QueryEngine(QueryEnginePromptMixin):
                     tokens_out = chunk.get("tokens_out", 0)
                     model = chunk.get("model", "")
                     llm_latency_ms = chunk.get("latency_ms", 0.0)
+                    backend_metrics = chunk.get("backend_metrics")
+            record_span("llm_generation", (time.perf_counter() - gen_start) * 1000)
 
             answer = "".join(full_text)
             elapsed_ms = (time.time() - start_time) * 1000
@@ -800,6 +822,7 @@ class QueryEngine(QueryEnginePromptMixin):
                     tokens_out = fallback.tokens_out
                     model = fallback.model
                     llm_latency_ms = fallback.latency_ms
+                    backend_metrics = getattr(fallback, "backend_metrics", None)
                     yield {"token": answer}
 
             if not answer or not answer.strip():
@@ -818,6 +841,7 @@ class QueryEngine(QueryEnginePromptMixin):
             llm_response = LLMResponse(
                 text=answer, tokens_in=tokens_in, tokens_out=tokens_out,
                 model=model, latency_ms=llm_latency_ms,
+                backend_metrics=backend_metrics,
             )
             cost_usd = self._calculate_cost(llm_response)
 
@@ -906,6 +930,7 @@ _QUERY_SPLIT_PATTERNS = [
 ]
 
 
+@timed_stage("corrective_retrieval")
 def _attempt_corrective_retrieval(config, retriever, user_query, initial_results,
                                   query_expander=None):
     """CRAG pattern: if initial retrieval is low-confidence, reformulate and retry.
@@ -975,6 +1000,7 @@ def _reformulate_for_retry(user_query, query_expander=None):
     return q
 
 
+@timed_stage("low_relevance_filter")
 def _filter_low_relevance_chunks(user_query, search_results):
     """CRAG-inspired chunk filter: drop chunks with zero query term overlap.
 
@@ -1011,6 +1037,7 @@ def _filter_low_relevance_chunks(user_query, search_results):
     return filtered
 
 
+@timed_stage("decomposition")
 def _decompose_query(user_query: str) -> list:
     """Split a multi-part query into atomic sub-queries.
 
@@ -1063,11 +1090,15 @@ def _retrieval_access_denied(retrieval_trace: dict[str, Any] | None) -> bool:
     return int(access_control.get("denied_hits", 0) or 0) > 0
 
 
+@timed_stage("context_trim")
 def _qe_trim_context_to_fit(engine: QueryEngine, context: str, user_query: str) -> str:
-    """Trim context so the full prompt fits within the context window.
+    """Pack context so the full prompt fits within the context window.
 
-    Removes whole chunks from the end (lowest relevance) rather than
-    hard-truncating mid-sentence.
+    Token counts come from context_packer.estimate_tokens() for the active
+    model family and are computed once per chunk. Whole chunks are packed
+    in relevance order (skipping ones that do not fit) and text repeated
+    between adjacent chunks of the same file is dropped, so more evidence
+    fits than with the old chars/4 trim-from-the-end loop.
 
     Mode-aware: online API models (GPT-4o etc.) have much larger context
     windows than local Ollama models.  Using the Ollama limit for online
@@ -1075,38 +1106,30 @@ def _qe_trim_context_to_fit(engine: QueryEngine, context: str, user_query: str)
     model appear ungrounded.
     """
     ctx_window, num_predict = _qe_resolve_prompt_budget(engine)
-    prompt_overhead_tokens = 800 + (len(user_query) // 4) + num_predict
+    model_name = resolve_context_model_name(engine.config)
+    prompt_overhead_tokens = 800 + estimate_tokens(user_query, model_name) + num_predict
     max_context_tokens = max(ctx_window - prompt_overhead_tokens, 512)
-    max_context_chars = max_context_tokens * 4
-
-    if len(context) <= max_context_chars:
-        return context
-
-    separator = "\n\n---\n\n"
-    chunks = context.split(separator)
-
-    while len(chunks) > 1 and len(separator.join(chunks)) > max_context_chars:
-        chunks.pop()
-
-    trimmed = separator.join(chunks)
-
-    if len(trimmed) > max_context_chars:
-        cut = trimmed[:max_context_chars]
-        last_period = cut.rfind(". ")
-        if last_period > max_context_chars // 2:
-            trimmed = cut[: last_period + 1]
-        else:
-            trimmed = cut
-
-    engine.logger.warning(
-        "context_trimmed",
-        original_chars=len(context),
-        trimmed_chars=len(trimmed),
-        chunks_original=len(context.split(separator)),
-        chunks_kept=len(trimmed.split(separator)),
-        ctx_window=ctx_window,
+
+    chunking_cfg = getattr(engine.config, "chunking", None)
+    pack = pack_context(
+        context,
+        max_context_tokens,
+        model_name=model_name,
+        overlap_chars=int(getattr(chunking_cfg, "overlap", 200) or 0),
     )
-    return trimmed
+    if pack.trimmed:
+        engine.logger.warning(
+            "context_trimmed",
+            original_chars=len(context),
+            trimmed_chars=len(pack.text),
+            chunks_original=pack.chunks_before,
+            chunks_kept=pack.chunks_kept,
+            tokens_original=pack.tokens_before,
+            tokens_kept=pack.tokens_after,
+            overlap_chars_removed=pack.overlap_chars_removed,
+            ctx_window=ctx_window,
+        )
+    return pack.text
 
 
 def _qe_sync_runtime_components(
@@ -1195,6 +1218,21 @@ def _qe_resolve_online_context_window(engine: QueryEngine) -> int:
     return max(configured, known_ctx, 4096)
 
 
+def _qe_stable_prompt_prefix(build_prompt) -> str:
+    """Longest prompt prefix that does not depend on query or context.
+
+    Builds two prompts with different questions, contexts and chunk
+    counts and keeps their common prefix up to the last full line.
+    """
+    first = build_prompt("stable-prefix probe one", "alpha")
+    second = build_prompt(
+        "different probe", "beta\n\n---\n\ngamma"
+    )
+    prefix = os.path.commonprefix([str(first or ""), str(second or "")])
+    cut = prefix.rfind("\n")
+    return prefix[:cut + 1] if cut >= 0 else ""
+
+
 def _qe_build_relaxed_prompt(user_query: str, context: str) -> str:
     """Prompt variant that prioritizes context but allows model reasoning."""
     return (
@@ -71,6 +71,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+from .query_spans import timed_stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -335,6 +337,7 @@ class QueryExpander:
     # Feature 1: Acronym & Synonym Expansion
     # ------------------------------------------------------------------
 
+    @timed_stage("keyword_expansion")
     def expand_keywords(self, query: str) -> str:
         """
         Expand acronyms and abbreviations in the query text.
@@ -0,0 +1,360 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Times each stage of a query (classify, retrieve, trim, LLM, verify...) with cheap spans.
+# What to read first: Start at query_span(), timed_stage() and traced_query().
+# Inputs: Span names from the query engines; HYBRIDRAG_QUERY_SPANS / HYBRIDRAG_QUERY_SPAN_WINDOW.
+# Outputs: Per-query span lists for the query trace, rolling p50/p95/p99 per stage, Prometheus text.
+# Safety notes: Uses a ContextVar so concurrent queries never mix spans; disabled spans cost one lookup.
+# ============================
+# ============================================================================
+# HybridRAG -- Query Stage Spans (src/core/query_spans.py)
+# ============================================================================
+# WHAT: A tiny span API for the query pipeline.
+#         with query_span("llm_generation"):
+#             response = llm_router.query(prompt)
+#         @timed_stage("classify")
+#         def classify(self, query): ...
+# WHY:  build_retrieval_trace() only timed search and rerank.  Slow
+#       classification, keyword expansion, context trimming, time to
+#       first token or hallucination-guard verification were invisible.
+# HOW:  traced_query() wraps QueryEngine.query()/query_stream() (and the
+#       grounded versions) and puts a SpanRecorder in a ContextVar for
+#       the duration of the query.  query_span()/timed_stage() look the
+#       recorder up; with no recorder (spans disabled, or code called
+#       outside a query) they return a shared no-op, so the cost is one
+#       ContextVar.get().  Spans nest; only top-level spans count toward
+#       the per-stage totals, so a retry search inside corrective
+#       retrieval is not counted twice.  When the outermost query
+#       finishes, the totals feed StageLatencyStats, a rolling window
+#       per stage that reports p50/p95/p99 and Prometheus text.
+# ============================================================================
+
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Pipeline order, used to sort snapshots.  Unknown stage names still
+# work; they sort after these.
+STAGE_ORDER = (
+    "classify",
+    "keyword_expansion",
+    "decomposition",
+    "retrieval",
+    "corrective_retrieval",
+    "low_relevance_filter",
+    "context_build",
+    "context_trim",
+    "prompt_build",
+    "llm_ttft",
+    "verified_ttft",
+    "llm_generation",
+    "grounding_verify",
+    "total",
+)
+
+DEFAULT_WINDOW = 512
+
+_ACTIVE: ContextVar[Optional["SpanRecorder"]] = ContextVar(
+    "hybridrag_query_span_recorder", default=None,
+)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "t0", "path")
+
+    def __init__(self, recorder: "SpanRecorder", name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.path = "/".join(self.recorder._stack)
+        self.recorder._stack.append(self.name)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        t1 = time.perf_counter()
+        stack = self.recorder._stack
+        if stack and stack[-1] == self.name:
+            stack.pop()
+        self.recorder._add(self.name, self.t0, t1, self.path)
+        return False
+
+
+class SpanRecorder:
+    """Spans of one query, in the order they finished."""
+
+    def __init__(self, engine_kind: str = "", stream: bool = False):
+        self.engine_kind = engine_kind
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[str] = []
+
+    def _add(self, name: str, t0: float, t1: float, path: str) -> None:
+        self.spans.append({
+            "name": name,
+            "parent": path,
+            "start_ms": round((t0 - self.started) * 1000, 3),
+            "duration_ms": round((t1 - t0) * 1000, 3),
+        })
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """Add a span measured elsewhere (e.g. time to first token) ending now."""
+        t1 = time.perf_counter()
+        self._add(name, t1 - max(0.0, duration_ms) / 1000.0, t1, "/".join(self._stack))
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Summed duration per top-level stage name (nested spans excluded)."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span["parent"]:
+                continue
+            totals[span["name"]] = round(totals.get(span["name"], 0.0) + span["duration_ms"], 3)
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": self.elapsed_ms(),
+            "stages_ms": self.stage_totals(),
+            "spans": [dict(span) for span in self.spans],
+        }
+
+
+def query_span(name: str):
+    """Context manager timing `name` inside the current query (no-op outside one)."""
+    recorder = _ACTIVE.get()
+    if recorder is None:
+        return _NOOP
+    return _Span(recorder, name)
+
+
+def record_span(name: str, duration_ms: float) -> None:
+    """Record an already-measured duration in the current query, if any."""
+    recorder = _ACTIVE.get()
+    if recorder is not None:
+        recorder.record(name, duration_ms)
+
+
+def current_query_spans() -> Optional[Dict[str, Any]]:
+    """Spans recorded so far for the running query, or None outside one."""
+    recorder = _ACTIVE.get()
+    return recorder.to_dict() if recorder is not None else None
+
+
+def timed_stage(name: str) -> Callable[[Callable], Callable]:
+    """Decorator: run the function inside query_span(name)."""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _ACTIVE.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Span(recorder, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _finish(recorder: SpanRecorder) -> None:
+    get_stage_latency_stats().observe_query(recorder.stage_totals(), recorder.elapsed_ms())
+
+
+def traced_query(engine_kind: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator for query()/query_stream(): record spans for the whole call.
+
+    A call made while a query is already being traced (GroundedQueryEngine
+    falling back to QueryEngine.query) joins the outer recorder.  For
+    generators the recorder is re-activated around every step, because
+    each next() may run in a different thread or copied context.
+    """
+    def decorate(func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                if _ACTIVE.get() is not None or not get_stage_latency_stats().enabled:
+                    yield from func(*args, **kwargs)
+                    return
+                recorder = SpanRecorder(engine_kind, stream=True)
+                gen = func(*args, **kwargs)
+                try:
+                    while True:
+                        token = _ACTIVE.set(recorder)
+                        try:
+                            item = next(gen)
+                        except StopIteration:
+                            return
+                        finally:
+                            _ACTIVE.reset(token)
+                        yield item
+                finally:
+                    gen.close()
+                    _finish(recorder)
+            return gen_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE.get() is not None or not get_stage_latency_stats().enabled:
+                return func(*args, **kwargs)
+            recorder = SpanRecorder(engine_kind)
+            token = _ACTIVE.set(recorder)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _ACTIVE.reset(token)
+                _finish(recorder)
+        return wrapper
+    return decorate
+
+
+# ============================================================================
+# Rolling per-stage latency
+# ============================================================================
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile.
+    rank = math.ceil(pct / 100.0 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+def _stage_sort_key(name: str) -> tuple:
+    try:
+        return (STAGE_ORDER.index(name), name)
+    except ValueError:
+        return (len(STAGE_ORDER), name)
+
+
+class StageLatencyStats:
+    """Rolling window of per-stage durations across recent queries."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, enabled: bool = True) -> None:
+        self.window = max(1, int(window))
+        self.enabled = bool(enabled)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._count: Dict[str, int] = {}
+        self._sum_ms: Dict[str, float] = {}
+        self._queries = 0
+
+    @classmethod
+    def from_env(cls) -> "StageLatencyStats":
+        raw_window = (os.environ.get("HYBRIDRAG_QUERY_SPAN_WINDOW") or "").strip()
+        window = int(raw_window) if raw_window.isdigit() else DEFAULT_WINDOW
+        enabled = (os.environ.get("HYBRIDRAG_QUERY_SPANS") or "1").strip().lower() not in (
+            "0", "false", "no", "off",
+        )
+        return cls(window=window, enabled=enabled)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples = {}
+            self._count = {}
+            self._sum_ms = {}
+            self._queries = 0
+
+    def observe(self, stage: str, duration_ms: float) -> None:
+        with self._lock:
+            self._observe_locked(stage, float(duration_ms))
+
+    def _observe_locked(self, stage: str, duration_ms: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+        samples.append(duration_ms)
+        self._count[stage] = self._count.get(stage, 0) + 1
+        self._sum_ms[stage] = self._sum_ms.get(stage, 0.0) + duration_ms
+
+    def observe_query(self, stages_ms: Dict[str, float], total_ms: float) -> None:
+        with self._lock:
+            self._queries += 1
+            for stage, duration_ms in stages_ms.items():
+                self._observe_locked(stage, float(duration_ms))
+            self._observe_locked("total", float(total_ms))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = []
+            for stage in sorted(self._samples, key=_stage_sort_key):
+                ordered = sorted(self._samples[stage])
+                stages.append({
+                    "stage": stage,
+                    "count": self._count[stage],
+                    "window_count": len(ordered),
+                    "p50_ms": round(_percentile(ordered, 50), 3),
+                    "p95_ms": round(_percentile(ordered, 95), 3),
+                    "p99_ms": round(_percentile(ordered, 99), 3),
+                    "max_ms": round(ordered[-1], 3),
+                    "mean_ms": round(sum(ordered) / len(ordered), 3),
+                })
+            return {
+                "enabled": self.enabled,
+                "window": self.window,
+                "queries": self._queries,
+                "stages": stages,
+            }
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition (summary per stage, in seconds)."""
+        name = "hybridrag_query_stage_duration_seconds"
+        snap = self.snapshot()
+        with self._lock:
+            sums = dict(self._sum_ms)
+        lines = [
+            f"# HELP {name} Query pipeline stage duration over the last {snap['window']} queries.",
+            f"# TYPE {name} summary",
+        ]
+        for row in snap["stages"]:
+            label = row["stage"].replace("\\", "\\\\").replace('"', '\\"')
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{name}{{stage="{label}",quantile="{quantile}"}} {row[key] / 1000:.6f}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {sums.get(row["stage"], 0.0) / 1000:.6f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {row["count"]}')
+        lines.extend([
+            "# HELP hybridrag_queries_traced_total Queries whose stages were timed.",
+            "# TYPE hybridrag_queries_traced_total counter",
+            f"hybridrag_queries_traced_total {snap['queries']}",
+        ])
+        return "\n".join(lines) + "\n"
+
+
+_STATS: Optional[StageLatencyStats] = None
+_STATS_LOCK = threading.Lock()
+
+
+def get_stage_latency_stats() -> StageLatencyStats:
+    """Process-wide stage latency aggregator (created from env on first use)."""
+    global _STATS
+    if _STATS is None:
+        with _STATS_LOCK:
+            if _STATS is None:
+                _STATS = StageLatencyStats.from_env()
+    return _STATS
@@ -7,8 +7,10 @@ from typing import Any
 from uuid import uuid4
 
 from .access_tags import normalize_access_tags
+from .context_packer import CONTEXT_SEPARATOR, estimate_tokens, resolve_context_model_name
 from .generation_params import snapshot_backend_generation_settings
 from .query_mode import resolve_query_mode_settings
+from .query_spans import STAGE_ORDER, current_query_spans
 from .request_access import get_request_access_context
 
 
@@ -335,9 +337,13 @@ def attach_result_trace(
     payload["retrieval"] = copy.deepcopy(
         retrieval_trace if retrieval_trace is not None else minimal_retrieval_trace([])
     )
+    packed_model = resolve_context_model_name(getattr(engine, "config", None))
     payload["context"] = {
         "chars_before_trim": len(context_before_trim or ""),
         "chars_after_trim": len(context_after_trim or ""),
+        "tokens_before_trim": estimate_tokens(context_before_trim or "", packed_model),
+        "tokens_after_trim": estimate_tokens(context_after_trim or "", packed_model),
+        "chunks_after_trim": len(context_after_trim.split(CONTEXT_SEPARATOR)) if context_after_trim else 0,
         "trimmed": bool(context_before_trim and context_after_trim and len(context_after_trim) < len(context_before_trim)),
         "sources": copy.deepcopy(sources or getattr(result, "sources", []) or []),
     }
@@ -354,6 +360,7 @@ def attach_result_trace(
         ),
         "stream_error": str(llm_stream_error or ""),
         "router_last_error": str(getattr(getattr(engine, "llm_router", None), "last_error", "") or ""),
+        "backend_metrics": dict(getattr(llm_response, "backend_metrics", None) or {}),
     }
     payload["decision"] = {
         "path": str(decision_path or ""),
@@ -370,6 +377,7 @@ def attach_result_trace(
         "mode": str(getattr(result, "mode", "") or ""),
     }
     payload["grounding"] = copy.deepcopy(grounding or {})
+    payload["spans"] = current_query_spans() or {}
 
     recorded = record_query_trace(engine, payload)
     result.debug_trace = copy.deepcopy(recorded)
@@ -547,6 +555,17 @@ def format_query_trace_text(trace: dict[str, Any] | None) -> str:
         ]
     )
 
+    spans = trace.get("spans", {})
+    stages_ms = spans.get("stages_ms", {})
+    if stages_ms:
+        lines.extend(["", "Stage Timings", "-------------"])
+        for stage in sorted(
+            stages_ms,
+            key=lambda name: STAGE_ORDER.index(name) if name in STAGE_ORDER else len(STAGE_ORDER),
+        ):
+            lines.append("{:<22} {:>10.1f} ms".format(stage, stages_ms[stage]))
+        lines.append("{:<22} {:>10.1f} ms".format("total (so far)", spans.get("total_ms", 0.0)))
+
     grounding = trace.get("grounding", {})
     if grounding:
         lines.extend(
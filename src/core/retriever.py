@@ -80,6 +80,7 @@ from .access_tags import normalize_access_tags
 from .request_access import get_request_access_context
 from .vector_store import VectorStore
 from .embedder import Embedder
+from .query_spans import timed_stage
 from .query_trace import build_retrieval_trace, hit_to_debug_dict
 from .source_quality import ensure_source_quality_map
 
@@ -278,13 +279,24 @@ class Retriever:
             # Lazy-load on first enable -- _load_reranker checks Ollama health
             if self._reranker is None:
                 self._reranker = self._load_reranker()
-            if self._reranker is None:
+            if self._reranker is None and _reranker_probe_deferred():
+                # API startup: a background probe attaches it when ready.
+                self.reranker_enabled = False
+            elif self._reranker is None:
                 logger.warning(
                     "[WARN] reranker_enabled but Ollama reranker unavailable. "
                     "Running without reranker."
                 )
                 self.reranker_enabled = False
 
+    def attach_reranker(self, reranker) -> None:
+        """Install a reranker loaded elsewhere (e.g. by a startup probe)."""
+        self._reranker = reranker
+        self.reranker_enabled = bool(
+            _retriever_resolve_settings(self.config)["reranker_enabled"]
+            and reranker is not None
+        )
+
     def clear_runtime_state(self, warn: bool = False):
         """Purge query-time caches so a mode/profile switch starts clean."""
         self._embed_cache.clear()
@@ -298,6 +310,7 @@ class Retriever:
     # Public API -- this is what query_engine.py calls
     # ------------------------------------------------------------------
 
+    @timed_stage("retrieval")
     def search(self, query, classification=None):
         """
         Search for chunks relevant to the query.
@@ -667,7 +680,7 @@ class Retriever:
         """Load the Ollama-based reranker (replaces retired sentence-transformers)."""
         from .ollama_reranker import load_ollama_reranker
         reranker = load_ollama_reranker(self.config)
-        if reranker is None:
+        if reranker is None and not _reranker_probe_deferred():
             logger.warning(
                 "Reranker requested but Ollama unavailable; "
                 "running without reranker."
@@ -678,6 +691,7 @@ class Retriever:
     # Context building -- format hits for the LLM prompt
     # ------------------------------------------------------------------
 
+    @timed_stage("context_build")
     def build_context(self, hits):
         """
         Format search hits into a text block that gets inserted into
@@ -842,6 +856,11 @@ class Retriever:
 # Extracted helpers (keep Retriever class under 500 lines)
 # -------------------------------------------------------------------
 
+def _reranker_probe_deferred() -> bool:
+    from .ollama_reranker import reranker_probe_deferred
+    return reranker_probe_deferred()
+
+
 def _warn_aggressive_settings(top_k, reranker_top_n):
     """Log warnings when retrieval settings may cause high latency."""
     if top_k > 10:
@@ -0,0 +1,131 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Turns chunk text into compact sorted token-ID arrays so grounding checks are fast.
+# What to read first: Start at token_ids(), then SourceTokenIndex.score_claim().
+# Inputs: Chunk text (at index time) or stored token-ID blobs (at query time).
+# Outputs: uint32 token-ID arrays, packed blobs for SQLite, and per-claim overlap + best source.
+# Safety notes: IDs are CRC32 hashes; a rare collision can only make a claim look slightly better supported.
+# ============================
+# ============================================================================
+# HybridRAG -- Source Token Index (src/core/source_tokens.py)
+# ============================================================================
+# WHAT: The content-token rules used by the hallucination guard's
+#       token-overlap scorer, plus a compact form of them:
+#         content_tokens("Rated 28VDC input") -> ["rated", "28", "vdc", "input"]
+#         token_ids(text)                     -> sorted unique uint32 array
+# WHY:  _gqe_fallback_score() used to re-run its regexes over every
+#       retrieved chunk on every query.  Chunks never change once indexed,
+#       so VectorStore now stores each chunk's token IDs next to its text
+#       (4 bytes per distinct token) and the guard only tokenizes the
+#       answer's claims.
+# HOW:  SourceTokenIndex holds the top-k chunks' ID arrays plus their
+#       union.  A claim is scored with one lookup against the union;
+#       the same check per chunk names the chunk that best supports it.
+#       Both are binary searches into sorted arrays.
+# ============================================================================
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+STOPWORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "could", "should", "may", "might", "shall", "can",
+    "to", "of", "in", "for", "on", "with", "at", "by", "from",
+    "as", "into", "through", "during", "before", "after", "and",
+    "but", "or", "nor", "not", "no", "so", "if", "than", "that",
+    "this", "these", "those", "it", "its", "they", "them", "their",
+    "we", "our", "you", "your", "he", "she", "his", "her",
+})
+_WORD_RE = re.compile(r"[A-Za-z0-9][\w\-\.]*")
+_PART_RE = re.compile(r"[a-z]+|[0-9]+")
+
+_EMPTY = np.zeros(0, dtype=np.uint32)
+
+
+def content_tokens(text: str) -> List[str]:
+    """Split text into content tokens, handling 28VDC -> [28, vdc]."""
+    tokens = []
+    for raw in _WORD_RE.findall((text or "").lower()):
+        # Split on digit-letter boundaries (e.g. 28vdc -> 28, vdc)
+        for part in _PART_RE.findall(raw):
+            if len(part) >= 2 and part not in STOPWORDS:
+                tokens.append(part)
+    return tokens
+
+
+def _hash_tokens(tokens: Iterable[str]) -> np.ndarray:
+    return np.fromiter(
+        (zlib.crc32(tok.encode("utf-8")) for tok in tokens), dtype=np.uint32,
+    )
+
+
+def token_ids(text: str) -> np.ndarray:
+    """Sorted, de-duplicated uint32 IDs of the content tokens in `text`."""
+    return np.unique(_hash_tokens(content_tokens(text)))
+
+
+def pack_token_ids(ids: np.ndarray) -> bytes:
+    """Little-endian uint32 bytes for storage in SQLite."""
+    return np.asarray(ids, dtype="<u4").tobytes()
+
+
+def unpack_token_ids(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """Inverse of pack_token_ids(); None for a missing (pre-index) value."""
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32, copy=False)
+
+
+def _count_present(claim: np.ndarray, ids: np.ndarray) -> int:
+    """How many entries of `claim` occur in the sorted array `ids`."""
+    if ids.size == 0:
+        return 0
+    pos = np.searchsorted(ids, claim)
+    pos[pos == ids.size] = 0
+    return int(np.count_nonzero(ids[pos] == claim))
+
+
+class SourceTokenIndex:
+    """Token IDs of the retrieved chunks, ready for claim scoring."""
+
+    def __init__(self, per_source: Sequence[np.ndarray]) -> None:
+        self.per_source = [np.asarray(ids, dtype=np.uint32) for ids in per_source]
+        if self.per_source:
+            self.union = np.unique(np.concatenate(self.per_source))
+        else:
+            self.union = _EMPTY
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "SourceTokenIndex":
+        return cls([token_ids(text) for text in texts])
+
+    def score_claim(self, text: str) -> dict:
+        """
+        Overlap of one claim with the sources.
+
+        Returns tokens / hits (counted with repeats, like the original
+        per-token scan), overlap = hits / tokens, and source_index: the
+        chunk covering the most claim tokens (-1 when none do).
+        """
+        claim = _hash_tokens(content_tokens(text))
+        if claim.size == 0:
+            return {"tokens": 0, "hits": 0, "overlap": 0.0, "source_index": -1, "source_hits": 0}
+        hits = _count_present(claim, self.union)
+        best_index, best_hits = -1, 0
+        if hits:
+            for i, ids in enumerate(self.per_source):
+                n = _count_present(claim, ids)
+                if n > best_hits:
+                    best_index, best_hits = i, n
+        return {
+            "tokens": int(claim.size),
+            "hits": hits,
+            "overlap": hits / claim.size,
+            "source_index": best_index,
+            "source_hits": best_hits,
+        }
@@ -0,0 +1,527 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Remembers what the source folder looked like so freshness checks only re-read folders that changed.
+# What to read first: Start at SourceTreeSummary.refresh(), then count_newer_than().
+# Inputs: The source folder, indexer file filters, and optional change notices from a folder watcher.
+# Outputs: File totals, newest file, "files newer than the last index" counts, and per-folder digests.
+# Safety notes: Reads folder listings and file metadata only; never opens document contents.
+# ============================
+# ============================================================================
+# HybridRAG -- Source Tree Summary (src/core/source_tree_summary.py)
+# ============================================================================
+# WHAT: A persistent per-directory summary of the source tree:
+#         own files  -- count, sorted mtimes, newest file, digest of
+#                       (name, size, mtime) for indexable files
+#         rollups    -- subtree file count, subtree newest file, and a
+#                       Merkle-style subtree digest (own digest + child
+#                       names and digests)
+# WHY:  Content freshness used os.walk + os.stat on every file on every
+#       check.  On a network share that takes minutes per Admin refresh.
+# HOW:  refresh() re-lists only directories that are new, whose own mtime
+#       moved (a file was added, removed or renamed in them), that were
+#       marked changed by a watcher, or that were scanned so recently that
+#       a same-tick change could hide behind an unchanged mtime ("racy"
+#       directories, as git does for its index).  Unchanged directories
+#       cost one stat and keep their stored rollups; with a watcher that
+#       reports every change (events_complete) even that stat pass is
+#       skipped.  In-place edits do not touch the parent directory mtime,
+#       so a full re-list runs every full_scan_interval_s.
+#       count_newer_than() skips any subtree whose newest mtime is older
+#       than the cutoff, so the answer costs what changed since the index,
+#       not the corpus size.
+# USAGE:
+#   summary = get_source_tree_summary(folder, [".pdf"], ["archive"], store)
+#   summary.refresh()
+#   summary.count_newer_than(last_index_ts)
+#   summary.mark_changed(path)     # from a filesystem watcher
+# ============================================================================
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directories modified this close to their last scan are re-listed next
+# time; FAT and some SMB servers only keep 2-second mtimes.
+RACY_WINDOW_NS = 2_000_000_000
+FULL_SCAN_INTERVAL_S = 24 * 3600.0
+
+_SCHEMA_VERSION = 1
+
+
+@dataclass
+class DirSummary:
+    """Stored state for one directory (paths are relative to the root)."""
+
+    dir_mtime_ns: int = 0
+    scanned_at_ns: int = 0
+    subdirs: tuple[str, ...] = ()
+    file_count: int = 0
+    mtimes: list[int] = field(default_factory=list)
+    newest_ns: int = 0
+    newest_name: str = ""
+    own_digest: str = ""
+    tree_files: int = 0
+    tree_newest_ns: int = 0
+    tree_newest_path: str = ""
+    tree_digest: str = ""
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def _row(rel_dir: str, d: DirSummary) -> tuple:
+    return (
+        rel_dir, d.dir_mtime_ns, d.scanned_at_ns, json.dumps(list(d.subdirs)),
+        d.file_count, json.dumps(d.mtimes), d.newest_ns, d.newest_name,
+        d.own_digest, d.tree_files, d.tree_newest_ns, d.tree_newest_path,
+        d.tree_digest,
+    )
+
+
+def _parent(rel_dir: str) -> Optional[str]:
+    if not rel_dir:
+        return None
+    return rel_dir.rsplit("/", 1)[0] if "/" in rel_dir else ""
+
+
+class SourceTreeSummary:
+    """Incrementally maintained summary of one source folder."""
+
+    def __init__(
+        self,
+        source_folder: str,
+        *,
+        supported_extensions: Optional[Iterable[str]] = None,
+        excluded_dirs: Optional[Iterable[str]] = None,
+        store_path: str = "",
+        full_scan_interval_s: float = FULL_SCAN_INTERVAL_S,
+    ) -> None:
+        self.root = str(source_folder or "")
+        self.supported = (
+            {str(ext).lower() for ext in supported_extensions}
+            if supported_extensions else None
+        )
+        self.excluded = {str(name).lower() for name in (excluded_dirs or ())}
+        self.store_path = str(store_path or "")
+        self.full_scan_interval_s = float(full_scan_interval_s)
+        self.events_complete = False
+        self.last_full_scan_at = 0.0
+        self.last_refresh = {"dirs_checked": 0, "dirs_rescanned": 0, "full": False}
+        self._dirs: dict[str, DirSummary] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    # -- Signature / persistence ------------------------------------------
+
+    @property
+    def signature(self) -> str:
+        return json.dumps(
+            [
+                _SCHEMA_VERSION,
+                os.path.normcase(os.path.abspath(self.root)) if self.root else "",
+                sorted(self.supported) if self.supported is not None else None,
+                sorted(self.excluded),
+            ]
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.store_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.store_path, timeout=10)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS source_tree_meta ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS source_tree_dirs (
+                rel_dir          TEXT PRIMARY KEY,
+                dir_mtime_ns     INTEGER NOT NULL,
+                scanned_at_ns    INTEGER NOT NULL,
+                subdirs          TEXT NOT NULL,
+                file_count       INTEGER NOT NULL,
+                mtimes           TEXT NOT NULL,
+                newest_ns        INTEGER NOT NULL,
+                newest_name      TEXT NOT NULL,
+                own_digest       TEXT NOT NULL,
+                tree_files       INTEGER NOT NULL,
+                tree_newest_ns   INTEGER NOT NULL,
+                tree_newest_path TEXT NOT NULL,
+                tree_digest      TEXT NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.store_path:
+            return
+        try:
+            conn = self._connect()
+        except sqlite3.Error as exc:
+            logger.warning("Source tree summary store unavailable: %s", exc)
+            self.store_path = ""
+            return
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM source_tree_meta").fetchall())
+            if meta.get("signature") != self.signature:
+                return
+            self.last_full_scan_at = float(meta.get("last_full_scan_at") or 0.0)
+            for row in conn.execute("SELECT * FROM source_tree_dirs"):
+                self._dirs[row[0]] = DirSummary(
+                    dir_mtime_ns=row[1],
+                    scanned_at_ns=row[2],
+                    subdirs=tuple(json.loads(row[3])),
+                    file_count=row[4],
+                    mtimes=json.loads(row[5]),
+                    newest_ns=row[6],
+                    newest_name=row[7],
+                    own_digest=row[8],
+                    tree_files=row[9],
+                    tree_newest_ns=row[10],
+                    tree_newest_path=row[11],
+                    tree_digest=row[12],
+                )
+        finally:
+            conn.close()
+
+    def _save(self, changed: set[str], removed: set[str], full: bool) -> None:
+        if not self.store_path or not (changed or removed or full):
+            return
+        try:
+            conn = self._connect()
+        except sqlite3.Error as exc:
+            logger.warning("Source tree summary not saved: %s", exc)
+            return
+        try:
+            with conn:
+                meta = dict(conn.execute("SELECT key, value FROM source_tree_meta").fetchall())
+                if meta.get("signature") != self.signature:
+                    conn.execute("DELETE FROM source_tree_dirs")
+                    changed = set(self._dirs)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO source_tree_meta (key, value) VALUES (?, ?)",
+                    [
+                        ("signature", self.signature),
+                        ("last_full_scan_at", str(self.last_full_scan_at)),
+                    ],
+                )
+                conn.executemany(
+                    "DELETE FROM source_tree_dirs WHERE rel_dir = ?",
+                    [(rel,) for rel in removed],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO source_tree_dirs VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [_row(rel, self._dirs[rel]) for rel in changed if rel in self._dirs],
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Source tree summary not saved: %s", exc)
+        finally:
+            conn.close()
+
+    # -- Change notices ---------------------------------------------------
+
+    def mark_changed(self, path: str) -> None:
+        """
+        Note a created, modified, moved or deleted path (watcher callback).
+
+        The containing directory is re-listed on the next refresh(); a
+        directory path is re-listed itself.
+        """
+        try:
+            rel = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        except ValueError:  # different drive on Windows
+            return
+        rel = rel.replace(os.sep, "/")
+        if rel == ".":
+            rel = ""
+        elif rel == ".." or rel.startswith("../"):
+            return
+        with self._lock:
+            if rel in self._dirs:
+                # A known directory: re-list it and its parent (it may be gone).
+                self._dirty.add(rel)
+            parent = _parent(rel)
+            # New folders are discovered by re-listing the nearest known one.
+            while parent and parent not in self._dirs:
+                parent = _parent(parent)
+            if parent is not None:
+                self._dirty.add(parent)
+
+    # -- Refresh ----------------------------------------------------------
+
+    def refresh(self, *, full: Optional[bool] = None) -> dict:
+        """
+        Bring the summary up to date; returns refresh counters.
+
+        full=None runs a full re-list only when full_scan_interval_s has
+        passed; otherwise directories are re-listed only when changed.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            now = time.time()
+            if full is None:
+                full = (
+                    self.full_scan_interval_s > 0
+                    and now - self.last_full_scan_at >= self.full_scan_interval_s
+                )
+            dirty, self._dirty = self._dirty, set()
+            stats = {"dirs_checked": 0, "dirs_rescanned": 0, "full": bool(full)}
+            if not (self.root and os.path.isdir(self.root)):
+                removed = set(self._dirs)
+                self._dirs.clear()
+                self._save(set(), removed, False)
+                self.last_refresh = stats
+                return stats
+
+            changed: set[str] = set()
+            before = set(self._dirs)
+            if self.events_complete and not full and "" in self._dirs:
+                self._refresh_dirty(dirty, changed, stats)
+            else:
+                self._visit("", full, dirty, changed, stats)
+            removed = before - set(self._dirs)
+            if full:
+                self.last_full_scan_at = now
+            self._save(changed, removed, full)
+            self.last_refresh = stats
+            return stats
+
+    def _visit(self, rel: str, full: bool, dirty: set[str], changed: set[str], stats: dict) -> bool:
+        """Check one directory and its subtree; True if its rollup changed."""
+        stats["dirs_checked"] += 1
+        record = self._dirs.get(rel)
+        try:
+            mtime_ns = os.stat(self._abs(rel)).st_mtime_ns
+        except OSError:
+            self._drop(rel)
+            return True
+        if (
+            full
+            or record is None
+            or rel in dirty
+            or mtime_ns != record.dir_mtime_ns
+            or mtime_ns >= record.scanned_at_ns - RACY_WINDOW_NS
+        ):
+            own_changed = self._rescan(rel, mtime_ns, stats)
+            record = self._dirs.get(rel)
+            if record is None:
+                return True
+        else:
+            own_changed = False
+        child_changed = False
+        for name in record.subdirs:
+            if self._visit(_join(rel, name), full, dirty, changed, stats):
+                child_changed = True
+        if own_changed or child_changed or not record.tree_digest:
+            self._roll_up(rel)
+            changed.add(rel)
+            return True
+        return False
+
+    def _refresh_dirty(self, dirty: set[str], changed: set[str], stats: dict) -> None:
+        """Watcher-fed path: re-list only reported directories, then roll up ancestors."""
+        for rel in sorted(dirty, key=lambda item: item.count("/")):
+            if rel in self._dirs:
+                self._visit_new_or_dirty(rel, dirty, changed, stats)
+        ancestors: set[str] = set()
+        for rel in changed:
+            parent = _parent(rel)
+            while parent is not None:
+                ancestors.add(parent)
+                parent = _parent(parent)
+        for rel in sorted(ancestors, key=lambda item: -item.count("/")):
+            if rel in self._dirs:
+                self._roll_up(rel)
+                changed.add(rel)
+
+    def _visit_new_or_dirty(self, rel: str, dirty: set[str], changed: set[str], stats: dict) -> None:
+        stats["dirs_checked"] += 1
+        try:
+            mtime_ns = os.stat(self._abs(rel)).st_mtime_ns
+        except OSError:
+            self._drop(rel)
+            changed.add(_parent(rel) or "")
+            return
+        known = set(self._dirs.get(rel, DirSummary()).subdirs)
+        self._rescan(rel, mtime_ns, stats)
+        record = self._dirs[rel]
+        for name in record.subdirs:
+            child = _join(rel, name)
+            if name not in known or child not in self._dirs:
+                self._visit(child, False, dirty, changed, stats)
+        self._roll_up(rel)
+        changed.add(rel)
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def _drop(self, rel: str) -> None:
+        prefix = rel + "/"
+        for key in [key for key in self._dirs if key == rel or key.startswith(prefix)]:
+            del self._dirs[key]
+
+    def _rescan(self, rel: str, mtime_ns: int, stats: dict) -> bool:
+        """List one directory; True if its own files or subdirectories changed."""
+        stats["dirs_rescanned"] += 1
+        scanned_at_ns = time.time_ns()
+        subdirs: list[str] = []
+        entries: list[tuple[str, int, int]] = []
+        try:
+            with os.scandir(self._abs(rel)) as listing:
+                for entry in listing:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in self.excluded:
+                                subdirs.append(entry.name)
+                            continue
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        if self.supported is not None and ext not in self.supported:
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, int(st.st_size), int(st.st_mtime_ns)))
+        except OSError:
+            self._drop(rel)
+            return True
+        entries.sort()
+        subdirs.sort()
+        digest = hashlib.sha1(json.dumps(entries).encode("utf-8")).hexdigest()
+        newest = max(entries, key=lambda item: item[2], default=("", 0, 0))
+        old = self._dirs.get(rel)
+        for gone in set(old.subdirs if old else ()) - set(subdirs):
+            self._drop(_join(rel, gone))
+        record = DirSummary(
+            dir_mtime_ns=mtime_ns,
+            scanned_at_ns=scanned_at_ns,
+            subdirs=tuple(subdirs),
+            file_count=len(entries),
+            mtimes=sorted(item[2] for item in entries),
+            newest_ns=newest[2],
+            newest_name=newest[0],
+            own_digest=digest,
+        )
+        if old is not None:
+            record.tree_files = old.tree_files
+            record.tree_newest_ns = old.tree_newest_ns
+            record.tree_newest_path = old.tree_newest_path
+            record.tree_digest = old.tree_digest
+        self._dirs[rel] = record
+        return old is None or old.own_digest != digest or old.subdirs != record.subdirs
+
+    def _roll_up(self, rel: str) -> None:
+        record = self._dirs[rel]
+        files = record.file_count
+        newest_ns = record.newest_ns
+        newest_path = _join(rel, record.newest_name) if record.newest_name else ""
+        parts = [record.own_digest]
+        for name in record.subdirs:
+            child = self._dirs.get(_join(rel, name))
+            if child is None:
+                continue
+            files += child.tree_files
+            if child.tree_newest_ns > newest_ns:
+                newest_ns = child.tree_newest_ns
+                newest_path = child.tree_newest_path
+            parts.append(f"{name}:{child.tree_digest}")
+        record.tree_files = files
+        record.tree_newest_ns = newest_ns
+        record.tree_newest_path = newest_path
+        record.tree_digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    # -- Queries ----------------------------------------------------------
+
+    @property
+    def total_files(self) -> int:
+        with self._lock:
+            root = self._dirs.get("")
+            return root.tree_files if root else 0
+
+    def newest(self) -> tuple[int, str]:
+        """(mtime_ns, absolute path) of the newest indexable file, or (0, "")."""
+        with self._lock:
+            root = self._dirs.get("")
+            if root is None or not root.tree_newest_path:
+                return 0, ""
+            return root.tree_newest_ns, self._abs(root.tree_newest_path)
+
+    def digest(self, rel_dir: str = "") -> str:
+        """Merkle digest of a subtree ("" for the whole source folder)."""
+        with self._lock:
+            record = self._dirs.get(rel_dir)
+            return record.tree_digest if record else ""
+
+    def count_newer_than(self, cutoff_ns: Optional[int]) -> int:
+        """Files modified after cutoff_ns; subtrees older than it are skipped."""
+        with self._lock:
+            if cutoff_ns is None:
+                return self.total_files
+            count = 0
+            stack = [""] if "" in self._dirs else []
+            while stack:
+                rel = stack.pop()
+                record = self._dirs.get(rel)
+                if record is None or record.tree_newest_ns <= cutoff_ns:
+                    continue
+                count += len(record.mtimes) - bisect.bisect_right(record.mtimes, cutoff_ns)
+                stack.extend(_join(rel, name) for name in record.subdirs)
+            return count
+
+
+_REGISTRY: dict[tuple, SourceTreeSummary] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_source_tree_summary(
+    source_folder: str,
+    supported_extensions: Optional[Iterable[str]] = None,
+    excluded_dirs: Optional[Iterable[str]] = None,
+    store_path: str = "",
+) -> SourceTreeSummary:
+    """Shared summary per (folder, filters, store) for this process."""
+    key = (
+        str(source_folder or ""),
+        tuple(sorted({str(ext).lower() for ext in supported_extensions}))
+        if supported_extensions else None,
+        tuple(sorted({str(name).lower() for name in (excluded_dirs or ())})),
+        str(store_path or ""),
+    )
+    with _REGISTRY_LOCK:
+        summary = _REGISTRY.get(key)
+        if summary is None:
+            interval_s = FULL_SCAN_INTERVAL_S
+            raw_hours = str(os.environ.get("HYBRIDRAG_FRESHNESS_FULL_SCAN_HOURS", "") or "").strip()
+            if raw_hours.isdigit():
+                interval_s = int(raw_hours) * 3600.0
+            summary = SourceTreeSummary(
+                source_folder,
+                supported_extensions=supported_extensions,
+                excluded_dirs=excluded_dirs,
+                store_path=store_path,
+                full_scan_interval_s=interval_s,
+            )
+            _REGISTRY[key] = summary
+        return summary
+
+
+def source_tree_summary_path(database_path: str) -> str:
+    """Place the summary store beside the main configured data DB."""
+    db_path = Path(str(database_path or "")).expanduser()
+    parent = db_path.parent if str(db_path) else Path.cwd() / "data"
+    return str(parent / "hybridrag_source_tree.sqlite3")
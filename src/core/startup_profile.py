@@ -0,0 +1,412 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Records where startup time goes (boot steps and heavy imports).
+# What to read first: Start at StartupProfiler.phase() and StartupPhase.step().
+# Inputs: Calls from boot_hybridrag(), the API lifespan and the GUI launcher.
+# Outputs: A JSON-friendly snapshot shown in /status and rag-diag.
+# Safety notes: Update small sections at a time and run relevant tests after edits.
+# ============================
+# ============================================================================
+# HybridRAG -- Startup Profiler (src/core/startup_profile.py)
+# ============================================================================
+# WHAT: A process-wide recorder of wall time per startup step and per
+#       top-level import, grouped into phases ("boot", "api", "gui").
+# WHY:  Boot, the API lifespan and the GUI launcher each load config,
+#       resolve credentials, probe Ollama and pull in heavy modules.  The
+#       "[BOOT hh:mm:ss]" console lines show WHERE a hang is, but not how
+#       long each part took or which import was slow.  This gives the same
+#       answer as "python -X importtime", but structured and always on.
+# HOW:  A phase is a sequence of steps; starting a new step closes the
+#       previous one (like lap times on a stopwatch).  While any phase is
+#       open, builtins.__import__ is wrapped so every import statement that
+#       loads NEW modules is timed and attributed to the running step.
+#       Only imports made directly by the running step are recorded; the
+#       modules they pull in are counted inside them (cumulative time, like
+#       the right-hand column of -X importtime).  A step opened while a
+#       module is being imported (e.g. at server.py module level) gets its
+#       own top-level imports.
+# USAGE:
+#   from src.core.startup_profile import get_startup_profile
+#
+#   with get_startup_profile().phase("boot") as phase:
+#       phase.step("config")
+#       ...
+#       phase.step("credentials")
+#       ...
+#
+#   python -m src.core.startup_profile --target boot   # cold-start JSON
+#
+# ENV:
+#   HYBRIDRAG_STARTUP_IMPORTS=0  turns off import timing (steps still recorded)
+#
+# INTERNET ACCESS: NONE
+# ============================================================================
+
+from __future__ import annotations
+
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only the slowest imports are kept in snapshots; the long tail of
+# sub-millisecond stdlib imports is noise for startup tuning.
+MAX_IMPORTS_REPORTED = 25
+_MIN_IMPORT_MS = 1.0
+
+
+def _now_iso() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+class StartupPhase:
+    """One named startup sequence whose steps are timed back to back."""
+
+    def __init__(self, profiler: "StartupProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.steps: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    @property
+    def current_step(self) -> str:
+        return self._current["name"] if self._current else ""
+
+    def step(self, name: str) -> None:
+        """Close the running step (if any) and start timing a new one."""
+        self._close_step("ok")
+        self._current = {
+            "phase": self.name,
+            "name": name,
+            "start_ms": self.profiler.offset_ms(),
+            "duration_ms": 0.0,
+            "status": "running",
+            "_t0": time.perf_counter(),
+            "_depth": self.profiler.import_depth(),
+        }
+        self.steps.append(self._current)
+
+    def _close_step(self, status: str) -> None:
+        current, self._current = self._current, None
+        if current is not None:
+            current["duration_ms"] = round((time.perf_counter() - current.pop("_t0")) * 1000, 1)
+            current["status"] = status
+
+    def finish(self, status: str = "ok") -> None:
+        if self.finished is not None:
+            return
+        self._close_step(status)
+        self.finished = time.perf_counter()
+        self.profiler._phase_finished(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return round((end - self.started) * 1000, 1)
+
+    def __enter__(self) -> "StartupPhase":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.finish("error" if exc_type is not None else "ok")
+
+
+class StartupProfiler:
+    """Thread-safe collector of startup phases, steps and import timings."""
+
+    def __init__(self, capture_imports: bool = True) -> None:
+        self.capture_imports = capture_imports
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._started_at = _now_iso()
+        self._phases: List[StartupPhase] = []
+        self._imports: List[Dict[str, Any]] = []
+        self._open_phases = 0
+        self._original_import = None
+        self._timed_import = None
+
+    @classmethod
+    def from_env(cls) -> "StartupProfiler":
+        raw = (os.environ.get("HYBRIDRAG_STARTUP_IMPORTS") or "1").strip().lower()
+        return cls(capture_imports=raw not in ("0", "false", "no", "off"))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._started_at = _now_iso()
+            self._phases = [p for p in self._phases if p.finished is None]
+            self._imports = []
+
+    def import_depth(self) -> int:
+        """How many import statements the calling thread is nested inside."""
+        return getattr(self._local, "depth", 0)
+
+    def offset_ms(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1000, 1)
+
+    # -- phases ------------------------------------------------------------
+
+    def phase(self, name: str) -> StartupPhase:
+        """Open a phase; use as a context manager or call finish()."""
+        phase = StartupPhase(self, name)
+        with self._lock:
+            self._phases.append(phase)
+            self._open_phases += 1
+            if self._open_phases == 1 and self.capture_imports:
+                self._install_import_hook()
+        return phase
+
+    def _phase_finished(self, phase: StartupPhase) -> None:
+        with self._lock:
+            self._open_phases = max(0, self._open_phases - 1)
+            if self._open_phases == 0:
+                self._remove_import_hook()
+        slowest = max(phase.steps, key=lambda s: s["duration_ms"], default=None)
+        logger.info(
+            "[STARTUP] %s phase took %.0f ms%s",
+            phase.name, phase.duration_ms,
+            " (slowest step: {} {:.0f} ms)".format(slowest["name"], slowest["duration_ms"])
+            if slowest else "",
+        )
+
+    def _running_step(self):
+        """(label, import depth) of the innermost step still running."""
+        for phase in reversed(self._phases):
+            current = phase._current
+            if phase.finished is None and current is not None:
+                return f"{phase.name}.{current['name']}", current["_depth"]
+        return "", 0
+
+    # -- imports -----------------------------------------------------------
+
+    def _install_import_hook(self) -> None:
+        if self._original_import is not None:
+            return
+        original = builtins.__import__
+        self._original_import = original
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            local = self._local
+            depth = getattr(local, "depth", 0)
+            step, step_depth = self._running_step()
+            if depth != step_depth:
+                # Nested inside an import that is already being timed.
+                local.depth = depth + 1
+                try:
+                    return original(name, globals, locals, fromlist, level)
+                finally:
+                    local.depth = depth
+            before = len(sys.modules)
+            local.depth = depth + 1
+            t0 = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                local.depth = depth
+                loaded = len(sys.modules) - before
+                if loaded > 0 and elapsed_ms >= _MIN_IMPORT_MS:
+                    self._record_import(name, globals, level, elapsed_ms, loaded, step)
+
+        builtins.__import__ = _timed_import
+        self._timed_import = _timed_import
+
+    def _remove_import_hook(self) -> None:
+        if self._original_import is None:
+            return
+        # Someone else may have wrapped __import__ on top of ours; leave
+        # their hook in place rather than unwinding it.
+        if builtins.__import__ is self._timed_import:
+            builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _record_import(self, name, globals, level, elapsed_ms, loaded, step) -> None:
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            try:
+                module = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                module = "." * level + name
+        entry = {
+            "module": module,
+            "ms": round(elapsed_ms, 1),
+            "new_modules": loaded,
+            "step": step,
+        }
+        with self._lock:
+            self._imports.append(entry)
+
+    # -- reporting ---------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view of everything recorded so far."""
+        with self._lock:
+            phases = list(self._phases)
+            imports = sorted(self._imports, key=lambda i: i["ms"], reverse=True)
+        steps = [
+            {k: v for k, v in step.items() if not k.startswith("_")}
+            for phase in phases for step in phase.steps
+        ]
+        return {
+            "started_at": self._started_at,
+            "total_ms": max(
+                [round(((p.finished or time.perf_counter()) - self._origin) * 1000, 1)
+                 for p in phases] or [0.0]
+            ),
+            "phases": [
+                {
+                    "name": p.name,
+                    "duration_ms": p.duration_ms,
+                    "complete": p.finished is not None,
+                }
+                for p in phases
+            ],
+            "steps": steps,
+            "imports": imports[:MAX_IMPORTS_REPORTED],
+            "imports_recorded": len(imports),
+            "import_capture": self.capture_imports,
+            "import_hook_active": self._original_import is not None,
+        }
+
+    def format_report(self, limit: int = 10) -> str:
+        """Plain-text breakdown for consoles and rag-diag."""
+        snap = self.snapshot()
+        return format_snapshot(snap, limit=limit)
+
+
+def format_snapshot(snap: Dict[str, Any], limit: int = 10) -> str:
+    """Render a snapshot() dict as an aligned text table."""
+    lines = ["Startup total: {:.0f} ms".format(snap.get("total_ms", 0.0))]
+    for step in snap.get("steps", []):
+        label = "{}.{}".format(step["phase"], step["name"])
+        lines.append("  {:<36} {:>8.1f} ms  {}".format(
+            label, step["duration_ms"], step["status"],
+        ))
+    imports = snap.get("imports", [])[:limit]
+    if imports:
+        lines.append("Slowest imports:")
+        for entry in imports:
+            lines.append("  {:<36} {:>8.1f} ms  (+{} modules, {})".format(
+                entry["module"], entry["ms"], entry["new_modules"], entry["step"] or "-",
+            ))
+    return "\n".join(lines)
+
+
+_PROFILE: Optional[StartupProfiler] = None
+_PROFILE_LOCK = threading.Lock()
+
+
+def get_startup_profile() -> StartupProfiler:
+    """Return the process-wide profiler, creating it on first use."""
+    global _PROFILE
+    if _PROFILE is None:
+        with _PROFILE_LOCK:
+            if _PROFILE is None:
+                _PROFILE = StartupProfiler.from_env()
+    return _PROFILE
+
+
+# ============================================================================
+# Cold-start measurement (fresh interpreter)
+# ============================================================================
+
+# Wall-clock budget for a fresh interpreter to import and run a target.
+# Boot includes the Ollama probe's 2s join window when Ollama is slow to
+# answer, so the default leaves room for that.  Override per machine with
+# HYBRIDRAG_COLD_START_BUDGET_MS.
+DEFAULT_COLD_START_BUDGET_MS = {"boot": 4000.0, "api": 6000.0}
+
+
+def cold_start_budget_ms(target: str = "boot") -> float:
+    raw = (os.environ.get("HYBRIDRAG_COLD_START_BUDGET_MS") or "").strip()
+    try:
+        return float(raw) if raw else DEFAULT_COLD_START_BUDGET_MS[target]
+    except ValueError:
+        return DEFAULT_COLD_START_BUDGET_MS[target]
+
+
+def measure_cold_start(target: str = "boot", timeout_s: float = 120.0) -> Dict[str, Any]:
+    """
+    Start a fresh interpreter, run `target` once, and return its profile.
+
+    The snapshot gains "process_ms" (wall time of the whole child process,
+    interpreter start-up included), "budget_ms" and "over_budget".
+    """
+    import json
+    import subprocess
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.core.startup_profile", "--target", target],
+        cwd=project_root, capture_output=True, text=True, timeout=timeout_s,
+    )
+    process_ms = round((time.perf_counter() - t0) * 1000, 1)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"cold-start probe failed (exit {proc.returncode}): {proc.stderr.strip()[-300:]}"
+        )
+    snap = json.loads(proc.stdout.strip().splitlines()[-1])
+    budget = cold_start_budget_ms(target)
+    snap["process_ms"] = process_ms
+    snap["budget_ms"] = budget
+    snap["over_budget"] = process_ms > budget
+    return snap
+
+
+def _run_target(target: str) -> None:
+    # Under "python -m" this file runs as __main__; go through the real
+    # module so boot.py and this function share one profiler.
+    from src.core.startup_profile import get_startup_profile as shared_profile
+
+    profile = shared_profile()
+    if target == "boot":
+        with profile.phase("cold_start") as phase:
+            phase.step("import_boot")
+            from src.core.boot import boot_hybridrag
+            phase.step("boot_hybridrag")
+            boot_hybridrag()
+    elif target == "api":
+        with profile.phase("cold_start") as phase:
+            phase.step("import_api_server")
+            import src.api.server  # noqa: F401
+    else:
+        raise ValueError(f"unknown cold-start target: {target}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one startup target in this (fresh) process and print JSON."""
+    import argparse
+    import json
+
+    ap = argparse.ArgumentParser(description="Measure HybridRAG cold start")
+    ap.add_argument("--target", choices=("boot", "api"), default="boot")
+    args = ap.parse_args(argv)
+
+    # boot_hybridrag() prints progress lines; keep stdout for the JSON.
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        _run_target(args.target)
+    finally:
+        sys.stdout = real_stdout
+    from src.core.startup_profile import get_startup_profile as shared_profile
+
+    snap = shared_profile().snapshot()
+    snap["target"] = args.target
+    print(json.dumps(snap))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
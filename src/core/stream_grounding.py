@@ -0,0 +1,148 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Checks a streamed answer sentence by sentence so verified text can be shown right away.
+# What to read first: Start at StreamingGroundingGate.feed() and finish().
+# Inputs: LLM tokens as they arrive, a per-sentence "is this supported?" check, the guard action.
+# Outputs: Text that is safe to show now; counts of released / held / redacted sentences.
+# Safety notes: Unsupported sentences are never released early under block or strip.
+# ============================
+# ============================================================================
+# HybridRAG -- Streaming Grounding Gate (src/core/stream_grounding.py)
+# ============================================================================
+# WHAT: Sentence-level hallucination gating for GroundedQueryEngine's
+#       streaming path.
+# WHY:  The guarded stream used to buffer the whole LLM answer, verify it,
+#       and only then replay it word by word, so /query/stream showed
+#       nothing until generation had finished.
+# HOW:  Tokens are appended to a buffer.  Whenever a sentence boundary is
+#       seen (end punctuation followed by the start of the next sentence,
+#       or a line break) the finished sentence is checked with the cheap
+#       token-overlap scorer and then, depending on guard_action:
+#         block -- supported sentences are released; the first unsupported
+#                  one is held, and so is everything after it (to keep the
+#                  answer in order) until the full-answer verdict is known
+#         strip -- supported sentences are released; unsupported ones are
+#                  redacted
+#         flag  -- everything is released; unsupported sentences get an
+#                  "[UNVERIFIED] " prefix
+#         warn  -- everything is released unchecked
+#       The full-answer verification after the stream still decides the
+#       final result; this gate only decides what may be shown early.
+# USAGE:
+#   gate = StreamingGroundingGate(is_supported, action="block")
+#   for token in stream:
+#       text = gate.feed(token)
+#       if text:
+#           yield {"token": text}
+#   tail = gate.finish()
+# ============================================================================
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+# Same boundary rule as ClaimExtractor.split_into_sentences(): end
+# punctuation, whitespace, then something that can start a sentence.
+# Line breaks always end a segment (bullet lists rarely end in a period).
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])|\n\s*")
+
+# Abbreviations that end in a period but, before a digit, are mid-sentence
+# ("See Fig. 3", "No. 4 bolt").
+_ABBREV_TAIL_RE = re.compile(
+    r"(?:\b(?:Fig|fig|No|no|Vol|vol|Rev|approx|vs|etc|e\.g|i\.e))\.\s+$"
+)
+
+GATED_ACTIONS = ("block", "strip", "flag")
+
+
+def split_complete_segments(buffer: str) -> Tuple[List[str], str]:
+    """
+    Split `buffer` into finished segments and the unfinished remainder.
+
+    Each segment keeps its trailing whitespace so the released text
+    concatenates back to exactly what the model produced.
+    """
+    segments: List[str] = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(buffer):
+        if match.group(0)[0] != "\n":
+            nxt = buffer[match.end():match.end() + 1]
+            if nxt.isdigit() and _ABBREV_TAIL_RE.search(buffer[start:match.end()]):
+                continue
+        segments.append(buffer[start:match.end()])
+        start = match.end()
+    return segments, buffer[start:]
+
+
+class StreamingGroundingGate:
+    """Release streamed answer text one verified sentence at a time."""
+
+    def __init__(self, is_supported: Callable[[str], bool], action: str = "block") -> None:
+        self.is_supported = is_supported
+        self.action = str(action or "").strip().lower()
+        self.released_parts: List[str] = []
+        self.held_parts: List[str] = []
+        self._buffer = ""
+        self.segments = 0
+        self.released = 0
+        self.held = 0
+        self.redacted = 0
+        self.flagged = 0
+
+    @property
+    def released_text(self) -> str:
+        return "".join(self.released_parts)
+
+    def feed(self, token: str) -> str:
+        """Add streamed text; return whatever may be shown now ('' if nothing)."""
+        if not token:
+            return ""
+        self._buffer += token
+        segments, self._buffer = split_complete_segments(self._buffer)
+        return "".join(self._gate(segment) for segment in segments)
+
+    def finish(self) -> str:
+        """End of stream: gate the trailing partial sentence."""
+        tail, self._buffer = self._buffer, ""
+        return self._gate(tail) if tail else ""
+
+    def _gate(self, segment: str) -> str:
+        if not segment.strip():
+            # Whitespace between sentences follows whatever came before it.
+            (self.held_parts if self.held_parts else self.released_parts).append(segment)
+            return "" if self.held_parts else segment
+        self.segments += 1
+        if self.action not in GATED_ACTIONS:
+            return self._release(segment)
+        if self.held_parts:
+            return self._hold(segment)
+        if self.is_supported(segment):
+            return self._release(segment)
+        if self.action == "flag":
+            self.flagged += 1
+            return self._release("[UNVERIFIED] " + segment)
+        if self.action == "strip":
+            self.redacted += 1
+            return ""
+        return self._hold(segment)
+
+    def _release(self, text: str) -> str:
+        self.released += 1
+        self.released_parts.append(text)
+        return text
+
+    def _hold(self, text: str) -> str:
+        self.held += 1
+        self.held_parts.append(text)
+        return ""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "action": self.action,
+            "segments": self.segments,
+            "released": self.released,
+            "held": self.held,
+            "redacted": self.redacted,
+            "flagged": self.flagged,
+            "released_chars": len(self.released_text),
+        }
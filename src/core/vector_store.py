@@ -69,7 +69,14 @@ from typing import Optional, List, Dict, Any, Tuple
 import numpy as np
 
 from .access_tags import normalize_access_tags, serialize_access_tags
+from .corpus_stats import (
+    compare_corpus_stats,
+    ensure_corpus_stats_schema,
+    read_corpus_stats,
+    rebuild_corpus_stats,
+)
 from .source_quality import ensure_source_quality_schema
+from .source_tokens import pack_token_ids, token_ids, unpack_token_ids
 
 
 logger = logging.getLogger(__name__)
@@ -268,6 +275,7 @@ class VectorStore:
         self.embedding_model = embedding_model
         self.conn: Optional[sqlite3.Connection] = None
         self._db_lock = threading.RLock()
+        self.last_stats_reconcile: Optional[Dict[str, Any]] = None
         data_dir = os.path.dirname(db_path) or "."
         self.mem_store = EmbeddingMemmapStore(
             data_dir=data_dir, dim=embedding_dim,
@@ -351,7 +359,8 @@ class VectorStore:
                     embedding_row INTEGER,
                     file_hash     TEXT DEFAULT '',
                     access_tags   TEXT DEFAULT 'shared',
-                    access_tag_source TEXT DEFAULT 'default_document_tags'
+                    access_tag_source TEXT DEFAULT 'default_document_tags',
+                    token_ids     BLOB
                 );
             """)
 
@@ -372,6 +381,11 @@ class VectorStore:
                 self.conn.execute(
                     "ALTER TABLE chunks ADD COLUMN access_tag_source TEXT DEFAULT 'default_document_tags';"
                 )
+            # Sorted uint32 content-token IDs (source_tokens.py) for the
+            # hallucination guard.  NULL on rows indexed before this column
+            # existed; callers tokenize the text instead.
+            if "token_ids" not in cols:
+                self.conn.execute("ALTER TABLE chunks ADD COLUMN token_ids BLOB;")
             self.conn.commit()
 
             self.conn.execute(
@@ -386,6 +400,7 @@ class VectorStore:
                            tokenize='porter unicode61');
             """)
             ensure_source_quality_schema(self.conn)
+            ensure_corpus_stats_schema(self.conn)
             self.conn.commit()
 
     # ------------------------------------------------------------------
@@ -450,14 +465,16 @@ class VectorStore:
                     str(file_hash),       # NEW: file fingerprint
                     serialize_access_tags(getattr(md, "access_tags", ()) or ()),
                     str(getattr(md, "access_tag_source", "") or "default_document_tags"),
+                    pack_token_ids(token_ids(str(texts[i]))),
                 ))
 
             # Step 3: INSERT OR IGNORE (idempotent for crash restarts)
             self.conn.executemany("""
                 INSERT OR IGNORE INTO chunks
                     (chunk_id, source_path, chunk_index, text, text_length,
-                     created_at, embedding_row, file_hash, access_tags, access_tag_source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                     created_at, embedding_row, file_hash, access_tags, access_tag_source,
+                     token_ids)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             """, rows)
 
             # Step 4: Populate FTS5 keyword search index in one set-based
@@ -497,6 +514,27 @@ class VectorStore:
             except Exception:
                 return ""
 
+    def get_source_hashes(self, prefix: str) -> Dict[str, str]:
+        """
+        Map source_path -> file_hash for every source starting with prefix.
+
+        Used for archives, whose members are stored as separate sources
+        ("archive.zip!/member.pdf"). A range scan on the source_path index
+        avoids LIKE wildcard escaping.
+        """
+        if self.conn is None or not prefix:
+            return {}
+        with self._db_lock:
+            try:
+                rows = self.conn.execute(
+                    "SELECT source_path, MAX(file_hash) FROM chunks "
+                    "WHERE source_path >= ? AND source_path < ? GROUP BY source_path",
+                    (str(prefix), str(prefix) + "\U0010ffff"),
+                ).fetchall()
+            except Exception:
+                return {}
+        return {str(path): str(file_hash or "") for path, file_hash in rows}
+
     def update_file_hash(self, source_path: str, file_hash: str) -> None:
         """Update the file_hash for all chunks from a specific source file."""
         if self.conn is None:
@@ -508,6 +546,35 @@ class VectorStore:
             )
             self.conn.commit()
 
+    def get_chunk_token_ids(
+        self, keys: List[Tuple[str, int]],
+    ) -> Dict[Tuple[str, int], np.ndarray]:
+        """
+        Stored content-token IDs for (source_path, chunk_index) pairs.
+
+        Pairs that are unknown, or were indexed before token IDs were
+        stored, are simply missing from the result.
+        """
+        keys = list(dict.fromkeys((str(p), int(i)) for p, i in keys))
+        if self.conn is None or not keys:
+            return {}
+        where = " OR ".join(["(source_path = ? AND chunk_index = ?)"] * len(keys))
+        params: List[Any] = [v for key in keys for v in key]
+        with self._db_lock:
+            try:
+                rows = self.conn.execute(
+                    f"SELECT source_path, chunk_index, token_ids FROM chunks WHERE {where}",
+                    params,
+                ).fetchall()
+            except Exception:
+                return {}
+        found: Dict[Tuple[str, int], np.ndarray] = {}
+        for source_path, chunk_index, blob in rows:
+            ids = unpack_token_ids(blob)
+            if ids is not None:
+                found[(str(source_path), int(chunk_index))] = ids
+        return found
+
     def delete_chunks_by_source(self, source_path: str) -> int:
         """
         Delete all chunks for a given source file.
@@ -808,7 +875,12 @@ class VectorStore:
     # --- Statistics and health checks -----------------------------------------
 
     def get_stats(self) -> Dict[str, Any]:
-        """Return summary statistics about what's stored."""
+        """
+        Return summary statistics about what's stored.
+
+        chunk_count / source_count come from the trigger-maintained
+        corpus_stats table (corpus_stats.py) -- two-row lookup, no scan.
+        """
         stats: Dict[str, Any] = {
             "embedding_count": self.mem_store.count,
             "embedding_dim": self.mem_store.dim,
@@ -817,17 +889,50 @@ class VectorStore:
         with self._db_lock:
             if self.conn:
                 try:
-                    row = self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()
-                    stats["chunk_count"] = row[0] if row else 0
-                    row = self.conn.execute(
-                        "SELECT COUNT(DISTINCT source_path) FROM chunks"
-                    ).fetchone()
-                    stats["source_count"] = row[0] if row else 0
+                    stats.update(read_corpus_stats(self.conn))
                 except Exception:
                     stats["chunk_count"] = "error"
                     stats["source_count"] = "error"
         return stats
 
+    def reconcile_stats(self, repair: bool = True) -> Dict[str, Any]:
+        """
+        Verify the maintained counters against a full count.
+
+        The counting runs on a separate read-only connection (WAL
+        snapshot), so searches and indexing are not blocked while it
+        scans.  On drift, and if repair is set, the counters are rebuilt
+        under the store lock.  Returns the comparison, plus "repaired".
+        """
+        self._ensure_connected()
+        if self.db_path == ":memory:":
+            with self._db_lock:
+                result = compare_corpus_stats(self.conn)
+        else:
+            reader = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True,
+                isolation_level=None, check_same_thread=False,
+            )
+            try:
+                reader.execute("PRAGMA busy_timeout=5000;")
+                result = compare_corpus_stats(reader)
+            finally:
+                reader.close()
+
+        result["repaired"] = False
+        if result["drift"]:
+            logger.warning(
+                "[WARN] Corpus stats drift %s (maintained=%s actual=%s)",
+                result["drift"], result["maintained"], result["actual"],
+            )
+            if repair:
+                with self._db_lock:
+                    result["actual"] = rebuild_corpus_stats(self.conn)
+                    self.conn.commit()
+                result["repaired"] = True
+        self.last_stats_reconcile = result
+        return result
+
     # =================================================================
     # BUG-003 FIX: close() to release resources
     # =================================================================
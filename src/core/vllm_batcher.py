@@ -0,0 +1,226 @@
+# ============================================================================
+# vllm_batcher.py -- Micro-batching window for concurrent vLLM generations
+# ============================================================================
+#
+# WHAT: Collects generation requests that arrive within a short window
+#       (default off; config.vllm.batch_window_ms), groups them by their
+#       stable system-prompt prefix, and dispatches each group so the
+#       vLLM server can batch them and reuse the shared prefix KV cache.
+#
+# WHY:  Without a window, concurrent API users each POST independently.
+#       vLLM's automatic prefix caching only helps a request whose prefix
+#       blocks are ALREADY computed, so N simultaneous requests sharing the
+#       long grounding prompt may all prefill it from scratch.
+#
+# HOW:  Per prefix group, one "primer" request is sent first. As soon as
+#       the primer produces its first token (its prefix is now cached) --
+#       or after prime_timeout_s -- the rest of the group is released
+#       together so they land in the same continuous batch and hit the
+#       prefix cache. Every request has its own event queue, so responses
+#       and token streams are demultiplexed back to the right caller.
+#
+# INTERNET ACCESS: NONE (delegates to VLLMRouter, localhost only)
+# ============================================================================
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+
+_END = object()
+
+
+class VLLMBatchRequest:
+    """One caller's generation request and its private event queue."""
+
+    __slots__ = ("messages", "prefix_key", "cancel_event", "events", "submitted_at")
+
+    def __init__(self, messages: List[Dict[str, str]], prefix_key: str,
+                 cancel_event=None):
+        self.messages = messages
+        self.prefix_key = prefix_key
+        self.cancel_event = cancel_event
+        self.events: "queue.Queue[Any]" = queue.Queue()
+        self.submitted_at = time.monotonic()
+
+    def iter_events(self) -> Generator[Dict[str, Any], None, None]:
+        """Yield this request's stream events until the backend finishes."""
+        while True:
+            event = self.events.get()
+            if event is _END:
+                return
+            yield event
+
+
+class VLLMMicroBatcher:
+    """
+    Group concurrent generation requests into prefix-sharing batches.
+
+    Args:
+        stream_fn:       callable(messages, cancel_event) -> generator of
+                         stream dicts ({"token"}, {"done"}, {"error"}).
+        window_ms:       how long to wait for more requests after the
+                         first one arrives.
+        max_batch_size:  dispatch early once this many requests are queued.
+        prime_timeout_s: longest a follower waits for its primer's first
+                         token before being sent anyway.
+    """
+
+    def __init__(
+        self,
+        stream_fn: Callable[..., Generator[Dict[str, Any], None, None]],
+        window_ms: int = 20,
+        max_batch_size: int = 8,
+        prime_timeout_s: float = 2.0,
+    ):
+        self._stream_fn = stream_fn
+        self.window_s = max(0.0, float(window_ms or 0) / 1000.0)
+        self.max_batch_size = max(1, int(max_batch_size or 1))
+        self.prime_timeout_s = max(0.0, float(prime_timeout_s))
+        self._pending: "queue.Queue[Optional[VLLMBatchRequest]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "requests": 0,
+            "max_batch_size_seen": 0,
+            "prefix_groups": 0,
+            "prefix_followers": 0,
+        }
+        self._closed = threading.Event()
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop,
+            daemon=True,
+            name="hybridrag-vllm-batcher",
+        )
+        self._dispatcher.start()
+
+    def submit(self, messages: List[Dict[str, str]],
+               cancel_event=None) -> VLLMBatchRequest:
+        """Queue one request; consume its events via iter_events()."""
+        prefix_key = ""
+        if messages and messages[0].get("role") == "system":
+            prefix_key = messages[0].get("content", "")
+        request = VLLMBatchRequest(messages, prefix_key, cancel_event)
+        if self._closed.is_set():
+            request.events.put({"error": "vLLM batcher is closed", "backend": "vllm"})
+            request.events.put(_END)
+            return request
+        self._pending.put(request)
+        return request
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters for status surfaces."""
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        snapshot["window_ms"] = int(self.window_s * 1000)
+        snapshot["max_batch_size"] = self.max_batch_size
+        return snapshot
+
+    def close(self) -> None:
+        """Stop the dispatcher thread; queued requests are failed."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._pending.put(None)
+        self._dispatcher.join(timeout=1.0)
+        while True:
+            try:
+                request = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.events.put({"error": "vLLM batcher is closed", "backend": "vllm"})
+                request.events.put(_END)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch_loop(self) -> None:
+        while not self._closed.is_set():
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.window_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._closed.set()
+                    break
+                batch.append(nxt)
+            self._dispatch_batch(batch)
+
+    def _dispatch_batch(self, batch: List[VLLMBatchRequest]) -> None:
+        groups: "OrderedDict[str, List[VLLMBatchRequest]]" = OrderedDict()
+        for request in batch:
+            groups.setdefault(request.prefix_key, []).append(request)
+
+        shared_groups = 0
+        followers = 0
+        for prefix_key, members in groups.items():
+            if not prefix_key or len(members) == 1:
+                for request in members:
+                    self._start(request, None)
+                continue
+            shared_groups += 1
+            followers += len(members) - 1
+            primed = threading.Event()
+            self._start(members[0], primed)
+            threading.Thread(
+                target=self._release_followers,
+                args=(primed, members[1:]),
+                daemon=True,
+                name="hybridrag-vllm-batch-release",
+            ).start()
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["requests"] += len(batch)
+            self._stats["max_batch_size_seen"] = max(
+                self._stats["max_batch_size_seen"], len(batch),
+            )
+            self._stats["prefix_groups"] += shared_groups
+            self._stats["prefix_followers"] += followers
+
+    def _release_followers(self, primed: threading.Event,
+                           followers: List[VLLMBatchRequest]) -> None:
+        primed.wait(self.prime_timeout_s)
+        for request in followers:
+            self._start(request, None)
+
+    def _start(self, request: VLLMBatchRequest,
+               primed: Optional[threading.Event]) -> None:
+        threading.Thread(
+            target=self._run,
+            args=(request, primed),
+            daemon=True,
+            name="hybridrag-vllm-batch-request",
+        ).start()
+
+    def _run(self, request: VLLMBatchRequest,
+             primed: Optional[threading.Event]) -> None:
+        try:
+            if request.cancel_event is not None and request.cancel_event.is_set():
+                return
+            for event in self._stream_fn(request.messages, request.cancel_event):
+                if primed is not None and not primed.is_set():
+                    primed.set()
+                request.events.put(event)
+        except Exception as e:
+            request.events.put({
+                "error": f"{type(e).__name__}: {e}",
+                "backend": "vllm",
+            })
+        finally:
+            if primed is not None:
+                primed.set()
+            request.events.put(_END)
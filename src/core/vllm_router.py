@@ -12,6 +12,14 @@
 # The router uses raw httpx to POST to the OpenAI-compatible
 # /v1/chat/completions endpoint.
 #
+# MICRO-BATCHING (optional, config.vllm.batch_window_ms > 0):
+#   Concurrent queries are routed through VLLMMicroBatcher, which sends
+#   the stable grounding instructions as a separate system message and
+#   releases requests that share it together so the server's prefix
+#   cache is hit. See vllm_batcher.py. Prompts are split into system +
+#   user messages on every path, so turning batching on does not change
+#   what the model sees.
+#
 # INTERNET ACCESS: NONE (localhost only)
 # ============================================================================
 
@@ -21,7 +29,9 @@ import threading
 from typing import Optional, Dict, Any, Generator
 
 from .llm_response import LLMResponse, _build_httpx_client
+from .api_router import _split_prompt_to_messages
 from .config import Config
+from .vllm_batcher import VLLMMicroBatcher
 from .network_gate import get_gate, NetworkBlockedError
 from ..monitoring.logger import get_app_logger
 
@@ -38,6 +48,8 @@ class VLLMRouter:
                     - config.vllm.base_url (default: http://localhost:8000)
                     - config.vllm.model (default: phi4-mini)
                     - config.vllm.timeout_seconds (default: 120)
+                    - config.vllm.batch_window_ms (default: 0 = off)
+                    - config.vllm.max_batch_size (default: 8)
         """
         self.config = config
         self.logger = get_app_logger("vllm_router")
@@ -57,6 +69,18 @@ class VLLMRouter:
         self._health_cache = None
         self._health_ttl = 30  # seconds between live checks
 
+        # Micro-batching window for concurrent generations (0 = disabled)
+        window_ms = int(getattr(config.vllm, "batch_window_ms", 0) or 0)
+        self._batcher = None
+        if window_ms > 0:
+            self._batcher = VLLMMicroBatcher(
+                lambda messages, cancel_event: self._stream_chat(
+                    messages, cancel_event, include_usage=True,
+                ),
+                window_ms=window_ms,
+                max_batch_size=int(getattr(config.vllm, "max_batch_size", 8) or 8),
+            )
+
     def is_available(self) -> bool:
         """
         Check if vLLM is running and reachable.
@@ -90,6 +114,9 @@ class VLLMRouter:
         Returns:
             LLMResponse with the answer, or None if the call failed
         """
+        if self._batcher is not None:
+            return self._query_batched(prompt)
+
         import httpx
         start_time = time.time()
         self.last_error = ""
@@ -106,7 +133,7 @@ class VLLMRouter:
 
         payload = {
             "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": _split_prompt_to_messages(prompt),
             "stream": False,
         }
 
@@ -162,10 +189,65 @@ class VLLMRouter:
         Yields dicts with either:
           {"token": str}        -- a partial text token
           {"done": True, ...}   -- final metadata
+          {"error": str, ...}   -- the request failed
         """
-        import httpx
+        self.last_error = ""
+        messages = _split_prompt_to_messages(prompt)
+        if self._batcher is not None:
+            events = self._batcher.submit(messages, cancel_event).iter_events()
+        else:
+            events = self._stream_chat(messages, cancel_event)
+        for chunk in events:
+            if "error" in chunk:
+                self.last_error = str(chunk.get("error", ""))
+            yield chunk
+
+    def _query_batched(self, prompt: str) -> Optional[LLMResponse]:
+        """Run a non-streaming query through the micro-batcher."""
         start_time = time.time()
         self.last_error = ""
+        request = self._batcher.submit(_split_prompt_to_messages(prompt))
+        parts = []
+        done = None
+        error = ""
+        for chunk in request.iter_events():
+            if "error" in chunk:
+                error = str(chunk.get("error", ""))
+            elif "token" in chunk:
+                parts.append(chunk["token"])
+            elif chunk.get("done"):
+                done = chunk
+        if error or done is None:
+            self.last_error = error or "vLLM batch request ended without a result"
+            return None
+        return LLMResponse(
+            text="".join(parts),
+            tokens_in=done.get("tokens_in", 0),
+            tokens_out=done.get("tokens_out", 0),
+            model=self.model,
+            latency_ms=(time.time() - start_time) * 1000,
+        )
+
+    def batch_stats(self) -> Optional[Dict[str, Any]]:
+        """Micro-batching counters, or None when batching is disabled."""
+        if self._batcher is None:
+            return None
+        return self._batcher.stats()
+
+    def _stream_chat(
+        self,
+        messages: list,
+        cancel_event=None,
+        include_usage: bool = False,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        POST one streaming chat completion and yield its events.
+
+        Runs on the batcher's worker threads, so failures are reported only
+        as {"error": ...} events; callers copy them to last_error.
+        """
+        import httpx
+        start_time = time.time()
 
         try:
             get_gate().check_allowed(
@@ -173,16 +255,17 @@ class VLLMRouter:
                 "vllm_query_stream", "vllm_router",
             )
         except NetworkBlockedError as e:
-            self.last_error = f"NetworkBlockedError: {e}"
             self.logger.error("vllm_stream_blocked_by_gate", error=str(e))
-            yield {"error": self.last_error, "backend": "vllm"}
+            yield {"error": f"NetworkBlockedError: {e}", "backend": "vllm"}
             return
 
         payload = {
             "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": messages,
             "stream": True,
         }
+        if include_usage:
+            payload["stream_options"] = {"include_usage": True}
 
         try:
             if cancel_event is not None and cancel_event.is_set():
@@ -224,7 +307,9 @@ class VLLMRouter:
                         if data_str.strip() == "[DONE]":
                             break
                         chunk = json.loads(data_str)
-                        delta = chunk.get("choices", [{}])[0].get("delta", {})
+                        # include_usage sends a final chunk with no choices
+                        choices = chunk.get("choices") or [{}]
+                        delta = choices[0].get("delta", {})
                         token_text = delta.get("content", "")
                         if token_text:
                             yield {"token": token_text}
@@ -256,17 +341,17 @@ class VLLMRouter:
         except httpx.HTTPError as e:
             if cancel_event is not None and cancel_event.is_set():
                 return
-            self.last_error = f"{type(e).__name__}: {e}"
             self.logger.error("vllm_stream_http_error", error=str(e))
-            yield {"error": self.last_error, "backend": "vllm"}
+            yield {"error": f"{type(e).__name__}: {e}", "backend": "vllm"}
         except Exception as e:
             if cancel_event is not None and cancel_event.is_set():
                 return
-            self.last_error = f"{type(e).__name__}: {e}"
             self.logger.error("vllm_stream_error", error=str(e))
-            yield {"error": self.last_error, "backend": "vllm"}
+            yield {"error": f"{type(e).__name__}: {e}", "backend": "vllm"}
 
     def close(self):
         """Release the persistent HTTP client."""
+        if getattr(self, "_batcher", None) is not None:
+            self._batcher.close()
         if hasattr(self, "_client") and self._client:
             self._client.close()
@@ -149,7 +149,8 @@ def test_guard_nli_model() -> TestResult:
                 "guard_nli_model", "Hallucination Filter", "FAIL",
                 "NLI model failed to load -- filter CANNOT verify claims",
                 {"load_time_s": round(load_s, 2)},
-                fix_hint="Download (~440MB) or copy .model_cache/ for air-gap.",
+                fix_hint="Copy the ONNX export to .model_cache/nli_onnx/ "
+                         "(model.onnx + tokenizer.json).",
             )
 
         # Smoke test: must produce 3-class output
@@ -191,7 +192,7 @@ def test_guard_nli_model() -> TestResult:
         return TestResult(
             "guard_nli_model", "Hallucination Filter", "FAIL",
             f"Missing dependency: {e}",
-            fix_hint="RETIRED: sentence-transformers removed (Session 15). NLI guard is dormant.",
+            fix_hint="pip install onnxruntime tokenizers (optional NLI runtime).",
         )
     except Exception as e:
         return TestResult(
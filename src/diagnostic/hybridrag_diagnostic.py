@@ -18,6 +18,8 @@
 # USAGE: rag-diag              (quick check + fault analysis)
 #        rag-diag --verbose    (full details + evidence trail)
 #        rag-diag --perf-only  (benchmarks only, no health checks)
+#        rag-diag --startup    (cold-start step + import breakdown)
+#        rag-diag --retrieval-bench 10k,100k  (offline per-stage timings)
 #        rag-diag --json-file report.json  (structured output)
 # ===================================================================
 
@@ -50,9 +52,9 @@ from src.diagnostic.component_tests import (
     test_parser_smoke,
 )
 from src.diagnostic.perf_benchmarks import (
-    perf_config_load, perf_sqlite_query, perf_chunker,
+    perf_cold_start, perf_config_load, perf_sqlite_query, perf_chunker,
     perf_embedder, perf_vector_search, perf_fts5_search,
-    perf_hybrid_search,
+    perf_hybrid_search, perf_nli_verify,
 )
 from src.diagnostic.report import detect_known_bugs, print_report, save_json_report
 from src.diagnostic.fault_analysis import (
@@ -69,16 +71,21 @@ def main():
           rag-diag                                    # Quick check + fault analysis
           rag-diag --verbose                          # Full details + evidence trail
           rag-diag --test-embed                       # With embedding benchmark
+          rag-diag --test-cold-start                  # With fresh-process boot benchmark
           rag-diag --test-query "freq range"          # End-to-end query test
           rag-diag --test-parse "C:\\docs\\m.pdf"      # Test specific file
           rag-diag --json-file report.json            # Save for trend tracking
           rag-diag --fix-preview --verbose            # Bug fix details
           rag-diag --perf-only                        # Benchmarks only (no health)
+          rag-diag --startup                          # Where cold start time goes
+          rag-diag --retrieval-bench 10k              # Offline per-stage retrieval timings
           rag-diag --no-fault-analysis                # Skip fault analysis
         """))
     ap.add_argument("--verbose", "-v", action="store_true", help="Detailed output + evidence trail")
     ap.add_argument("--test-embed", action="store_true",
                     help="Live embedding benchmark (loads model, ~30s)")
+    ap.add_argument("--test-cold-start", action="store_true",
+                    help="Cold-start benchmark (boots fresh processes, one per iteration)")
     ap.add_argument("--test-query", type=str, default="",
                     help="End-to-end query test")
     ap.add_argument("--test-parse", type=str, default="",
@@ -93,8 +100,21 @@ def main():
                     help="Benchmark iterations (default: 3)")
     ap.add_argument("--no-fault-analysis", action="store_true",
                     help="Skip fault analysis (faster)")
+    ap.add_argument("--startup", action="store_true",
+                    help="Print the cold-start step and import breakdown, then exit")
+    ap.add_argument("--retrieval-bench", type=str, default="", metavar="SIZES",
+                    help="Run the offline retrieval stage benchmarks (e.g. 10k,100k,1m), then exit")
     args = ap.parse_args()
 
+    if args.startup:
+        sys.exit(_print_startup_profile())
+    if args.retrieval_bench:
+        from src.diagnostic.retrieval_benchmarks import main as retrieval_bench_main
+        bench_args = ["--sizes", args.retrieval_bench]
+        if args.json_file:
+            bench_args += ["--output", args.json_file]
+        sys.exit(retrieval_bench_main(bench_args))
+
     report = DiagnosticReport()
     report.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     report.python_version = sys.version.split()[0]
@@ -149,12 +169,15 @@ def main():
         ("SQLite Query",   perf_sqlite_query),
         ("Chunker",        perf_chunker),
     ]
+    if args.test_cold_start:
+        perf_tests.insert(0, ("Cold Start", perf_cold_start))
     if args.test_embed:
         perf_tests.append(("Embedder", perf_embedder))
     perf_tests.append(("Vector Search", perf_vector_search))
     perf_tests.append(("FTS5 Search",   perf_fts5_search))
     if args.test_embed:
         perf_tests.append(("Hybrid Search", perf_hybrid_search))
+    perf_tests.append(("NLI Verify", perf_nli_verify))
 
     total_p = len(perf_tests)
     print(f"\n  {CYAN}Running {total_p} performance benchmarks ({iters} iterations each)...{RESET}")
@@ -214,6 +237,28 @@ def main():
     sys.exit(1 if report.failed > 0 or has_crit else 0)
 
 
+def _print_startup_profile() -> int:
+    """Profile boot and API import in fresh processes; 1 if over budget."""
+    from src.core.startup_profile import format_snapshot, measure_cold_start
+
+    over = False
+    for target in ("boot", "api"):
+        print(f"\n  {CYAN}Cold start: {target}{RESET}")
+        try:
+            snap = measure_cold_start(target)
+        except Exception as e:
+            print(f"  {RED}  failed: {e}{RESET}")
+            over = True
+            continue
+        color = RED if snap["over_budget"] else GREEN
+        print(f"  {color}  process {snap['process_ms']:.0f} ms "
+              f"(budget {snap['budget_ms']:.0f} ms){RESET}")
+        for line in format_snapshot(snap).splitlines():
+            print(f"    {line}")
+        over = over or snap["over_budget"]
+    return 1 if over else 0
+
+
 def _safe_perf(report, func, iters):
     """Run a perf benchmark, catching errors gracefully."""
     try:
@@ -0,0 +1,574 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Measures indexing throughput without a real Ollama or real documents.
+# What to read first: Start at run_indexing_benchmark(), then generate_corpus() and StubEmbedServer.
+# Inputs: A file count and format mix (or an existing folder), embed latency settings, a seed.
+# Outputs: files/s, chunks/s, MB/s and the time split across discovery, parse, chunk, embed, store and GC.
+# Safety notes: Writes only to a temp/work directory and serves embeddings on 127.0.0.1 only.
+# ============================
+# ===================================================================
+# WHAT: Indexing throughput benchmark: a synthetic source-tree
+#       generator (txt, md, csv, docx, xlsx, pdf, eml, zip), a stub
+#       Ollama /api/embed server, and a driver around
+#       Indexer.index_folder().
+# WHY:  Indexing speed could only be measured against a live Ollama
+#       and somebody's real documents, so there was no stable baseline
+#       to compare before and after an indexing change.
+# HOW:  generate_corpus() writes a seeded tree of mixed formats.
+#       StubEmbedServer answers POST /api/embed with deterministic
+#       vectors after a configurable delay (fixed per request plus per
+#       input), so embed cost can be set to match a real GPU or CPU.
+#       The real Embedder, Chunker, VectorStore and Indexer are used
+#       unchanged; the driver only wraps chunk_text(), embed_documents()
+#       and add_embeddings() (and gc.collect(), which the indexer calls
+#       between blocks and files) with timers. Discovery is the time
+#       until the first file starts; "parse" is the rest of each file's
+#       time (parsing plus preflight, hashing and text cleanup).
+# USAGE:
+#   python -m src.diagnostic.indexing_benchmarks --files 400
+#   python -m src.diagnostic.indexing_benchmarks --files 2000 \
+#       --embed-latency-ms 40 --embed-per-item-ms 2 --output idx.json
+#   python -m src.diagnostic.indexing_benchmarks --source D:\docs
+# ===================================================================
+
+from __future__ import annotations
+
+import argparse
+import email.message
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .retrieval_benchmarks import DEFAULT_SEED, HashingEmbedder, _VOCAB, _git_commit
+
+SCHEMA_VERSION = 1
+INDEX_STAGES = ("discovery", "parse", "chunk", "embed", "store", "gc")
+DEFAULT_MIX = {
+    ".txt": 4, ".md": 3, ".csv": 2, ".docx": 2,
+    ".xlsx": 1, ".pdf": 2, ".eml": 2, ".zip": 1,
+}
+
+
+# ============================================================================
+# Synthetic source tree
+# ============================================================================
+
+def _paragraphs(rng: np.random.Generator, count: int, words: int = 80) -> List[str]:
+    out = []
+    for _ in range(count):
+        topic = int(rng.integers(0, len(_VOCAB)))
+        ids = (topic + rng.integers(-8, 9, size=words)) % len(_VOCAB)
+        text = " ".join(_VOCAB[i] for i in ids)
+        out.append(
+            text[0].upper() + text[1:]
+            + f". Part number PN-{int(rng.integers(1000, 9999))}"
+            f" rated {int(rng.integers(5, 500))} W."
+        )
+    return out
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _write_pdf(path: Path, paragraphs: List[str]) -> None:
+    """Write a plain text PDF (Helvetica, one page per ~60 lines) by hand."""
+    lines = [ln for p in paragraphs for ln in _wrap(p) + [""]]
+    pages = [lines[i:i + 60] for i in range(0, len(lines), 60)] or [[""]]
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, page_lines in enumerate(pages):
+        escaped = [
+            ln.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            for ln in page_lines
+        ]
+        body = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(
+            f"({ln}) Tj T*" for ln in escaped
+        ) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[i] + 1} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    path.write_bytes(bytes(out))
+
+
+def _write_docx(path: Path, paragraphs: List[str]) -> None:
+    import docx
+
+    doc = docx.Document()
+    doc.add_heading(paragraphs[0][:60], level=1)
+    for p in paragraphs:
+        doc.add_paragraph(p)
+    doc.save(str(path))
+
+
+def _write_xlsx(path: Path, rng: np.random.Generator, rows: int) -> None:
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Parts"
+    ws.append(["part_number", "description", "quantity", "vendor"])
+    for _ in range(rows):
+        ws.append([
+            f"PN-{int(rng.integers(1000, 9999))}",
+            " ".join(_VOCAB[int(i)] for i in rng.integers(0, len(_VOCAB), size=6)),
+            int(rng.integers(1, 50)),
+            _VOCAB[int(rng.integers(0, len(_VOCAB)))].title() + " Corp",
+        ])
+    wb.save(str(path))
+
+
+def _write_csv(path: Path, rng: np.random.Generator, rows: int) -> None:
+    lines = ["part_number,description,quantity,vendor"]
+    for _ in range(rows):
+        desc = " ".join(_VOCAB[int(i)] for i in rng.integers(0, len(_VOCAB), size=6))
+        lines.append(
+            f"PN-{int(rng.integers(1000, 9999))},{desc},{int(rng.integers(1, 50))},"
+            f"{_VOCAB[int(rng.integers(0, len(_VOCAB)))].title()} Corp"
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _write_eml(path: Path, paragraphs: List[str], n: int) -> None:
+    msg = email.message.EmailMessage()
+    msg["From"] = f"technician{n % 7}@example.com"
+    msg["To"] = "maintenance@example.com"
+    msg["Subject"] = paragraphs[0][:60]
+    msg["Date"] = "Mon, 06 Jan 2025 09:00:00 +0000"
+    msg.set_content("\n\n".join(paragraphs))
+    path.write_bytes(bytes(msg))
+
+
+def _write_file(path: Path, ext: str, rng: np.random.Generator, paragraphs: int, n: int) -> None:
+    if ext == ".txt":
+        path.write_text("\n\n".join(_paragraphs(rng, paragraphs)), encoding="utf-8")
+    elif ext == ".md":
+        paras = _paragraphs(rng, paragraphs)
+        body = [f"# Document {n}"]
+        for i, p in enumerate(paras):
+            if i % 3 == 0:
+                body.append(f"## Section {i // 3 + 1}")
+            body.append(p)
+        path.write_text("\n\n".join(body), encoding="utf-8")
+    elif ext == ".csv":
+        _write_csv(path, rng, paragraphs * 8)
+    elif ext == ".docx":
+        _write_docx(path, _paragraphs(rng, paragraphs))
+    elif ext == ".xlsx":
+        _write_xlsx(path, rng, paragraphs * 8)
+    elif ext == ".pdf":
+        _write_pdf(path, _paragraphs(rng, paragraphs))
+    elif ext == ".eml":
+        _write_eml(path, _paragraphs(rng, paragraphs), n)
+    elif ext == ".zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for m in range(3):
+                zf.writestr(f"member_{m}.txt", "\n\n".join(_paragraphs(rng, paragraphs)))
+    else:
+        raise ValueError(f"Unsupported synthetic format: {ext}")
+
+
+def generate_corpus(
+    root: Path,
+    files: int,
+    mix: Optional[Dict[str, int]] = None,
+    paragraphs: int = 12,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """Write `files` seeded documents under root/ in folders of 50; returns a summary."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    weights = dict(mix or DEFAULT_MIX)
+    cycle = [ext for ext, w in sorted(weights.items()) for _ in range(max(0, int(w)))]
+    if not cycle:
+        raise ValueError("Format mix has no positive weights")
+    rng = np.random.default_rng(seed)
+    by_ext: Dict[str, int] = {}
+    total_bytes = 0
+    for n in range(files):
+        ext = cycle[n % len(cycle)]
+        folder = root / f"batch_{n // 50:04d}"
+        folder.mkdir(exist_ok=True)
+        path = folder / f"doc_{n:06d}{ext}"
+        _write_file(path, ext, rng, paragraphs, n)
+        by_ext[ext] = by_ext.get(ext, 0) + 1
+        total_bytes += path.stat().st_size
+    return {"root": str(root), "files": files, "bytes": total_bytes,
+            "by_extension": dict(sorted(by_ext.items())), "seed": seed,
+            "paragraphs": paragraphs}
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    """'txt=4,pdf=2' -> {'.txt': 4, '.pdf': 2}."""
+    mix: Dict[str, int] = {}
+    for part in str(raw or "").split(","):
+        if "=" not in part:
+            continue
+        ext, weight = part.split("=", 1)
+        ext = ext.strip().lower()
+        mix[ext if ext.startswith(".") else "." + ext] = int(weight)
+    return mix or dict(DEFAULT_MIX)
+
+
+# ============================================================================
+# Stub Ollama embedding server
+# ============================================================================
+
+class StubEmbedServer:
+    """
+    Minimal stand-in for Ollama's POST /api/embed on 127.0.0.1.
+
+    Each request sleeps latency_ms + per_item_ms * len(input) before
+    answering with deterministic HashingEmbedder vectors, so embed cost
+    can be dialed to match real hardware without running a model.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 768,
+        latency_ms: float = 0.0,
+        per_item_ms: float = 0.0,
+        seed: int = DEFAULT_SEED,
+    ):
+        self.dimension = int(dimension)
+        self.latency_ms = float(latency_ms)
+        self.per_item_ms = float(per_item_ms)
+        self.embedder = HashingEmbedder(self.dimension, seed)
+        self.requests = 0
+        self.inputs = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep benchmark output clean
+                pass
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") in ("/api/tags", "/api/version"):
+                    self._reply(200, {"models": [{"name": "stub"}], "version": "stub"})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/api/embed":
+                    self._reply(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                data = json.loads(self.rfile.read(length) or b"{}")
+                inputs = data.get("input") or []
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                with stub._lock:
+                    stub.requests += 1
+                    stub.inputs += len(inputs)
+                delay = stub.latency_ms + stub.per_item_ms * len(inputs)
+                if delay > 0:
+                    time.sleep(delay / 1000.0)
+                vectors = stub.embedder.embed_documents([str(t) for t in inputs])
+                self._reply(200, {"model": data.get("model", ""),
+                                  "embeddings": vectors.tolist()})
+
+        return Handler
+
+    def start(self) -> "StubEmbedServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stub-embed-server", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubEmbedServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# ============================================================================
+# Benchmark driver
+# ============================================================================
+
+class _StageClock:
+    """Accumulates wall time per indexing stage from wrapped callables."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in INDEX_STAGES}
+        self.file_seconds = 0.0
+        self._file_t0: Optional[float] = None
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - t0
+        return timed
+
+    def file_boundary(self) -> None:
+        now = time.perf_counter()
+        if self._file_t0 is not None:
+            self.file_seconds += now - self._file_t0
+        self._file_t0 = now
+
+
+def _progress_callback(clock: _StageClock, started: float):
+    from src.core.indexer import IndexingProgressCallback
+
+    class _Progress(IndexingProgressCallback):
+        def on_file_start(self, file_path, file_num, total_files):
+            if file_num == 1:
+                clock.seconds["discovery"] = time.perf_counter() - started
+            clock.file_boundary()
+
+        def on_indexing_complete(self, total_chunks, elapsed_seconds):
+            if clock._file_t0 is None:
+                clock.seconds["discovery"] = time.perf_counter() - started
+            clock.file_boundary()
+
+    return _Progress()
+
+
+def run_indexing_benchmark(
+    source_dir: Path,
+    workdir: Path,
+    dimension: int = 768,
+    embed_latency_ms: float = 0.0,
+    embed_per_item_ms: float = 0.0,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """Index source_dir into a fresh store under workdir against a stub embed server."""
+    from src.core.chunker import Chunker, ChunkerConfig
+    from src.core.config import Config
+    from src.core.embedder import Embedder
+    from src.core.indexer import Indexer
+    from src.core.vector_store import VectorStore
+
+    config = Config()  # dataclass defaults, not the user's YAML
+    config.embedding.dimension = dimension
+    supported = set(config.indexing.supported_extensions)
+    source_bytes = sum(
+        p.stat().st_size for p in Path(source_dir).rglob("*")
+        if p.is_file() and p.suffix.lower() in supported
+    )
+
+    db_path = Path(workdir) / "index" / "bench.sqlite3"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    previous_host = os.environ.get("OLLAMA_HOST")
+    with StubEmbedServer(dimension, embed_latency_ms, embed_per_item_ms, seed) as server:
+        os.environ["OLLAMA_HOST"] = server.url
+        store = VectorStore(db_path=str(db_path), embedding_dim=dimension)
+        store.connect()
+        embedder = Embedder(config.embedding.model_name, dimension=dimension)
+        try:
+            chunker = Chunker(ChunkerConfig(
+                chunk_size=config.chunking.chunk_size, overlap=config.chunking.overlap,
+            ))
+            clock = _StageClock()
+            chunker.chunk_text = clock.wrap("chunk", chunker.chunk_text)
+            embedder.embed_documents = clock.wrap("embed", embedder.embed_documents)
+            store.add_embeddings = clock.wrap("store", store.add_embeddings)
+            indexer = Indexer(config, store, embedder, chunker)
+
+            gc_collect = gc.collect
+            gc.collect = clock.wrap("gc", gc_collect)
+            try:
+                started = time.perf_counter()
+                result = indexer.index_folder(
+                    str(source_dir), progress_callback=_progress_callback(clock, started),
+                )
+                elapsed = time.perf_counter() - started
+            finally:
+                gc.collect = gc_collect
+        finally:
+            embedder.close()
+            store.close()
+            if previous_host is None:
+                os.environ.pop("OLLAMA_HOST", None)
+            else:
+                os.environ["OLLAMA_HOST"] = previous_host
+        embed_calls = {"requests": server.requests, "inputs": server.inputs,
+                       "latency_ms": embed_latency_ms, "per_item_ms": embed_per_item_ms}
+
+    measured = sum(clock.seconds[s] for s in ("chunk", "embed", "store", "gc"))
+    clock.seconds["parse"] = max(0.0, clock.file_seconds - measured)
+    chunks = int(result["total_chunks_added"])
+    files = int(result["total_files_scanned"])
+
+    def per_s(value: float) -> float:
+        return round(value / elapsed, 3) if elapsed > 0 else 0.0
+
+    return {
+        "files_scanned": files,
+        "files_indexed": int(result["total_files_indexed"]),
+        "files_skipped": int(result["total_files_skipped"]),
+        "skip_reason_counts": result["skip_reason_counts"],
+        "chunks": chunks,
+        "bytes": source_bytes,
+        "elapsed_s": round(elapsed, 3),
+        "files_per_s": per_s(files),
+        "chunks_per_s": per_s(chunks),
+        "mb_per_s": per_s(source_bytes / (1024 * 1024)),
+        "stages": {
+            stage: {
+                "seconds": round(clock.seconds[stage], 4),
+                "pct": round(100 * clock.seconds[stage] / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+            for stage in INDEX_STAGES
+        },
+        "embed_server": embed_calls,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    r = report["result"]
+    lines = [
+        f"Indexing throughput ({report.get('git_commit') or 'no git'})",
+        f"  {r['files_scanned']:,} files ({r['files_indexed']:,} indexed, "
+        f"{r['files_skipped']:,} skipped), {r['chunks']:,} chunks, "
+        f"{r['bytes'] / (1024 * 1024):.1f} MB in {r['elapsed_s']:.2f}s",
+        f"  {r['files_per_s']:.1f} files/s   {r['chunks_per_s']:.1f} chunks/s   "
+        f"{r['mb_per_s']:.2f} MB/s",
+    ]
+    for stage in INDEX_STAGES:
+        s = r["stages"][stage]
+        lines.append(f"    {stage:<10}{s['seconds']:>9.3f}s  {s['pct']:>5.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Indexing throughput on a synthetic corpus with a stub embed server.",
+    )
+    parser.add_argument("--files", type=int, default=200, help="Synthetic files to generate.")
+    parser.add_argument("--mix", default="", help="Format weights, e.g. txt=4,pdf=2,zip=1.")
+    parser.add_argument("--paragraphs", type=int, default=12, help="Paragraphs per document.")
+    parser.add_argument("--source", default="", help="Index this folder instead of generating one.")
+    parser.add_argument("--generate-only", default="", metavar="DIR",
+                        help="Write the synthetic tree to DIR and exit.")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension.")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0,
+                        help="Stub /api/embed delay per request.")
+    parser.add_argument("--embed-per-item-ms", type=float, default=0.0,
+                        help="Stub /api/embed extra delay per input text.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workdir", default="", help="Keep the corpus and index here.")
+    parser.add_argument("--output", default="", help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    if args.generate_only:
+        summary = generate_corpus(Path(args.generate_only), args.files, mix,
+                                  args.paragraphs, args.seed)
+        print(json.dumps(summary, indent=2, sort_keys=True))
+        return 0
+
+    keep = bool(args.workdir)
+    root = Path(args.workdir) if keep else Path(tempfile.mkdtemp(prefix="hybridrag_idxbench_"))
+    try:
+        corpus = None
+        source = Path(args.source) if args.source else root / "source"
+        # Indexer and query logs go to stderr so stdout stays pure JSON.
+        with redirect_stdout(sys.stderr):
+            if not args.source:
+                shutil.rmtree(source, ignore_errors=True)
+                corpus = generate_corpus(source, args.files, mix, args.paragraphs, args.seed)
+            shutil.rmtree(root / "index", ignore_errors=True)
+            result = run_indexing_benchmark(
+                source, root, dimension=args.dim,
+                embed_latency_ms=args.embed_latency_ms,
+                embed_per_item_ms=args.embed_per_item_ms,
+                seed=args.seed,
+            )
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "suite": "indexing_throughput",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": corpus or {"root": str(source)},
+        "result": result,
+    }
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+        print(format_report(report))
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,21 +6,24 @@
 # Safety notes: Update small sections at a time and run relevant tests after edits.
 # ============================
 # ===================================================================
-# WHAT: Performance benchmarks for every pipeline stage (config load,
-#       SQLite, chunker, embedder, vector search, FTS5, hybrid search)
+# WHAT: Performance benchmarks for every pipeline stage (cold start,
+#       config load, SQLite, chunker, embedder, vector search, FTS5,
+#       hybrid search, batched NLI verification)
 # WHY:  Detect regressions after code changes, identify bottlenecks,
 #       and establish baselines before long indexing runs. Each benchmark
 #       returns min/max/avg/stddev so you see variance, not just averages.
 # HOW:  Each function times an operation N iterations, computes stats,
 #       and returns a PerfMetric. All benchmarks are read-only and
 #       non-destructive -- safe to run on production data.
-# USAGE: Called by hybridrag_diagnostic.py --perf-only or rag-diag.
+# USAGE: Called by hybridrag_diagnostic.py --perf-only or rag-diag
+#        (cold start only with --test-cold-start).
 # ===================================================================
 
 from __future__ import annotations
 
 import os
 import json
+import time
 import sqlite3
 from typing import Optional
 
@@ -32,6 +35,32 @@ def _get_db_path() -> str:
     return getattr(load_config(str(PROJ_ROOT)).paths, "database", "")
 
 
+def perf_cold_start(iters: int = 3) -> PerfMetric:
+    """How long does a fresh process take to run boot_hybridrag()?
+
+    Starts one subprocess per iteration, so rag-diag only runs it with
+    --test-cold-start.
+    """
+    import statistics
+    from src.core.startup_profile import measure_cold_start
+
+    runs = [measure_cold_start("boot") for _ in range(max(1, iters))]
+    values = [r["process_ms"] for r in runs]
+    last = runs[-1]
+    return PerfMetric(
+        "cold_start_boot", "Startup", statistics.median(values), "ms",
+        iterations=len(values), min_val=min(values), max_val=max(values),
+        avg_val=statistics.mean(values),
+        std_dev=statistics.stdev(values) if len(values) > 1 else 0.0,
+        details={
+            "budget_ms": last["budget_ms"],
+            "over_budget": statistics.median(values) > last["budget_ms"],
+            "steps": last["steps"],
+            "imports": last["imports"][:10],
+        },
+    )
+
+
 def perf_config_load(iters: int = 3) -> PerfMetric:
     """How long does loading the full config take?"""
     from src.core.config import load_config
@@ -180,3 +209,42 @@ def perf_hybrid_search(iters: int = 3) -> Optional[PerfMetric]:
     except Exception as e:
         return PerfMetric("hybrid_search", "Search", 0, "ms/query",
                           details={"error": str(e)})
+
+
+def perf_nli_verify(iters: int = 3, verifier=None) -> PerfMetric:
+    """How many (chunk, claim) pairs per second does batched NLI score?"""
+    try:
+        from src.core.hallucination_guard.nli_verifier import NLIVerifier
+        from src.core.hallucination_guard.golden_probes import PROBE_DOMAINS
+
+        verifier = verifier or NLIVerifier()
+        if not verifier.load_model():
+            return PerfMetric("nli_verify_batch", "Guard", 0, "pairs/sec",
+                              details={"skip": "no NLI model"})
+
+        chunks = [d.source_text for d in PROBE_DOMAINS]
+        claims = [c for d in PROBE_DOMAINS
+                  for c, *_ in (d.should_pass[:1] + d.should_fail[:1])]
+
+        def run():
+            # Cold cache every iteration so the model does the work.
+            verifier.cache.clear()
+            before = verifier.pairs_scored
+            verifier.verify_batch(claims, chunks)
+            return verifier.pairs_scored - before
+
+        m = benchmark(
+            run, iters, "nli_verify_batch", "Guard", "pairs/sec",
+            value_extractor=lambda el, pairs: pairs / el if el > 0 else 0)
+        t0 = time.perf_counter()
+        verifier.verify_batch(claims, chunks)
+        m.details.update(verifier.throughput())
+        m.details.update({
+            "claims": len(claims),
+            "chunks": len(chunks),
+            "cached_batch_ms": round((time.perf_counter() - t0) * 1000, 2),
+        })
+        return m
+    except Exception as e:
+        return PerfMetric("nli_verify_batch", "Guard", 0, "pairs/sec",
+                          details={"error": str(e)})
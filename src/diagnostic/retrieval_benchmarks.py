@@ -0,0 +1,546 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Times each stage of the query-time retrieval path on a synthetic, offline corpus.
+# What to read first: Start at run_suite(), then build_corpus() and bench_stages().
+# Inputs: Corpus sizes (10k/100k/1M chunks), a seed, and an optional baseline JSON file.
+# Outputs: A JSON document with per-stage min/median/p95 timings that can be diffed between commits.
+# Safety notes: Writes only to a temp/work directory; never touches the real index, Ollama, or the network.
+# ============================
+# ===================================================================
+# WHAT: Offline microbenchmarks for the query hot path, one number
+#       per retrieval stage: vector scan, FTS5, path search, RRF
+#       fusion, source-quality bias, access control, adjacent-chunk
+#       augmentation, context build and context trim -- plus the full
+#       Retriever.search() and QueryEngine.query() for reference.
+# WHY:  perf_benchmarks.py only measures coarse search calls against
+#       whatever database is on disk, and tools/query_benchmark.py
+#       needs a live LLM. Neither is reproducible between machines or
+#       commits, and neither says WHICH stage got slower.
+# HOW:  A seeded generator writes a synthetic corpus straight into a
+#       real VectorStore (memmap + SQLite/FTS5). HashingEmbedder turns
+#       text into deterministic vectors from a seeded token table, and
+#       StubLLMRouter answers instantly, so nothing leaves the process.
+#       Every stage is timed separately with its inputs precomputed,
+#       and the results are written as sorted-key JSON.
+# USAGE:
+#   python -m src.diagnostic.retrieval_benchmarks --sizes 10k
+#   python -m src.diagnostic.retrieval_benchmarks --sizes 10k,100k,1m \
+#       --workdir .bench_corpus --output bench_after.json \
+#       --compare bench_before.json
+# ===================================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from . import PROJ_ROOT
+
+SCHEMA_VERSION = 1
+DEFAULT_SEED = 1337
+DEFAULT_SIZES = (10_000,)
+SIZE_ALIASES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+CHUNKS_PER_FILE = 24
+INSERT_BATCH = 5_000
+TOKEN_TABLE_ROWS = 8_192
+
+STAGES = (
+    "query_embed",
+    "vector_scan",
+    "fts5",
+    "path_search",
+    "rrf_fusion",
+    "source_quality_bias",
+    "access_control",
+    "adjacent_augment",
+    "context_build",
+    "context_trim",
+    "retriever_search",
+    "query_end_to_end",
+)
+
+# Access policy applied while timing the access_control stage: the
+# corpus mixes these tags so some hits are always denied.
+ACCESS_TAGS = (("shared",), ("shared",), ("engineering",), ("restricted",))
+ACCESS_CONTEXT = {
+    "actor": "bench",
+    "actor_role": "engineer",
+    "allowed_doc_tags": ["shared", "engineering"],
+    "document_policy_source": "retrieval_benchmarks",
+}
+
+_VOCAB = (
+    "radar transmitter receiver antenna gain beamwidth magnetron waveguide "
+    "calibration maintenance inspection torque voltage current frequency "
+    "amplifier oscillator filter mixer synthesizer ionosphere digisonde "
+    "sounder elevation azimuth pedestal encoder servo bearing lubrication "
+    "schedule procedure warning caution interval replacement hours cycles "
+    "power supply rectifier capacitor resistor fuse breaker relay connector "
+    "cable harness shield ground bonding corrosion humidity temperature "
+    "pressure cooling fan airflow heat sink thermal sensor alarm fault "
+    "diagnostic test result report revision drawing assembly subassembly "
+    "part number serial lot quantity vendor supplier contract deliverable "
+    "requirement specification verification validation acceptance review "
+    "training manual operator technician engineer supervisor safety lockout "
+    "tagout hazard exposure limit threshold margin tolerance accuracy drift"
+).split()
+
+_QUERIES = (
+    "radar transmitter peak power and magnetron replacement interval",
+    "antenna gain beamwidth calibration procedure",
+    "digisonde ionosphere sounder maintenance schedule",
+    "part number PN-4471 serial quantity vendor",
+    "doc_00003 inspection report torque tolerance",
+    "thermal sensor alarm fault diagnostic test result",
+)
+
+
+# ============================================================================
+# Deterministic stand-ins for the embedder and the LLM
+# ============================================================================
+
+def _token_row(token: str) -> int:
+    return zlib.crc32(token.lower().encode("utf-8")) % TOKEN_TABLE_ROWS
+
+
+class HashingEmbedder:
+    """
+    Deterministic fake embedder: a text's vector is the normalized sum of
+    seeded random rows, one per token.  Texts that share words get similar
+    vectors, so vector search ranks meaningfully, and the same seed always
+    produces the same vectors on every machine.
+    """
+
+    def __init__(self, dimension: int, seed: int = DEFAULT_SEED):
+        self.dimension = int(dimension)
+        rng = np.random.default_rng(seed)
+        self.table = rng.standard_normal((TOKEN_TABLE_ROWS, self.dimension)).astype(np.float32)
+        self.vocab_rows = np.array([_token_row(w) for w in _VOCAB], dtype=np.int64)
+
+    def _embed_rows(self, rows: np.ndarray) -> np.ndarray:
+        vec = self.table[rows].sum(axis=-2)
+        norm = np.linalg.norm(vec, axis=-1, keepdims=True)
+        return vec / np.maximum(norm, 1e-9)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        rows = [_token_row(t) for t in str(text).split() if t]
+        if not rows:
+            return np.zeros(self.dimension, dtype=np.float32)
+        return self._embed_rows(np.asarray(rows, dtype=np.int64))
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.vstack([self.embed_query(t) for t in texts]).astype(np.float32)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return self.embed_documents(texts)
+
+
+class StubLLMRouter:
+    """LLMRouter stand-in that answers instantly with a fixed grounded reply."""
+
+    last_error = ""
+
+    def __init__(self, config):
+        self.config = config
+
+    def query(self, prompt: str):
+        from src.core.llm_response import LLMResponse
+
+        return LLMResponse(
+            text="According to [Source 1], the requested value is listed in the document.",
+            tokens_in=len(prompt) // 4,
+            tokens_out=16,
+            model="stub",
+            latency_ms=0.0,
+        )
+
+    def query_stream(self, prompt: str, cancel_event=None):
+        yield {"token": self.query(prompt).text}
+
+
+# ============================================================================
+# Synthetic corpus
+# ============================================================================
+
+@dataclass
+class Corpus:
+    """A synthetic index on disk plus the objects used to query it."""
+    chunks: int
+    dimension: int
+    seed: int
+    db_path: str
+    build_s: float
+    reused: bool
+    store: Any = None
+    embedder: Optional[HashingEmbedder] = None
+    manifest: Dict[str, Any] = field(default_factory=dict)
+
+
+def _chunk_words(rng: np.random.Generator, n: int, words: int) -> np.ndarray:
+    # Each chunk draws mostly from a small "topic" window of the
+    # vocabulary so chunks cluster by topic like real documents do.
+    topics = rng.integers(0, len(_VOCAB), size=(n, 1))
+    offsets = rng.integers(-6, 7, size=(n, words))
+    return (topics + offsets) % len(_VOCAB)
+
+
+def _corpus_texts(rng: np.random.Generator, start: int, word_ids: np.ndarray) -> List[str]:
+    texts = []
+    for i, ids in enumerate(word_ids):
+        idx = start + i
+        words = [_VOCAB[w] for w in ids]
+        texts.append(
+            f"Section {idx % CHUNKS_PER_FILE + 1}. " + " ".join(words)
+            + f". Part number PN-{int(rng.integers(1000, 9999))} qty {idx % 17 + 1}."
+        )
+    return texts
+
+
+def build_corpus(
+    chunks: int,
+    workdir: Path,
+    dimension: int,
+    seed: int = DEFAULT_SEED,
+) -> Corpus:
+    """Create (or reuse) a seeded synthetic index with `chunks` chunks."""
+    from src.core.vector_store import ChunkMetadata, VectorStore
+
+    corpus_dir = Path(workdir) / f"corpus_{chunks}_{dimension}_{seed}"
+    db_path = corpus_dir / "bench.sqlite3"
+    manifest_path = corpus_dir / "manifest.json"
+    manifest = {"chunks": chunks, "dimension": dimension, "seed": seed, "schema": SCHEMA_VERSION}
+    embedder = HashingEmbedder(dimension, seed)
+
+    if manifest_path.exists():
+        try:
+            if json.loads(manifest_path.read_text(encoding="utf-8")) == manifest:
+                store = VectorStore(db_path=str(db_path), embedding_dim=dimension)
+                store.connect()
+                return Corpus(chunks, dimension, seed, str(db_path), 0.0, True,
+                              store, embedder, manifest)
+        except (OSError, ValueError):
+            pass
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    store = VectorStore(db_path=str(db_path), embedding_dim=dimension)
+    store.connect()
+    created_at = "2025-01-01T00:00:00"
+    for start in range(0, chunks, INSERT_BATCH):
+        n = min(INSERT_BATCH, chunks - start)
+        word_ids = _chunk_words(rng, n, 60)
+        texts = _corpus_texts(rng, start, word_ids)
+        embeddings = embedder._embed_rows(embedder.vocab_rows[word_ids]).astype(np.float32)
+        metadata = []
+        for i, text in enumerate(texts):
+            idx = start + i
+            file_no = idx // CHUNKS_PER_FILE
+            metadata.append(ChunkMetadata(
+                source_path=f"/bench/system_{file_no % 40:02d}/doc_{file_no:05d}.txt",
+                chunk_index=idx % CHUNKS_PER_FILE,
+                text_length=len(text),
+                created_at=created_at,
+                access_tags=ACCESS_TAGS[file_no % len(ACCESS_TAGS)],
+                access_tag_source="retrieval_benchmarks",
+            ))
+        store.add_embeddings(
+            embeddings, metadata, texts,
+            chunk_ids=[f"bench-{idx}" for idx in range(start, start + n)],
+            file_hash=f"bench:{seed}",
+        )
+    manifest_path.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+    return Corpus(chunks, dimension, seed, str(db_path),
+                  round(time.perf_counter() - started, 3), False, store, embedder, manifest)
+
+
+# ============================================================================
+# Stage timing
+# ============================================================================
+
+def _stats(samples_ms: List[float]) -> Dict[str, Any]:
+    ordered = sorted(samples_ms)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "n": len(ordered),
+        "min_ms": round(ordered[0], 4),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(p95, 4),
+        "mean_ms": round(statistics.mean(ordered), 4),
+    }
+
+
+def _time(func: Callable[[], Any], repeat: int, samples: List[float]) -> Any:
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return result
+
+
+@contextmanager
+def _access_context(context: Dict[str, Any]) -> Iterator[None]:
+    from src.core.request_access import (
+        reset_request_access_context, set_request_access_context,
+    )
+
+    token = set_request_access_context(context)
+    try:
+        yield
+    finally:
+        reset_request_access_context(token)
+
+
+def _bench_config(dimension: int):
+    from src.core.config import Config
+
+    # Dataclass defaults, not the user's YAML, so runs are comparable.
+    config = Config()
+    config.mode = "offline"
+    config.embedding.dimension = dimension
+    config.retrieval.reranker_enabled = False
+    return config
+
+
+def bench_stages(
+    corpus: Corpus,
+    repeat: int = 5,
+    queries: tuple = _QUERIES,
+) -> Dict[str, Dict[str, Any]]:
+    """Time every retrieval stage over `queries`, `repeat` times each."""
+    from src.core import retriever as retriever_mod
+    from src.core.query_engine import QueryEngine, _qe_trim_context_to_fit
+
+    config = _bench_config(corpus.dimension)
+    engine = QueryEngine(config, corpus.store, corpus.embedder, StubLLMRouter(config))
+    retriever = engine.retriever
+    store = corpus.store
+    candidate_k = max(retriever.reranker_top_n, retriever.top_k * 4)
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    for query in queries:
+        # One untimed pass warms SQLite pages and the source-quality table.
+        engine.query(query)
+
+        q_vec = _time(lambda: corpus.embedder.embed_query(query), repeat, samples["query_embed"])
+        vector_hits = _time(
+            lambda: store.search(q_vec, top_k=candidate_k, block_rows=retriever.block_rows),
+            repeat, samples["vector_scan"],
+        )
+        fts_hits = _time(
+            lambda: store.fts_search(query, top_k=candidate_k),
+            repeat, samples["fts5"],
+        )
+        path_hits = _time(
+            lambda: store.source_path_search(query, top_k=candidate_k),
+            repeat, samples["path_search"],
+        )
+        keyword_hits = list(fts_hits) + [
+            h for h in path_hits
+            if (h["source_path"], h["chunk_index"])
+            not in {(f["source_path"], f["chunk_index"]) for f in fts_hits}
+        ]
+        fused = _time(
+            lambda: retriever._reciprocal_rank_fusion(vector_hits, keyword_hits),
+            repeat, samples["rrf_fusion"],
+        )
+        biased = _time(
+            lambda: retriever_mod._apply_source_quality_bias(retriever, fused),
+            repeat, samples["source_quality_bias"],
+        )
+        with _access_context(ACCESS_CONTEXT):
+            authorized = _time(
+                lambda: retriever_mod._apply_document_access_control(biased)[0],
+                repeat, samples["access_control"],
+            )
+        augmented = _time(
+            lambda: retriever._augment_with_adjacent_chunks(authorized),
+            repeat, samples["adjacent_augment"],
+        )
+        context = _time(
+            lambda: retriever.build_context(augmented),
+            repeat, samples["context_build"],
+        )
+        _time(
+            lambda: _qe_trim_context_to_fit(engine, context, query),
+            repeat, samples["context_trim"],
+        )
+        _time(lambda: retriever.search(query), repeat, samples["retriever_search"])
+        _time(lambda: engine.query(query), repeat, samples["query_end_to_end"])
+
+    return {stage: _stats(values) for stage, values in samples.items()}
+
+
+# ============================================================================
+# Suite runner and JSON output
+# ============================================================================
+
+def parse_sizes(raw: str) -> List[int]:
+    """'10k,100k,1m' or '2500' -> [10000, 100000, 1000000] / [2500]."""
+    sizes = []
+    for part in str(raw or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        sizes.append(SIZE_ALIASES.get(part) or int(part))
+    return sizes or list(DEFAULT_SIZES)
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(PROJ_ROOT),
+            capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() if out.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(
+    sizes: List[int],
+    workdir: Optional[Path] = None,
+    dimension: int = 768,
+    seed: int = DEFAULT_SEED,
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    """Build each corpus size, time every stage, and return the report dict."""
+    keep = workdir is not None
+    root = Path(workdir) if keep else Path(tempfile.mkdtemp(prefix="hybridrag_bench_"))
+    results: Dict[str, Any] = {}
+    try:
+        for size in sizes:
+            corpus = build_corpus(size, root, dimension, seed)
+            try:
+                stages = bench_stages(corpus, repeat=repeat)
+            finally:
+                corpus.store.close()
+            results[str(size)] = {
+                "chunks": size,
+                "corpus_build_s": corpus.build_s,
+                "corpus_reused": corpus.reused,
+                "stages": stages,
+            }
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+    return {
+        "schema": SCHEMA_VERSION,
+        "suite": "retrieval_hot_path",
+        "git_commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "dimension": dimension,
+            "seed": seed,
+            "repeat": repeat,
+            "queries": list(_QUERIES),
+            "chunks_per_file": CHUNKS_PER_FILE,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Median-to-median deltas for every (size, stage) present in both reports."""
+    rows = []
+    for size, entry in sorted(current.get("results", {}).items(), key=lambda kv: int(kv[0])):
+        base_entry = baseline.get("results", {}).get(size)
+        if not base_entry:
+            continue
+        for stage, stats in entry["stages"].items():
+            base = base_entry["stages"].get(stage)
+            if not base:
+                continue
+            before, after = base["median_ms"], stats["median_ms"]
+            rows.append({
+                "chunks": int(size),
+                "stage": stage,
+                "before_ms": before,
+                "after_ms": after,
+                "delta_pct": round((after - before) / before * 100, 1) if before else 0.0,
+            })
+    return rows
+
+
+def format_report(report: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    lines = [f"Retrieval hot path ({report.get('git_commit') or 'no git'})"]
+    for size, entry in sorted(report["results"].items(), key=lambda kv: int(kv[0])):
+        build = "reused" if entry["corpus_reused"] else f"built in {entry['corpus_build_s']:.1f}s"
+        lines.append(f"\n  {int(size):,} chunks ({build})")
+        lines.append(f"    {'stage':<22}{'median':>11}{'p95':>11}{'min':>11}")
+        for stage in STAGES:
+            s = entry["stages"][stage]
+            lines.append(
+                f"    {stage:<22}{s['median_ms']:>9.3f}ms{s['p95_ms']:>9.3f}ms{s['min_ms']:>9.3f}ms"
+            )
+    if comparison:
+        lines.append("\n  vs baseline (median)")
+        for row in comparison:
+            lines.append(
+                f"    {row['chunks']:>9,} {row['stage']:<22}"
+                f"{row['before_ms']:>9.3f} -> {row['after_ms']:>9.3f}ms  {row['delta_pct']:+.1f}%"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Offline per-stage retrieval benchmarks on a synthetic corpus.",
+    )
+    parser.add_argument("--sizes", default="10k",
+                        help="Comma list of corpus sizes: 10k, 100k, 1m or a number.")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query and stage.")
+    parser.add_argument("--workdir", default="",
+                        help="Keep corpora here and reuse them on later runs.")
+    parser.add_argument("--output", default="", help="Write the JSON report to this file.")
+    parser.add_argument("--compare", default="", help="Baseline JSON report to diff against.")
+    args = parser.parse_args(argv)
+
+    # Query logs go to stderr so stdout stays pure JSON.
+    with redirect_stdout(sys.stderr):
+        report = run_suite(
+            parse_sizes(args.sizes),
+            workdir=Path(args.workdir) if args.workdir else None,
+            dimension=args.dim,
+            seed=args.seed,
+            repeat=max(1, args.repeat),
+        )
+    comparison = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        comparison = compare_reports(baseline, report)
+        report["comparison"] = {"baseline_commit": baseline.get("git_commit", ""),
+                                "rows": comparison}
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+        print(format_report(report, comparison))
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -685,62 +685,70 @@ def main():
     logger = logging.getLogger("gui_launcher")
     _sanitize_tk_env()
 
-    # NOTE: _preload_thread is already running (started at module load).
-    # While we boot + load config + build the GUI (~2s), the Ollama
-    # embedder connection is being established in parallel.
+    from src.core.startup_profile import get_startup_profile
+    # The phase closes (and its import hook comes off) even if GUI
+    # construction raises.
+    with get_startup_profile().phase("gui") as startup:
+        # NOTE: _preload_thread is already running (started at module load).
+        # While we boot + load config + build the GUI (~2s), the Ollama
+        # embedder connection is being established in parallel.
+
+        # -- Step 1: Boot the system (lightweight -- config + creds + gate) --
+        _step("Step 1: boot_hybridrag()...")
+        startup.step("boot")
+        boot_result = None
+        config = None
 
-    # -- Step 1: Boot the system (lightweight -- config + creds + gate) --
-    _step("Step 1: boot_hybridrag()...")
-    boot_result = None
-    config = None
-
-    try:
-        from src.core.boot import boot_hybridrag
-        _step("Step 1a: boot module imported")
-        boot_result = boot_hybridrag()
-        _step("Step 1b: boot complete (success={})".format(
-            boot_result.success if boot_result else "None"))
-        if boot_result and not boot_result.success:
-            for err in boot_result.errors:
-                _step("  boot error: {}".format(err))
-    except Exception as e:
-        _step("Step 1 FAILED: {}".format(e))
-
-    # -- Step 2: Load config --
-    _step("Step 2: load_config()...")
-    try:
-        from src.core.config import load_config
-        config = load_config(_project_root)
-        _step("Step 2 done (mode={})".format(config.mode))
-    except Exception as e:
-        _step("Step 2 FAILED: {}".format(e))
-        from src.core.config import Config
-        config = Config()
-
-    # -- Step 2.5: First-run setup status (informational only) --
-    _step("Step 2.5: checking needs_setup()...")
-    from src.gui.panels.setup_wizard import needs_setup
-    wizard_needed = needs_setup(_project_root)
-    _step("Step 2.5: needs_setup = {}".format(wizard_needed))
-
-    # -- Step 3: Open GUI immediately --
-    _step("Step 3: creating HybridRAGApp...")
-    from src.gui.app import HybridRAGApp
-
-    app = HybridRAGApp(
-        boot_result=boot_result,
-        config=config,
-    )
-    _step("Step 3 done: GUI window created")
+        try:
+            from src.core.boot import boot_hybridrag
+            _step("Step 1a: boot module imported")
+            boot_result = boot_hybridrag()
+            _step("Step 1b: boot complete (success={})".format(
+                boot_result.success if boot_result else "None"))
+            if boot_result and not boot_result.success:
+                for err in boot_result.errors:
+                    _step("  boot error: {}".format(err))
+        except Exception as e:
+            _step("Step 1 FAILED: {}".format(e))
 
-    # -- Step 3.5/4: Always boot the GUI; never auto-launch the wizard --
-    if wizard_needed:
-        logger.warning(
-            "[LAUNCH:WIZARD] Setup appears incomplete, but automatic wizard "
-            "launch is disabled during startup so the main GUI can boot."
+        # -- Step 2: Load config --
+        _step("Step 2: load_config()...")
+        startup.step("config")
+        try:
+            from src.core.config import load_config
+            config = load_config(_project_root)
+            _step("Step 2 done (mode={})".format(config.mode))
+        except Exception as e:
+            _step("Step 2 FAILED: {}".format(e))
+            from src.core.config import Config
+            config = Config()
+
+        # -- Step 2.5: First-run setup status (informational only) --
+        _step("Step 2.5: checking needs_setup()...")
+        startup.step("setup_check")
+        from src.gui.panels.setup_wizard import needs_setup
+        wizard_needed = needs_setup(_project_root)
+        _step("Step 2.5: needs_setup = {}".format(wizard_needed))
+
+        # -- Step 3: Open GUI immediately --
+        _step("Step 3: creating HybridRAGApp...")
+        startup.step("window")
+        from src.gui.app import HybridRAGApp
+
+        app = HybridRAGApp(
+            boot_result=boot_result,
+            config=config,
         )
-        _step("Step 3.5: setup needed but startup wizard is skipped")
-    _start_backend_thread(app, logger)
+        _step("Step 3 done: GUI window created")
+
+        # -- Step 3.5/4: Always boot the GUI; never auto-launch the wizard --
+        if wizard_needed:
+            logger.warning(
+                "[LAUNCH:WIZARD] Setup appears incomplete, but automatic wizard "
+                "launch is disabled during startup so the main GUI can boot."
+            )
+            _step("Step 3.5: setup needed but startup wizard is skipped")
+        _start_backend_thread(app, logger)
 
     # -- Step 5: Run the GUI event loop --
     _step("Step 5: entering mainloop() -- GUI should be visible now")
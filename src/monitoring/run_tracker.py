@@ -15,6 +15,13 @@
 #       per-file stage events (scan, parse, chunk, embed, done, error).
 #       ETA uses exponential moving average of bytes/sec to smooth out
 #       OCR-heavy file spikes.
+#       Events go through a bounded queue to one background writer
+#       thread that owns a single connection and inserts them in
+#       batched transactions, so the indexing hot path never opens a
+#       connection or waits on an fsync. When the queue is full, events
+#       are dropped and counted (events_dropped) instead of blocking, as
+#       are events logged after close(). One atexit hook closes every
+#       tracker still open when the process exits.
 # USAGE: tracker = RunTracker(db_path)
 #        tracker.set_discovery_totals(files, bytes)
 #        tracker.mark_file_done(path, bytes, chars, chunks, embeds, ms)
@@ -28,17 +35,34 @@
 
 from __future__ import annotations
 
+import atexit
 import os
+import queue
 import sqlite3
+import threading
 import time
 import uuid
 import platform
 import getpass
+import weakref
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, Tuple
 
 
+# Trackers whose writer is still running; closed by one atexit hook so
+# short-lived trackers do not each leave an atexit entry behind.
+_LIVE_TRACKERS: "weakref.WeakSet[RunTracker]" = weakref.WeakSet()
+
+
+def _close_live_trackers() -> None:
+    for tracker in list(_LIVE_TRACKERS):
+        tracker.close()
+
+
+atexit.register(_close_live_trackers)
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat() + "Z"
 
@@ -102,10 +126,30 @@ class RunTracker:
     before schema refactors, and it remains stable for audits.
     """
 
-    def __init__(self, db_path: str):
+    _INSERT_EVENT_SQL = """
+        INSERT INTO doc_events (
+            run_id, ts, source_path, stage, message,
+            bytes_in, text_chars, chunks, embeddings, elapsed_ms
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db_path: str, queue_size: int = 10000,
+                 batch_size: int = 500, flush_interval_s: float = 0.5):
         self.db_path = db_path
         self.run_id = str(uuid.uuid4())
 
+        # Background event writer (see _writer_loop)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_s = max(0.01, float(flush_interval_s))
+        self._events: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._stats_lock = threading.Lock()
+        self.events_written = 0
+        self.events_dropped = 0
+        self.write_errors = 0
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self._stop_queued = False
+
         # Totals (we update these as we go)
         self.start_ts = time.time()
         self.files_total = 0
@@ -133,6 +177,14 @@ class RunTracker:
         # Create run row
         self._insert_run_row()
 
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            daemon=True,
+            name="hybridrag-run-tracker",
+        )
+        self._writer.start()
+        _LIVE_TRACKERS.add(self)
+
     # ------------------------------------------------------------------
     # SQLite helpers
     # ------------------------------------------------------------------
@@ -222,6 +274,109 @@ class RunTracker:
         finally:
             con.close()
 
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+
+    def _writer_loop(self) -> None:
+        """Drain the event queue into batched transactions until stopped."""
+        con = self._connect()
+        try:
+            while True:
+                try:
+                    item = self._events.get(timeout=self.flush_interval_s)
+                except queue.Empty:
+                    continue
+                rows = []
+                waiters = []
+                stop = False
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        rows.append(item)
+                    if stop or len(rows) >= self.batch_size:
+                        break
+                    try:
+                        item = self._events.get_nowait()
+                    except queue.Empty:
+                        break
+                if rows:
+                    self._write_batch(con, rows)
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            con.close()
+
+    def _write_batch(self, con: sqlite3.Connection, rows) -> None:
+        try:
+            with con:
+                con.executemany(self._INSERT_EVENT_SQL, rows)
+        except sqlite3.Error:
+            with self._stats_lock:
+                self.write_errors += 1
+            return
+        with self._stats_lock:
+            self.events_written += len(rows)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every event queued so far is committed."""
+        if self._writer is None or not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._events.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> bool:
+        """
+        Flush queued events and stop the writer thread (idempotent).
+
+        Later events are dropped and counted. Returns False if the writer
+        did not stop within timeout (the queue stayed full or the last
+        batches were still being written); calling close() again retries.
+        """
+        self._closed = True
+        writer = self._writer
+        if writer is None:
+            return True
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        if writer.is_alive() and not self._stop_queued:
+            try:
+                self._events.put(None, timeout=max(0.0, float(timeout)))
+            except queue.Full:
+                return False
+            self._stop_queued = True
+        writer.join(max(0.0, deadline - time.monotonic()))
+        if writer.is_alive():
+            return False
+        self._writer = None
+        _LIVE_TRACKERS.discard(self)
+        self._drop_unwritten()
+        return True
+
+    def _drop_unwritten(self) -> None:
+        """Count events that raced close() into the queue behind the stop marker."""
+        dropped = 0
+        while True:
+            try:
+                item = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                dropped += 1
+        if dropped:
+            with self._stats_lock:
+                self.events_dropped += dropped
+
     def _format_notes(self, snap: RunConfigSnapshot) -> str:
         """
         Store a readable snapshot.
@@ -272,31 +427,28 @@ class RunTracker:
         embeddings: Optional[int] = None,
         elapsed_ms: Optional[float] = None,
     ) -> None:
-        con = self._connect()
+        """Queue one doc_events row; never blocks (drops and counts if full or closed)."""
+        if self._closed:
+            with self._stats_lock:
+                self.events_dropped += 1
+            return
+        row = (
+            self.run_id,
+            utc_now_iso(),
+            source_path,
+            stage,
+            message,
+            bytes_in,
+            text_chars,
+            chunks,
+            embeddings,
+            elapsed_ms,
+        )
         try:
-            con.execute(
-                """
-                INSERT INTO doc_events (
-                    run_id, ts, source_path, stage, message,
-                    bytes_in, text_chars, chunks, embeddings, elapsed_ms
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    self.run_id,
-                    utc_now_iso(),
-                    source_path,
-                    stage,
-                    message,
-                    bytes_in,
-                    text_chars,
-                    chunks,
-                    embeddings,
-                    elapsed_ms,
-                ),
-            )
-            con.commit()
-        finally:
-            con.close()
+            self._events.put_nowait(row)
+        except queue.Full:
+            with self._stats_lock:
+                self.events_dropped += 1
 
     def mark_file_done(self, source_path: str, bytes_in: int, text_chars: int,
                        chunks_added: int, embeddings_added: int, elapsed_ms: float) -> None:
@@ -383,11 +535,15 @@ class RunTracker:
             "chunks_added": self.chunks_added,
             "embeddings_added": self.embeddings_added,
             "eta_seconds": eta,
+            "events_written": self.events_written,
+            "events_dropped": self.events_dropped,
         }
 
     def finish(self, status: str = "finished") -> None:
         """Mark this indexing run as complete in the database.
-        Called at the very end of indexing (or with status='failed' on crash)."""
+        Called at the very end of indexing (or with status='failed' on crash).
+        Queued events are flushed first and the writer thread is stopped."""
+        writer_stopped = self.close()
         con = self._connect()
         try:
             con.execute(
@@ -398,6 +554,17 @@ class RunTracker:
                 """,
                 (utc_now_iso(), status, self.run_id),
             )
+            if self.events_dropped or self.write_errors or not writer_stopped:
+                # Make an incomplete event history visible in the audit row.
+                con.execute(
+                    "UPDATE index_runs SET notes = COALESCE(notes, '') || ? WHERE run_id=?",
+                    (
+                        f"\nevents_dropped={self.events_dropped}"
+                        f"\nevent_write_errors={self.write_errors}"
+                        + ("" if writer_stopped else "\nevent_writer_timeout=1"),
+                        self.run_id,
+                    ),
+                )
             con.commit()
         finally:
             con.close()
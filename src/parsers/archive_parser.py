@@ -22,6 +22,14 @@
 #   5. Collect all text with archive member markers
 #   6. Clean up the temp directory
 #
+# PARALLEL PARSING AND PER-MEMBER SOURCES:
+#   Extracted members are parsed concurrently in a process pool
+#   (HYBRIDRAG_ARCHIVE_WORKERS, 0 = auto) and returned in archive order.
+#   Each member's SHA-256 is taken while it is extracted. parse_members()
+#   returns one ArchiveMember per file so the indexer can store each one
+#   as its own source ("archive.zip!/docs/member.pdf", see
+#   member_source_path()) and skip members whose hash has not changed.
+#
 # SAFETY FEATURES:
 #   - Max extraction size: won't extract files > 500 MB (zip bomb guard)
 #   - Max member count: won't process > 5000 files per archive
@@ -41,14 +49,17 @@
 from __future__ import annotations
 
 import gzip
+import hashlib
 import logging
 import os
 import shutil
 import tarfile
 import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +69,30 @@ _MAX_EXTRACT_BYTES = 500 * 1024 * 1024  # 500 MB per file
 _MAX_MEMBERS = 5000                      # max files to process per archive
 _SKIP_EXTENSIONS = {".zip", ".7z", ".rar", ".tar", ".tgz", ".gz", ".bz2", ".xz"}
 
+# "archive.zip" + MEMBER_SEPARATOR + "docs/member.pdf" = member source path
+MEMBER_SEPARATOR = "!/"
+
+
+def member_source_path(archive_path: str, member_name: str) -> str:
+    """Logical source path for one archive member ("archive.zip!/docs/a.pdf")."""
+    return f"{archive_path}{MEMBER_SEPARATOR}{member_name.replace(os.sep, '/')}"
+
+
+@dataclass
+class ArchiveMember:
+    """
+    One file inside an archive.
+
+    status is "parsed", "empty" (parser returned no text), "unsupported"
+    (no parser for the extension), "failed" or "unchanged" (skipped by
+    the caller's skip() check, not parsed).
+    """
+    name: str
+    sha256: str
+    status: str = "pending"
+    text: str = ""
+    parser: str = ""
+
 
 class ArchiveParser:
     """
@@ -73,9 +108,19 @@ class ArchiveParser:
         return text
 
     def parse_with_details(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
-        path = Path(file_path)
-        details: Dict[str, Any] = {
-            "file": str(path),
+        details = self._new_details(file_path)
+        members = self.parse_members(file_path, details)
+        parts = [
+            f"[ARCHIVE_MEMBER={m.name}]\n{m.text}" for m in members if m.status == "parsed"
+        ]
+        text = "\n\n".join(parts).strip()
+        details["total_chars"] = len(text)
+        return text, details
+
+    @staticmethod
+    def _new_details(file_path: str) -> Dict[str, Any]:
+        return {
+            "file": str(file_path),
             "parser": "ArchiveParser",
             "archive_type": None,
             "members_found": 0,
@@ -84,6 +129,24 @@ class ArchiveParser:
             "total_chars": 0,
         }
 
+    def parse_members(
+        self,
+        file_path: str,
+        details: Optional[Dict[str, Any]] = None,
+        skip: Optional[Callable[[str, str], bool]] = None,
+    ) -> List[ArchiveMember]:
+        """
+        Extract the archive and parse every supported member.
+
+        skip(member_name, sha256) -> True marks a member "unchanged" and
+        it is not parsed (the indexer passes a check against the hashes
+        it already stored). Members are parsed in a process pool and
+        returned in archive order. Errors are recorded in details.
+        """
+        path = Path(file_path)
+        if details is None:
+            details = self._new_details(file_path)
+
         ext = path.suffix.lower()
         # .tar.gz, .tar.bz2, .tar.xz have double suffixes
         if path.name.lower().endswith((".tar.gz", ".tar.bz2", ".tar.xz")):
@@ -95,34 +158,31 @@ class ArchiveParser:
 
             if ext == ".zip":
                 details["archive_type"] = "zip"
-                members = self._extract_zip(file_path, tmp_dir, details)
+                extracted = self._extract_zip(file_path, tmp_dir, details)
             elif ext in (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"):
                 details["archive_type"] = "tar"
-                members = self._extract_tar(file_path, tmp_dir, details)
+                extracted = self._extract_tar(file_path, tmp_dir, details)
             elif ext == ".gz":
                 details["archive_type"] = "gzip_single"
-                members = self._extract_gz_single(file_path, tmp_dir, details)
+                extracted = self._extract_gz_single(file_path, tmp_dir, details)
             else:
                 details["likely_reason"] = "UNSUPPORTED_ARCHIVE_FORMAT"
-                return "", details
+                return []
 
             # Parse each extracted file via the registry
-            parts = self._parse_members(members, details)
-            text = "\n\n".join(parts).strip()
-            details["total_chars"] = len(text)
-            return text, details
+            return self._parse_members(extracted, details, skip)
 
         except Exception as e:
             details["error"] = f"ARCHIVE_ERROR: {type(e).__name__}: {e}"
-            return "", details
+            return []
         finally:
             if tmp_dir and os.path.exists(tmp_dir):
                 shutil.rmtree(tmp_dir, ignore_errors=True)
 
     def _extract_zip(
         self, archive_path: str, tmp_dir: str, details: Dict
-    ) -> List[Tuple[str, str]]:
-        """Extract ZIP contents. Returns list of (member_name, extracted_path)."""
+    ) -> List[Tuple[str, str, str]]:
+        """Extract ZIP contents. Returns list of (member_name, extracted_path, sha256)."""
         members = []
         with zipfile.ZipFile(archive_path, "r") as zf:
             entries = zf.infolist()
@@ -159,9 +219,9 @@ class ArchiveParser:
                     counter += 1
 
                 try:
-                    with zf.open(entry) as src, open(dest, "wb") as dst:
-                        shutil.copyfileobj(src, dst)
-                    members.append((entry.filename, dest))
+                    with zf.open(entry) as src:
+                        digest = _copy_hashed(src, dest)
+                    members.append((entry.filename, dest, digest))
                 except Exception:
                     details["members_skipped"] = details.get("members_skipped", 0) + 1
 
@@ -169,7 +229,7 @@ class ArchiveParser:
 
     def _extract_tar(
         self, archive_path: str, tmp_dir: str, details: Dict
-    ) -> List[Tuple[str, str]]:
+    ) -> List[Tuple[str, str, str]]:
         """Extract TAR/TGZ/TBZ2/TXZ contents."""
         members = []
         with tarfile.open(archive_path, "r:*") as tf:
@@ -205,9 +265,8 @@ class ArchiveParser:
                     if src is None:
                         continue
                     try:
-                        with open(dest, "wb") as dst:
-                            shutil.copyfileobj(src, dst)
-                        members.append((entry.name, dest))
+                        digest = _copy_hashed(src, dest)
+                        members.append((entry.name, dest, digest))
                     finally:
                         src.close()
                 except Exception as e:
@@ -218,7 +277,7 @@ class ArchiveParser:
 
     def _extract_gz_single(
         self, archive_path: str, tmp_dir: str, details: Dict
-    ) -> List[Tuple[str, str]]:
+    ) -> List[Tuple[str, str, str]]:
         """Extract a single .gz file (not tar.gz)."""
         details["members_found"] = 1
         # Strip .gz to get the inner filename
@@ -228,41 +287,116 @@ class ArchiveParser:
         dest = os.path.join(tmp_dir, inner_name)
 
         try:
-            with gzip.open(archive_path, "rb") as src, open(dest, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-            return [(inner_name, dest)]
+            with gzip.open(archive_path, "rb") as src:
+                digest = _copy_hashed(src, dest)
+            return [(inner_name, dest, digest)]
         except Exception:
             details["members_skipped"] = 1
             return []
 
     def _parse_members(
-        self, members: List[Tuple[str, str]], details: Dict
-    ) -> List[str]:
-        """Route each extracted file to its parser and collect text."""
-        from .registry import REGISTRY
-
-        parts = []
-        for member_name, extracted_path in members:
-            ext = Path(extracted_path).suffix.lower()
-            info = REGISTRY.get(ext)
-            if info is None:
-                details["members_skipped"] = details.get("members_skipped", 0) + 1
+        self,
+        extracted: List[Tuple[str, str, str]],
+        details: Dict,
+        skip: Optional[Callable[[str, str], bool]] = None,
+    ) -> List[ArchiveMember]:
+        """Parse extracted files (in a process pool when worthwhile), in archive order."""
+        members: List[ArchiveMember] = []
+        todo: List[Tuple[ArchiveMember, str]] = []
+        for member_name, extracted_path, digest in extracted:
+            member = ArchiveMember(name=member_name, sha256=digest)
+            members.append(member)
+            if skip is not None and skip(member_name, digest):
+                member.status = "unchanged"
+                details["members_unchanged"] = details.get("members_unchanged", 0) + 1
                 continue
-
-            try:
-                parser = info.parser_cls()
-                if hasattr(parser, "parse_with_details"):
-                    text, _ = parser.parse_with_details(extracted_path)
-                else:
-                    text = parser.parse(extracted_path)
-
-                text = (text or "").strip()
-                if text:
-                    parts.append(f"[ARCHIVE_MEMBER={member_name}]\n{text}")
-                    details["members_parsed"] = details.get("members_parsed", 0) + 1
-                else:
-                    details["members_skipped"] = details.get("members_skipped", 0) + 1
-            except Exception:
+            todo.append((member, extracted_path))
+
+        workers = min(_archive_worker_count(), len(todo))
+        details["workers"] = workers
+        results = None
+        if workers > 1:
+            results = self._parse_in_pool(todo, workers, details)
+        if results is None:
+            details["executor"] = "inline"
+            results = [_parse_member_file(path) for _, path in todo]
+
+        for (member, _), (status, text, parser_name) in zip(todo, results):
+            member.status, member.text, member.parser = status, text, parser_name
+            if status == "parsed":
+                details["members_parsed"] = details.get("members_parsed", 0) + 1
+            else:
                 details["members_skipped"] = details.get("members_skipped", 0) + 1
+        return members
+
+    @staticmethod
+    def _parse_in_pool(todo, workers: int, details: Dict):
+        """Parse members on a process pool; None if the pool cannot be used."""
+        try:
+            executor = _make_member_executor(workers)
+        except Exception as e:
+            details["executor_error"] = type(e).__name__
+            return None
+        try:
+            results = list(executor.map(_parse_member_file, [path for _, path in todo]))
+            details["executor"] = "process_pool"
+            return results
+        except Exception as e:
+            # A crashed worker (BrokenProcessPool) or unpicklable result:
+            # redo the whole batch in-process rather than lose members.
+            details["executor_error"] = type(e).__name__
+            return None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _copy_hashed(src, dest: str) -> str:
+    """Copy a member stream to dest and return its SHA-256 hex digest."""
+    sha = hashlib.sha256()
+    with open(dest, "wb") as dst:
+        while True:
+            block = src.read(1024 * 1024)
+            if not block:
+                break
+            sha.update(block)
+            dst.write(block)
+    return sha.hexdigest()
 
-        return parts
+
+def _archive_worker_count() -> int:
+    """Member parser processes (HYBRIDRAG_ARCHIVE_WORKERS, 0=auto)."""
+    try:
+        configured = int(os.getenv("HYBRIDRAG_ARCHIVE_WORKERS", "0") or 0)
+    except ValueError:
+        configured = 0
+    if configured > 0:
+        return configured
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _make_member_executor(workers: int):
+    """Create the process pool used for member parsing (separate for testing)."""
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _parse_member_file(extracted_path: str) -> Tuple[str, str, str]:
+    """
+    Parse one extracted member; returns (status, text, parser_name).
+
+    Module-level so it can run in a worker process. Never raises.
+    """
+    from .registry import REGISTRY
+
+    info = REGISTRY.get(Path(extracted_path).suffix.lower())
+    if info is None:
+        return "unsupported", "", ""
+    try:
+        parser = info.parser_cls()
+        if hasattr(parser, "parse_with_details"):
+            text, _ = parser.parse_with_details(extracted_path)
+        else:
+            text = parser.parse(extracted_path)
+    except Exception:
+        return "failed", "", info.name
+    text = (text or "").strip()
+    return ("parsed" if text else "empty"), text, info.name
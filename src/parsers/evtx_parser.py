@@ -29,7 +29,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .segments import TextSegment
 
 
 class EvtxParser:
@@ -50,8 +52,20 @@ class EvtxParser:
         return text
 
     def parse_with_details(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        details: Dict[str, Any] = {}
+        parts = [segment.text for segment in self.parse_iter(file_path, details)]
+        full = "\n".join(parts).strip()
+        details["total_len"] = len(full)
+        return full, details
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """Yield the log header, then one segment per event record."""
         path = Path(file_path)
-        details: Dict[str, Any] = {"file": str(path), "parser": "EvtxParser"}
+        if details is None:
+            details = {}
+        details.update({"file": str(path), "parser": "EvtxParser"})
 
         try:
             import Evtx.Evtx as evtx
@@ -60,36 +74,33 @@ class EvtxParser:
             details["error"] = (
                 f"IMPORT_ERROR: {e}. Install with: pip install python-evtx"
             )
-            return "", details
+            return
 
-        parts: List[str] = [f"Windows Event Log: {path.name}"]
+        yield TextSegment(f"Windows Event Log: {path.name}", kind="header")
         event_count = 0
+        details["events"] = 0
 
         try:
             with evtx.Evtx(str(path)) as log:
                 for record in log.records():
                     if event_count >= self.MAX_EVENTS:
-                        parts.append(
-                            f"\n... truncated at {self.MAX_EVENTS} events"
+                        yield TextSegment(
+                            f"\n... truncated at {self.MAX_EVENTS} events", kind="note",
                         )
                         break
                     event_count += 1
+                    details["events"] = event_count
                     try:
                         xml = record.xml()
                         # Extract key fields from XML
                         text = _extract_event_text(xml)
-                        if text:
-                            parts.append(text)
                     except Exception:
-                        pass  # Skip malformed records
+                        continue  # Skip malformed records
+                    if text:
+                        yield TextSegment(text, kind="record", locator=event_count)
         except Exception as e:
             details["error"] = f"RUNTIME_ERROR: {e}"
 
-        full = "\n".join(parts).strip()
-        details["total_len"] = len(full)
-        details["events"] = event_count
-        return full, details
-
 
 def _extract_event_text(xml_str: str) -> str:
     """Extract key fields from an event XML record as plain text."""
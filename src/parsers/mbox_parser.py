@@ -29,7 +29,9 @@ import email
 import logging
 import mailbox
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .segments import TextSegment
 
 logger = logging.getLogger(__name__)
 
@@ -52,17 +54,30 @@ class MboxParser:
         return text
 
     def parse_with_details(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        details: Dict[str, Any] = {}
+        parts = [segment.text for segment in self.parse_iter(file_path, details)]
+        full = "\n".join(parts).strip()
+        details["total_len"] = len(full)
+        return full, details
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """Yield the archive header, then one segment per message."""
         path = Path(file_path)
-        details: Dict[str, Any] = {"file": str(path), "parser": "MboxParser"}
+        if details is None:
+            details = {}
+        details.update({"file": str(path), "parser": "MboxParser"})
 
         try:
             mbox = mailbox.mbox(str(path))
         except Exception as e:
             details["error"] = f"RUNTIME_ERROR: Cannot read mbox: {e}"
-            return "", details
+            return
 
-        parts: List[str] = [f"Email Archive: {path.name}"]
+        yield TextSegment(f"Email Archive: {path.name}", kind="header")
         msg_count = 0
+        details["messages"] = 0
 
         try:
             for message in mbox:
@@ -71,12 +86,13 @@ class MboxParser:
                         "[WARN] mbox file truncated: %d messages exceeded cap of %d",
                         msg_count, self.MAX_MESSAGES,
                     )
-                    parts.append(
-                        f"\n... truncated at {self.MAX_MESSAGES} messages"
+                    yield TextSegment(
+                        f"\n... truncated at {self.MAX_MESSAGES} messages", kind="note",
                     )
                     break
                 msg_count += 1
-                parts.append(f"\n--- Message {msg_count} ---")
+                details["messages"] = msg_count
+                parts: List[str] = [f"\n--- Message {msg_count} ---"]
 
                 for header in ["From", "To", "Subject", "Date"]:
                     val = message.get(header, "")
@@ -87,14 +103,10 @@ class MboxParser:
                 body = _get_email_body(message)
                 if body:
                     parts.append(body[:5000])  # Cap body length
+                yield TextSegment("\n".join(parts), kind="message", locator=msg_count)
         except Exception as e:
             details["error"] = f"PARSE_ERROR: {e}"
 
-        full = "\n".join(parts).strip()
-        details["total_len"] = len(full)
-        details["messages"] = msg_count
-        return full, details
-
 
 def _decode_payload(part) -> str:
     """Decode email part payload using the declared charset."""
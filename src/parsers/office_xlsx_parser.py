@@ -41,12 +41,15 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Tuple, Dict, Any
+from typing import Any, Dict, Iterator, Optional, Tuple
 from datetime import datetime, date
 
+from .segments import TextSegment
+
 logger = logging.getLogger(__name__)
 
 _MAX_ROWS_PER_SHEET = 100_000
+_ROWS_PER_SEGMENT = 500  # parse_iter() yields a sheet in slices of this many rows
 
 
 def _cell_to_text(value: Any) -> str:
@@ -75,29 +78,50 @@ class XlsxParser:
         return text
 
     def parse_with_details(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        details: Dict[str, Any] = {}
+        parts = [segment.text for segment in self.parse_iter(file_path, details)]
+        if details.get("error"):
+            # A workbook that fails part-way is reported as unreadable.
+            return "", details
+        full = "\n".join(parts).strip()
+        details["total_len"] = len(full)
+        return full, details
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """
+        Yield each sheet as a series of segments of up to
+        _ROWS_PER_SEGMENT rows (locator = sheet name), so a 100K-row
+        sheet is never held in memory as one string.
+        """
         path = Path(file_path)
-        details: Dict[str, Any] = {"file": str(path), "parser": "XlsxParser"}
+        if details is None:
+            details = {}
+        details.update({"file": str(path), "parser": "XlsxParser"})
 
         try:
             import openpyxl
         except Exception as e:
             details["error"] = f"IMPORT_ERROR: {type(e).__name__}: {e}"
-            return "", details
+            return
 
         try:
             # data_only=True reads the computed VALUES of formulas (not the
             # formula text). read_only=True prevents loading the entire file
             # into memory at once (important for huge spreadsheets).
             wb = openpyxl.load_workbook(str(path), data_only=True, read_only=True)
+        except Exception as e:
+            details["error"] = f"RUNTIME_ERROR: {type(e).__name__}: {e}"
+            return
 
-            parts = []
-            sheets = 0
-            rows_emitted = 0
-
+        details["sheets"] = 0
+        details["rows_emitted"] = 0
+        try:
             for sheet_name in wb.sheetnames:
                 ws = wb[sheet_name]
-                sheets += 1
-                parts.append(f"[SHEET] {sheet_name}")
+                details["sheets"] += 1
+                parts = [f"[SHEET] {sheet_name}"]
                 header = None
                 header_row_idx = None
 
@@ -116,10 +140,10 @@ class XlsxParser:
 
                     row_count += 1
                     if row_count >= _MAX_ROWS_PER_SHEET:
-                        logger.warning("[WARN] XLSX sheet '%s' truncated at %d rows", sheet.title, _MAX_ROWS_PER_SHEET)
+                        logger.warning("[WARN] XLSX sheet '%s' truncated at %d rows", sheet_name, _MAX_ROWS_PER_SHEET)
                         break
 
-                    rows_emitted += 1
+                    details["rows_emitted"] += 1
                     # Always include raw row for exact matching.
                     parts.append(f"[ROW {ridx}] " + " | ".join(vals))
 
@@ -135,16 +159,15 @@ class XlsxParser:
                         if keyed:
                             parts.append(f"[ROW_KV {ridx}] " + " ; ".join(keyed))
 
+                    if row_count % _ROWS_PER_SEGMENT == 0:
+                        yield TextSegment("\n".join(parts), kind="sheet", locator=sheet_name)
+                        parts = []
+
                 if header_row_idx is not None:
                     parts.append(f"[SHEET_SUMMARY] header_row={header_row_idx}")
-
-            full = "\n".join(parts).strip()
-            details["total_len"] = len(full)
-            details["sheets"] = sheets
-            details["rows_emitted"] = rows_emitted
-
-            wb.close()
-            return full, details
+                if parts:
+                    yield TextSegment("\n".join(parts), kind="sheet", locator=sheet_name)
         except Exception as e:
             details["error"] = f"RUNTIME_ERROR: {type(e).__name__}: {e}"
-            return "", details
+        finally:
+            wb.close()
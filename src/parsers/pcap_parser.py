@@ -29,7 +29,9 @@ from __future__ import annotations
 
 import struct
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .segments import TextSegment
 
 
 class PcapParser:
@@ -50,8 +52,25 @@ class PcapParser:
         return text
 
     def parse_with_details(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        details: Dict[str, Any] = {}
+        parts = [segment.text for segment in self.parse_iter(file_path, details)]
+        full = "\n".join(parts).strip()
+        details["total_len"] = len(full)
+        return full, details
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """
+        Yield the capture header, then the traffic summary.
+
+        Packets are read one at a time and only counters are kept, so
+        the summary is the single segment that follows the header.
+        """
         path = Path(file_path)
-        details: Dict[str, Any] = {"file": str(path), "parser": "PcapParser"}
+        if details is None:
+            details = {}
+        details.update({"file": str(path), "parser": "PcapParser"})
 
         try:
             import dpkt
@@ -59,7 +78,7 @@ class PcapParser:
             details["error"] = (
                 f"IMPORT_ERROR: {e}. Install with: pip install dpkt"
             )
-            return "", details
+            return
 
         try:
             with open(str(path), "rb") as f:
@@ -71,19 +90,23 @@ class PcapParser:
                         pcap = dpkt.pcapng.Reader(f)
                     except Exception as e:
                         details["error"] = f"RUNTIME_ERROR: Not a valid pcap: {e}"
-                        return "", details
+                        return
 
-                return self._analyze(pcap, path, details)
+                summary = self._analyze(pcap, details)
         except Exception as e:
             details["error"] = f"RUNTIME_ERROR: {e}"
-            return "", details
+            return
+
+        yield TextSegment(f"Network Capture: {path.name}", kind="header")
+        yield TextSegment("\n".join(summary), kind="summary")
 
-    def _analyze(self, pcap, path, details) -> Tuple[str, Dict[str, Any]]:
+    def _analyze(self, pcap, details) -> List[str]:
+        """Count packets, protocols and addresses; return the summary lines."""
         import dpkt
         from collections import Counter
         import socket
 
-        parts: List[str] = [f"Network Capture: {path.name}"]
+        parts: List[str] = []
         pkt_count = 0
         protos: Counter = Counter()
         src_ips: Counter = Counter()
@@ -159,7 +182,5 @@ class PcapParser:
                 f"{ip}({c})" for ip, c in top_dst
             ))
 
-        full = "\n".join(parts).strip()
-        details["total_len"] = len(full)
         details["packets"] = pkt_count
-        return full, details
+        return parts
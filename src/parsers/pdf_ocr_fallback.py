@@ -26,14 +26,27 @@
 #   By keeping OCR in a separate file, the rest of HybridRAG works fine
 #   even if these tools are missing. PDFs that don't need OCR still index.
 #
+# SPEED:
+#   - Pages are rendered in batches: one poppler call per batch instead
+#     of re-opening and re-parsing the PDF for every page
+#   - Tesseract runs on several pages at once in a process pool
+#     (HYBRIDRAG_OCR_WORKERS), and the batch size is capped so rendered
+#     page images stay within HYBRIDRAG_OCR_MEMORY_MB
+#   - Results are put back in page order before the text is joined
+#
 # SAFETY FEATURES:
 #   - Per-page timeout: If one page takes too long, we skip it and move on
+#     (Tesseract itself is killed after timeout_s, see pytesseract timeout)
 #   - Max pages limit: Don't try to OCR a 10,000-page document
 #   - Graceful failure: If OCR tools are missing, returns empty text + reason
-#   - Thread isolation: OCR runs in a separate thread so timeouts actually work
+#   - Process isolation: a crashing/hung Tesseract cannot take down indexing;
+#     if worker processes cannot be started, pages are OCR'd in-process
 #
 # CONFIGURATION (via environment variables):
 #   HYBRIDRAG_OCR_TRIGGER_MIN_CHARS = 20    (OCR if normal extraction < this)
+#   HYBRIDRAG_OCR_PAGE_MIN_CHARS = 20       (per page: OCR pages below this in mixed PDFs)
+#   HYBRIDRAG_OCR_SELECTIVE = 1             (OCR only text-less pages of mixed PDFs)
+#   HYBRIDRAG_OCR_STREAM_HOLD_PAGES = 32    (streamed PDFs: text pages held behind a page awaiting OCR)
 #   HYBRIDRAG_OCR_MAX_PAGES = 200           (don't OCR more than this)
 #   HYBRIDRAG_OCR_DPI = 200                 (image quality -- higher = slower)
 #   HYBRIDRAG_OCR_TIMEOUT_S = 20            (seconds per page before giving up)
@@ -44,14 +57,18 @@
 #   HYBRIDRAG_OCR_BINARIZE = 1             (black/white threshold: 1=on, 0=off)
 #   HYBRIDRAG_OCR_BIN_THRESHOLD = 130      (binarization cutoff: 0-255)
 #   HYBRIDRAG_OCR_PSM = 3                  (Tesseract page segmentation mode: 3=auto)
+#   HYBRIDRAG_OCR_WORKERS = 0              (parallel Tesseract processes: 0=auto, max 4)
+#   HYBRIDRAG_OCR_MEMORY_MB = 512          (budget for rendered page images per batch)
 #
 # INTERNET ACCESS: None -- purely local processing
 # ============================================================================
 
+import math
 import os
+import re
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from typing import Tuple, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Tuple, Dict, Any, List, Optional
 
 
 # ============================================================================
@@ -209,12 +226,12 @@ def _preprocess_for_ocr(pil_image):
 # Single Page OCR: Convert one page image to text
 # ============================================================================
 
-def _ocr_page_image_to_text(pil_image, lang: str) -> str:
+def _ocr_page_image_to_text(pil_image, lang: str, timeout_s: int = 0) -> str:
     """
     Preprocess and OCR a single page image, returning extracted text.
 
-    This function runs inside a thread with a timeout, so if Tesseract
-    hangs on a complex page, the main process can kill it and move on.
+    timeout_s is handed to pytesseract, which kills the Tesseract process
+    and raises RuntimeError if a complex page takes too long.
 
     Pipeline:
       1. Preprocess image (grayscale, contrast, sharpen, binarize)
@@ -245,7 +262,66 @@ def _ocr_page_image_to_text(pil_image, lang: str) -> str:
     tess_config = f"--oem 1 --psm {psm}"
 
     # Run OCR and return the text
-    return pytesseract.image_to_string(cleaned, lang=lang, config=tess_config) or ""
+    return pytesseract.image_to_string(
+        cleaned, lang=lang, config=tess_config, timeout=max(0, int(timeout_s or 0)),
+    ) or ""
+
+
+def _ocr_page_worker(page_num: int, pil_image, lang: str, timeout_s: int) -> Tuple[int, str, str]:
+    """
+    OCR one page inside a worker process.
+
+    Returns (page_num, status, text) where status is "ok", "timeout" or
+    "failed". Never raises, so one bad page cannot break the pool.
+    """
+    try:
+        return page_num, "ok", _ocr_page_image_to_text(pil_image, lang, timeout_s)
+    except RuntimeError as e:
+        if "timeout" in str(e).lower():
+            return page_num, "timeout", ""
+        return page_num, "failed", ""
+    except Exception:
+        return page_num, "failed", ""
+
+
+# ============================================================================
+# Parallelism + memory budget
+# ============================================================================
+
+def _ocr_worker_count() -> int:
+    """Number of Tesseract worker processes (HYBRIDRAG_OCR_WORKERS, 0=auto)."""
+    configured = _get_int_env("HYBRIDRAG_OCR_WORKERS", 0)
+    if configured > 0:
+        return configured
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _render_batch_pages(dpi: int, workers: int) -> int:
+    """
+    How many pages to rasterize per poppler call.
+
+    A US-letter page at `dpi` is about (8.5*dpi) x (11*dpi) RGB pixels;
+    we count it twice (the rendered image plus the copy sent to a worker)
+    against HYBRIDRAG_OCR_MEMORY_MB. At least one page per worker is
+    rendered when the budget allows, never more than 32 at a time.
+    """
+    budget_mb = max(64, _get_int_env("HYBRIDRAG_OCR_MEMORY_MB", 512))
+    page_mb = (8.5 * dpi) * (11 * dpi) * 3 * 2 / (1024 * 1024)
+    by_memory = int(budget_mb // max(page_mb, 1.0))
+    return max(1, min(32, by_memory, max(workers * 2, 1)))
+
+
+def _make_ocr_executor(workers: int):
+    """Create the process pool used for Tesseract (separate for testing)."""
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _pdf_page_count(pdf_path: str, poppler_bin: Optional[str]) -> Optional[int]:
+    try:
+        from pdf2image import pdfinfo_from_path
+        return int(pdfinfo_from_path(pdf_path, poppler_path=poppler_bin).get("Pages", 0)) or None
+    except Exception:
+        return None
 
 
 # ============================================================================
@@ -259,17 +335,18 @@ def ocr_pdf_pages(
     dpi: int,
     timeout_s: int,
     lang: str,
+    pages: Optional[List[int]] = None,
 ) -> Tuple[str, Dict[str, Any]]:
     """
-    OCR a PDF file page by page and return the combined text.
+    OCR a PDF file (or only the listed pages) and return the combined text.
 
     How the pipeline works:
-        For each page (up to max_pages):
-            1. Convert the PDF page to a PNG image using pdf2image + Poppler
-            2. Send the image to Tesseract OCR in a separate thread
-            3. Wait up to timeout_s seconds for the result
-            4. If the page times out, skip it and continue with the next page
-            5. Collect all extracted text with page markers
+        For each batch of pages (up to max_pages in total):
+            1. Render the whole batch to images in one pdf2image/Poppler call
+            2. Send every page image to the Tesseract worker pool
+            3. Each page gets timeout_s seconds; a page that times out or
+               crashes is skipped and the rest continue
+        Then the page texts are joined in page order.
 
     The output text includes page markers like [OCR_PAGE=1] so you can
     tell which text came from which page.
@@ -280,6 +357,9 @@ def ocr_pdf_pages(
         dpi:        Image quality (200 = good balance of speed/accuracy)
         timeout_s:  Seconds to wait per page before giving up
         lang:       OCR language code (e.g., "eng" for English)
+        pages:      Optional 1-based page numbers to OCR (e.g. only the
+                    pages of a mixed PDF that have no text layer); at
+                    most max_pages of them are processed
 
     Returns:
         Tuple of (combined_text, stats_dictionary)
@@ -292,6 +372,9 @@ def ocr_pdf_pages(
     # Poppler is required by pdf2image to render PDF pages as images
     poppler_bin = _get_str_env("HYBRIDRAG_POPPLER_BIN", "") or None
 
+    workers = _ocr_worker_count()
+    batch_pages = _render_batch_pages(dpi, workers)
+
     # Initialize statistics for diagnostics
     details: Dict[str, Any] = {
         "enabled": True,
@@ -299,6 +382,11 @@ def ocr_pdf_pages(
         "dpi": dpi,
         "max_pages": max_pages,
         "timeout_s": timeout_s,
+        "workers": workers,
+        "batch_pages": batch_pages,
+        "executor": "inline",      # "process_pool" when workers > 1
+        "render_batches": 0,       # Poppler invocations
+        "render_s": 0.0,           # Time spent rasterizing
         "pages_attempted": 0,      # How many pages we tried
         "pages_successful": 0,     # How many returned text
         "pages_timed_out": 0,      # How many exceeded the timeout
@@ -307,57 +395,166 @@ def ocr_pdf_pages(
         "runtime_s": None,         # Total wall-clock time
     }
 
-    parts = []        # Collected text from each successful page
+    page_texts: Dict[int, str] = {}  # page number -> OCR text
     t0 = time.time()  # Start the overall timer
 
-    # Process pages one at a time (not all at once) to control memory
-    for page_num in range(1, max_pages + 1):
-        details["pages_attempted"] += 1
+    page_count = _pdf_page_count(pdf_path, poppler_bin)
+    last_page = min(max_pages, page_count) if page_count else max_pages
+    if pages is None:
+        ranges = [
+            (first, min(first + batch_pages - 1, last_page))
+            for first in range(1, last_page + 1, batch_pages)
+        ]
+        total_pages = last_page
+    else:
+        wanted = sorted({int(n) for n in pages if int(n) >= 1})
+        if page_count:
+            wanted = [n for n in wanted if n <= page_count]
+        wanted = wanted[:max_pages]
+        ranges = _page_ranges(wanted, batch_pages)
+        total_pages = len(wanted)
+
+    executor = None
+    if workers > 1 and total_pages > 1:
         try:
-            # STEP 1: Convert this single PDF page to a PNG image
-            # We do one page at a time to avoid loading a huge PDF into RAM
-            images = convert_from_path(
-                pdf_path,
-                dpi=dpi,                    # Image resolution (pixels per inch)
-                first_page=page_num,        # Only convert this page
-                last_page=page_num,
-                poppler_path=poppler_bin,   # Path to Poppler tools
-                fmt="png",                  # Output format
-                thread_count=1,             # Single thread for stability
-            )
-            # If no images returned, we've gone past the end of the PDF
+            executor = _make_ocr_executor(workers)
+            details["executor"] = "process_pool"
+        except Exception as e:
+            details["executor_error"] = type(e).__name__
+
+    try:
+        for first, last in ranges:
+            try:
+                # STEP 1: Rasterize this page range in one poppler run
+                t_render = time.time()
+                images = convert_from_path(
+                    pdf_path,
+                    dpi=dpi,                    # Image resolution (pixels per inch)
+                    first_page=first,
+                    last_page=last,
+                    poppler_path=poppler_bin,   # Path to Poppler tools
+                    fmt="png",                  # Output format
+                    thread_count=min(workers, last - first + 1),
+                )
+                details["render_batches"] += 1
+                details["render_s"] += time.time() - t_render
+            except Exception:
+                # The whole range failed to render -- count and move on
+                details["pages_attempted"] += last - first + 1
+                details["pages_failed"] += last - first + 1
+                continue
+
+            # No images means we've gone past the end of the PDF
             if not images:
                 break
 
-            img = images[0]  # The rendered page image
-
-            # STEP 2: Run OCR in a separate thread with a timeout
-            # ThreadPoolExecutor lets us set a time limit on the OCR
-            # If Tesseract takes longer than timeout_s, we give up on this page
-            with ThreadPoolExecutor(max_workers=1) as ex:
-                fut = ex.submit(_ocr_page_image_to_text, img, lang)
-                try:
-                    page_text = fut.result(timeout=timeout_s)
-                except FuturesTimeoutError:
-                    # This page took too long -- skip it and continue
-                    details["pages_timed_out"] += 1
-                    continue
+            page_images = list(zip(range(first, first + len(images)), images))
+            details["pages_attempted"] += len(page_images)
 
-            # STEP 3: Collect the extracted text
-            page_text = (page_text or "").strip()
-            if page_text:
-                details["pages_successful"] += 1
-                details["total_chars"] += len(page_text)
-                # Add a page marker so we know where this text came from
-                parts.append(f"\n\n[OCR_PAGE={page_num}]\n{page_text}")
+            # STEP 2: OCR the batch (in parallel when a pool is available)
+            results, executor = _ocr_batch(page_images, lang, timeout_s, executor, workers, details)
+            del images, page_images
 
-        except Exception:
-            # This page crashed OCR -- skip it and continue
-            details["pages_failed"] += 1
-            continue
+            # STEP 3: Collect the extracted text
+            for page_num, status, page_text in results:
+                if status == "timeout":
+                    details["pages_timed_out"] += 1
+                    continue
+                if status != "ok":
+                    details["pages_failed"] += 1
+                    continue
+                page_text = (page_text or "").strip()
+                if page_text:
+                    details["pages_successful"] += 1
+                    details["total_chars"] += len(page_text)
+                    page_texts[page_num] = page_text
+
+            # A short batch means poppler ran out of pages
+            if last - first + 1 > len(results):
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     # Record total time
+    details["render_s"] = round(details["render_s"], 3)
     details["runtime_s"] = round(time.time() - t0, 3)
 
-    # Combine all page texts into one string
+    # Combine all page texts into one string, in page order, with a page
+    # marker so we know where each text came from
+    parts = [f"\n\n[OCR_PAGE={n}]\n{page_texts[n]}" for n in sorted(page_texts)]
     return "".join(parts).strip(), details
+
+
+_OCR_PAGE_MARKER_RE = re.compile(r"(?:^|\n\n)\[OCR_PAGE=(\d+)\]\n")
+
+
+def split_ocr_pages(ocr_text: str) -> Dict[int, str]:
+    """Split ocr_pdf_pages() output back into {page_number: text}."""
+    pieces = _OCR_PAGE_MARKER_RE.split(ocr_text or "")
+    return {
+        int(pieces[i]): pieces[i + 1].strip()
+        for i in range(1, len(pieces) - 1, 2)
+        if pieces[i + 1].strip()
+    }
+
+
+def _page_ranges(page_numbers: List[int], batch_pages: int) -> List[Tuple[int, int]]:
+    """Group sorted page numbers into consecutive (first, last) render ranges."""
+    ranges: List[Tuple[int, int]] = []
+    for n in page_numbers:
+        if ranges and n == ranges[-1][1] + 1 and n - ranges[-1][0] < batch_pages:
+            ranges[-1] = (ranges[-1][0], n)
+        else:
+            ranges.append((n, n))
+    return ranges
+
+
+def _ocr_batch(
+    pages: List[Tuple[int, Any]],
+    lang: str,
+    timeout_s: int,
+    executor,
+    workers: int,
+    details: Dict[str, Any],
+):
+    """
+    OCR one rendered batch; returns ([(page_num, status, text)], executor).
+
+    With a pool, every page is submitted at once and results are read in
+    page order. Each page keeps its own timeout inside the worker; the
+    wait here is a backstop sized for the pages queued ahead of it. If
+    the pool breaks, the remaining pages fall back to in-process OCR and
+    the executor is dropped for the rest of the document.
+    """
+    if executor is None:
+        return [_ocr_page_worker(n, img, lang, timeout_s) for n, img in pages], None
+
+    try:
+        futures = [
+            (n, img, executor.submit(_ocr_page_worker, n, img, lang, timeout_s))
+            for n, img in pages
+        ]
+    except Exception as e:
+        details["executor_error"] = type(e).__name__
+        details["executor"] = "inline"
+        executor.shutdown(wait=False, cancel_futures=True)
+        return [_ocr_page_worker(n, img, lang, timeout_s) for n, img in pages], None
+
+    rounds = math.ceil(len(futures) / max(workers, 1))
+    deadline = time.time() + (max(timeout_s, 1) + 5) * (rounds + 1)
+    results = []
+    for n, img, fut in futures:
+        try:
+            results.append(fut.result(timeout=max(0.0, deadline - time.time())))
+        except FuturesTimeoutError:
+            fut.cancel()
+            results.append((n, "timeout", ""))
+        except Exception as e:
+            if executor is not None:
+                details["executor_error"] = type(e).__name__
+                details["executor"] = "inline"
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = None
+            results.append(_ocr_page_worker(n, img, lang, timeout_s))
+    return results, executor
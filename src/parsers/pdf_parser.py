@@ -30,6 +30,8 @@
 #   Step 1: Try pypdf (fast, handles most digital PDFs)
 #   Step 2: If pypdf fails or gets no text -> try pdfplumber (more robust)
 #   Step 3: If both fail or get very little text -> trigger OCR fallback
+#           If only SOME pages lack text (mixed PDF) -> OCR just those
+#           pages and merge them back in page order
 #   Step 4: OCR converts page images to text using Tesseract
 #   Step 5: Return whatever text we got + detailed diagnostic info
 #
@@ -51,7 +53,7 @@
 # ============================================================================
 
 import os
-from typing import Tuple, Dict, Any
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 # Import OCR fallback utilities from our companion module
 from .pdf_ocr_fallback import (
@@ -59,7 +61,9 @@ from .pdf_ocr_fallback import (
     _get_str_env,       # Read string from environment variable (with default)
     ocr_deps_available, # Check if Tesseract + pdf2image are installed
     ocr_pdf_pages,      # Actually perform OCR on PDF pages
+    split_ocr_pages,    # Split OCR output back into {page_number: text}
 )
+from .segments import TextSegment
 
 
 class PDFParser:
@@ -87,6 +91,45 @@ class PDFParser:
         # Each call to parse() is independent.
         pass
 
+    @staticmethod
+    def _new_details(file_path: str) -> Dict[str, Any]:
+        """
+        Build the diagnostics dictionary used by parse_with_details() and
+        parse_iter(). Every field starts with a default "nothing happened
+        yet" value; file_size_bytes is filled in here.
+        """
+        details: Dict[str, Any] = {
+            "parser": "PDFParser",
+            "file_path": file_path,
+            "file_size_bytes": None,
+            "pdf_page_count": None,
+            "pdf_encrypted": None,
+            "normal_extract": {
+                "attempted": False,
+                "method": None,        # "pypdf" or "pdfplumber"
+                "chars": 0,            # How many characters were extracted
+                "status": None,        # "OK", "NO_TEXT", or "ERROR:..."
+                "errors": [],          # List of any errors that occurred
+            },
+            "ocr_fallback": {
+                "triggered": False,    # Did we decide OCR was needed?
+                "used": False,         # Did we actually run OCR?
+                "status": None,        # Result status
+                "dependency_check": {},  # Are Tesseract + pdf2image installed?
+                "settings": {},        # OCR settings used (DPI, max pages, etc.)
+                "result": None,        # "OCR_TEXT_PRODUCED" or "OCR_PRODUCED_NO_TEXT"
+                "stats": {},           # Per-page OCR timing and character counts
+            },
+            "likely_reason": None,     # Best guess at why extraction failed
+        }
+
+        # Get the file size (useful for diagnostics -- large files may be slow)
+        try:
+            details["file_size_bytes"] = os.path.getsize(file_path)
+        except Exception:
+            details["file_size_bytes"] = None
+        return details
+
     @staticmethod
     def _try_ocrmypdf(file_path, lang, dpi, details):
         """
@@ -158,6 +201,103 @@ class PDFParser:
                 except Exception:
                     pass
 
+    @staticmethod
+    def _ocr_sparse_pages(file_path, text, page_texts, sparse_pages,
+                          page_min_chars, details):
+        """
+        OCR only the pages of a mixed PDF that have no usable text layer.
+
+        Pages with text keep their pypdf/pdfplumber text; OCR'd pages are
+        merged back in page order with their [OCR_PAGE=N] marker. If OCR
+        is unavailable or fails, the text-layer pages are still returned.
+        """
+        recovered = PDFParser._ocr_page_subset(
+            file_path, len(page_texts), sparse_pages, page_min_chars, details,
+        )
+        if not details["ocr_fallback"]["used"]:
+            return text, details
+
+        merged = []
+        for page_num, page_text in enumerate(page_texts, start=1):
+            if page_num in recovered:
+                merged.append(f"[OCR_PAGE={page_num}]\n{recovered[page_num]}")
+            elif page_text:
+                merged.append(page_text)
+        return "\n\n".join(merged).strip(), details
+
+    @staticmethod
+    def _ocr_page_subset(file_path, total_pages, sparse_pages,
+                         page_min_chars, details):
+        """
+        OCR the listed pages and return {page_number: text}.
+
+        Records settings, per-page counts and the outcome under
+        details["ocr_fallback"]. Returns {} when OCR is unavailable or
+        fails (ocr_fallback["used"] stays False in that case). Called
+        again with the same details (parse_iter OCRs in windows), the page
+        counts add up and HYBRIDRAG_OCR_MAX_PAGES caps the whole document.
+        """
+        ocr = details["ocr_fallback"]
+        ocr["triggered"] = True
+        ocr_max_pages = _get_int_env("HYBRIDRAG_OCR_MAX_PAGES", 200)
+        ocr["settings"] = {
+            "max_pages": ocr_max_pages,
+            "dpi": _get_int_env("HYBRIDRAG_OCR_DPI", 200),
+            "timeout_s": _get_int_env("HYBRIDRAG_OCR_TIMEOUT_S", 20),
+            "lang": _get_str_env("HYBRIDRAG_OCR_LANG", "eng"),
+        }
+        page_stats = ocr.get("pages") or {
+            "mode": "selective",
+            "total": total_pages,
+            "with_text": total_pages,
+            "needing_ocr": 0,
+            "ocr_recovered": 0,
+            "page_min_chars": page_min_chars,
+            "ocr_page_numbers": [],
+        }
+        budget = max(0, ocr_max_pages - len(page_stats["ocr_page_numbers"]))
+        page_stats["with_text"] -= len(sparse_pages)
+        page_stats["needing_ocr"] += len(sparse_pages)
+        page_stats["ocr_page_numbers"] += sparse_pages[:budget]
+        ocr["pages"] = page_stats
+        if not budget:
+            if ocr["status"] is None:
+                ocr["status"] = "OCR_MAX_PAGES_REACHED"
+            return {}
+
+        ok, dep_details = ocr_deps_available()
+        ocr["dependency_check"] = dep_details
+        if not ok:
+            ocr["status"] = "OCR_DEPS_MISSING"
+            details["likely_reason"] = "MIXED_PDF_SCANNED_PAGES_NOT_OCRED"
+            return {}
+
+        try:
+            ocr_text, ocr_stats = ocr_pdf_pages(
+                file_path,
+                max_pages=budget,
+                dpi=ocr["settings"]["dpi"],
+                timeout_s=ocr["settings"]["timeout_s"],
+                lang=ocr["settings"]["lang"],
+                pages=sparse_pages,
+            )
+        except Exception as e:
+            ocr["status"] = f"OCR_ERROR:{type(e).__name__}"
+            details["likely_reason"] = "MIXED_PDF_SCANNED_PAGES_NOT_OCRED"
+            return {}
+
+        ocr["used"] = True
+        ocr["status"] = "OCR_ATTEMPTED"
+        ocr["stats"] = ocr_stats
+        recovered = split_ocr_pages(ocr_text)
+        page_stats["ocr_recovered"] += len(recovered)
+        if page_stats["ocr_recovered"]:
+            ocr["result"] = "OCR_TEXT_PRODUCED"
+            details["likely_reason"] = "MIXED_PDF_OCR_RECOVERED_SCANNED_PAGES"
+        else:
+            ocr["result"] = "OCR_PRODUCED_NO_TEXT"
+        return recovered
+
     def parse(self, file_path: str) -> str:
         """
         Simple interface: extract text from a PDF file.
@@ -195,41 +335,11 @@ class PDFParser:
                 - ocr_fallback: What happened with OCR (if triggered)
                 - likely_reason: Best guess at why extraction failed (if it did)
         """
-        # Initialize the diagnostics dictionary
-        # Every field starts with a default "nothing happened yet" value
-        details: Dict[str, Any] = {
-            "parser": "PDFParser",
-            "file_path": file_path,
-            "file_size_bytes": None,
-            "pdf_page_count": None,
-            "pdf_encrypted": None,
-            "normal_extract": {
-                "attempted": False,
-                "method": None,        # "pypdf" or "pdfplumber"
-                "chars": 0,            # How many characters were extracted
-                "status": None,        # "OK", "NO_TEXT", or "ERROR:..."
-                "errors": [],          # List of any errors that occurred
-            },
-            "ocr_fallback": {
-                "triggered": False,    # Did we decide OCR was needed?
-                "used": False,         # Did we actually run OCR?
-                "status": None,        # Result status
-                "dependency_check": {},  # Are Tesseract + pdf2image installed?
-                "settings": {},        # OCR settings used (DPI, max pages, etc.)
-                "result": None,        # "OCR_TEXT_PRODUCED" or "OCR_PRODUCED_NO_TEXT"
-                "stats": {},           # Per-page OCR timing and character counts
-            },
-            "likely_reason": None,     # Best guess at why extraction failed
-        }
-
-        # Get the file size (useful for diagnostics -- large files may be slow)
-        try:
-            details["file_size_bytes"] = os.path.getsize(file_path)
-        except Exception:
-            details["file_size_bytes"] = None
+        details = self._new_details(file_path)
 
         text = ""
         normal_errors = []
+        page_texts = []  # Per-page text from whichever extractor succeeded
 
         # ================================================================
         # STEP 1: Try pypdf (fast, handles most digital PDFs)
@@ -259,18 +369,18 @@ class PDFParser:
 
             # Extract text from each page individually
             # We do this page-by-page so one bad page doesn't kill the whole PDF
-            extracted_parts = []
+            # (page_texts keeps one entry per page, "" for empty/failed
+            # pages, so pages without a text layer can be found later)
             for i, page in enumerate(reader.pages):
                 try:
-                    page_text = page.extract_text() or ""
-                    if page_text:
-                        extracted_parts.append(page_text)
+                    page_texts.append(page.extract_text() or "")
                 except Exception as e:
                     # Log which page failed but keep going with the rest
+                    page_texts.append("")
                     normal_errors.append(f"pypdf_page_{i+1}_error:{type(e).__name__}")
 
             # Join all pages with double-newline separators
-            text = "\n\n".join(extracted_parts).strip()
+            text = "\n\n".join(t for t in page_texts if t).strip()
             details["normal_extract"]["method"] = "pypdf"
             details["normal_extract"]["chars"] = len(text)
             details["normal_extract"]["status"] = "OK" if text else "NO_TEXT"
@@ -291,7 +401,7 @@ class PDFParser:
             try:
                 import pdfplumber
 
-                extracted_parts = []
+                plumber_pages = []
                 with pdfplumber.open(file_path) as pdf:
                     # Update page count if pypdf didn't get it
                     if details["pdf_page_count"] is None:
@@ -299,13 +409,13 @@ class PDFParser:
 
                     for i, page in enumerate(pdf.pages):
                         try:
-                            page_text = page.extract_text() or ""
-                            if page_text:
-                                extracted_parts.append(page_text)
+                            plumber_pages.append(page.extract_text() or "")
                         except Exception as e:
+                            plumber_pages.append("")
                             normal_errors.append(f"pdfplumber_page_{i+1}_error:{type(e).__name__}")
 
-                text = "\n\n".join(extracted_parts).strip()
+                page_texts = plumber_pages
+                text = "\n\n".join(t for t in page_texts if t).strip()
                 details["normal_extract"]["method"] = "pdfplumber"
                 details["normal_extract"]["chars"] = len(text)
                 details["normal_extract"]["status"] = "OK" if text else "NO_TEXT"
@@ -330,6 +440,23 @@ class PDFParser:
         trigger_min_chars = _get_int_env("HYBRIDRAG_OCR_TRIGGER_MIN_CHARS", 20)
         should_ocr = (len((text or "").strip()) < trigger_min_chars)
 
+        # Per-page text density: a page whose text layer has fewer than
+        # HYBRIDRAG_OCR_PAGE_MIN_CHARS characters is treated as scanned.
+        # If the document as a whole has enough text but some pages are
+        # scanned (a MIXED PDF), only those pages are OCR'd.
+        page_min_chars = _get_int_env("HYBRIDRAG_OCR_PAGE_MIN_CHARS", trigger_min_chars)
+        sparse_pages = [
+            i + 1 for i, page_text in enumerate(page_texts)
+            if len(page_text.strip()) < page_min_chars
+        ]
+        selective_enabled = _get_str_env("HYBRIDRAG_OCR_SELECTIVE", "1").lower() not in (
+            "0", "false", "no", "off",
+        )
+        if not should_ocr and sparse_pages and selective_enabled:
+            return self._ocr_sparse_pages(
+                file_path, text, page_texts, sparse_pages, page_min_chars, details,
+            )
+
         if should_ocr:
             # ============================================================
             # STEP 4: Run OCR fallback
@@ -367,6 +494,13 @@ class PDFParser:
                 "timeout_s": ocr_timeout_s,
                 "lang": ocr_lang,
             }
+            details["ocr_fallback"]["pages"] = {
+                "mode": "full",
+                "total": len(page_texts) or page_count,
+                "with_text": len(page_texts) - len(sparse_pages),
+                "needing_ocr": len(sparse_pages) or page_count,
+                "page_min_chars": page_min_chars,
+            }
 
             # ============================================================
             # STEP 4A: Try ocrmypdf first (best quality, handles deskew)
@@ -419,3 +553,145 @@ class PDFParser:
         details["ocr_fallback"]["used"] = False
         details["ocr_fallback"]["status"] = "NOT_NEEDED"
         return (text or ""), details
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """
+        Streaming interface: yield one segment per page as pypdf reads it.
+
+        Pages are yielded in page order. Pages whose text layer is too thin
+        are OCR'd (when selective OCR is on) and yielded in their place with
+        their [OCR_PAGE=N] marker; the text pages after a thin page are held
+        until it is OCR'd, and thin pages are OCR'd together once
+        HYBRIDRAG_OCR_STREAM_HOLD_PAGES text pages are waiting behind them
+        or the document ends, so memory stays bounded and OCR stays batched.
+        If pypdf cannot open the file, or the whole document turns out to
+        have no usable text layer, this falls back to parse_with_details()
+        (pdfplumber, ocrmypdf, full OCR) and yields its result page by page.
+
+        details (if given) is filled in place with the same diagnostics
+        parse_with_details() returns.
+        """
+        if details is None:
+            details = {}
+        details.update(self._new_details(file_path))
+        normal = details["normal_extract"]
+        normal["attempted"] = True
+        normal["method"] = "pypdf"
+
+        trigger_min_chars = _get_int_env("HYBRIDRAG_OCR_TRIGGER_MIN_CHARS", 20)
+        page_min_chars = _get_int_env("HYBRIDRAG_OCR_PAGE_MIN_CHARS", trigger_min_chars)
+        selective_enabled = _get_str_env("HYBRIDRAG_OCR_SELECTIVE", "1").lower() not in (
+            "0", "false", "no", "off",
+        )
+        hold_pages = max(1, _get_int_env("HYBRIDRAG_OCR_STREAM_HOLD_PAGES", 32))
+
+        try:
+            from pypdf import PdfReader
+
+            reader = PdfReader(file_path)
+            details["pdf_encrypted"] = bool(getattr(reader, "is_encrypted", False))
+            if details["pdf_encrypted"]:
+                try:
+                    reader.decrypt("")
+                except Exception as e:
+                    normal["errors"].append(f"pypdf_decrypt_error:{type(e).__name__}")
+            pages = reader.pages
+            details["pdf_page_count"] = len(pages)
+        except Exception:
+            yield from self._iter_full_parse(file_path, details)
+            return
+
+        # held keeps pages in order: TextSegments, and the page numbers of
+        # thin pages still waiting for OCR. Everything is held until the
+        # document has proven it has a text layer (trigger_min_chars), and
+        # after that only behind a thin page not OCR'd yet.
+        held = []
+        held_text = 0
+        unresolved = []
+        thin_text = {}
+        streaming = False
+        any_sparse = False
+        chars = 0
+
+        def _release(recovered):
+            for item in held:
+                if isinstance(item, TextSegment):
+                    yield item
+                elif item in recovered:
+                    yield TextSegment(
+                        f"[OCR_PAGE={item}]\n{recovered[item]}", kind="page", locator=item,
+                    )
+                elif item in thin_text:
+                    yield TextSegment(thin_text.pop(item), kind="page", locator=item)
+
+        for page_num, page in enumerate(pages, start=1):
+            try:
+                page_text = page.extract_text() or ""
+            except Exception as e:
+                page_text = ""
+                normal["errors"].append(f"pypdf_page_{page_num}_error:{type(e).__name__}")
+            if selective_enabled and len(page_text.strip()) < page_min_chars:
+                any_sparse = True
+                unresolved.append(page_num)
+                held.append(page_num)
+                if page_text.strip():
+                    thin_text[page_num] = page_text
+                continue
+            if not page_text:
+                continue
+            chars += len(page_text.strip())
+            held.append(TextSegment(page_text, kind="page", locator=page_num))
+            held_text += 1
+            if not streaming and chars >= trigger_min_chars:
+                streaming = True
+            if not streaming:
+                continue
+            if not unresolved:
+                yield from _release({})
+            elif held_text >= hold_pages:
+                recovered = self._ocr_page_subset(
+                    file_path, len(pages), unresolved, page_min_chars, details,
+                )
+                unresolved = []
+                yield from _release(recovered)
+            else:
+                continue
+            held = []
+            held_text = 0
+
+        if not streaming:
+            # No usable text layer: the scanned-PDF path needs the whole
+            # file anyway, so hand over to parse_with_details().
+            yield from self._iter_full_parse(file_path, details)
+            return
+
+        normal["chars"] = chars
+        normal["status"] = "OK"
+        if not any_sparse:
+            details["ocr_fallback"]["status"] = "NOT_NEEDED"
+            return
+
+        recovered = {}
+        if unresolved:
+            recovered = self._ocr_page_subset(
+                file_path, len(pages), unresolved, page_min_chars, details,
+            )
+        yield from _release(recovered)
+
+    def _iter_full_parse(self, file_path: str, details: Dict[str, Any]) -> Iterator[TextSegment]:
+        """Run parse_with_details() and yield its text split back into pages."""
+        text, parsed = self.parse_with_details(file_path)
+        details.clear()
+        details.update(parsed)
+        if not text:
+            return
+        ocr_pages = split_ocr_pages(text) if text.startswith("[OCR_PAGE=") else {}
+        if not ocr_pages:
+            yield TextSegment(text, kind="document")
+            return
+        for page_num, page_text in ocr_pages.items():
+            yield TextSegment(
+                f"[OCR_PAGE={page_num}]\n{page_text}", kind="page", locator=page_num,
+            )
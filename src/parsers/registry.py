@@ -17,56 +17,77 @@
 #
 # HOW TO ADD A NEW FORMAT:
 #   1. Create a parser class in src/parsers/ (see existing ones for template)
-#   2. Import it at the top of this file
-#   3. Register it in the __init__ method below with self.register()
-#   4. Add it to docs/FORMAT_SUPPORT.md
+#   2. Register it in the __init__ method below with self.register(),
+#      naming it as "module:ClassName" (e.g. "pdf_parser:PDFParser")
+#   3. Add it to docs/FORMAT_SUPPORT.md
+#
+# LAZY IMPORTS:
+#   Parser modules are NOT imported when this file is imported. Each
+#   entry holds a "module:ClassName" reference that is imported the
+#   first time info.parser_cls is used, so commands that only touch
+#   REGISTRY (rag-query, rag-status, the API server, Indexer setup) do
+#   not pay for pypdf, openpyxl, Pillow and friends. If a parser module
+#   fails to import (a broken optional dependency), only that file type
+#   is affected: its parser_cls becomes a stub that returns no text and
+#   an IMPORT_ERROR in the details.
 #
 # DESIGN RULES:
 #   - registry.py must NOT import text_parser.py (prevents circular imports)
+#   - registry.py must NOT import parser modules at module level
+#     (tests/test_parser_registry_lazy.py enforces this). The only
+#     exception is placeholder_parser.py (stdlib only), which the
+#     placeholder entries subclass when the registry is built.
 #   - All extensions are lowercase with leading dot (".pdf", not "pdf")
 #   - Each parser must have parse(file_path) and parse_with_details(file_path)
+#   - A parser MAY also have parse_iter(file_path, details) that yields
+#     TextSegment objects (see "STREAMING PARSERS" below)
+#
+# STREAMING PARSERS:
+#   parse_with_details() returns the whole document as one string, so a
+#   500MB mbox or a thousand-page PDF sits in memory before the indexer
+#   slices it. Parsers that also implement parse_iter() hand back one
+#   segment at a time (a page, a sheet, a message, a record) and fill
+#   the details dict in place as they go. The indexer chunks and embeds
+#   segments as they arrive and stops reading once max_chars_per_file
+#   is reached. Use iter_segments() to read any parser this way; parsers
+#   without parse_iter() come back as a single "document" segment.
 #
 # INTERNET ACCESS: NONE
 # ============================================================================
 
 from __future__ import annotations
 
+import importlib
+import logging
 from dataclasses import dataclass
-from typing import Dict, Optional, Type
-
-# --- Original parsers ---
-from .plain_text_parser import PlainTextParser
-from .pdf_parser import PDFParser
-from .office_docx_parser import DocxParser
-from .office_pptx_parser import PptxParser
-from .office_xlsx_parser import XlsxParser
-from .eml_parser import EmlParser
-from .image_parser import ImageOCRParser
-from .html_file_parser import HtmlFileParser
-
-# --- New parsers (expanded parsing) ---
-from .dxf_parser import DxfParser
-from .stl_parser import StlParser
-from .rtf_parser import RtfParser
-from .doc_parser import DocParser
-from .msg_parser import MsgParser
-from .psd_parser import PsdParser
-from .step_iges_parser import StepParser, IgesParser
-from .visio_parser import VsdxParser
-from .certificate_parser import CertificateParser
-from .evtx_parser import EvtxParser
-from .access_db_parser import AccessDbParser
-from .mbox_parser import MboxParser
-from .pcap_parser import PcapParser
-from .placeholder_parser import PlaceholderParser
-from .archive_parser import ArchiveParser
+from typing import Any, Dict, Iterator, Optional, Type, Union
+
+from .segments import TextSegment
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
 class ParserInfo:
-    """One entry in the parser registry: a human-readable name and the parser class."""
+    """
+    One entry in the parser registry: a human-readable name and the
+    parser, given either as a class or as a lazy "module:ClassName"
+    reference inside src/parsers/.
+    """
     name: str
-    parser_cls: Type
+    target: Union[str, Type]
+
+    @property
+    def parser_cls(self) -> Type:
+        """The parser class, importing its module on first use."""
+        if isinstance(self.target, str):
+            return _load_parser_class(self.name, self.target)
+        return self.target
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once the parser's module has been imported."""
+        return not isinstance(self.target, str) or self.target in _LOADED
 
 
 class ParserRegistry:
@@ -92,34 +113,34 @@ class ParserRegistry:
             ".yaml", ".yml", ".ini", ".cfg", ".conf", ".properties",
             ".reg",  # Windows registry export (text-based)
         ]:
-            self.register(ext, "PlainTextParser", PlainTextParser)
+            self.register(ext, "PlainTextParser", "plain_text_parser:PlainTextParser")
 
         # ==============================================================
         # DOCUMENT FORMATS (office, legacy, rich text)
         # ==============================================================
-        self.register(".pdf",  "PDFParser",  PDFParser)
-        self.register(".docx", "DocxParser",  DocxParser)
-        self.register(".pptx", "PptxParser",  PptxParser)
-        self.register(".xlsx", "XlsxParser",  XlsxParser)
-        self.register(".doc",  "DocParser",   DocParser)   # Legacy Word 97-2003
-        self.register(".rtf",  "RtfParser",   RtfParser)   # Rich Text Format
+        self.register(".pdf",  "PDFParser",  "pdf_parser:PDFParser")
+        self.register(".docx", "DocxParser",  "office_docx_parser:DocxParser")
+        self.register(".pptx", "PptxParser",  "office_pptx_parser:PptxParser")
+        self.register(".xlsx", "XlsxParser",  "office_xlsx_parser:XlsxParser")
+        self.register(".doc",  "DocParser",   "doc_parser:DocParser")   # Legacy Word 97-2003
+        self.register(".rtf",  "RtfParser",   "rtf_parser:RtfParser")   # Rich Text Format
 
         # .ai files (Adobe Illustrator) are internally PDF since CS era.
         # We parse them with the PDF parser to extract any embedded text.
-        self.register(".ai",   "PDFParser",   PDFParser)
+        self.register(".ai",   "PDFParser",   "pdf_parser:PDFParser")
 
         # ==============================================================
         # EMAIL FORMATS
         # ==============================================================
-        self.register(".eml",  "EmlParser",   EmlParser)    # RFC 822 email
-        self.register(".msg",  "MsgParser",   MsgParser)    # Outlook .msg
-        self.register(".mbox", "MboxParser",  MboxParser)   # Unix mbox archive
+        self.register(".eml",  "EmlParser",   "eml_parser:EmlParser")    # RFC 822 email
+        self.register(".msg",  "MsgParser",   "msg_parser:MsgParser")    # Outlook .msg
+        self.register(".mbox", "MboxParser",  "mbox_parser:MboxParser")   # Unix mbox archive
 
         # ==============================================================
         # WEB FORMATS
         # ==============================================================
-        self.register(".html", "HtmlFileParser", HtmlFileParser)
-        self.register(".htm",  "HtmlFileParser", HtmlFileParser)
+        self.register(".html", "HtmlFileParser", "html_file_parser:HtmlFileParser")
+        self.register(".htm",  "HtmlFileParser", "html_file_parser:HtmlFileParser")
 
         # ==============================================================
         # IMAGE FORMATS (parsed via OCR using Tesseract)
@@ -128,63 +149,63 @@ class ParserRegistry:
             ".png", ".jpg", ".jpeg", ".tif", ".tiff",
             ".bmp", ".gif", ".webp",
         ]:
-            self.register(ext, "ImageOCRParser", ImageOCRParser)
+            self.register(ext, "ImageOCRParser", "image_parser:ImageOCRParser")
 
         # WMF/EMF: Windows Metafile formats. Pillow can rasterize them
         # on Windows (GDI+), then OCR extracts text from the raster.
-        self.register(".wmf", "ImageOCRParser", ImageOCRParser)
-        self.register(".emf", "ImageOCRParser", ImageOCRParser)
+        self.register(".wmf", "ImageOCRParser", "image_parser:ImageOCRParser")
+        self.register(".emf", "ImageOCRParser", "image_parser:ImageOCRParser")
 
         # PSD: Photoshop files. Extract text layers + layer names.
-        self.register(".psd", "PsdParser", PsdParser)
+        self.register(".psd", "PsdParser", "psd_parser:PsdParser")
 
         # ==============================================================
         # CAD / ENGINEERING FORMATS
         # ==============================================================
 
         # DXF: AutoCAD exchange format (OPEN, fully supported)
-        self.register(".dxf", "DxfParser", DxfParser)
+        self.register(".dxf", "DxfParser", "dxf_parser:DxfParser")
 
         # STEP: ISO 10303 CAD exchange (OPEN, text-based)
-        self.register(".stp",  "StepParser", StepParser)
-        self.register(".step", "StepParser", StepParser)
-        self.register(".ste",  "StepParser", StepParser)
+        self.register(".stp",  "StepParser", "step_iges_parser:StepParser")
+        self.register(".step", "StepParser", "step_iges_parser:StepParser")
+        self.register(".ste",  "StepParser", "step_iges_parser:StepParser")
 
         # IGES: older CAD exchange format (OPEN, text-based)
-        self.register(".igs",  "IgesParser", IgesParser)
-        self.register(".iges", "IgesParser", IgesParser)
+        self.register(".igs",  "IgesParser", "step_iges_parser:IgesParser")
+        self.register(".iges", "IgesParser", "step_iges_parser:IgesParser")
 
         # STL: 3D printing mesh format (OPEN, geometry metadata)
-        self.register(".stl", "StlParser", StlParser)
+        self.register(".stl", "StlParser", "stl_parser:StlParser")
 
         # ==============================================================
         # VISIO DIAGRAMS
         # ==============================================================
-        self.register(".vsdx", "VsdxParser", VsdxParser)  # Visio 2013+
+        self.register(".vsdx", "VsdxParser", "visio_parser:VsdxParser")  # Visio 2013+
 
         # ==============================================================
         # CYBERSECURITY / SYSTEM ADMIN FORMATS
         # ==============================================================
-        self.register(".evtx", "EvtxParser",        EvtxParser)        # Windows event logs
-        self.register(".pcap", "PcapParser",         PcapParser)        # Network captures
-        self.register(".pcapng", "PcapParser",       PcapParser)        # PCAPNG format
-        self.register(".cer",  "CertificateParser",  CertificateParser) # X.509 certs
-        self.register(".crt",  "CertificateParser",  CertificateParser)
-        self.register(".pem",  "CertificateParser",  CertificateParser)
+        self.register(".evtx", "EvtxParser",        "evtx_parser:EvtxParser")        # Windows event logs
+        self.register(".pcap", "PcapParser",         "pcap_parser:PcapParser")        # Network captures
+        self.register(".pcapng", "PcapParser",       "pcap_parser:PcapParser")        # PCAPNG format
+        self.register(".cer",  "CertificateParser",  "certificate_parser:CertificateParser") # X.509 certs
+        self.register(".crt",  "CertificateParser",  "certificate_parser:CertificateParser")
+        self.register(".pem",  "CertificateParser",  "certificate_parser:CertificateParser")
 
         # ==============================================================
         # DATABASE FORMATS
         # ==============================================================
-        self.register(".accdb", "AccessDbParser", AccessDbParser)  # Access 2007+
-        self.register(".mdb",   "AccessDbParser", AccessDbParser)  # Access 97-2003
+        self.register(".accdb", "AccessDbParser", "access_db_parser:AccessDbParser")  # Access 2007+
+        self.register(".mdb",   "AccessDbParser", "access_db_parser:AccessDbParser")  # Access 97-2003
 
         # ==============================================================
         # ARCHIVE FORMATS (extract contents and parse each file inside)
         # ==============================================================
-        self.register(".zip",    "ArchiveParser", ArchiveParser)
-        self.register(".tar",    "ArchiveParser", ArchiveParser)
-        self.register(".tgz",    "ArchiveParser", ArchiveParser)
-        self.register(".gz",     "ArchiveParser", ArchiveParser)
+        self.register(".zip",    "ArchiveParser", "archive_parser:ArchiveParser")
+        self.register(".tar",    "ArchiveParser", "archive_parser:ArchiveParser")
+        self.register(".tgz",    "ArchiveParser", "archive_parser:ArchiveParser")
+        self.register(".gz",     "ArchiveParser", "archive_parser:ArchiveParser")
 
         # ==============================================================
         # PLACEHOLDER FORMATS (recognized but not fully parseable)
@@ -200,14 +221,24 @@ class ParserRegistry:
         for ext in [".mpp", ".vsd", ".one", ".ost", ".eps"]:
             self.register(ext, "PlaceholderParser", _make_placeholder(ext))
 
-    def register(self, ext: str, name: str, parser_cls) -> None:
-        """Register a parser class for a file extension."""
-        self._map[ext.lower()] = ParserInfo(name=name, parser_cls=parser_cls)
+    def register(self, ext: str, name: str, parser_cls: Union[str, Type]) -> None:
+        """
+        Register a parser for a file extension.
+
+        parser_cls is a class or a "module:ClassName" string naming a
+        module in src/parsers/; strings are imported on first use.
+        """
+        self._map[ext.lower()] = ParserInfo(name=name, target=parser_cls)
 
     def get(self, ext: str) -> Optional[ParserInfo]:
         """Look up the parser for a given extension. Returns None if unknown."""
         return self._map.get(ext.lower())
 
+    def supports_streaming(self, ext: str) -> bool:
+        """True when the parser for ext implements parse_iter()."""
+        info = self.get(ext)
+        return info is not None and callable(getattr(info.parser_cls, "parse_iter", None))
+
     def supported_extensions(self) -> list[str]:
         """Return sorted list of all registered extensions."""
         return sorted(self._map.keys())
@@ -236,6 +267,8 @@ def _make_placeholder(ext: str):
       knows which format description to include. This factory function
       creates a small wrapper class for each one.
     """
+    from .placeholder_parser import PlaceholderParser
+
     class _Placeholder(PlaceholderParser):
         def __init__(self):
             super().__init__(extension=ext)
@@ -243,4 +276,70 @@ def _make_placeholder(ext: str):
     return _Placeholder
 
 
+# "module:ClassName" -> parser class (or import-error stub), filled on first use
+_LOADED: Dict[str, Type] = {}
+
+
+def _load_parser_class(name: str, target: str) -> Type:
+    """Import a "module:ClassName" parser reference once and cache it."""
+    cls = _LOADED.get(target)
+    if cls is not None:
+        return cls
+    module_name, _, class_name = target.partition(":")
+    try:
+        module = importlib.import_module(f".{module_name}", __package__)
+        cls = getattr(module, class_name)
+    except Exception as e:
+        logger.warning("[WARN] Parser %s unavailable: %s: %s", target, type(e).__name__, e)
+        cls = _make_unavailable(name, f"{type(e).__name__}: {e}")
+    _LOADED[target] = cls
+    return cls
+
+
+def _make_unavailable(name: str, reason: str):
+    """
+    Stand-in parser for a module that failed to import.
+
+    NON-PROGRAMMER NOTE:
+      If a parser's library is broken or missing in a way that breaks
+      the import itself, files of that type come back empty with an
+      IMPORT_ERROR reason (the indexer reports and skips them) instead
+      of every file type failing.
+    """
+    class _Unavailable:
+        def parse(self, file_path: str) -> str:
+            return ""
+
+        def parse_with_details(self, file_path: str):
+            return "", {"file": str(file_path), "parser": name, "error": f"IMPORT_ERROR: {reason}"}
+
+    _Unavailable.__name__ = f"Unavailable_{name}"
+    return _Unavailable
+
+
+def iter_segments(
+    parser: Any, file_path: str, details: Optional[Dict[str, Any]] = None,
+) -> Iterator[TextSegment]:
+    """
+    Read any parser as a stream of TextSegment objects.
+
+    Uses parser.parse_iter() when the parser has one. Otherwise the
+    parser's full text is yielded as a single "document" segment.
+    details (if given) is updated in place with the parser's diagnostics.
+    """
+    if details is None:
+        details = {}
+    if callable(getattr(parser, "parse_iter", None)):
+        yield from parser.parse_iter(file_path, details)
+        return
+    if hasattr(parser, "parse_with_details"):
+        text, parsed = parser.parse_with_details(file_path)
+        if isinstance(parsed, dict):
+            details.update(parsed)
+    else:
+        text = parser.parse(file_path)
+    if text:
+        yield TextSegment(text=text)
+
+
 REGISTRY = ParserRegistry()
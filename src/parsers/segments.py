@@ -0,0 +1,44 @@
+# ============================================================================
+# HybridRAG -- Streamed Parse Segments (src/parsers/segments.py)
+# ============================================================================
+#
+# WHAT THIS FILE DOES (plain English):
+#   Defines TextSegment, the unit a streaming parser hands back from
+#   parse_iter(): a piece of text plus where it came from (a PDF page,
+#   a spreadsheet sheet, an email message, an event record).
+#
+# WHY A SEPARATE FILE:
+#   Parsers import TextSegment, and registry.py imports every parser.
+#   Keeping the dataclass here (importing nothing from this package)
+#   avoids a circular import. registry.py re-exports it.
+#
+# INTERNET ACCESS: NONE
+# ============================================================================
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class TextSegment:
+    """
+    One piece of a streamed parse.
+
+    kind says what the segment is ("page", "sheet", "message", "record",
+    "header", "summary", "note" or "document") and locator says which
+    one (page number, sheet name, message number, ...). For mbox, evtx,
+    pcap and xlsx, joining the segment texts with "\\n" gives exactly
+    the text parse_with_details() returns. A PDF streams its pages in
+    page order, with OCR'd pages in place of the thin ones they replace.
+    """
+    text: str
+    kind: str = "document"
+    locator: Any = None
+
+    def provenance(self) -> str:
+        """Short label such as "page=12" or "sheet=Parts" for logs and reports."""
+        if self.locator is None:
+            return self.kind
+        return f"{self.kind}={self.locator}"
@@ -36,9 +36,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Tuple, Dict, Any
+from typing import Any, Dict, Iterator, Optional, Tuple
 
-from .registry import REGISTRY
+from .registry import REGISTRY, TextSegment, iter_segments
 
 
 class TextParser:
@@ -70,3 +70,24 @@ class TextParser:
             return parser.parse_with_details(str(path))  # type: ignore
 
         return parser.parse(str(path)), {"file": str(path), "parser": info.name}
+
+    def parse_iter(
+        self, file_path: str, details: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[TextSegment]:
+        """
+        Streaming variant of parse_with_details(): yields TextSegment
+        objects and fills details in place. Parsers without parse_iter()
+        yield their whole text as one segment.
+        """
+        path = Path(file_path)
+        ext = path.suffix.lower()
+        if details is None:
+            details = {}
+        info = REGISTRY.get(ext)
+        if info is None:
+            details.update(
+                {"file": str(path), "parser": "NONE", "error": f"UNSUPPORTED_EXTENSION: {ext}"}
+            )
+            return
+        details.setdefault("parser", info.name)
+        yield from iter_segments(info.parser_cls(), str(path), details)
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import hashlib
 import json
+import os
 from pathlib import Path
 import shutil
 import sqlite3
 import sys
-from typing import Any
+import time
+from typing import Any, Callable
 
 from src.api.query_threads import conversation_history_db_path
 from src.core.config import load_config
@@ -17,6 +20,17 @@ from src.core.index_qc import build_index_fingerprint, compare_fingerprints, ins
 
 _MAIN_DB_FINGERPRINT_LABEL = "database/main.sqlite3"
 _HISTORY_DB_FINGERPRINT_LABEL = "history/query_history.sqlite3"
+_BUNDLE_SUFFIX = "_shared_deployment_backup"
+_BUNDLE_SCHEMA_VERSION = 2
+_HASH_SCHEME_CHUNKED = "sha256-chunked"
+_HASH_CHUNK_BYTES = 16 * 1024 * 1024
+_COPY_BUFFER_BYTES = 1024 * 1024
+_SQLITE_PAGES_PER_STEP = 1024
+_MAX_EMBEDDING_CHAIN = 8
+_EMBEDDINGS_DAT_NAME = "embeddings.f16.dat"
+_EMBEDDINGS_META_NAME = "embeddings_meta.json"
+
+BackupProgress = Callable[[str, int, int], None]
 
 
 def default_shared_backup_dir(project_root: str | Path | None = None) -> Path:
@@ -36,17 +50,30 @@ def create_shared_backup_bundle(
     output_root: str | Path | None = None,
     timestamp: datetime | None = None,
     include_logs: bool = True,
+    incremental: bool = True,
+    base_bundle: str | Path | None = None,
+    sqlite_pages_per_step: int = _SQLITE_PAGES_PER_STEP,
+    sqlite_step_sleep_s: float = 0.0,
+    hash_workers: int | None = None,
+    progress: BackupProgress | None = None,
 ) -> dict[str, Any]:
     root = Path(project_root).resolve()
     created_at = _normalize_timestamp(timestamp)
     main_db = _resolve_main_database_path(root, database_path)
     history_db = Path(conversation_history_db_path(str(main_db))).resolve()
     bundle_root = Path(output_root).resolve() if output_root else default_shared_backup_dir(root)
-    bundle_dir = bundle_root / "{}_shared_deployment_backup".format(
-        created_at.strftime("%Y-%m-%d_%H%M%S")
+    bundle_dir = bundle_root / "{}{}".format(
+        created_at.strftime("%Y-%m-%d_%H%M%S"),
+        _BUNDLE_SUFFIX,
     )
     payload_dir = bundle_dir / "payload"
     payload_dir.mkdir(parents=True, exist_ok=True)
+    copy_options = {
+        "sqlite_pages_per_step": sqlite_pages_per_step,
+        "sqlite_step_sleep_s": sqlite_step_sleep_s,
+        "hash_workers": hash_workers,
+        "progress": progress,
+    }
 
     entries: list[dict[str, Any]] = []
     missing: list[dict[str, str]] = []
@@ -54,6 +81,37 @@ def create_shared_backup_bundle(
     for category, path in [
         ("database", main_db),
         ("history", history_db),
+    ]:
+        record = _copy_target(
+            category=category,
+            source_path=Path(path),
+            payload_dir=payload_dir,
+            **copy_options,
+        )
+        if record is None:
+            missing.append({"category": category, "source_path": str(Path(path).resolve())})
+        else:
+            entries.append(record)
+
+    # The memmap is copied after the database snapshot so every row the
+    # snapshot points at is already on disk when its byte range is taken.
+    base_manifest = None
+    if incremental:
+        base_dir = Path(base_bundle).resolve() if base_bundle else _latest_bundle_dir(
+            bundle_root, exclude=bundle_dir
+        )
+        base_manifest = _load_manifest(base_dir) if base_dir is not None else None
+    embedding_entries, embedding_missing = _backup_embeddings(
+        main_db=main_db,
+        payload_dir=payload_dir,
+        base_manifest=base_manifest,
+        hash_workers=hash_workers,
+        progress=progress,
+    )
+    entries.extend(embedding_entries)
+    missing.extend(embedding_missing)
+
+    for category, path in [
         ("config", root / "config" / "config.yaml"),
         ("config", root / "config" / "user_modes.yaml"),
     ]:
@@ -61,6 +119,7 @@ def create_shared_backup_bundle(
             category=category,
             source_path=Path(path),
             payload_dir=payload_dir,
+            **copy_options,
         )
         if record is None:
             missing.append({"category": category, "source_path": str(Path(path).resolve())})
@@ -76,13 +135,14 @@ def create_shared_backup_bundle(
                     source_path=file_path,
                     payload_dir=payload_dir,
                     relative_root=logs_root,
+                    **copy_options,
                 )
                 if record is not None:
                     entries.append(record)
 
     summary = _build_backup_summary(main_db, history_db, entries, missing)
     manifest = {
-        "bundle_schema_version": 1,
+        "bundle_schema_version": _BUNDLE_SCHEMA_VERSION,
         "created_at": created_at.isoformat(timespec="seconds"),
         "project_root": str(root),
         "bundle_dir": str(bundle_dir),
@@ -140,9 +200,17 @@ def verify_shared_backup_bundle(bundle_dir: str | Path) -> dict[str, Any]:
             files_missing += 1
             continue
         expected_hash = str(entry.get("sha256", "")).strip().lower()
-        actual_hash = _sha256_file(backup_path)
+        actual_hash = _entry_file_digest(backup_path, entry)
         if expected_hash and actual_hash != expected_hash:
             hash_mismatches += 1
+        # Earlier links of an incremental chain were hash-checked when their
+        # own bundle was verified; here they only need to still be there.
+        for segment in _base_segments(entry):
+            segment_path = Path(str(segment.get("backup_path", ""))).resolve()
+            if not segment_path.exists():
+                files_missing += 1
+            elif segment_path.stat().st_size != int(segment.get("length", -1)):
+                hash_mismatches += 1
         if str(entry.get("category", "")) in ("database", "history"):
             quick_check = _sqlite_quick_check(backup_path)
             if quick_check != "ok":
@@ -221,16 +289,28 @@ def run_shared_restore_drill(
     for entry in files:
         backup_path = Path(str(entry.get("backup_path", ""))).resolve()
         relative_path = str(entry.get("relative_path", "")).strip()
-        if not backup_path.exists():
-            files_missing += 1
+        chain = _segment_chain(entry)
+        absent = [
+            segment for segment in chain
+            if not Path(str(segment.get("backup_path", ""))).exists()
+        ]
+        if not backup_path.exists() or absent:
+            files_missing += max(1, len(absent))
             continue
         destination = restored_payload_dir / relative_path
         destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(backup_path, destination)
+        if chain:
+            _reassemble_segments(chain, destination, int(entry["logical_size_bytes"]))
+            actual_hash = _chunked_root(
+                _chunk_sha256s(destination, chunk_size=_entry_chunk_size(entry))
+            )
+            expected_hash = _chunked_root(list(entry.get("logical_chunk_sha256", []) or []))
+        else:
+            shutil.copy2(backup_path, destination)
+            actual_hash = _entry_file_digest(destination, entry)
+            expected_hash = str(entry.get("sha256", "")).strip().lower()
         files_restored += 1
 
-        actual_hash = _sha256_file(destination)
-        expected_hash = str(entry.get("sha256", "")).strip().lower()
         if expected_hash and actual_hash != expected_hash:
             hash_mismatches += 1
 
@@ -292,6 +372,7 @@ def format_backup_console_summary(result: dict[str, Any]) -> str:
     ]
     main_db = dict(summary.get("main_database", {}) or {})
     history_db = dict(summary.get("history_database", {}) or {})
+    embeddings = dict(summary.get("embeddings", {}) or {})
     if main_db:
         lines.append(
             "Main DB: chunks={} sources={} quick_check={}".format(
@@ -308,6 +389,15 @@ def format_backup_console_summary(result: dict[str, Any]) -> str:
                 str(history_db.get("quick_check", "")),
             )
         )
+    if embeddings:
+        lines.append(
+            "Embeddings: mode={} copied={} of {} bytes chain={}".format(
+                str(embeddings.get("copy_mode", "")),
+                int(embeddings.get("bytes_copied", 0) or 0),
+                int(embeddings.get("logical_size_bytes", 0) or 0),
+                int(embeddings.get("chain_length", 0) or 0),
+            )
+        )
     return "\n".join(lines)
 
 
@@ -367,6 +457,28 @@ def build_cli_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not copy the repo logs directory into the bundle.",
     )
+    create_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Copy the whole embeddings file instead of only what was appended since the last bundle.",
+    )
+    create_parser.add_argument(
+        "--base-bundle",
+        default="",
+        help="Bundle to continue the embeddings chain from (default: latest in the output root).",
+    )
+    create_parser.add_argument(
+        "--sqlite-pages-per-step",
+        type=int,
+        default=_SQLITE_PAGES_PER_STEP,
+        help="SQLite pages copied per online-backup step.",
+    )
+    create_parser.add_argument(
+        "--throttle-ms",
+        type=float,
+        default=0.0,
+        help="Pause between SQLite backup steps to leave I/O for live queries.",
+    )
 
     verify_parser = subparsers.add_parser("verify", help="Verify an existing backup bundle.")
     verify_parser.add_argument("bundle_dir", help="Path to the backup bundle directory.")
@@ -399,6 +511,10 @@ def main(argv: list[str] | None = None) -> int:
             output_root=args.output_root or None,
             timestamp=_parse_timestamp(args.timestamp),
             include_logs=not bool(args.skip_logs),
+            incremental=not bool(args.full),
+            base_bundle=args.base_bundle or None,
+            sqlite_pages_per_step=args.sqlite_pages_per_step,
+            sqlite_step_sleep_s=max(0.0, float(args.throttle_ms)) / 1000.0,
         )
         print(format_backup_console_summary(result))
         print("Saved manifest: {}".format(str(result.get("manifest_path", ""))))
@@ -458,6 +574,10 @@ def _copy_target(
     source_path: Path,
     payload_dir: Path,
     relative_root: Path | None = None,
+    sqlite_pages_per_step: int = _SQLITE_PAGES_PER_STEP,
+    sqlite_step_sleep_s: float = 0.0,
+    hash_workers: int | None = None,
+    progress: BackupProgress | None = None,
 ) -> dict[str, Any] | None:
     source = Path(source_path).expanduser().resolve()
     if not source.exists():
@@ -468,16 +588,260 @@ def _copy_target(
     relative_path = Path(category) / relative
     destination = payload_dir / relative_path
     destination.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(source, destination)
+    if category in ("database", "history"):
+        _sqlite_online_backup(
+            source,
+            destination,
+            label=str(relative_path).replace("\\", "/"),
+            pages_per_step=sqlite_pages_per_step,
+            step_sleep_s=sqlite_step_sleep_s,
+            progress=progress,
+        )
+    else:
+        shutil.copy2(source, destination)
     stat = destination.stat()
+    chunk_hashes = _chunk_sha256s(destination, workers=hash_workers)
     return {
         "category": category,
         "relative_path": str(relative_path).replace("\\", "/"),
         "source_path": str(source),
         "backup_path": str(destination.resolve()),
         "size_bytes": int(stat.st_size),
-        "sha256": _sha256_file(destination),
+        "sha256": _chunked_root(chunk_hashes),
+        "hash_scheme": _HASH_SCHEME_CHUNKED,
+        "chunk_size_bytes": _HASH_CHUNK_BYTES,
+        "chunk_sha256": chunk_hashes,
+    }
+
+
+def _sqlite_online_backup(
+    source: Path,
+    destination: Path,
+    *,
+    label: str,
+    pages_per_step: int,
+    step_sleep_s: float,
+    progress: BackupProgress | None,
+) -> None:
+    # SQLite's backup API reads a consistent snapshot in page batches, so
+    # WAL writers keep going between steps. A write from another connection
+    # restarts the copy, which is why the default step is large and the
+    # sleep between steps is opt-in.
+    partial = destination.with_name(destination.name + ".partial")
+    if partial.exists():
+        partial.unlink()
+
+    def _on_step(_status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(label, total - remaining, total)
+        if step_sleep_s > 0 and remaining:
+            time.sleep(step_sleep_s)
+
+    src = sqlite3.connect(str(source))
+    try:
+        dst = sqlite3.connect(str(partial))
+        try:
+            src.backup(dst, pages=max(1, int(pages_per_step)), progress=_on_step)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    os.replace(partial, destination)
+
+
+def _backup_embeddings(
+    *,
+    main_db: Path,
+    payload_dir: Path,
+    base_manifest: dict[str, Any] | None,
+    hash_workers: int | None,
+    progress: BackupProgress | None,
+) -> tuple[list[dict[str, Any]], list[dict[str, str]]]:
+    data_dir = main_db.parent
+    meta_path = data_dir / _EMBEDDINGS_META_NAME
+    dat_path = data_dir / _EMBEDDINGS_DAT_NAME
+    if not meta_path.exists() and not dat_path.exists():
+        return [], []
+
+    entries: list[dict[str, Any]] = []
+    missing: list[dict[str, str]] = []
+    # Meta before data: the count it records never exceeds the rows copied.
+    meta_record = _copy_target(
+        category="embeddings",
+        source_path=meta_path,
+        payload_dir=payload_dir,
+        hash_workers=hash_workers,
+    )
+    if meta_record is None:
+        missing.append({"category": "embeddings", "source_path": str(meta_path.resolve())})
+    else:
+        entries.append(meta_record)
+    if not dat_path.exists():
+        missing.append({"category": "embeddings", "source_path": str(dat_path.resolve())})
+        return entries, missing
+
+    source = dat_path.resolve()
+    size = int(source.stat().st_size)
+    base_entry = _incremental_base_entry(base_manifest, source, size, hash_workers)
+    if base_entry is None:
+        offset = 0
+        base_chunks: list[str] = []
+        chain: list[dict[str, Any]] = []
+    else:
+        # Segments start on a chunk boundary, so the base's partial last
+        # chunk is copied again and every chunk hash lines up with the file.
+        base_chunks = list(base_entry.get("logical_chunk_sha256", []) or [])
+        kept = int(base_entry["logical_size_bytes"]) // _HASH_CHUNK_BYTES
+        offset = kept * _HASH_CHUNK_BYTES
+        base_chunks = base_chunks[:kept]
+        chain = _segment_chain(base_entry)
+
+    relative_path = Path("embeddings") / _EMBEDDINGS_DAT_NAME
+    segment_path = payload_dir / "embeddings" / "{}.{}.part".format(_EMBEDDINGS_DAT_NAME, offset)
+    segment_path.parent.mkdir(parents=True, exist_ok=True)
+    _copy_byte_range(
+        source,
+        segment_path,
+        offset=offset,
+        length=size - offset,
+        label=str(relative_path).replace("\\", "/"),
+        progress=progress,
+    )
+    segment_chunks = _chunk_sha256s(segment_path, workers=hash_workers)
+    segment = {
+        "backup_path": str(segment_path.resolve()),
+        "offset": offset,
+        "length": size - offset,
     }
+    entries.append(
+        {
+            "category": "embeddings",
+            "relative_path": str(relative_path).replace("\\", "/"),
+            "source_path": str(source),
+            "backup_path": segment["backup_path"],
+            "size_bytes": size - offset,
+            "sha256": _chunked_root(segment_chunks),
+            "hash_scheme": _HASH_SCHEME_CHUNKED,
+            "chunk_size_bytes": _HASH_CHUNK_BYTES,
+            "chunk_sha256": segment_chunks,
+            "copy_mode": "full" if base_entry is None else "incremental",
+            "base_bundle": "" if base_manifest is None or base_entry is None else str(
+                base_manifest.get("bundle_dir", "")
+            ),
+            "logical_size_bytes": size,
+            "logical_chunk_sha256": base_chunks + segment_chunks,
+            "segments": chain + [segment],
+        }
+    )
+    return entries, missing
+
+
+def _incremental_base_entry(
+    manifest: dict[str, Any] | None,
+    source: Path,
+    size: int,
+    hash_workers: int | None,
+) -> dict[str, Any] | None:
+    if manifest is None:
+        return None
+    entry = None
+    for candidate in list(manifest.get("files", []) or []):
+        if (
+            str(candidate.get("category", "")) == "embeddings"
+            and candidate.get("segments")
+            and str(candidate.get("source_path", "")) == str(source)
+        ):
+            entry = candidate
+    if entry is None or int(entry.get("chunk_size_bytes", 0) or 0) != _HASH_CHUNK_BYTES:
+        return None
+    base_size = int(entry.get("logical_size_bytes", 0) or 0)
+    chain = _segment_chain(entry)
+    if base_size > size or len(chain) >= _MAX_EMBEDDING_CHAIN:
+        return None
+    for segment in chain:
+        segment_path = Path(str(segment.get("backup_path", "")))
+        if not segment_path.exists() or segment_path.stat().st_size != int(segment.get("length", -1)):
+            return None
+    # Append-only means the old full chunks are untouched; spot-check the
+    # first and last of them so a rebuilt file is copied in full instead.
+    kept = base_size // _HASH_CHUNK_BYTES
+    base_chunks = list(entry.get("logical_chunk_sha256", []) or [])
+    if kept == 0 or len(base_chunks) < kept:
+        return None
+    for index in sorted({0, kept - 1}):
+        start = index * _HASH_CHUNK_BYTES
+        current = _chunk_sha256s(
+            source,
+            start=start,
+            end=start + _HASH_CHUNK_BYTES,
+            workers=hash_workers,
+        )
+        if current != [base_chunks[index]]:
+            return None
+    return entry
+
+
+def _copy_byte_range(
+    source: Path,
+    destination: Path,
+    *,
+    offset: int,
+    length: int,
+    label: str,
+    progress: BackupProgress | None,
+) -> None:
+    copied = 0
+    with source.open("rb") as reader, destination.open("wb") as writer:
+        reader.seek(offset)
+        while copied < length:
+            block = reader.read(min(_COPY_BUFFER_BYTES, length - copied))
+            if not block:
+                break
+            writer.write(block)
+            copied += len(block)
+            if progress is not None:
+                progress(label, copied, length)
+    if copied != length:
+        raise OSError("{} shrank while it was being backed up".format(source))
+
+
+def _reassemble_segments(
+    chain: list[dict[str, Any]],
+    destination: Path,
+    logical_size: int,
+) -> None:
+    # Later segments overlap the re-copied tail of earlier ones, so writing
+    # them in chain order leaves the newest bytes in place.
+    with destination.open("wb") as writer:
+        for segment in chain:
+            writer.seek(int(segment.get("offset", 0) or 0))
+            with Path(str(segment["backup_path"])).open("rb") as reader:
+                shutil.copyfileobj(reader, writer, _COPY_BUFFER_BYTES)
+        writer.truncate(logical_size)
+
+
+def _segment_chain(entry: dict[str, Any] | None) -> list[dict[str, Any]]:
+    if not entry:
+        return []
+    return [dict(segment) for segment in list(entry.get("segments", []) or [])]
+
+
+def _base_segments(entry: dict[str, Any]) -> list[dict[str, Any]]:
+    return _segment_chain(entry)[:-1]
+
+
+def _latest_bundle_dir(bundle_root: Path, *, exclude: Path | None = None) -> Path | None:
+    if not bundle_root.exists():
+        return None
+    candidates = sorted(
+        path
+        for path in bundle_root.iterdir()
+        if path.is_dir()
+        and path.name.endswith(_BUNDLE_SUFFIX)
+        and (path / "backup_manifest.json").exists()
+        and (exclude is None or path.resolve() != exclude.resolve())
+    )
+    return candidates[-1] if candidates else None
 
 
 def _build_backup_summary(
@@ -488,12 +852,23 @@ def _build_backup_summary(
 ) -> dict[str, Any]:
     main_summary_path = _entry_backup_path(entries, "database") or main_db
     history_summary_path = _entry_backup_path(entries, "history") or history_db
-    return {
+    summary = {
         "copied_files": len(entries),
         "missing_files": len(missing),
+        "bytes_copied": sum(int(entry.get("size_bytes", 0) or 0) for entry in entries),
         "main_database": _main_database_summary(main_summary_path),
         "history_database": _history_database_summary(history_summary_path),
     }
+    for entry in entries:
+        if entry.get("segments"):
+            summary["embeddings"] = {
+                "copy_mode": str(entry.get("copy_mode", "")),
+                "base_bundle": str(entry.get("base_bundle", "")),
+                "logical_size_bytes": int(entry.get("logical_size_bytes", 0) or 0),
+                "bytes_copied": int(entry.get("size_bytes", 0) or 0),
+                "chain_length": len(entry.get("segments", []) or []),
+            }
+    return summary
 
 
 def _main_database_summary(path: Path) -> dict[str, Any]:
@@ -623,5 +998,56 @@ def _sha256_file(path: Path) -> str:
     return digest.hexdigest()
 
 
+def _chunk_sha256s(
+    path: Path,
+    *,
+    start: int = 0,
+    end: int | None = None,
+    chunk_size: int | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    chunk_size = int(chunk_size or _HASH_CHUNK_BYTES)
+    stop = int(path.stat().st_size) if end is None else int(end)
+    offsets = list(range(int(start), stop, chunk_size)) or [int(start)]
+
+    def _hash_range(offset: int) -> str:
+        digest = hashlib.sha256()
+        remaining = max(0, min(chunk_size, stop - offset))
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            while remaining:
+                block = handle.read(min(_COPY_BUFFER_BYTES, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+
+    if len(offsets) == 1:
+        return [_hash_range(offsets[0])]
+    # hashlib releases the GIL on large buffers, so threads hash in parallel.
+    max_workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_hash_range, offsets))
+
+
+def _chunked_root(chunk_hashes: list[str]) -> str:
+    digest = hashlib.sha256()
+    for chunk_hash in chunk_hashes:
+        digest.update(bytes.fromhex(chunk_hash))
+    return digest.hexdigest()
+
+
+def _entry_chunk_size(entry: dict[str, Any]) -> int:
+    return int(entry.get("chunk_size_bytes", 0) or 0) or _HASH_CHUNK_BYTES
+
+
+def _entry_file_digest(path: Path, entry: dict[str, Any]) -> str:
+    # Schema 1 bundles recorded a plain whole-file SHA-256.
+    if str(entry.get("hash_scheme", "")) != _HASH_SCHEME_CHUNKED:
+        return _sha256_file(path)
+    return _chunked_root(_chunk_sha256s(path, chunk_size=_entry_chunk_size(entry)))
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
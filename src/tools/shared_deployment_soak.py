@@ -23,6 +23,29 @@ class JsonHttpResponse:
 FetchJson = Callable[..., JsonHttpResponse]
 
 
+@dataclass(frozen=True)
+class LatencySlo:
+    """Latency and error-rate targets a soak run is judged against."""
+
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+    ttft_p95_ms: float | None = None
+    max_error_rate: float | None = None
+
+    def configured(self) -> bool:
+        return any(
+            value is not None
+            for value in (
+                self.p50_ms,
+                self.p95_ms,
+                self.p99_ms,
+                self.ttft_p95_ms,
+                self.max_error_rate,
+            )
+        )
+
+
 def default_shared_soak_report_dir(project_root: str | Path | None = None) -> Path:
     root = Path(project_root or ".").resolve()
     return root / "output" / "shared_soak"
@@ -119,6 +142,7 @@ def run_shared_deployment_soak(
     poll_interval_seconds: float = 0.5,
     extra_headers: dict[str, str] | None = None,
     fetcher: FetchJson = fetch_json,
+    slo: LatencySlo | None = None,
 ) -> dict[str, Any]:
     prompts = [str(item or "").strip() for item in questions if str(item or "").strip()]
     if not prompts:
@@ -259,8 +283,9 @@ def run_shared_deployment_soak(
     )
 
     summary = summarize_soak_results(results, queue_samples=queue_samples)
+    slo_verdict = evaluate_latency_slo(summary, slo)
     report = {
-        "ok": summary["failed_requests"] == 0,
+        "ok": summary["failed_requests"] == 0 and slo_verdict["verdict"] != "fail",
         "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
         "window": {
             "started_at": started_at,
@@ -292,6 +317,7 @@ def run_shared_deployment_soak(
             for index, prompt in enumerate(prompts)
         ],
         "summary": summary,
+        "slo": slo_verdict,
         "requests": sorted(results, key=lambda item: str(item.get("request_id", ""))),
         "queue_samples": list(queue_samples),
         "post_run": {
@@ -374,6 +400,46 @@ def summarize_soak_results(
     }
 
 
+def evaluate_latency_slo(
+    summary: dict[str, Any],
+    slo: LatencySlo | None,
+) -> dict[str, Any]:
+    if slo is None or not slo.configured():
+        return {"verdict": "not_configured", "checks": []}
+    client = dict(summary.get("client_latency_ms", {}) or {})
+    ttft = dict(summary.get("ttft_ms", {}) or {})
+    total = int(summary.get("total_requests", 0) or 0)
+    failed = int(summary.get("failed_requests", 0) or 0)
+    checks: list[dict[str, Any]] = []
+
+    def _check(name: str, threshold: float | None, observed: float | None) -> None:
+        if threshold is None:
+            return
+        checks.append(
+            {
+                "name": name,
+                "threshold": float(threshold),
+                "observed": observed,
+                "passed": observed is not None and float(observed) <= float(threshold),
+            }
+        )
+
+    has_latency = bool(client.get("count"))
+    _check("client_p50_ms", slo.p50_ms, client.get("p50") if has_latency else None)
+    _check("client_p95_ms", slo.p95_ms, client.get("p95") if has_latency else None)
+    _check("client_p99_ms", slo.p99_ms, client.get("p99") if has_latency else None)
+    _check("ttft_p95_ms", slo.ttft_p95_ms, ttft.get("p95") if ttft.get("count") else None)
+    _check(
+        "error_rate",
+        slo.max_error_rate,
+        round(failed / total, 4) if total else None,
+    )
+    return {
+        "verdict": "pass" if all(check["passed"] for check in checks) else "fail",
+        "checks": checks,
+    }
+
+
 def write_shared_soak_report(
     report: dict[str, Any],
     *,
@@ -421,9 +487,31 @@ def format_soak_console_summary(report: dict[str, Any]) -> str:
             int(queue.get("peak_total_rejected", 0) or 0),
         ),
     ]
+    ttft = dict(summary.get("ttft_ms", {}) or {})
+    if ttft.get("count"):
+        lines.append(
+            "Stream TTFT ms: p50={:.1f} p95={:.1f} max={:.1f}".format(
+                float(ttft.get("p50", 0.0) or 0.0),
+                float(ttft.get("p95", 0.0) or 0.0),
+                float(ttft.get("max", 0.0) or 0.0),
+            )
+        )
     errors = dict(summary.get("errors", {}) or {})
     if errors:
         lines.append("Errors: {}".format(json.dumps(errors, sort_keys=True)))
+    slo = dict(report.get("slo", {}) or {})
+    if slo.get("checks"):
+        failed_checks = [
+            str(check.get("name", ""))
+            for check in list(slo.get("checks", []) or [])
+            if not check.get("passed")
+        ]
+        lines.append(
+            "SLO: {}{}".format(
+                str(slo.get("verdict", "")),
+                " ({})".format(", ".join(failed_checks)) if failed_checks else "",
+            )
+        )
     return "\n".join(lines)
 
 
@@ -619,6 +707,7 @@ def _latency_summary(values: Sequence[float]) -> dict[str, float]:
             "mean": 0.0,
             "p50": 0.0,
             "p95": 0.0,
+            "p99": 0.0,
             "max": 0.0,
         }
     total = sum(ordered)
@@ -628,6 +717,7 @@ def _latency_summary(values: Sequence[float]) -> dict[str, float]:
         "mean": round(total / len(ordered), 2),
         "p50": round(_percentile(ordered, 50), 2),
         "p95": round(_percentile(ordered, 95), 2),
+        "p99": round(_percentile(ordered, 99), 2),
         "max": round(ordered[-1], 2),
     }
 
@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Sequence
+
+import httpx
+
+from src.tools.shared_deployment_soak import (
+    LatencySlo,
+    build_request_headers,
+    evaluate_latency_slo,
+    summarize_soak_results,
+)
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """How the async driver schedules requests against the shared API.
+
+    closed: ``concurrency`` virtual users each wait for their answer before
+    sending the next one, paced ``pacing_seconds`` apart when set.
+    open: requests arrive as a Poisson process at ``rate_per_second`` no
+    matter how slowly the server answers; ``concurrency`` caps in-flight
+    requests and anything above it waits client-side on the clock.
+    """
+
+    mode: str = "closed"
+    concurrency: int = 4
+    rate_per_second: float = 2.0
+    duration_seconds: float = 30.0
+    total_requests: int | None = None
+    pacing_seconds: float = 0.0
+    stream_fraction: float = 0.0
+    timeout_seconds: float = 60.0
+    seed: int = 1337
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with about 1% relative error."""
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self._log_base = math.log1p(float(precision))
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        value = max(0.0, float(value_ms))
+        key = int(math.floor(math.log(max(value, 0.001)) / self._log_base))
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(float(percentile) / 100.0 * self.count)))
+        seen = 0
+        for key in sorted(self._counts):
+            seen += self._counts[key]
+            if seen >= rank:
+                upper = math.exp((key + 1) * self._log_base)
+                return min(max(upper, self.min or 0.0), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        if not self.count:
+            return {
+                "count": 0.0,
+                "min": 0.0,
+                "mean": 0.0,
+                "p50": 0.0,
+                "p90": 0.0,
+                "p95": 0.0,
+                "p99": 0.0,
+                "max": 0.0,
+            }
+        return {
+            "count": float(self.count),
+            "min": round(float(self.min or 0.0), 2),
+            "mean": round(self.total / self.count, 2),
+            "p50": round(self.percentile(50), 2),
+            "p90": round(self.percentile(90), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2),
+            "max": round(self.max, 2),
+        }
+
+
+def poisson_arrivals(
+    rate_per_second: float,
+    *,
+    duration_seconds: float | None = None,
+    total_requests: int | None = None,
+    seed: int = 1337,
+) -> list[float]:
+    if rate_per_second <= 0:
+        raise ValueError("Open-loop load needs a positive rate_per_second")
+    if duration_seconds is None and total_requests is None:
+        raise ValueError("Open-loop load needs a duration or a request count")
+    rng = random.Random(seed)
+    offsets: list[float] = []
+    clock = 0.0
+    while total_requests is None or len(offsets) < total_requests:
+        clock += rng.expovariate(rate_per_second)
+        if duration_seconds is not None and clock > duration_seconds:
+            break
+        offsets.append(clock)
+    return offsets
+
+
+def run_shared_load_soak(
+    *,
+    base_url: str,
+    questions: Sequence[str],
+    profile: LoadProfile | None = None,
+    auth_token: str = "",
+    proxy_user_header: str = "",
+    proxy_identity_secret: str = "",
+    poll_interval_seconds: float = 0.5,
+    extra_headers: dict[str, str] | None = None,
+    slo: LatencySlo | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Any]:
+    return asyncio.run(
+        run_shared_load_soak_async(
+            base_url=base_url,
+            questions=questions,
+            profile=profile,
+            auth_token=auth_token,
+            proxy_user_header=proxy_user_header,
+            proxy_identity_secret=proxy_identity_secret,
+            poll_interval_seconds=poll_interval_seconds,
+            extra_headers=extra_headers,
+            slo=slo,
+            transport=transport,
+        )
+    )
+
+
+async def run_shared_load_soak_async(
+    *,
+    base_url: str,
+    questions: Sequence[str],
+    profile: LoadProfile | None = None,
+    auth_token: str = "",
+    proxy_user_header: str = "",
+    proxy_identity_secret: str = "",
+    poll_interval_seconds: float = 0.5,
+    extra_headers: dict[str, str] | None = None,
+    slo: LatencySlo | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Any]:
+    prompts = [str(item or "").strip() for item in questions if str(item or "").strip()]
+    if not prompts:
+        raise ValueError("At least one soak question is required")
+    profile = profile or LoadProfile()
+    mode = str(profile.mode or "closed").strip().lower()
+    if mode not in ("closed", "open"):
+        raise ValueError("Load mode must be 'closed' or 'open', got {!r}".format(profile.mode))
+    concurrency = max(1, int(profile.concurrency or 1))
+    target = str(base_url or "").strip().rstrip("/")
+    if not target:
+        raise ValueError("base_url is required")
+    plain_headers = build_request_headers(auth_token=auth_token, extra_headers=extra_headers)
+
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=target,
+        transport=transport,
+        limits=limits,
+        timeout=float(profile.timeout_seconds),
+    ) as client:
+        preflight = {
+            "health": await _get_record(client, "/health", plain_headers),
+            "status": await _get_record(client, "/status", plain_headers),
+            "auth_context": await _get_record(client, "/auth/context", plain_headers),
+        }
+        queue_samples: list[dict[str, Any]] = []
+        poll_stop = asyncio.Event()
+        poller = None
+        if poll_interval_seconds > 0:
+            poller = asyncio.create_task(
+                _queue_poll_loop(client, plain_headers, queue_samples, poll_stop, poll_interval_seconds)
+            )
+
+        rng = random.Random(profile.seed)
+        header_cache: dict[int, dict[str, str]] = {}
+
+        def headers_for(user_index: int) -> dict[str, str]:
+            if user_index not in header_cache:
+                header_cache[user_index] = build_request_headers(
+                    auth_token=auth_token,
+                    proxy_user_header=proxy_user_header,
+                    proxy_user_value="soak-user-{:02d}".format(user_index + 1) if proxy_user_header else "",
+                    proxy_identity_secret=proxy_identity_secret,
+                    extra_headers=extra_headers,
+                )
+            return header_cache[user_index]
+
+        def plan(index: int) -> tuple[str, bool]:
+            return prompts[index % len(prompts)], rng.random() < float(profile.stream_fraction)
+
+        started_at = datetime.now().astimezone().isoformat(timespec="seconds")
+        loop = asyncio.get_running_loop()
+        run_started = loop.time()
+        try:
+            if mode == "open":
+                results = await _drive_open_loop(client, profile, concurrency, plan, headers_for)
+            else:
+                results = await _drive_closed_loop(client, profile, concurrency, plan, headers_for)
+        finally:
+            poll_stop.set()
+            if poller is not None:
+                await poller
+        elapsed = max(1e-9, loop.time() - run_started)
+        finished_at = datetime.now().astimezone().isoformat(timespec="seconds")
+
+        post_run = {
+            "status": await _get_record(client, "/status", plain_headers),
+            "query_queue": await _get_record(client, "/activity/query-queue", plain_headers),
+            "query_activity": await _get_record(client, "/activity/queries", plain_headers),
+        }
+
+    summary = summarize_load_results(results, queue_samples=queue_samples, elapsed_seconds=elapsed)
+    corrected = mode == "open" or float(profile.pacing_seconds) > 0
+    summary["coordinated_omission"] = (
+        "corrected: latency is measured from each request's scheduled send time"
+        if corrected
+        else "not applicable: unpaced closed loop has no schedule to fall behind"
+    )
+    slo_verdict = evaluate_latency_slo(summary, slo)
+    return {
+        "ok": summary["failed_requests"] == 0 and slo_verdict["verdict"] != "fail",
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "driver": "async",
+        "window": {
+            "started_at": started_at,
+            "finished_at": finished_at,
+        },
+        "target": {"base_url": target, **preflight},
+        "config": {
+            "load_mode": mode,
+            "concurrency": concurrency,
+            "rate_per_second": float(profile.rate_per_second) if mode == "open" else None,
+            "duration_seconds": float(profile.duration_seconds),
+            "total_requests": profile.total_requests,
+            "pacing_seconds": float(profile.pacing_seconds),
+            "stream_fraction": float(profile.stream_fraction),
+            "timeout_seconds": float(profile.timeout_seconds),
+            "seed": int(profile.seed),
+            "question_count": len(prompts),
+            "poll_interval_seconds": float(poll_interval_seconds),
+            "proxy_user_header": str(proxy_user_header or ""),
+            "proxy_identity_secret_configured": bool(str(proxy_identity_secret or "").strip()),
+        },
+        "summary": summary,
+        "slo": slo_verdict,
+        "requests": sorted(results, key=lambda item: str(item.get("request_id", ""))),
+        "queue_samples": list(queue_samples),
+        "post_run": post_run,
+    }
+
+
+def summarize_load_results(
+    results: Sequence[dict[str, Any]],
+    *,
+    queue_samples: Sequence[dict[str, Any]] | None = None,
+    elapsed_seconds: float | None = None,
+) -> dict[str, Any]:
+    summary = summarize_soak_results(results, queue_samples=queue_samples)
+    client = LatencyHistogram()
+    service = LatencyHistogram()
+    ttft = LatencyHistogram()
+    transports: dict[str, int] = {}
+    for item in results:
+        transport = str(item.get("transport", "") or "")
+        if transport:
+            transports[transport] = transports.get(transport, 0) + 1
+        if item.get("client_latency_ms") is not None:
+            client.record(float(item["client_latency_ms"]))
+        if item.get("service_time_ms") is not None:
+            service.record(float(item["service_time_ms"]))
+        if item.get("ttft_ms") is not None:
+            ttft.record(float(item["ttft_ms"]))
+    summary["client_latency_ms"] = client.summary()
+    summary["service_time_ms"] = service.summary()
+    summary["ttft_ms"] = ttft.summary()
+    summary["transports"] = transports
+    if elapsed_seconds:
+        summary["elapsed_seconds"] = round(float(elapsed_seconds), 3)
+        summary["achieved_rate_per_second"] = round(len(results) / float(elapsed_seconds), 3)
+    return summary
+
+
+async def _drive_closed_loop(client, profile, concurrency, plan, headers_for) -> list[dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + float(profile.duration_seconds)
+    limit = profile.total_requests
+    issued = [0]
+    results: list[dict[str, Any]] = []
+
+    async def user(user_index: int) -> None:
+        sent_by_user = 0
+        while True:
+            if limit is not None and issued[0] >= limit:
+                return
+            if limit is None and loop.time() >= deadline:
+                return
+            index = issued[0]
+            issued[0] += 1
+            pacing = float(profile.pacing_seconds)
+            if pacing > 0:
+                # The user's schedule keeps ticking while a slow answer is
+                # outstanding, so a stall shows up in every request it delayed.
+                intended = start + sent_by_user * pacing
+                if intended > loop.time():
+                    await asyncio.sleep(intended - loop.time())
+            else:
+                intended = loop.time()
+            sent_by_user += 1
+            question, stream = plan(index)
+            results.append(
+                await _send(client, index, question, stream, intended, start, headers_for(user_index))
+            )
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return results
+
+
+async def _drive_open_loop(client, profile, concurrency, plan, headers_for) -> list[dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    arrivals = poisson_arrivals(
+        float(profile.rate_per_second),
+        duration_seconds=None if profile.total_requests is not None else float(profile.duration_seconds),
+        total_requests=profile.total_requests,
+        seed=int(profile.seed),
+    )
+    gate = asyncio.Semaphore(concurrency)
+    start = loop.time()
+    tasks = []
+
+    async def fire(index: int, intended: float) -> dict[str, Any]:
+        question, stream = plan(index)
+        async with gate:
+            return await _send(
+                client, index, question, stream, intended, start, headers_for(index % concurrency)
+            )
+
+    for index, offset in enumerate(arrivals):
+        intended = start + offset
+        delay = intended - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(index, intended)))
+    return list(await asyncio.gather(*tasks))
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    index: int,
+    question: str,
+    stream: bool,
+    intended: float,
+    run_start: float,
+    headers: dict[str, str],
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    sent = loop.time()
+    first_token: float | None = None
+    status_code = 0
+    payload: dict[str, Any] = {}
+    error_text = ""
+    try:
+        if stream:
+            async with client.stream(
+                "POST",
+                "/query/stream",
+                json={"question": question},
+                headers={**headers, "Accept": "text/event-stream"},
+            ) as response:
+                status_code = int(response.status_code)
+                if status_code >= 400:
+                    await response.aread()
+                    payload = _parse_json(response.text)
+                else:
+                    async for event, data in _iter_sse(response):
+                        if event == "token" and first_token is None:
+                            first_token = loop.time()
+                        elif event == "done":
+                            payload = _parse_json(data)
+                        elif event == "error":
+                            error_text = data or "stream error"
+                    if not payload and not error_text:
+                        error_text = "stream ended without a done event"
+        else:
+            response = await client.post("/query", json={"question": question}, headers=headers)
+            status_code = int(response.status_code)
+            payload = _parse_json(response.text)
+    except Exception as exc:
+        status_code = status_code or 599
+        error_text = "{}: {}".format(type(exc).__name__, exc)
+    finished = loop.time()
+
+    error_text = error_text or str(payload.get("error", "") or payload.get("detail", "") or "").strip()
+    server_latency = payload.get("latency_ms")
+    return {
+        "request_id": "req-{:05d}".format(index + 1),
+        "question_preview": " ".join(question.split())[:120],
+        "transport": "stream" if stream else "sync",
+        "status_code": status_code,
+        "ok": status_code < 400 and not error_text,
+        "scheduled_offset_ms": round((intended - run_start) * 1000.0, 2),
+        "send_delay_ms": round(max(0.0, sent - intended) * 1000.0, 2),
+        "client_latency_ms": round((finished - intended) * 1000.0, 2),
+        "service_time_ms": round((finished - sent) * 1000.0, 2),
+        "ttft_ms": round((first_token - intended) * 1000.0, 2) if first_token is not None else None,
+        "server_latency_ms": round(float(server_latency), 2) if server_latency is not None else None,
+        "chunks_used": int(payload.get("chunks_used", 0) or 0),
+        "source_count": len(list(payload.get("sources", []) or [])),
+        "mode": str(payload.get("mode", "") or ""),
+        "error": error_text or None,
+    }
+
+
+async def _iter_sse(response: httpx.Response):
+    event = "message"
+    data_lines: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data_lines or event != "message":
+                yield event, "\n".join(data_lines)
+            event, data_lines = "message", []
+        elif line.startswith(":"):
+            continue
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].lstrip(" "))
+    if data_lines:
+        yield event, "\n".join(data_lines)
+
+
+async def _queue_poll_loop(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    samples: list[dict[str, Any]],
+    stop: asyncio.Event,
+    interval_seconds: float,
+) -> None:
+    while not stop.is_set():
+        record = await _get_record(client, "/activity/query-queue", headers)
+        samples.append(
+            {
+                "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+                "status_code": record["status_code"],
+                "snapshot": record["payload"],
+            }
+        )
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            continue
+
+
+async def _get_record(client: httpx.AsyncClient, path: str, headers: dict[str, str]) -> dict[str, Any]:
+    try:
+        response = await client.get(path, headers=headers)
+    except Exception as exc:
+        return {"status_code": 599, "payload": {"detail": "{}: {}".format(type(exc).__name__, exc)}}
+    return {"status_code": int(response.status_code), "payload": _parse_json(response.text)}
+
+
+def _parse_json(text: str) -> dict[str, Any]:
+    raw = str(text or "").strip()
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        return {"detail": raw}
+    return data if isinstance(data, dict) else {"data": data}
+
+
+class StubQueryEngine:
+    """Query engine stand-in that answers after a fixed delay, for offline soaks.
+
+    Streams emit ``tokens`` tokens; the first arrives after
+    ``first_token_seconds`` and the rest are spread over the remaining
+    ``latency_seconds``.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.05,
+        first_token_seconds: float = 0.02,
+        tokens: int = 8,
+    ) -> None:
+        self.latency_seconds = float(latency_seconds)
+        self.first_token_seconds = min(float(first_token_seconds), self.latency_seconds)
+        self.tokens = max(1, int(tokens))
+        self.calls = 0
+
+    def _result(self, question: str, started: float):
+        from src.core.query_engine import QueryResult
+
+        return QueryResult(
+            answer="Stub answer for: {}".format(question),
+            sources=[{"path": "stub/source.txt"}],
+            chunks_used=1,
+            tokens_in=len(question) // 4,
+            tokens_out=self.tokens,
+            cost_usd=0.0,
+            latency_ms=(time.perf_counter() - started) * 1000.0,
+            mode="online",
+            error=None,
+        )
+
+    def query(self, question: str):
+        self.calls += 1
+        started = time.perf_counter()
+        time.sleep(self.latency_seconds)
+        return self._result(question, started)
+
+    def query_stream(self, question: str):
+        self.calls += 1
+        started = time.perf_counter()
+        yield {"phase": "searching"}
+        time.sleep(self.first_token_seconds)
+        yield {"phase": "generating", "chunks": 1, "retrieval_ms": self.first_token_seconds * 1000.0}
+        gap = (self.latency_seconds - self.first_token_seconds) / max(1, self.tokens - 1)
+        for index in range(self.tokens):
+            if index:
+                time.sleep(gap)
+            yield {"token": "tok{} ".format(index)}
+        yield {"done": True, "result": self._result(question, started)}
+
+
+@contextmanager
+def _stub_engine_installed(engine: StubQueryEngine | None) -> Iterator[None]:
+    """Swap the running API's query engine for a stub and force online mode."""
+    from src.api.server import state
+
+    original_engine = state.query_engine
+    original_mode = getattr(state.config, "mode", None) if state.config is not None else None
+    state.query_engine = engine or StubQueryEngine()
+    if state.config is not None:
+        state.config.mode = "online"
+    try:
+        yield
+    finally:
+        state.query_engine = original_engine
+        if state.config is not None and original_mode is not None:
+            state.config.mode = original_mode
+
+
+@asynccontextmanager
+async def stub_api_transport(
+    engine: StubQueryEngine | None = None,
+) -> AsyncIterator[httpx.AsyncBaseTransport]:
+    """Run the real API in this event loop (lifespan included) with a stub engine.
+
+    Yields an ASGI transport for run_shared_load_soak_async(); nothing
+    binds a port and uvicorn is not needed.
+    """
+    from src.api.server import app
+
+    async with app.router.lifespan_context(app):
+        with _stub_engine_installed(engine):
+            yield httpx.ASGITransport(app=app)
+
+
+@contextmanager
+def serve_stub_api(
+    engine: StubQueryEngine | None = None,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    startup_timeout_seconds: float = 60.0,
+) -> Iterator[str]:
+    """Run the real API on a local port with its query engine swapped for a stub."""
+    import uvicorn
+
+    from src.api.server import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=host, port=int(port), log_level="warning", lifespan="on")
+    )
+    thread = threading.Thread(target=server.run, daemon=True, name="hybridrag-stub-api")
+    thread.start()
+    deadline = time.monotonic() + float(startup_timeout_seconds)
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            server.should_exit = True
+            raise RuntimeError("Stub API server did not start")
+        time.sleep(0.05)
+
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        with _stub_engine_installed(engine):
+            yield "http://{}:{}".format(host, bound_port)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=30.0)
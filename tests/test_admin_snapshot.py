@@ -0,0 +1,206 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies the background Admin snapshot cache and the /admin/stream delta feed.
+# What to read first: Start at the service tests, then the SSE stream test.
+# Inputs: Counting section builders and a stand-in request object.
+# Outputs: Assertions on rebuild counts, change events and SSE frames.
+# Safety notes: No server, source tree or log files required.
+# ============================
+
+import asyncio
+import json
+import threading
+
+from src.api.admin_snapshot import (
+    AdminSnapshotService,
+    SnapshotSection,
+    get_admin_snapshot_service,
+    publish_admin_event,
+    reset_admin_snapshot_service,
+)
+
+
+class _Counter:
+    def __init__(self, value="v"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"{self.value}{self.calls}"
+
+
+def test_snapshot_serves_cache_and_rebuilds_on_events_interval_and_token():
+    slow = _Counter("scan")
+    logs = _Counter("log")
+    token = {"mtime": 1}
+    service = AdminSnapshotService([
+        SnapshotSection("freshness", slow, interval_s=300, events=("index_finished",)),
+        SnapshotSection("logs", logs, change_token=lambda: token["mtime"]),
+    ])
+
+    # Nothing is built on the reader's thread; the worker tick builds.
+    assert service.snapshot() == {"freshness": None, "logs": None}
+    assert (slow.calls, logs.calls) == (0, 0)
+    assert service.run_once() == ["freshness", "logs"]
+    assert service.snapshot() == {"freshness": "scan1", "logs": "log1"}
+    assert service.snapshot() == {"freshness": "scan1", "logs": "log1"}
+    assert (slow.calls, logs.calls) == (1, 1)
+
+    # Events only mark sections dirty; the worker tick rebuilds them.
+    assert service.publish("index_finished") == ["freshness"]
+    assert service.publish("query_completed") == []
+    assert service.snapshot()["freshness"] == "scan1"
+    assert service.run_once() == ["freshness"]
+    assert service.snapshot()["freshness"] == "scan2"
+
+    # A moved change token serves the old value and schedules a rebuild.
+    token["mtime"] = 2
+    assert service.snapshot()["logs"] == "log1"
+    assert service.run_once() == ["logs"]
+    assert service.snapshot()["logs"] == "log2"
+    assert service.run_once() == []
+    assert service.run_once(now=10**9) == ["freshness"]
+    assert service.version == 5
+
+
+def test_failing_builder_keeps_last_good_value():
+    state = {"fail": False}
+
+    def build():
+        if state["fail"]:
+            raise OSError("share offline")
+        return "ok"
+
+    service = AdminSnapshotService([SnapshotSection("freshness", build, events=("x",))])
+    service.run_once()
+    assert service.snapshot() == {"freshness": "ok"}
+    state["fail"] = True
+    service.publish("x")
+    assert service.run_once() == []
+    assert service.snapshot() == {"freshness": "ok"}
+    assert service.errors["freshness"] == "OSError: share offline"
+
+
+def test_first_build_failure_serves_placeholder_and_other_sections():
+    def broken():
+        raise OSError("share offline")
+
+    service = AdminSnapshotService([
+        SnapshotSection("freshness", broken, placeholder=lambda: "pending"),
+        SnapshotSection("logs", _Counter("log")),
+    ])
+
+    assert service.run_once() == ["logs"]
+    assert service.snapshot() == {"freshness": "pending", "logs": "log1"}
+    assert service.errors["freshness"] == "OSError: share offline"
+
+
+def test_snapshot_waits_for_the_worker_instead_of_building_inline():
+    builders = []
+
+    def build():
+        builders.append(threading.current_thread().name)
+        return "scan"
+
+    service = AdminSnapshotService([SnapshotSection("freshness", build)], tick_s=30)
+    service.start()
+    try:
+        assert service.snapshot(wait_s=5.0) == {"freshness": "scan"}
+    finally:
+        service.stop()
+    assert builders == ["admin-snapshot"]
+
+
+def test_worker_thread_and_module_events_wake_subscribers():
+    counter = _Counter("trace")
+    reset_admin_snapshot_service()
+    service = get_admin_snapshot_service(
+        lambda: AdminSnapshotService(
+            [SnapshotSection("traces", counter, events=("query_completed",))],
+            tick_s=30,
+        )
+    )
+
+    async def scenario():
+        service.run_once()
+        subscription = service.subscribe()
+        service.start()
+        publish_admin_event("query_completed")
+        changed = await subscription.wait(5.0)
+        service.unsubscribe(subscription)
+        return changed
+
+    try:
+        assert asyncio.run(scenario()) == {"traces"}
+        assert service.subscriber_count == 0
+        assert counter.calls == 2
+    finally:
+        reset_admin_snapshot_service()
+    assert not service.running
+    publish_admin_event("query_completed")  # no service: no-op
+
+
+class _Snapshot:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def model_dump(self, mode="python", include=None):
+        return {
+            key: value for key, value in self.payload.items()
+            if include is None or key in include
+        }
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+def test_admin_stream_sends_snapshot_then_only_changed_sections(monkeypatch):
+    from src.api import routes as api_routes
+
+    current = {"dashboard": {"active": 0}, "freshness": {"stale": False}}
+    builds = {"full": 0, "live": 0}
+
+    def _full(request, **_kwargs):
+        builds["full"] += 1
+        return _Snapshot(current)
+
+    def _live(request, base, **_kwargs):
+        builds["live"] += 1
+        return _Snapshot(dict(base.payload, dashboard=current["dashboard"]))
+
+    monkeypatch.setattr(api_routes, "_build_admin_console_snapshot", _full)
+    monkeypatch.setattr(api_routes, "_build_admin_live_sections", _live)
+
+    async def collect():
+        frames = []
+        stream = api_routes._admin_console_event_stream(
+            _Request(), live_interval_s=0.01, max_events=3,
+        )
+        frames.append(await stream.__anext__())
+        frames.append(await stream.__anext__())  # nothing changed yet
+        current["dashboard"] = {"active": 1}
+        current["freshness"] = {"stale": True}
+        frames.append(await stream.__anext__())  # live tick: dashboard only
+        assert builds == {"full": 1, "live": 2}
+        api_routes._admin_snapshot_service().put("freshness", {"stale": True})
+        async for frame in stream:
+            frames.append(frame)
+        return frames
+
+    reset_admin_snapshot_service()
+    try:
+        frames = asyncio.run(collect())
+    finally:
+        reset_admin_snapshot_service()
+
+    assert frames[0].startswith("event: snapshot\n")
+    assert json.loads(frames[0].split("data: ", 1)[1]) == {
+        "dashboard": {"active": 0}, "freshness": {"stale": False},
+    }
+    assert frames[1] == ": keepalive\n\n"
+    assert json.loads(frames[2].split("data: ", 1)[1]) == {"dashboard": {"active": 1}}
+    assert builds["full"] == 2
+    assert frames[-1].startswith("event: delta\n")
+    assert json.loads(frames[-1].split("data: ", 1)[1]) == {"freshness": {"stale": True}}
@@ -42,6 +42,15 @@ def reset_browser_login_rate_state():
         web_dashboard._LOGIN_RATE_STATE.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_admin_snapshot_cache():
+    from src.api.admin_snapshot import reset_admin_snapshot_service
+
+    reset_admin_snapshot_service()
+    yield
+    reset_admin_snapshot_service()
+
+
 def _swap_conversation_thread_state(tmp_path):
     from src.api.server import state
     from src.api.query_threads import ConversationThreadStore
@@ -480,6 +489,7 @@ class TestWebDashboard:
                 "operator_logs",
                 "latest_query_trace",
                 "recent_query_traces",
+                "stage_latency",
             }
             assert data["dashboard"]["status"]["status"] == "ok"
             assert data["config"]["mode"] in ("offline", "online")
@@ -868,6 +878,24 @@ class TestWebDashboard:
         assert data["operator_logs"]["app_log_entries"][0]["summary"] == "Indexed 12 files"
         assert data["operator_logs"]["index_reports"][0]["size_bytes"] == 1935
 
+    def test_admin_data_serves_placeholder_when_first_freshness_scan_fails(self, client, monkeypatch):
+        from src.api import routes as api_routes
+
+        client.cookies.clear()
+        monkeypatch.delenv("HYBRIDRAG_API_AUTH_TOKEN", raising=False)
+
+        def _offline():
+            raise OSError("share offline")
+
+        monkeypatch.setattr(api_routes, "_build_admin_content_freshness_response", _offline)
+
+        response = client.get("/admin/data")
+
+        assert response.status_code == 200
+        freshness = response.json()["freshness"]
+        assert freshness["summary"] == "Freshness scan in progress."
+        assert freshness["stale"] is False
+
     def test_admin_data_requires_auth_when_token_configured(self, client, monkeypatch):
         client.cookies.clear()
         monkeypatch.setenv("HYBRIDRAG_API_AUTH_TOKEN", "test-token")
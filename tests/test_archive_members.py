@@ -0,0 +1,150 @@
+import hashlib
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.core.vector_store import VectorStore
+from src.parsers import archive_parser
+from tests.conftest import FakeConfig
+
+_DOCS = {
+    "specs/radar.txt": "The radar transmitter operates at 9.4 GHz with 25 kW peak power. " * 8,
+    "specs/antenna.txt": "The antenna gain is 32 dBi and the beamwidth is 1.8 degrees. " * 8,
+    "notes/readme.md": "Maintenance notes: replace the magnetron every 4000 hours. " * 8,
+}
+
+
+def _write_zip(path, docs):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in docs.items():
+            zf.writestr(name, text)
+    # Distinct mtime per rewrite so the size:mtime fingerprint changes.
+    stamp = os.stat(path).st_mtime + len(docs) + sum(map(len, docs.values())) % 97
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_ARCHIVE_WORKERS", "3")
+    monkeypatch.setattr(
+        archive_parser, "_make_member_executor",
+        lambda workers: ThreadPoolExecutor(max_workers=workers),
+    )
+
+
+def test_members_are_parsed_in_pool_in_archive_order(tmp_path, thread_pool):
+    bundle = tmp_path / "bundle.zip"
+    _write_zip(bundle, _DOCS)
+    details = {}
+
+    members = archive_parser.ArchiveParser().parse_members(str(bundle), details)
+
+    assert [m.name for m in members] == list(_DOCS)
+    assert all(m.status == "parsed" for m in members)
+    assert members[0].sha256 == hashlib.sha256(_DOCS["specs/radar.txt"].encode()).hexdigest()
+    assert details["executor"] == "process_pool"
+    assert details["members_parsed"] == 3
+    assert archive_parser.member_source_path(str(bundle), "specs/radar.txt") == (
+        f"{bundle}!/specs/radar.txt"
+    )
+
+    text, _ = archive_parser.ArchiveParser().parse_with_details(str(bundle))
+    assert text.index("[ARCHIVE_MEMBER=specs/radar.txt]") < text.index("[ARCHIVE_MEMBER=notes/readme.md]")
+
+
+def test_skip_callback_marks_members_unchanged_without_parsing(tmp_path, thread_pool, monkeypatch):
+    bundle = tmp_path / "bundle.zip"
+    _write_zip(bundle, _DOCS)
+    parsed = []
+    original = archive_parser._parse_member_file
+
+    def _tracking(path):
+        parsed.append(os.path.basename(path))
+        return original(path)
+
+    monkeypatch.setattr(archive_parser, "_parse_member_file", _tracking)
+
+    members = archive_parser.ArchiveParser().parse_members(
+        str(bundle), {}, skip=lambda name, digest: name.startswith("specs/"),
+    )
+
+    assert [m.status for m in members] == ["unchanged", "unchanged", "parsed"]
+    assert parsed == ["readme.md"]
+
+
+def _make_indexer(tmp_path):
+    from src.core.indexer import Indexer
+
+    store = VectorStore(db_path=str(tmp_path / "db" / "index.sqlite3"), embedding_dim=4)
+    store.connect()
+    embedder = MagicMock()
+    embedder.embed_documents.side_effect = lambda texts: np.ones((len(texts), 4), dtype=np.float32)
+    chunker = MagicMock()
+    chunker.chunk_text.side_effect = lambda text: [
+        text[i:i + 300] for i in range(0, len(text), 300)
+    ]
+    return Indexer(FakeConfig(), store, embedder, chunker), store, embedder
+
+
+def test_indexer_stores_members_as_sources_and_skips_unchanged_ones(tmp_path, thread_pool):
+    indexer, store, embedder = _make_indexer(tmp_path)
+    bundle = tmp_path / "bundle.zip"
+    _write_zip(bundle, _DOCS)
+    try:
+        chunks, reason, _, details = indexer._process_single_file(bundle)
+        assert reason is None and chunks > 0
+        sources = store.get_source_hashes(f"{bundle}!/")
+        assert sorted(sources) == sorted(f"{bundle}!/{name}" for name in _DOCS)
+        assert store.get_file_hash(str(bundle)) == ""
+
+        # Untouched archive: skipped without opening it.
+        assert indexer._process_single_file(bundle)[1] == "unchanged (hash match)"
+
+        # One member edited, one removed: only the edited one is re-embedded.
+        embedder.embed_documents.reset_mock()
+        changed = {
+            "specs/radar.txt": _DOCS["specs/radar.txt"],
+            "specs/antenna.txt": "The antenna gain is now 34 dBi after the refit. " * 8,
+        }
+        _write_zip(bundle, changed)
+        chunks, reason, was_reindex, details = indexer._process_single_file(bundle)
+
+        assert reason is None and was_reindex
+        assert details["members_unchanged"] == 1
+        assert details["members_removed"] == 1
+        embedded = [t for call in embedder.embed_documents.call_args_list for t in call.args[0]]
+        assert embedded and all("34 dBi" in t for t in embedded)
+        sources = store.get_source_hashes(f"{bundle}!/")
+        assert sorted(sources) == sorted(f"{bundle}!/{name}" for name in changed)
+        current = indexer._compute_file_hash(bundle)
+        assert all(h.startswith(current + "#sha256:") for h in sources.values())
+    finally:
+        store.close()
+
+
+def test_extraction_error_keeps_previously_indexed_members(tmp_path, thread_pool, monkeypatch):
+    indexer, store, _ = _make_indexer(tmp_path)
+    bundle = tmp_path / "bundle.zip"
+    _write_zip(bundle, _DOCS)
+    try:
+        assert indexer._process_single_file(bundle)[1] is None
+        _write_zip(bundle, {"specs/radar.txt": "half-copied"})
+
+        def _locked(self, path, details, skip=None):
+            details["error"] = "ARCHIVE_ERROR: BadZipFile: File is not a zip file"
+            return []
+
+        monkeypatch.setattr(archive_parser.ArchiveParser, "parse_members", _locked)
+        chunks, reason, _, details = indexer._process_single_file(bundle)
+
+        assert chunks == 0
+        assert reason.startswith("archive extraction failed")
+        assert "members_removed" not in details
+        sources = store.get_source_hashes(f"{bundle}!/")
+        assert sorted(sources) == sorted(f"{bundle}!/{name}" for name in _DOCS)
+    finally:
+        store.close()
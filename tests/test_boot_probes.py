@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+os.environ["HYBRIDRAG_DEPLOYMENT_MODE"] = "development"
+
+from fastapi.testclient import TestClient
+
+from src.api.readiness import ReadinessTracker
+from src.core.boot_probes import BootProbe, ProbeOutcome, start_boot_probes
+
+
+def test_probes_run_concurrently_and_pending_ones_finish_late():
+    release = threading.Event()
+    late = []
+
+    def _slow():
+        release.wait(5)
+        return "late"
+
+    t0 = time.perf_counter()
+    run = start_boot_probes([
+        BootProbe("a", lambda: time.sleep(0.2) or "a"),
+        BootProbe("b", lambda: time.sleep(0.2) or "b"),
+        BootProbe("slow", _slow, critical=False),
+        BootProbe("broken", lambda: 1 / 0),
+    ])
+    assert run.wait(timeout=0.6) is False
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.75  # one deadline, not 0.2 + 0.2 + 0.6
+    assert [run.outcomes[n].status for n in ("a", "b", "broken")] == ["ok", "ok", "failed"]
+    assert isinstance(run.outcomes["broken"].error, ZeroDivisionError)
+    assert run.pending() == ["slow"]
+
+    run.add_done_callback("slow", late.append)
+    release.set()
+    assert run.wait(timeout=5)
+    assert [o.detail for o in late] == ["late"]
+
+
+def test_failed_critical_probe_is_retried_until_it_passes():
+    attempts = []
+    finished = []
+    stop = threading.Event()
+
+    def _ollama():
+        attempts.append(time.perf_counter())
+        if len(attempts) < 3:
+            raise ConnectionError("refused")
+        return "up"
+
+    run = start_boot_probes(
+        [BootProbe("ollama", _ollama), BootProbe("reranker", lambda: 1 / 0, critical=False)],
+        on_done=lambda o: finished.append((o.name, o.status)),
+        retry_s=0.02, retry_max_s=0.05, stop_event=stop,
+    )
+    assert run.wait(timeout=1)
+    assert run.outcomes["ollama"].status == "failed"
+
+    deadline = time.monotonic() + 2
+    while run.outcomes["ollama"].status != "ok" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+
+    assert run.outcomes["ollama"].status == "ok"
+    assert run.outcomes["ollama"].error is None
+    assert len(attempts) == 3
+    assert ("ollama", "ok") in finished
+    assert run.outcomes["reranker"].status == "failed"  # non-critical: no retry
+
+
+def test_readiness_tracker_states():
+    tracker = ReadinessTracker()
+    assert tracker.snapshot()["status"] == "starting"
+
+    tracker.record(ProbeOutcome("vector_store", status="ok"), kind="component")
+    tracker.expect("ollama", "probe")
+    tracker.expect("reranker", "probe", critical=False)
+    snap = tracker.snapshot()
+    assert (snap["ready"], snap["status"]) == (False, "starting")
+    assert snap["pending"] == ["ollama", "reranker"]
+
+    tracker.record(ProbeOutcome("ollama", status="ok"))
+    assert tracker.snapshot()["status"] == "ready"
+    tracker.record(ProbeOutcome("reranker", critical=False, status="failed", detail="down"))
+    snap = tracker.snapshot()
+    assert (snap["ready"], snap["status"]) == (True, "degraded")
+    assert snap["ready_at"]
+
+    tracker.record(ProbeOutcome("ollama", status="failed"))
+    assert tracker.snapshot()["status"] == "failed"
+
+
+def test_ready_endpoint_reports_progress_then_flips_to_ready(monkeypatch):
+    from src.api import server
+
+    release = threading.Event()
+    monkeypatch.setenv("HYBRIDRAG_BOOT_DEADLINE_S", "0.05")
+    monkeypatch.setattr(server, "_readiness_probes", lambda: [
+        BootProbe("ollama", lambda: "up"),
+        BootProbe("embedding_dimension", lambda: release.wait(5) and "768 dims"),
+    ])
+
+    with TestClient(server.app) as client:
+        assert client.get("/health").status_code == 200
+        r = client.get("/ready")
+        assert r.status_code == 503
+        body = r.json()
+        assert body["status"] == "starting"
+        assert body["pending"] == ["embedding_dimension"]
+        assert {c["name"] for c in body["checks"] if c["kind"] == "component"} == {
+            "vector_store", "embedder", "llm_router", "query_engine",
+        }
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        r = client.get("/ready")
+        assert r.status_code == 200
+        assert r.json()["status"] == "ready"
+
+
+def test_boot_runs_ollama_and_vllm_probes_together(monkeypatch):
+    from src.core import boot as boot_module
+
+    class _Response:
+        status = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class _SlowOpener:
+        def open(self, req, timeout=None):
+            time.sleep(0.4)
+            return _Response()
+
+    monkeypatch.setattr(boot_module, "load_config", lambda _path=None: {
+        "mode": "offline", "ollama": {}, "api": {},
+        "vllm": {"enabled": True, "base_url": "http://localhost:8000"},
+    })
+    monkeypatch.setattr(
+        "src.security.credentials.resolve_credentials",
+        lambda _config, use_cache=False: SimpleNamespace(
+            has_endpoint=False, has_key=False, endpoint="", is_online_ready=False,
+        ),
+    )
+    monkeypatch.setattr(
+        "src.core.network_gate.configure_gate", lambda *a, **k: SimpleNamespace(mode="offline"),
+    )
+    monkeypatch.setattr(
+        "src.core.network_gate.get_gate",
+        lambda: SimpleNamespace(check_allowed=lambda *a, **k: None),
+    )
+    monkeypatch.setattr("urllib.request.build_opener", lambda *a, **k: _SlowOpener())
+
+    t0 = time.perf_counter()
+    result = boot_module.boot_hybridrag()
+    elapsed = time.perf_counter() - t0
+
+    assert result.offline_available is True
+    assert not any("vLLM" in w for w in result.warnings)
+    assert elapsed < 0.75  # sequential probes took 0.8s+
+
+
+def test_boot_fills_in_a_late_ollama_result(monkeypatch):
+    from src.core import boot as boot_module
+
+    release = threading.Event()
+
+    class _Response:
+        status = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class _HungOpener:
+        def open(self, req, timeout=None):
+            release.wait(5)
+            return _Response()
+
+    monkeypatch.setenv("HYBRIDRAG_BOOT_DEADLINE_S", "0.1")
+    monkeypatch.setattr(boot_module, "load_config", lambda _path=None: {
+        "mode": "offline", "ollama": {}, "api": {},
+    })
+    monkeypatch.setattr(
+        "src.security.credentials.resolve_credentials",
+        lambda _config, use_cache=False: SimpleNamespace(
+            has_endpoint=False, has_key=False, endpoint="", is_online_ready=False,
+        ),
+    )
+    monkeypatch.setattr(
+        "src.core.network_gate.configure_gate", lambda *a, **k: SimpleNamespace(mode="offline"),
+    )
+    monkeypatch.setattr(
+        "src.core.network_gate.get_gate",
+        lambda: SimpleNamespace(check_allowed=lambda *a, **k: None),
+    )
+    monkeypatch.setattr("urllib.request.build_opener", lambda *a, **k: _HungOpener())
+
+    result = boot_module.boot_hybridrag()
+    assert result.offline_probe_pending and not result.offline_available
+    assert any("timed out (0.1s)" in w for w in result.warnings)
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while result.offline_probe_pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert result.offline_available is True
+
+
+def test_lifespan_fails_when_components_miss_their_deadline(monkeypatch):
+    import pytest
+    from src.api import server
+
+    release = threading.Event()
+    monkeypatch.setenv("HYBRIDRAG_COMPONENT_DEADLINE_S", "0.05")
+    monkeypatch.setattr(server, "_init_embedder", lambda: release.wait(5))
+    try:
+        with pytest.raises(RuntimeError, match="embedder"):
+            with TestClient(server.app):
+                pass
+    finally:
+        release.set()
+
+
+def test_lifespan_warms_the_engine_prefix_off_the_startup_path(monkeypatch):
+    from src.api import server
+
+    warmed = []
+    done = threading.Event()
+
+    def _warm(router, prefix):
+        warmed.append((threading.current_thread().name, prefix))
+        done.set()
+
+    monkeypatch.setattr(server.LLMRouter, "warm_prefix", _warm)
+    monkeypatch.setattr(server, "_readiness_probes", lambda: [])
+
+    with TestClient(server.app):
+        assert done.wait(5)
+        expected = server.state.query_engine._stable_prompt_prefix()
+
+    assert warmed == [("ollama-warmup", expected)]
+
+
+def test_embedding_dimension_probe_uses_the_public_embedder_probe(monkeypatch):
+    from src.api import server
+
+    embedder = SimpleNamespace(model_name="nomic-embed-text", probe_dimension=lambda: 768)
+    config = SimpleNamespace(embedding=SimpleNamespace(dimension=768))
+    monkeypatch.setattr(server.state, "embedder", embedder)
+    monkeypatch.setattr(server.state, "config", config)
+
+    assert server._probe_embedding_dimension() == "768 dims"
+    config.embedding.dimension = 384
+    with pytest.raises(RuntimeError, match="returns 768 dims"):
+        server._probe_embedding_dimension()
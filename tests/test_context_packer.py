@@ -0,0 +1,93 @@
+from src.core.chunker import Chunker
+from src.core.config import ChunkingConfig
+from src.core.context_packer import (
+    CONTEXT_SEPARATOR,
+    estimate_tokens,
+    model_family,
+    pack_context,
+)
+
+
+def _block(n, path, chunk, text, score=0.9):
+    return f"[Source {n}] {path} (chunk {chunk}, score={score:.3f})\n{text}"
+
+
+def test_estimate_tokens_tracks_model_family():
+    text = "Calibration of the transmitter requires 12.5 MHz +/- 5 kHz."
+
+    assert model_family("phi4-mini") == "large_vocab"
+    assert model_family("mistral:7b") == "small_vocab"
+    assert 10 < estimate_tokens(text, "phi4-mini") <= estimate_tokens(text, "mistral:7b")
+    assert estimate_tokens("", "phi4-mini") == 0
+
+
+def test_pack_keeps_everything_when_it_fits():
+    context = CONTEXT_SEPARATOR.join(
+        [_block(1, "/a.txt", 0, "Alpha fact."), _block(2, "/b.txt", 3, "Beta fact.")]
+    )
+
+    pack = pack_context(context, 4096, model_name="phi4-mini")
+
+    assert pack.text == context
+    assert pack.chunks_kept == pack.chunks_before == 2
+    assert not pack.trimmed
+    assert pack.tokens_after == pack.tokens_before
+
+
+def test_pack_skips_oversized_block_but_keeps_smaller_later_ones():
+    big = _block(2, "/big.txt", 0, "filler words here " * 300)
+    small = _block(3, "/c.txt", 0, "Gamma fact is 7 volts.")
+    context = CONTEXT_SEPARATOR.join([_block(1, "/a.txt", 0, "Alpha fact."), big, small])
+
+    pack = pack_context(context, 200, model_name="phi4-mini")
+
+    assert "Alpha fact." in pack.text
+    assert "Gamma fact is 7 volts." in pack.text
+    assert "filler" not in pack.text
+    assert pack.chunks_kept == 2 and pack.trimmed
+    assert pack.tokens_after <= 200
+
+
+def test_pack_truncates_top_block_when_nothing_fits():
+    text = "The radar operates at 10 MHz. " * 200
+    pack = pack_context(_block(1, "/a.txt", 0, text), 120, model_name="phi4-mini")
+
+    assert pack.truncated and pack.chunks_kept == 1
+    assert pack.tokens_after <= 120
+    assert pack.text.endswith(".")
+
+
+def test_pack_removes_chunker_overlap_between_adjacent_chunks():
+    sentences = " ".join(f"Sentence {i} describes part {i * 7} in detail." for i in range(80))
+    chunks = Chunker(ChunkingConfig(chunk_size=600, overlap=200)).chunk_text(sentences)
+    assert len(chunks) >= 3
+    context = CONTEXT_SEPARATOR.join(
+        [
+            _block(1, "/doc.txt", 1, chunks[1]),
+            _block(2, "/doc.txt", 0, chunks[0]),
+            _block(3, "/doc.txt", 2, chunks[2]),
+        ]
+    )
+
+    pack = pack_context(context, 4096, model_name="phi4-mini", overlap_chars=200)
+
+    assert pack.chunks_kept == 3
+    assert pack.overlap_chars_removed >= 300
+    assert pack.tokens_after < pack.tokens_before
+    for i in range(0, 30):
+        assert pack.text.count(f"describes part {i * 7} in") <= 1
+
+
+def test_block_cache_keeps_digests_not_text_and_skips_whole_contexts():
+    from src.core import context_packer
+
+    context_packer._block_cache.clear()
+    blocks = [_block(n, f"/doc{n}.txt", 0, f"Fact number {n} about the radar. " * 20) for n in range(3)]
+    context = CONTEXT_SEPARATOR.join(blocks)
+
+    pack_context(context, 4096, model_name="phi4-mini")
+    estimate_tokens(context, "phi4-mini")
+
+    assert len(context_packer._block_cache) == 3
+    assert all(isinstance(digest, bytes) and len(digest) == 16
+               for digest, _family in context_packer._block_cache)
@@ -0,0 +1,85 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies the trigger-maintained chunk/source counters behind VectorStore.get_stats().
+# What to read first: Start at the write-path test, then seeding and reconciliation.
+# Inputs: A temporary SQLite/memmap store with a few hand-made chunks.
+# Outputs: Assertions that counters match a full count and that get_stats() no longer scans.
+# Safety notes: Uses tmp_path only; no model or network required.
+# ============================
+
+import numpy as np
+
+from src.core.corpus_stats import count_corpus
+from src.core.vector_store import ChunkMetadata, VectorStore
+
+
+def _store(tmp_path):
+    store = VectorStore(db_path=str(tmp_path / "index.sqlite3"), embedding_dim=4)
+    store.connect()
+    return store
+
+
+def _add(store, source, n, start=0):
+    store.add_embeddings(
+        np.ones((n, 4), dtype=np.float32),
+        [ChunkMetadata(source, start + i, 5, "2026-01-01T00:00:00") for i in range(n)],
+        [f"chunk {start + i}" for i in range(n)],
+    )
+
+
+def _counts(store):
+    stats = store.get_stats()
+    return stats["chunk_count"], stats["source_count"]
+
+
+def test_counters_follow_every_write_path_without_scanning(tmp_path):
+    store = _store(tmp_path)
+    try:
+        _add(store, "/docs/a.txt", 3)
+        _add(store, "/docs/b.txt", 2)
+        _add(store, "/docs/a.txt", 3)  # INSERT OR IGNORE duplicates
+        assert _counts(store) == (5, 2)
+
+        assert store.delete_chunks_by_source("/docs/a.txt") == 3
+        assert _counts(store) == (2, 1)
+
+        # Writers outside VectorStore are covered by the triggers too.
+        store.conn.execute("UPDATE chunks SET source_path = '/docs/c.txt' WHERE chunk_index = 0")
+        store.conn.commit()
+        assert _counts(store) == (2, 2)
+        assert _counts(store) == tuple(count_corpus(store.conn).values())
+
+        statements = []
+        store.conn.set_trace_callback(statements.append)
+        store.get_stats()
+        store.conn.set_trace_callback(None)
+        assert not any("FROM chunks" in sql for sql in statements)
+    finally:
+        store.close()
+
+
+def test_existing_index_is_seeded_and_reconcile_repairs_drift(tmp_path):
+    store = _store(tmp_path)
+    _add(store, "/docs/a.txt", 4)
+    _add(store, "/docs/b.txt", 1)
+    # Simulate an index built before the counters existed.
+    for name in ("chunk_ai", "chunk_ad", "chunk_au", "source_ai", "source_ad"):
+        store.conn.execute(f"DROP TRIGGER corpus_stats_{name}")
+    store.conn.execute("DROP TABLE corpus_stats")
+    store.conn.execute("DROP TABLE corpus_source_counts")
+    store.conn.commit()
+    store.close()
+
+    store = _store(tmp_path)
+    try:
+        assert _counts(store) == (5, 2)
+
+        store.conn.execute("UPDATE corpus_stats SET value = 42 WHERE name = 'chunk_count'")
+        store.conn.commit()
+        result = store.reconcile_stats()
+        assert result["drift"] == {"chunk_count": -37}
+        assert result["repaired"] is True
+        assert _counts(store) == (5, 2)
+        assert store.reconcile_stats()["ok"] is True
+        assert store.last_stats_reconcile["actual"] == {"chunk_count": 5, "source_count": 2}
+    finally:
+        store.close()
@@ -92,6 +92,16 @@ def client():
         yield c
 
 
+@pytest.fixture(autouse=True)
+def reset_admin_snapshot_cache():
+    """Each test reads the Admin snapshot through freshly built sections."""
+    from src.api.admin_snapshot import reset_admin_snapshot_service
+
+    reset_admin_snapshot_service()
+    yield
+    reset_admin_snapshot_service()
+
+
 # -------------------------------------------------------------------
 # Health endpoint
 # -------------------------------------------------------------------
@@ -108,6 +118,22 @@ class TestHealth:
         assert "version" in data
 
 
+# -------------------------------------------------------------------
+# Metrics endpoint
+# -------------------------------------------------------------------
+
+class TestMetrics:
+    def test_metrics_returns_prometheus_text(self, client):
+        from src.core.query_spans import get_stage_latency_stats
+
+        get_stage_latency_stats().observe_query({"retrieval": 12.0}, total_ms=40.0)
+        r = client.get("/metrics")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'hybridrag_query_stage_duration_seconds{stage="retrieval",quantile="0.5"}' in r.text
+        assert "hybridrag_queries_traced_total" in r.text
+
+
 # -------------------------------------------------------------------
 # Status endpoint
 # -------------------------------------------------------------------
@@ -142,6 +168,14 @@ class TestStatus:
         assert isinstance(data["current_user"], str)
         assert data["current_user"]
 
+    def test_status_exposes_startup_profile(self, client):
+        r = client.get("/status")
+        startup = r.json()["startup"]
+        steps = {(s["phase"], s["name"]) for s in startup["steps"]}
+        assert ("api", "components") in steps
+        assert ("api_imports", "fastapi") in steps
+        assert startup["total_ms"] > 0
+
     def test_status_exposes_auth_and_index_activity(self, client):
         r = client.get("/status")
         data = r.json()
@@ -854,6 +888,218 @@ class TestQueryActivity:
             state.query_engine.query_stream = original
             _reset_query_activity_state()
 
+    def test_identical_concurrent_queries_share_one_execution(self, client):
+        from src.api.server import state
+        from src.api.query_coalescer import QueryCoalescer
+        from src.core.query_engine import QueryResult
+        from src.api import routes as api_routes
+
+        _reset_query_activity_state()
+        _reset_query_queue_state()
+        state.query_coalescer = QueryCoalescer()
+        with api_routes._RATE_LOCK:
+            api_routes._RATE_STATE.clear()
+
+        entered = threading.Event()
+        release = threading.Event()
+        calls = []
+        responses = {}
+
+        original = state.query_engine.query
+        try:
+            def _blocked_query(q):
+                calls.append(q)
+                entered.set()
+                release.wait(timeout=5.0)
+                return QueryResult(
+                    answer="Shared answer",
+                    sources=[{"path": "README.md", "chunks": 1, "avg_relevance": 0.9}],
+                    chunks_used=1,
+                    tokens_in=5,
+                    tokens_out=5,
+                    cost_usd=0.0,
+                    latency_ms=2.0,
+                    mode="offline",
+                    error=None,
+                )
+
+            state.query_engine.query = _blocked_query
+
+            def _run(name, question):
+                responses[name] = client.post("/query", json={"question": question})
+
+            leader = threading.Thread(target=_run, args=("leader", "What is HybridRAG?"), daemon=True)
+            leader.start()
+            assert entered.wait(timeout=5.0)
+            follower = threading.Thread(target=_run, args=("follower", "  what is   hybridrag? "), daemon=True)
+            follower.start()
+            deadline = time.time() + 5.0
+            while state.query_coalescer.snapshot()["total_coalesced"] < 1:
+                assert time.time() < deadline, "follower never attached"
+                time.sleep(0.01)
+            release.set()
+            leader.join(timeout=5.0)
+            follower.join(timeout=5.0)
+
+            assert len(calls) == 1
+            assert responses["leader"].json()["answer"] == "Shared answer"
+            assert responses["follower"].json()["answer"] == "Shared answer"
+
+            data = client.get("/activity/queries").json()
+            assert data["total_completed"] == 2
+            assert data["total_coalesced"] == 1
+            follower_entry = next(e for e in data["recent"] if e["coalesced"])
+            leader_entry = next(e for e in data["recent"] if not e["coalesced"])
+            assert follower_entry["coalesced_with"] == leader_entry["query_id"]
+            assert client.get("/status").json()["query_activity"]["total_coalesced"] == 1
+        finally:
+            release.set()
+            state.query_engine.query = original
+            state.query_coalescer = QueryCoalescer()
+            _reset_query_activity_state()
+
+    def test_identical_concurrent_streams_fan_out_leader_tokens(self, client):
+        from src.api.server import state
+        from src.api.query_coalescer import QueryCoalescer
+        from src.core.query_engine import QueryResult
+        from src.api import routes as api_routes
+
+        _reset_query_activity_state()
+        _reset_query_queue_state()
+        state.query_coalescer = QueryCoalescer()
+        with api_routes._RATE_LOCK:
+            api_routes._RATE_STATE.clear()
+
+        entered = threading.Event()
+        release = threading.Event()
+        calls = []
+        responses = {}
+
+        original = state.query_engine.query_stream
+        try:
+            def _fake_stream(q):
+                calls.append(q)
+                yield {"phase": "searching"}
+                yield {"token": "First "}
+                entered.set()
+                release.wait(timeout=5.0)
+                yield {"token": "second"}
+                yield {
+                    "done": True,
+                    "result": QueryResult(
+                        answer="First second",
+                        sources=[],
+                        chunks_used=0,
+                        tokens_in=1,
+                        tokens_out=2,
+                        cost_usd=0.0,
+                        latency_ms=4.0,
+                        mode="offline",
+                        error=None,
+                    ),
+                }
+
+            state.query_engine.query_stream = _fake_stream
+
+            def _run(name):
+                responses[name] = client.post("/query/stream", json={"question": "Stream once"})
+
+            leader = threading.Thread(target=_run, args=("leader",), daemon=True)
+            leader.start()
+            assert entered.wait(timeout=5.0)
+            follower = threading.Thread(target=_run, args=("follower",), daemon=True)
+            follower.start()
+            deadline = time.time() + 5.0
+            while state.query_coalescer.snapshot()["total_coalesced"] < 1:
+                assert time.time() < deadline, "follower never attached"
+                time.sleep(0.01)
+            release.set()
+            leader.join(timeout=5.0)
+            follower.join(timeout=5.0)
+
+            assert len(calls) == 1
+            for name in ("leader", "follower"):
+                text = responses[name].text
+                assert "event: phase\ndata: searching" in text
+                assert "data: First " in text
+                assert "data: second" in text
+                assert "event: done" in text
+            data = client.get("/activity/queries").json()
+            assert data["total_completed"] == 2
+            assert data["total_coalesced"] == 1
+        finally:
+            release.set()
+            state.query_engine.query_stream = original
+            state.query_coalescer = QueryCoalescer()
+            _reset_query_activity_state()
+
+    @staticmethod
+    def _open_stream_flight(monkeypatch):
+        """Pin the coalesce key and start a leader flight whose reader already left."""
+        from src.api.server import state
+        from src.api.query_coalescer import QueryCoalescer
+        from src.api import routes as api_routes
+
+        _reset_query_activity_state()
+        state.query_coalescer = QueryCoalescer()
+        with api_routes._RATE_LOCK:
+            api_routes._RATE_STATE.clear()
+        key = ("stream", "pinned")
+        monkeypatch.setattr(api_routes, "_query_coalesce_key", lambda *args, **kwargs: key)
+        flight, _ = state.query_coalescer.join(key)
+        leader_events = flight.iter_events()
+        flight.publish({"token": "a"})
+        assert next(leader_events) == {"token": "a"}
+        return flight, leader_events
+
+    @staticmethod
+    def _post_stream_follower():
+        import asyncio
+        from starlette.requests import Request
+        from src.api import routes as api_routes
+        from src.api.models import QueryRequest
+
+        request = Request({
+            "type": "http", "method": "POST", "path": "/query/stream",
+            "headers": [], "query_string": b"", "client": ("testclient", 50000),
+            "app": app,
+        })
+        return asyncio.run(api_routes.query_stream(QueryRequest(question="Stream once"), request))
+
+    def test_stream_follower_body_never_read_releases_its_reservation(self, client, monkeypatch):
+        import asyncio
+        from src.api.server import state
+        from src.api.query_coalescer import QueryCoalescer
+
+        flight, leader_events = self._open_stream_flight(monkeypatch)
+        try:
+            response = self._post_stream_follower()
+            leader_events.close()
+            assert flight.finish_if_abandoned() is False
+
+            asyncio.run(response.background())  # client went away before the body
+            assert flight.finish_if_abandoned() is True
+        finally:
+            state.query_coalescer = QueryCoalescer()
+            _reset_query_activity_state()
+
+    def test_stream_follower_501_releases_its_reservation(self, client, monkeypatch):
+        from fastapi import HTTPException
+        from src.api.server import state
+        from src.api.query_coalescer import QueryCoalescer
+
+        flight, leader_events = self._open_stream_flight(monkeypatch)
+        monkeypatch.setattr(state, "query_engine", object())
+        try:
+            with pytest.raises(HTTPException) as excinfo:
+                self._post_stream_follower()
+            assert excinfo.value.status_code == 501
+            leader_events.close()
+            assert flight.finish_if_abandoned() is True
+        finally:
+            state.query_coalescer = QueryCoalescer()
+            _reset_query_activity_state()
+
     def test_activity_endpoint_records_request_policy_and_denied_hit_count(self, client, monkeypatch):
         from src.api.server import state
         from src.core.query_engine import QueryResult
@@ -113,3 +113,38 @@ def test_stream_emits_answer_when_verification_passes():
     assert "ABC123" in token_text
     assert result.grounding_blocked is False
     assert result.grounding_safe is True
+
+
+def test_stream_trace_records_backend_prompt_eval_metrics():
+    engine, mock_router = _make_engine()
+    engine.guard_enabled = False
+    engine._build_grounded_prompt = MagicMock(return_value="PROMPT")
+    metrics = {"prompt_eval_count": 12, "prompt_eval_ms": 30.0, "eval_ms": 90.0}
+    mock_router.query_stream.return_value = iter(
+        [
+            {"token": "ABC123."},
+            {"done": True, "tokens_in": 10, "tokens_out": 5,
+             "model": "phi4-mini", "backend_metrics": metrics},
+        ]
+    )
+
+    events = list(engine.query_stream("What is my serial number?"))
+    result = next(e for e in events if e.get("done"))["result"]
+
+    assert result.debug_trace["llm"]["backend_metrics"] == metrics
+
+
+def test_stable_prompt_prefix_is_shared_by_every_grounded_prompt():
+    engine, _ = _make_engine()
+
+    for guard_available in (False, True):
+        engine._guard_available = guard_available
+        prefix = engine._stable_prompt_prefix()
+        first = engine._build_grounded_prompt("What is the serial?", "ABC123", [])
+        second = engine._build_grounded_prompt(
+            "Who signed?", "Jane\n\n---\n\nJohn", []
+        )
+
+        assert len(prefix) > 100
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert "serial" not in prefix and "ABC123" not in prefix
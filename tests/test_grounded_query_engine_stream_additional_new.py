@@ -202,3 +202,39 @@ def test_stream_open_knowledge_gate_fallback_marks_done_result_unverified():
     assert result.grounding_blocked is False
     assert result.grounding_details["reason"] == "retrieval_gate_open_knowledge_fallback_unverified"
     assert result.debug_trace["decision"]["path"] == "open_knowledge_retrieval_gate_fallback"
+
+
+def test_stream_releases_verified_sentence_before_generation_ends():
+    engine, router, _ = _make_engine()
+    engine.guard_enabled = True
+    engine._guard_available = True
+    engine.guard_min_chunks = 1
+    engine.guard_min_score = 0.0
+    engine.guard_action = "block"
+    engine._build_grounded_prompt = MagicMock(return_value="PROMPT")
+    engine._verify_response = MagicMock(return_value=(0.50, {"claims": []}))
+    seen_before_second_sentence = []
+
+    def _stream(_prompt):
+        yield {"token": "The system serial number is ABC123. "}
+        yield {"token": "The admin "}
+        seen_before_second_sentence.extend(
+            e["token"] for e in events if "token" in e
+        )
+        yield {"token": "password is swordfish."}
+        yield {"done": True, "tokens_in": 12, "tokens_out": 9, "model": "phi4-mini"}
+
+    router.query_stream.side_effect = _stream
+    events = []
+    for event in engine.query_stream("serial + password?"):
+        events.append(event)
+
+    token_text = "".join(e["token"] for e in events if "token" in e)
+    result = [e for e in events if e.get("done")][0]["result"]
+
+    assert "".join(seen_before_second_sentence).startswith("The system serial number is ABC123.")
+    assert "swordfish" not in token_text
+    assert result.grounding_blocked is True
+    gate = result.debug_trace["grounding"]["stream_gate"]
+    assert gate["released"] == 1 and gate["held"] == 1
+    assert gate["first_verified_token_ms"] is not None
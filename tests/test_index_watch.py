@@ -0,0 +1,227 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies change-driven incremental indexing: watchers, debounce, and per-path index/delete decisions.
+# What to read first: Start at the apply_changes test, then the watcher and daemon tests.
+# Inputs: Temp source folders and a recording stand-in for Indexer / VectorStore.
+# Outputs: Assertions on which files were indexed or deleted and when batches fire.
+# Safety notes: Uses temp directories only; no embedder or real index required.
+# ============================
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.indexing.watch import (
+    ChangeBatcher,
+    IndexWatchDaemon,
+    InotifyWatcher,
+    PollingWatcher,
+    apply_changes,
+)
+
+
+class _Store:
+    def __init__(self, sources):
+        self.sources = set(sources)
+        self.deleted = []
+
+    def delete_chunks_by_source(self, source_path):
+        if source_path in self.sources:
+            self.sources.discard(source_path)
+            self.deleted.append(source_path)
+            return 3
+        return 0
+
+    def get_source_hashes(self, prefix):
+        return {s: "h" for s in self.sources if s.startswith(prefix)}
+
+
+class _Indexer:
+    def __init__(self, store):
+        self.vector_store = store
+        self._supported_extensions = {".md", ".zip"}
+        self.indexed = []
+
+    def _is_excluded(self, path):
+        return "archive" in {part.lower() for part in Path(path).parts}
+
+    def index_file(self, file_path):
+        self.indexed.append(file_path)
+        self.vector_store.sources.add(file_path)
+        return {"indexed": True, "chunks_added": 2, "skipped_reason": None}
+
+
+def _write(path, text="sample"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_apply_changes_indexes_present_paths_and_deletes_missing_ones(tmp_path):
+    root = tmp_path / "source"
+    _write(root / "new.md")
+    _write(root / "notes.tmp")
+    _write(root / "moved_in" / "a.md")
+    _write(root / "moved_in" / "archive" / "old.md")
+    gone_zip = str(root / "bundle.zip")
+    gone_dir = str(root / "moved_out")
+    store = _Store([
+        gone_zip, gone_zip + "!/specs/radar.pdf",
+        os.path.join(gone_dir, "x.md"), os.path.join(gone_dir, "sub", "y.md"),
+        str(root / "kept.md"),
+    ])
+    indexer = _Indexer(store)
+
+    result = apply_changes(indexer, [
+        str(root / "new.md"), str(root / "notes.tmp"),
+        str(root / "moved_in"), gone_zip, gone_dir,
+    ])
+
+    assert indexer.indexed == [str(root / "moved_in" / "a.md"), str(root / "new.md")]
+    assert sorted(store.sources) == sorted([
+        str(root / "kept.md"), str(root / "moved_in" / "a.md"), str(root / "new.md"),
+    ])
+    assert result["sources_deleted"] == 2
+    assert result["chunks_deleted"] == 12
+    assert result["files_indexed"] == 2
+
+
+def test_batcher_waits_for_quiet_period_or_max_wait():
+    batcher = ChangeBatcher(quiet_s=2.0, max_wait_s=5.0)
+    batcher.add(["a"], now=0.0)
+    batcher.add(["b"], now=1.5)
+    assert not batcher.ready(now=3.0)
+    assert batcher.ready(now=3.6)
+    assert batcher.wait_hint(10.0, now=3.0) == pytest.approx(0.5)
+
+    for t in (4.0, 5.0, 6.0, 7.0):
+        batcher.add([f"p{t}"], now=t)
+    assert batcher.ready(now=7.5)  # 5 s since the first change
+    assert batcher.drain() == (["a", "b", "p4.0", "p5.0", "p6.0", "p7.0"], False)
+    assert not batcher.ready(now=100.0)
+
+
+def _poll_until(watcher, wanted, timeout=5.0):
+    seen = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not wanted <= seen:
+        paths, _ = watcher.poll(0.2)
+        seen.update(paths)
+    return seen
+
+
+def test_polling_watcher_reports_created_deleted_and_new_folders(tmp_path):
+    root = tmp_path / "source"
+    _write(root / "keep.md")
+    _write(root / "drop.md")
+    _write(root / "archive" / "old.md")
+    watcher = PollingWatcher(str(root), ["archive"], interval_s=0.01)
+    watcher.start()
+
+    (root / "drop.md").unlink()
+    _write(root / "fresh" / "new.md")
+    _write(root / "archive" / "ignored.md")
+    seen = _poll_until(watcher, {str(root / "drop.md"), str(root / "fresh")})
+    assert str(root / "drop.md") in seen and str(root / "fresh") in seen
+    assert not any("archive" in p for p in seen)
+
+    _write(root / "fresh" / "second.md")
+    assert str(root / "fresh" / "second.md") in _poll_until(
+        watcher, {str(root / "fresh" / "second.md")})
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify not available")
+def test_inotify_watcher_reports_writes_and_files_in_new_folders(tmp_path):
+    root = tmp_path / "source"
+    _write(root / "doc.md")
+    watcher = InotifyWatcher(str(root))
+    watcher.start()
+    try:
+        _write(root / "doc.md", "edited")
+        (root / "sub").mkdir()
+        _write(root / "sub" / "deep.md")
+        seen = _poll_until(watcher, {str(root / "doc.md"), str(root / "sub")})
+        assert {str(root / "doc.md"), str(root / "sub")} <= seen
+
+        # The new folder is watched from now on.
+        _write(root / "sub" / "later.md")
+        assert str(root / "sub" / "later.md") in _poll_until(
+            watcher, {str(root / "sub" / "later.md")})
+    finally:
+        watcher.close()
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify not available")
+def test_inotify_watcher_waits_for_a_file_copy_to_finish(tmp_path):
+    root = tmp_path / "source"
+    root.mkdir()
+    watcher = InotifyWatcher(str(root))
+    watcher.start()
+    try:
+        target = root / "big.pdf"
+        with open(target, "wb") as handle:
+            handle.write(b"%PDF-1.4 first half")
+            handle.flush()
+            assert watcher.poll(0.2) == ([], False)  # created, still open
+            handle.write(b" second half")
+        assert str(target) in _poll_until(watcher, {str(target)})
+    finally:
+        watcher.close()
+
+
+class _ScriptedWatcher:
+    backend = "scripted"
+    root = "/src"
+
+    def __init__(self, events):
+        self.events = list(events)
+
+    def poll(self, timeout):
+        return self.events.pop(0) if self.events else ([], False)
+
+    def interrupt(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_daemon_keeps_batch_while_a_full_run_holds_the_index():
+    busy = {"value": True}
+    batches = []
+
+    def run_batch(paths, rescan):
+        if busy["value"]:
+            return False
+        batches.append((paths, rescan))
+        return True
+
+    daemon = IndexWatchDaemon(
+        _ScriptedWatcher([(["/src/a.md"], False), ([], True)]),
+        run_batch,
+        batcher=ChangeBatcher(quiet_s=0.0),
+    )
+    assert daemon.run_once(timeout=0) is False
+    assert daemon.snapshot()["pending_paths"] == 1
+
+    busy["value"] = False
+    assert daemon.run_once(timeout=0) is True
+    assert batches == [(["/src/a.md"], True)]
+    assert daemon.snapshot()["batches"] == 1
+
+
+def test_daemon_start_walks_the_tree_on_the_watch_thread():
+    release = threading.Event()
+
+    class _SlowStartWatcher(_ScriptedWatcher):
+        def start(self):
+            release.wait(5)
+
+    daemon = IndexWatchDaemon(_SlowStartWatcher([]), lambda paths, rescan: True)
+    t0 = time.monotonic()
+    daemon.start()
+    assert time.monotonic() - t0 < 1.0
+    release.set()
+    daemon.stop(timeout=5)
+    assert not daemon.thread.is_alive()
@@ -0,0 +1,32 @@
+import httpx
+import numpy as np
+
+from src.diagnostic import indexing_benchmarks as ib
+
+
+def test_stub_embed_server_mimics_ollama_embed():
+    with ib.StubEmbedServer(dimension=16, latency_ms=5) as server:
+        resp = httpx.post(
+            f"{server.url}/api/embed",
+            json={"model": "nomic-embed-text", "input": ["radar gain", "radar gain"]},
+            trust_env=False,
+        )
+    vectors = np.asarray(resp.json()["embeddings"])
+    assert resp.status_code == 200
+    assert vectors.shape == (2, 16)
+    assert np.allclose(vectors[0], vectors[1])
+    assert server.requests == 1 and server.inputs == 2
+
+
+def test_benchmark_indexes_every_generated_format(tmp_path):
+    corpus = ib.generate_corpus(tmp_path / "source", files=len(ib.DEFAULT_MIX), paragraphs=3,
+                                mix={ext: 1 for ext in ib.DEFAULT_MIX})
+    assert set(corpus["by_extension"]) == set(ib.DEFAULT_MIX)
+
+    result = ib.run_indexing_benchmark(tmp_path / "source", tmp_path, dimension=16)
+
+    assert result["files_indexed"] == len(ib.DEFAULT_MIX), result["skip_reason_counts"]
+    assert result["chunks"] > 0 and result["chunks_per_s"] > 0 and result["mb_per_s"] > 0
+    assert set(result["stages"]) == set(ib.INDEX_STAGES)
+    assert result["stages"]["embed"]["seconds"] > 0
+    assert result["embed_server"]["inputs"] == result["chunks"]
@@ -20,6 +20,7 @@
 #   8. Environment variable kill-switch override
 #   9. Prefix-based allowlisting
 #  10. Non-HTTP scheme rejection
+#  11. Compiled policy, decision cache and sampled audit counters
 #
 # RUN:
 #   python -m pytest tests/test_network_gate.py -v
@@ -29,6 +30,7 @@
 
 import os
 import sys
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -285,3 +287,86 @@ class TestIsAllowed:
 
     def test_returns_false_for_blocked(self, gate):
         assert gate.is_allowed("https://evil.com") is False
+
+
+# ============================================================================
+# 11. COMPILED POLICY, DECISION CACHE, SAMPLED AUDIT
+# ============================================================================
+
+class TestCompiledPolicy:
+    def test_prefix_trie_keeps_path_boundaries(self, gate):
+        gate.configure("online", allowed_prefixes=[
+            "https://proxy.corp.com/api",
+            "https://proxy.corp.com/v2/models/",
+            "https://root.corp.com/",
+        ])
+        assert gate.is_allowed("https://proxy.corp.com/api")
+        assert gate.is_allowed("https://proxy.corp.com/api/chat?x=1")
+        assert not gate.is_allowed("https://proxy.corp.com/api2")
+        assert gate.is_allowed("https://proxy.corp.com/v2/models/")
+        assert gate.is_allowed("https://proxy.corp.com/v2/models/embed")
+        assert not gate.is_allowed("https://proxy.corp.com/v2/models")
+        assert not gate.is_allowed("https://proxy.corp.com:8443/api/chat")
+        assert not gate.is_allowed("http://proxy.corp.com/api/chat")
+        assert gate.is_allowed("https://root.corp.com/anything/here")
+
+    def test_reconfigure_drops_cached_decisions(self, gate):
+        gate.configure("online", api_endpoint="https://api.example.com/v1")
+        gate.check_allowed("https://api.example.com/v1/chat")
+        gate.configure("offline")
+        with pytest.raises(NetworkBlockedError):
+            gate.check_allowed("https://api.example.com/v1/chat")
+
+    def test_malformed_port_is_denied_not_raised(self, gate):
+        gate.configure("online", api_endpoint="https://api.example.com")
+        with pytest.raises(NetworkBlockedError):
+            gate.check_allowed("https://api.example.com:99999/v1")
+
+    def test_repeated_allows_are_counted_but_sampled(self, gate):
+        for _ in range(250):
+            gate.check_allowed("http://localhost:11434/api/rerank", "rerank", "reranker")
+        for _ in range(3):
+            with pytest.raises(NetworkBlockedError):
+                gate.check_allowed("https://evil.com", "probe", "attacker")
+
+        summary = gate.get_audit_summary()
+        assert summary["total_checks"] == 253
+        assert summary["allowed"] == 250
+        assert summary["denied"] == 3
+        log = gate.get_audit_log(last_n=100)
+        assert sum(1 for e in log if e.allowed) == 3  # 1st, 100th, 200th
+        assert sum(1 for e in log if not e.allowed) == 3
+
+        gate.clear_audit_log()
+        gate.check_allowed("http://localhost:11434/api/rerank", "rerank", "reranker")
+        assert gate.get_audit_summary()["total_checks"] == 1
+        assert len(gate.get_audit_log()) == 1
+
+    def test_counters_are_exact_across_threads(self, gate):
+        def worker():
+            for _ in range(500):
+                gate.check_allowed("http://127.0.0.1:11434/api/embed", "embed", "embedder")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        summary = gate.get_audit_summary()
+        assert summary["allowed"] == 2000
+        assert summary["unique_hosts_contacted"] == ["127.0.0.1"]
+
+    def test_short_lived_threads_share_one_sample_count(self, gate):
+        def worker():
+            gate.check_allowed("http://127.0.0.1:8000/v1/completions", "generate", "vllm")
+
+        for _ in range(150):
+            t = threading.Thread(target=worker)
+            t.start()
+            t.join()
+
+        assert gate.get_audit_summary()["allowed"] == 150
+        log = gate.get_audit_log(last_n=1000)
+        assert sum(1 for e in log if e.allowed) == 2  # 1st and 100th
+        assert len(gate._audit_counts.totals()) == 1
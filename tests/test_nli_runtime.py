@@ -0,0 +1,133 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies batched NLI verification: length buckets, one model call per response, verdict cache.
+# What to read first: Start at the NLIVerifier tests, then the bucketing test.
+# Inputs: Hand-written claims and chunks; the NumPy TinyNLIRuntime stand-in model.
+# Outputs: Assertions on verdicts, forward-call counts, cache hits and pairs/s.
+# Safety notes: No onnxruntime, model files or network required.
+# ============================
+
+import numpy as np
+
+from src.core.hallucination_guard.guard_types import ClaimVerdict, GuardConfig
+from src.core.hallucination_guard.nli_runtime import (
+    TinyNLIRuntime,
+    VerdictCache,
+    iter_length_buckets,
+)
+from src.core.hallucination_guard.nli_verifier import NLIVerifier
+from src.diagnostic.perf_benchmarks import perf_nli_verify
+
+_CHUNKS = [
+    "The radar system uses a frequency of 10 MHz.",
+    "Maintenance interval for the filter is 500 operating hours.",
+    "The pump is rated for 28 VDC input.",
+    "Operators must wear hearing protection in the test cell.",
+]
+
+
+class _CountingRuntime(TinyNLIRuntime):
+    def __init__(self, batch_size=16):
+        super().__init__(batch_size)
+        self.predict_calls = 0
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False):
+        self.predict_calls += 1
+        return super().predict(pairs, batch_size, show_progress_bar)
+
+
+def _verifier(**config):
+    runtime = _CountingRuntime()
+    return NLIVerifier(GuardConfig(**config), runtime=runtime), runtime
+
+
+def test_verify_batch_scores_all_claims_in_one_model_call():
+    verifier, runtime = _verifier()
+    claims = [
+        "The radar operates at 10 MHz frequency.",
+        "The radar operates at 50 MHz frequency.",
+        {"text": "Pilots prefer window seats on long flights.", "is_trivial": False},
+    ]
+
+    results = verifier.verify_batch(claims, _CHUNKS)
+
+    assert [r.verdict for r in results] == [
+        ClaimVerdict.SUPPORTED,
+        ClaimVerdict.CONTRADICTED,
+        ClaimVerdict.UNSUPPORTED,
+    ]
+    assert results[0].best_source.startswith("The radar system")
+    assert runtime.predict_calls == 1
+    assert verifier.pairs_scored == 12
+    assert verifier.throughput()["pairs_per_s"] > 0
+
+
+def test_verdict_cache_skips_the_model_for_seen_pairs():
+    verifier, runtime = _verifier()
+    claim = "The pump is rated for 28 VDC input."
+
+    first = verifier.verify_claim_against_chunks(claim, _CHUNKS)
+    again = verifier.verify_batch_with_earlyexit([claim, claim], _CHUNKS)
+
+    assert runtime.predict_calls == 1
+    assert verifier.cache.hits == 8
+    assert [r.verdict for r in again] == [first.verdict] * 2
+
+    tiny = VerdictCache(max_entries=1)
+    tiny.put("a", "x", [1, 2, 3])
+    tiny.put("b", "x", [1, 2, 3])
+    assert len(tiny) == 1 and tiny.get("a", "x") is None
+
+
+def test_verdict_cache_survives_concurrent_get_and_evicting_put():
+    import threading
+
+    cache = VerdictCache(max_entries=8)
+    errors = []
+
+    def _worker(offset):
+        try:
+            for i in range(2000):
+                claim = "claim {}".format((i + offset) % 24)
+                cache.put(claim, "chunk", [0.1, 0.2, 0.7])
+                cache.get(claim, "chunk")
+        except Exception as exc:  # KeyError from an unlocked move_to_end
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_worker, args=(n * 5,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(cache) <= 8
+    assert cache.hits + cache.misses == 6 * 2000
+
+
+def test_length_buckets_pad_to_bucket_width_and_keep_order():
+    encoded = [[5] * 40, [5] * 3, [5] * 12, [5] * 600, [5] * 20]
+    batches = list(iter_length_buckets(encoded, batch_size=2))
+
+    widths = [ids.shape[1] for _, ids, _ in batches]
+    assert widths == [16, 32, 64, 512]
+    assert sorted(i for idx, _, _ in batches for i in idx) == [0, 1, 2, 3, 4]
+    idx, ids, mask = batches[0]
+    assert list(idx) == [1, 2]
+    assert mask.sum(axis=1).tolist() == [3, 12]
+
+    runtime = TinyNLIRuntime(batch_size=2)
+    logits = runtime.predict([(c, c) for c in _CHUNKS])
+    assert logits.shape == (4, 3) and runtime.forward_calls == 2
+    assert np.all(logits.argmax(axis=1) == 1)
+
+
+def test_missing_runtime_degrades_to_unsupported_and_rag_diag_reports_pairs_per_s(tmp_path):
+    dormant = NLIVerifier(GuardConfig(model_cache_dir=str(tmp_path)))
+    results = dormant.verify_batch(["The radar operates at 10 MHz."], _CHUNKS)
+    assert results[0].verdict == ClaimVerdict.UNSUPPORTED
+    assert results[0].explanation == "NLI model not available"
+
+    metric = perf_nli_verify(iters=2, verifier=NLIVerifier(runtime=TinyNLIRuntime()))
+    assert metric.unit == "pairs/sec" and metric.value > 0
+    assert metric.details["runtime"] == "tiny"
+    assert metric.details["cache_hits"] > 0
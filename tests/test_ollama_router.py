@@ -515,6 +515,60 @@ class TestOllamaRouter:
         assert second_payload["model"] == "phi4:14b"
         router._client.get.assert_called_once()
 
+    def test_query_reports_prompt_eval_and_generation_metrics(self):
+        """
+        WHAT: Ollama's nanosecond timings come back as a ms breakdown.
+        WHY:  prompt_eval vs eval time shows whether the KV-cached prefix
+              was reused (small prompt_eval) or re-evaluated.
+        """
+        router = self._make_router()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "response": "ok",
+            "prompt_eval_count": 40,
+            "prompt_eval_duration": 200_000_000,
+            "eval_count": 10,
+            "eval_duration": 500_000_000,
+            "load_duration": 1_000_000,
+            "total_duration": 701_000_000,
+        }
+        router._client = MagicMock()
+        router._client.post.return_value = mock_response
+
+        result = router.query("prompt")
+
+        assert result.backend_metrics["prompt_eval_ms"] == 200.0
+        assert result.backend_metrics["eval_ms"] == 500.0
+        assert result.backend_metrics["load_ms"] == 1.0
+        assert result.backend_metrics["prompt_tokens_per_s"] == 200.0
+        assert result.backend_metrics["eval_tokens_per_s"] == 20.0
+
+    def test_warm_prefix_uses_query_options_and_keep_alive(self):
+        """
+        WHAT: warm_prefix() must send the same options/keep_alive as queries.
+        WHY:  Any option drift (num_ctx especially) reloads the model and
+              throws away the cached prefix it was meant to create.
+        """
+        router = self._make_router()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "", "prompt_eval_count": 300}
+        router._client = MagicMock()
+        router._client.post.return_value = mock_response
+
+        router.query("real prompt")
+        query_payload = router._client.post.call_args.kwargs["json"]
+        metrics = router.warm_prefix("You are a precise technical assistant.\n")
+        warm_payload = router._client.post.call_args.kwargs["json"]
+
+        assert metrics["prompt_eval_count"] == 300
+        # Best-effort warmup keeps a short fixed timeout, not the query's.
+        assert router._client.post.call_args.kwargs["timeout"] == 20.0
+        assert warm_payload["keep_alive"] == query_payload["keep_alive"]
+        assert warm_payload["options"]["num_predict"] == 1
+        for key in ("num_ctx", "temperature", "top_p"):
+            assert warm_payload["options"][key] == query_payload["options"][key]
+        assert router.warm_prefix("   ") is None
+
 
 class TestLLMRouter:
     """
@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src.parsers.registry import ParserRegistry
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter so modules imported by other tests do not
+# hide an eager parser import.
+_PROBE = """
+import json, sys
+from src.parsers.registry import REGISTRY
+names = [REGISTRY.get(ext).name for ext in REGISTRY.supported_extensions()]
+print(json.dumps({
+    "entries": len(names),
+    "modules": sorted(m for m in sys.modules if m.startswith("src.parsers.")),
+    "heavy": sorted(m for m in ("pypdf", "pdfplumber", "openpyxl", "docx", "pptx",
+                                "PIL", "pytesseract", "pdf2image", "dpkt", "Evtx")
+                    if m in sys.modules),
+}))
+"""
+
+
+def _probe():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=60, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_registry_import_does_not_load_parser_modules():
+    report = _probe()
+
+    assert report["entries"] > 50
+    assert report["heavy"] == []
+    assert set(report["modules"]) <= {
+        "src.parsers.registry", "src.parsers.segments", "src.parsers.placeholder_parser",
+    }
+
+
+def test_parser_class_is_imported_on_first_use():
+    registry = ParserRegistry()
+    info = registry.get(".mbox")
+
+    from src.parsers.mbox_parser import MboxParser
+    assert info.parser_cls is MboxParser
+    assert info.is_loaded
+
+
+def test_broken_parser_module_only_affects_its_own_extension(tmp_path):
+    registry = ParserRegistry()
+    registry.register(".zzz", "BrokenParser", "no_such_parser_module:BrokenParser")
+    target = tmp_path / "file.zzz"
+    target.write_text("content", encoding="utf-8")
+
+    text, details = registry.get(".zzz").parser_cls().parse_with_details(str(target))
+
+    assert text == ""
+    assert details["parser"] == "BrokenParser"
+    assert details["error"].startswith("IMPORT_ERROR: ModuleNotFoundError")
+    assert registry.get(".txt").parser_cls().parse_with_details  # others unaffected
@@ -0,0 +1,158 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pdf2image
+import pytest
+
+from src.parsers import pdf_ocr_fallback
+
+
+class _FakePage:
+    def __init__(self, number):
+        self.number = number
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """A 7-page PDF whose pages render to _FakePage objects."""
+    calls = []
+
+    def _convert(path, dpi, first_page, last_page, **kwargs):
+        calls.append((first_page, last_page))
+        return [_FakePage(n) for n in range(first_page, min(last_page, 7) + 1)]
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", _convert)
+    monkeypatch.setattr(pdf2image, "pdfinfo_from_path", lambda *a, **k: {"Pages": 7})
+    monkeypatch.setattr(
+        pdf_ocr_fallback, "_make_ocr_executor",
+        lambda workers: ThreadPoolExecutor(max_workers=workers),
+    )
+    return calls
+
+
+def _ocr(**overrides):
+    kwargs = dict(max_pages=200, dpi=200, timeout_s=5, lang="eng")
+    kwargs.update(overrides)
+    return pdf_ocr_fallback.ocr_pdf_pages("scan.pdf", **kwargs)
+
+
+def test_pages_render_in_batches_and_reassemble_in_order(fake_pdf, monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_OCR_WORKERS", "3")
+
+    def _slow_first_pages(image, lang, timeout_s=0):
+        # Earlier pages finish last so ordering must come from page numbers.
+        time.sleep(0.02 * (8 - image.number))
+        return f"text of page {image.number}"
+
+    monkeypatch.setattr(pdf_ocr_fallback, "_ocr_page_image_to_text", _slow_first_pages)
+
+    text, stats = _ocr()
+
+    assert fake_pdf == [(1, 6), (7, 7)]
+    assert stats["executor"] == "process_pool"
+    assert stats["pages_successful"] == 7
+    markers = [f"[OCR_PAGE={n}]\ntext of page {n}" for n in range(1, 8)]
+    positions = [text.index(marker) for marker in markers]
+    assert positions == sorted(positions)
+
+
+def test_page_timeouts_and_failures_are_counted(fake_pdf, monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_OCR_WORKERS", "1")
+
+    def _flaky(image, lang, timeout_s=0):
+        assert timeout_s == 5
+        if image.number == 2:
+            raise RuntimeError("Tesseract process timeout")
+        if image.number == 3:
+            raise OSError("tesseract crashed")
+        return f"page {image.number}"
+
+    monkeypatch.setattr(pdf_ocr_fallback, "_ocr_page_image_to_text", _flaky)
+
+    text, stats = _ocr(max_pages=4)
+
+    assert stats["executor"] == "inline"
+    assert stats["pages_attempted"] == 4
+    assert stats["pages_timed_out"] == 1
+    assert stats["pages_failed"] == 1
+    assert "[OCR_PAGE=1]" in text and "[OCR_PAGE=4]" in text
+    assert "[OCR_PAGE=2]" not in text
+
+
+def test_batch_size_respects_memory_budget(monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_OCR_MEMORY_MB", "64")
+
+    assert pdf_ocr_fallback._render_batch_pages(dpi=300, workers=4) == 1
+    monkeypatch.setenv("HYBRIDRAG_OCR_MEMORY_MB", "4096")
+    assert pdf_ocr_fallback._render_batch_pages(dpi=150, workers=4) == 8
+
+
+class _FakeReaderPage:
+    def __init__(self, text):
+        self._text = text
+
+    def extract_text(self):
+        return self._text
+
+
+def _patch_reader(monkeypatch, page_texts):
+    import pypdf
+
+    class _Reader:
+        is_encrypted = False
+
+        def __init__(self, path):
+            self.pages = [_FakeReaderPage(t) for t in page_texts]
+
+    monkeypatch.setattr(pypdf, "PdfReader", _Reader)
+
+
+def test_mixed_pdf_ocrs_only_pages_without_text(monkeypatch, tmp_path):
+    from src.parsers import pdf_parser
+
+    body = "Digital page with a proper text layer describing the radar. "
+    _patch_reader(monkeypatch, [body, "", body, "  3 ", body])
+    requested = {}
+
+    def _fake_ocr(path, *, max_pages, dpi, timeout_s, lang, pages=None):
+        requested["pages"] = pages
+        text = "\n\n".join(f"[OCR_PAGE={n}]\nscanned text {n}" for n in pages)
+        return text, {"pages_attempted": len(pages)}
+
+    monkeypatch.setattr(pdf_parser, "ocr_deps_available", lambda: (True, {}))
+    monkeypatch.setattr(pdf_parser, "ocr_pdf_pages", _fake_ocr)
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake")
+
+    text, details = pdf_parser.PDFParser().parse_with_details(str(pdf))
+
+    assert requested["pages"] == [2, 4]
+    assert text.index("[OCR_PAGE=2]") < text.index("[OCR_PAGE=4]")
+    assert text.count(body.strip()) == 3
+    assert text.index("scanned text 2") < text.rindex(body.strip())
+    pages = details["ocr_fallback"]["pages"]
+    assert pages["mode"] == "selective"
+    assert (pages["total"], pages["with_text"], pages["needing_ocr"]) == (5, 3, 2)
+    assert pages["ocr_recovered"] == 2
+
+
+def test_mixed_pdf_keeps_text_pages_when_ocr_unavailable(monkeypatch, tmp_path):
+    from src.parsers import pdf_parser
+
+    body = "Digital page with a proper text layer describing the radar. "
+    _patch_reader(monkeypatch, [body, ""])
+    monkeypatch.setattr(pdf_parser, "ocr_deps_available", lambda: (False, {}))
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake")
+
+    text, details = pdf_parser.PDFParser().parse_with_details(str(pdf))
+
+    assert text == body.strip()
+    assert details["ocr_fallback"]["status"] == "OCR_DEPS_MISSING"
+    assert details["ocr_fallback"]["pages"]["needing_ocr"] == 1
+
+
+def test_split_ocr_pages_round_trips_markers():
+    text = "[OCR_PAGE=3]\nalpha\n\n[OCR_PAGE=10]\nbeta\nline two"
+
+    assert pdf_ocr_fallback.split_ocr_pages(text) == {3: "alpha", 10: "beta\nline two"}
@@ -0,0 +1,217 @@
+import threading
+
+import pytest
+
+from src.api.query_coalescer import QueryCoalescer, build_coalesce_key
+
+
+def _key(question="What is HybridRAG?", **overrides):
+    params = {
+        "transport": "sync",
+        "mode": "offline",
+        "model": "phi4-mini",
+        "allowed_doc_tags": ("shared",),
+    }
+    params.update(overrides)
+    return build_coalesce_key(question, **params)
+
+
+def test_coalesce_key_normalizes_text_and_tag_order():
+    assert _key("  what is   HYBRIDRAG? ") == _key("What is HybridRAG?")
+    assert _key(allowed_doc_tags=("restricted", "shared")) == _key(
+        allowed_doc_tags=("shared", "restricted")
+    )
+
+
+def test_coalesce_key_separates_mode_model_transport_and_tags():
+    base = _key()
+    assert _key(mode="online") != base
+    assert _key(model="phi4:14b") != base
+    assert _key(transport="stream") != base
+    assert _key(allowed_doc_tags=("shared", "restricted")) != base
+
+
+def test_followers_receive_leader_result():
+    coalescer = QueryCoalescer()
+    leader, is_leader = coalescer.join(_key())
+    follower, follower_is_leader = coalescer.join(_key())
+
+    assert is_leader is True
+    assert follower_is_leader is False
+    assert follower is leader
+
+    calls = []
+    assert leader.run(lambda: calls.append(1) or "answer") == "answer"
+    assert follower.wait_result(timeout=1.0) == "answer"
+    assert calls == [1]
+
+    snapshot = coalescer.snapshot()
+    assert snapshot["inflight_queries"] == 0
+    assert snapshot["total_leaders"] == 1
+    assert snapshot["total_coalesced"] == 1
+    assert snapshot["max_followers_seen"] == 1
+
+
+def test_finished_flight_is_not_reused():
+    coalescer = QueryCoalescer()
+    first, _ = coalescer.join(_key())
+    first.finish_result("old")
+
+    second, is_leader = coalescer.join(_key())
+    assert is_leader is True
+    assert second is not first
+
+
+def test_followers_see_leader_error():
+    coalescer = QueryCoalescer()
+    leader, _ = coalescer.join(_key())
+    follower, _ = coalescer.join(_key())
+
+    with pytest.raises(RuntimeError):
+        leader.run(lambda: (_ for _ in ()).throw(RuntimeError("backend down")))
+    with pytest.raises(RuntimeError, match="backend down"):
+        follower.wait_result(timeout=1.0)
+
+
+def test_disabled_coalescer_never_shares():
+    coalescer = QueryCoalescer(enabled=False)
+    first, first_leader = coalescer.join(_key())
+    second, second_leader = coalescer.join(_key())
+
+    assert first_leader is True
+    assert second_leader is True
+    assert first is not second
+    assert coalescer.snapshot()["total_coalesced"] == 0
+
+
+def test_disabled_via_env(monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_QUERY_COALESCE", "off")
+    assert QueryCoalescer.from_env().enabled is False
+    monkeypatch.delenv("HYBRIDRAG_QUERY_COALESCE")
+    assert QueryCoalescer.from_env().enabled is True
+
+
+def test_stream_events_fan_out_to_late_subscribers():
+    coalescer = QueryCoalescer()
+    flight, _ = coalescer.join(_key(transport="stream"))
+    flight.publish({"phase": "searching"})
+    flight.publish({"token": "Hello "})
+
+    received = {"early": [], "late": []}
+    started = threading.Event()
+
+    def _consume(name):
+        started.set()
+        for event in flight.iter_events():
+            received[name].append(event)
+
+    early = threading.Thread(target=_consume, args=("early",), daemon=True)
+    early.start()
+    assert started.wait(timeout=1.0)
+    flight.publish({"token": "world"})
+    flight.publish({"done": True, "result": "Hello world"})
+    flight.finish_result("Hello world")
+    early.join(timeout=1.0)
+
+    _consume("late")
+    expected = [
+        {"phase": "searching"},
+        {"token": "Hello "},
+        {"token": "world"},
+        {"done": True, "result": "Hello world"},
+    ]
+    assert received["early"] == expected
+    assert received["late"] == expected
+
+
+def test_stream_abandoned_after_all_subscribers_leave():
+    coalescer = QueryCoalescer()
+    flight, _ = coalescer.join(_key(transport="stream"))
+    assert flight.abandoned is False
+
+    flight.publish({"token": "a"})
+    events = flight.iter_events()
+    assert next(events) == {"token": "a"}
+    assert flight.abandoned is False
+    events.close()
+    assert flight.abandoned is True
+
+
+def test_abandoned_stream_is_not_joined():
+    coalescer = QueryCoalescer()
+    flight, _ = coalescer.join(_key(transport="stream"))
+    events = flight.iter_events()
+    flight.publish({"token": "a"})
+    assert next(events) == {"token": "a"}
+    events.close()
+
+    fresh, is_leader = coalescer.join(_key(transport="stream"), subscribe=True)
+    assert is_leader is True
+    assert fresh is not flight
+    assert flight.finish_if_abandoned() is True
+
+
+def test_joined_stream_follower_keeps_the_flight_alive_until_it_leaves():
+    coalescer = QueryCoalescer()
+    flight, _ = coalescer.join(_key(transport="stream"))
+    leader_events = flight.iter_events()
+    flight.publish({"token": "a"})
+    assert next(leader_events) == {"token": "a"}
+
+    same, is_leader = coalescer.join(_key(transport="stream"), subscribe=True)
+    assert same is flight and is_leader is False
+    leader_events.close()
+    # The follower has not started reading yet: the pump must keep going.
+    assert flight.finish_if_abandoned() is False
+
+    follower_events = flight.iter_events(reserved=True)
+    assert next(follower_events) == {"token": "a"}
+    follower_events.close()
+    assert flight.finish_if_abandoned() is True
+    assert flight.done is True
+
+
+def test_released_reservation_lets_the_flight_be_abandoned():
+    coalescer = QueryCoalescer()
+    flight, _ = coalescer.join(_key(transport="stream"))
+    leader_events = flight.iter_events()
+    flight.publish({"token": "a"})
+    assert next(leader_events) == {"token": "a"}
+
+    same, _ = coalescer.join(_key(transport="stream"), subscribe=True)
+    leader_events.close()
+    assert flight.finish_if_abandoned() is False
+
+    same.release_reservation()  # follower errored out before reading
+    assert flight.finish_if_abandoned() is True
+
+
+def test_follower_result_carries_its_own_access_identity():
+    from types import SimpleNamespace
+
+    from src.api.routes import _follower_query_result
+    from src.core.query_engine import QueryResult
+
+    leader_trace = {"retrieval": {"access_control": {
+        "enabled": True, "actor": "alice", "actor_source": "session",
+        "actor_role": "admin", "allowed_doc_tags": ["shared"],
+        "document_policy_source": "role_map", "denied_hits": 0,
+    }}}
+    result = QueryResult(
+        answer="a", sources=[], chunks_used=0, tokens_in=0, tokens_out=0,
+        cost_usd=0.0, latency_ms=1.0, mode="offline", debug_trace=leader_trace,
+    )
+    context = SimpleNamespace(
+        actor="bob", actor_source="api_token", actor_role="reviewer",
+        allowed_doc_tags=("shared",), document_policy_source="env",
+    )
+
+    follower = _follower_query_result(result, context)
+
+    access = follower.debug_trace["retrieval"]["access_control"]
+    assert (access["actor"], access["actor_source"], access["actor_role"]) == (
+        "bob", "api_token", "reviewer",
+    )
+    assert access["document_policy_source"] == "env"
+    assert access["allowed_doc_tags"] == ["shared"]
+    assert result.debug_trace["retrieval"]["access_control"]["actor"] == "alice"
@@ -0,0 +1,125 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies per-stage query timing spans, their rolling percentiles and Prometheus text.
+# What to read first: Start at the engine tests, then the StageLatencyStats tests.
+# Inputs: Mocked QueryEngine dependencies (shared with test_query_trace.py).
+# Outputs: Assertions on debug_trace["spans"] and StageLatencyStats snapshots.
+# Safety notes: No network, GPU, or real index required.
+# ============================
+
+import sys as _sys, os as _os
+_sys.path.insert(0, _os.path.dirname(__file__))
+from conftest import FakeConfig
+from test_query_trace import _make_query_engine
+
+from src.core import query_spans
+from src.core.query_trace import format_query_trace_text
+from src.core.query_spans import (
+    StageLatencyStats,
+    current_query_spans,
+    query_span,
+    timed_stage,
+    traced_query,
+)
+
+
+def _fresh_stats(monkeypatch, **kwargs):
+    stats = StageLatencyStats(**kwargs)
+    monkeypatch.setattr(query_spans, "_STATS", stats)
+    return stats
+
+
+def test_query_records_stage_spans_on_trace_and_stats(monkeypatch):
+    stats = _fresh_stats(monkeypatch)
+    engine, _, _ = _make_query_engine()
+
+    result = engine.query("What is nominal voltage?")
+
+    spans = result.debug_trace["spans"]
+    for stage in ("classify", "keyword_expansion", "context_trim", "prompt_build", "llm_generation"):
+        assert stage in spans["stages_ms"]
+    assert spans["total_ms"] >= sum(spans["stages_ms"].values()) * 0.5
+    assert "Stage Timings" in format_query_trace_text(result.debug_trace)
+    snap = stats.snapshot()
+    assert snap["queries"] == 1
+    assert {row["stage"] for row in snap["stages"]} >= {"classify", "llm_generation", "total"}
+
+
+def test_query_stream_records_time_to_first_token(monkeypatch):
+    _fresh_stats(monkeypatch)
+    engine, _, router = _make_query_engine(FakeConfig(mode="online"))
+    router.query_stream.return_value = iter(
+        [{"token": "Nominal "}, {"token": "12V."}, {"done": True, "tokens_out": 2}]
+    )
+
+    events = list(engine.query_stream("What is nominal voltage?"))
+    result = [e["result"] for e in events if e.get("done")][0]
+
+    stages = result.debug_trace["spans"]["stages_ms"]
+    assert "llm_ttft" in stages and "llm_generation" in stages
+    assert stages["llm_ttft"] <= stages["llm_generation"]
+    assert current_query_spans() is None
+
+
+def test_nested_spans_only_count_top_level(monkeypatch):
+    stats = _fresh_stats(monkeypatch)
+
+    @timed_stage("retrieval")
+    def search():
+        return 1
+
+    @traced_query("base")
+    def run():
+        search()
+        with query_span("corrective_retrieval"):
+            search()
+        return current_query_spans()
+
+    spans = run()
+    assert [s["name"] for s in spans["spans"]] == ["retrieval", "retrieval", "corrective_retrieval"]
+    assert spans["spans"][1]["parent"] == "corrective_retrieval"
+    assert set(spans["stages_ms"]) == {"retrieval", "corrective_retrieval"}
+    assert stats.snapshot()["stages"][0]["count"] == 1
+
+
+def test_disabled_stats_make_spans_noops(monkeypatch):
+    stats = _fresh_stats(monkeypatch, enabled=False)
+
+    @traced_query("base")
+    def run():
+        with query_span("classify") as span:
+            return span, current_query_spans()
+
+    span, spans = run()
+    assert span is None and spans is None
+    assert stats.snapshot()["queries"] == 0
+
+
+def test_stage_latency_percentiles_and_prometheus_text():
+    stats = StageLatencyStats(window=100)
+    for value in range(1, 101):
+        stats.observe_query({"retrieval": float(value)}, total_ms=float(value) * 2)
+
+    rows = {row["stage"]: row for row in stats.snapshot()["stages"]}
+    assert rows["retrieval"]["p50_ms"] == 50.0
+    assert rows["retrieval"]["p95_ms"] == 95.0
+    assert rows["retrieval"]["p99_ms"] == 99.0
+    assert rows["total"]["max_ms"] == 200.0
+
+    stats.observe("retrieval", 1000.0)
+    rows = {row["stage"]: row for row in stats.snapshot()["stages"]}
+    assert rows["retrieval"]["window_count"] == 100
+    assert rows["retrieval"]["count"] == 101
+
+    text = stats.prometheus_text()
+    assert "# TYPE hybridrag_query_stage_duration_seconds summary" in text
+    assert 'hybridrag_query_stage_duration_seconds{stage="retrieval",quantile="0.99"}' in text
+    assert 'hybridrag_query_stage_duration_seconds_count{stage="retrieval"} 101' in text
+    assert "hybridrag_queries_traced_total 100" in text
+
+
+def test_from_env_reads_switch_and_window(monkeypatch):
+    monkeypatch.setenv("HYBRIDRAG_QUERY_SPANS", "off")
+    monkeypatch.setenv("HYBRIDRAG_QUERY_SPAN_WINDOW", "64")
+    stats = StageLatencyStats.from_env()
+    assert stats.enabled is False
+    assert stats.window == 64
@@ -0,0 +1,34 @@
+import json
+
+import numpy as np
+
+from src.diagnostic import retrieval_benchmarks as rb
+
+
+def test_hashing_embedder_is_deterministic_and_topical():
+    a = rb.HashingEmbedder(32, seed=7)
+    b = rb.HashingEmbedder(32, seed=7)
+    q = a.embed_query("radar antenna gain")
+
+    assert np.array_equal(q, b.embed_query("radar antenna gain"))
+    assert float(q @ a.embed_query("antenna gain radar")) > 0.99
+    assert float(q @ a.embed_query("thermal sensor alarm")) < 0.9
+    assert a.embed_documents(["x", "y"]).shape == (2, 32)
+
+
+def test_suite_times_every_stage_and_reuses_corpus(tmp_path):
+    report = rb.run_suite([600], workdir=tmp_path, dimension=32, seed=3, repeat=1)
+    entry = report["results"]["600"]
+
+    assert set(entry["stages"]) == set(rb.STAGES)
+    assert all(s["n"] == len(rb._QUERIES) for s in entry["stages"].values())
+    assert all(s["min_ms"] <= s["median_ms"] <= s["p95_ms"] for s in entry["stages"].values())
+    assert entry["corpus_reused"] is False
+    json.dumps(report, sort_keys=True)
+
+    again = rb.run_suite([600], workdir=tmp_path, dimension=32, seed=3, repeat=1)
+    assert again["results"]["600"]["corpus_reused"] is True
+
+    rows = rb.compare_reports(report, again)
+    assert {r["stage"] for r in rows} == set(rb.STAGES)
+    assert rb.parse_sizes("10k, 1m,2500") == [10_000, 1_000_000, 2500]
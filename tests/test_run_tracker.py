@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+
+from src.monitoring.run_tracker import RunTracker
+
+
+def _event_count(db_path, run_id):
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute(
+            "SELECT COUNT(*) FROM doc_events WHERE run_id=?", (run_id,)
+        ).fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_events_are_batched_and_flushed_on_finish(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite3")
+    tracker = RunTracker(db_path, batch_size=50, flush_interval_s=5.0)
+    batches = []
+    original = tracker._write_batch
+
+    def _record(con, rows):
+        batches.append(len(rows))
+        original(con, rows)
+
+    tracker._write_batch = _record
+    tracker.set_discovery_totals(files_total=120, bytes_total=1200)
+    for i in range(120):
+        tracker.mark_file_done(f"/docs/{i}.txt", 10, 100, 2, 2, 1.5)
+
+    tracker.finish()
+
+    assert _event_count(db_path, tracker.run_id) == 121
+    assert len(batches) < 121 and max(batches) <= 50
+    assert tracker.summary()["events_written"] == 121
+    con = sqlite3.connect(db_path)
+    status = con.execute(
+        "SELECT status FROM index_runs WHERE run_id=?", (tracker.run_id,)
+    ).fetchone()[0]
+    con.close()
+    assert status == "finished"
+
+
+def test_full_queue_drops_events_instead_of_blocking(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite3")
+    tracker = RunTracker(db_path, queue_size=2, batch_size=1)
+    gate = threading.Event()
+    original = tracker._write_batch
+
+    def _stalled(con, rows):
+        gate.wait(5)
+        original(con, rows)
+
+    tracker._write_batch = _stalled
+    for i in range(20):
+        tracker.event(stage="parse", source_path=f"/docs/{i}.pdf")
+
+    assert tracker.events_dropped > 0
+    gate.set()
+    tracker.finish()
+
+    assert _event_count(db_path, tracker.run_id) == 20 - tracker.events_dropped
+    con = sqlite3.connect(db_path)
+    notes = con.execute(
+        "SELECT notes FROM index_runs WHERE run_id=?", (tracker.run_id,)
+    ).fetchone()[0]
+    con.close()
+    assert f"events_dropped={tracker.events_dropped}" in notes
+
+
+def test_flush_commits_pending_events_while_running(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite3")
+    tracker = RunTracker(db_path, flush_interval_s=5.0)
+    tracker.event(stage="hash", source_path="/docs/a.txt")
+
+    assert tracker.flush() is True
+    assert _event_count(db_path, tracker.run_id) == 1
+    tracker.close()
+    tracker.close()
+
+
+def test_events_after_close_are_counted_as_dropped(tmp_path):
+    tracker = RunTracker(str(tmp_path / "runs.sqlite3"))
+
+    assert tracker.close() is True
+    tracker.event(stage="parse", source_path="/docs/late.pdf")
+
+    assert tracker.events_dropped == 1
+
+
+def test_close_reports_a_writer_that_could_not_be_stopped(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite3")
+    tracker = RunTracker(db_path, queue_size=1, batch_size=1)
+    writing = threading.Event()
+    gate = threading.Event()
+    original = tracker._write_batch
+
+    def _stalled(con, rows):
+        writing.set()
+        gate.wait(5)
+        original(con, rows)
+
+    tracker._write_batch = _stalled
+    tracker.event(stage="parse", source_path="/docs/a.pdf")
+    assert writing.wait(5)
+    tracker.event(stage="parse", source_path="/docs/b.pdf")  # fills the queue
+
+    assert tracker.close(timeout=0.2) is False
+    gate.set()
+    assert tracker.close() is True
+    assert _event_count(db_path, tracker.run_id) == 2
+
+
+def test_trackers_share_one_atexit_hook(tmp_path, monkeypatch):
+    from src.monitoring import run_tracker
+
+    registered = []
+    monkeypatch.setattr(run_tracker.atexit, "register", registered.append)
+    trackers = [RunTracker(str(tmp_path / "runs.sqlite3")) for _ in range(3)]
+
+    assert registered == []
+    assert all(t in run_tracker._LIVE_TRACKERS for t in trackers)
+    run_tracker._close_live_trackers()
+    assert not any(t in run_tracker._LIVE_TRACKERS for t in trackers)
@@ -145,6 +145,90 @@ def test_backup_summary_uses_copied_history_snapshot_when_live_history_changes(
     assert verify["history_database_compare"]["matches"] is True
 
 
+def test_embeddings_backup_copies_only_appended_bytes_and_restores_chain(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(backup_tool, "_HASH_CHUNK_BYTES", 64)
+    project_root, main_db, _history_db = _make_shared_project(tmp_path / "project_chain")
+    dat_path = main_db.parent / "embeddings.f16.dat"
+    (main_db.parent / "embeddings_meta.json").write_text('{"dim": 4, "count": 0}', encoding="utf-8")
+    dat_path.write_bytes(bytes(range(200)))
+
+    def backup(minute: int, **kwargs) -> dict:
+        result = create_shared_backup_bundle(
+            project_root=project_root,
+            database_path=main_db,
+            output_root=tmp_path / "backups",
+            timestamp=datetime(2026, 3, 13, 11, minute, 0),
+            include_logs=False,
+            **kwargs,
+        )
+        return json.loads(Path(result["manifest_path"]).read_text(encoding="utf-8"))
+
+    first = backup(0)
+    assert first["summary"]["embeddings"]["copy_mode"] == "full"
+    assert first["summary"]["embeddings"]["bytes_copied"] == 200
+
+    with dat_path.open("ab") as handle:
+        handle.write(b"\x07" * 100)
+    second = backup(1)
+    embeddings = second["summary"]["embeddings"]
+    assert embeddings["copy_mode"] == "incremental"
+    assert embeddings["base_bundle"] == first["bundle_dir"]
+    # Appended 100 bytes plus the re-copied partial chunk (192..200).
+    assert embeddings["bytes_copied"] == 108
+    assert embeddings["chain_length"] == 2
+
+    verify = verify_shared_backup_bundle(second["bundle_dir"])
+    assert verify["ok"] is True
+    restore = run_shared_restore_drill(
+        second["bundle_dir"],
+        restore_root=tmp_path / "restore",
+        timestamp=datetime(2026, 3, 13, 11, 2, 0),
+    )
+    assert restore["ok"] is True
+    restored = Path(restore["restore_dir"]) / "payload" / "embeddings" / "embeddings.f16.dat"
+    assert restored.read_bytes() == dat_path.read_bytes()
+
+    # A rebuilt file no longer shares the old prefix and is copied in full.
+    dat_path.write_bytes(b"\x01" * 400)
+    third = backup(3)
+    assert third["summary"]["embeddings"]["copy_mode"] == "full"
+    assert third["summary"]["embeddings"]["chain_length"] == 1
+
+
+def test_database_is_copied_with_online_backup_while_wal_writer_is_open(
+    tmp_path: Path,
+) -> None:
+    project_root, main_db, _history_db = _make_shared_project(tmp_path / "project_wal")
+    writer = sqlite3.connect(str(main_db))
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("INSERT INTO chunks (source_path) VALUES ('docs/gamma.txt')")
+    writer.commit()
+    writer.execute("INSERT INTO chunks (source_path) VALUES ('docs/uncommitted.txt')")
+    steps: list[tuple[str, int, int]] = []
+    try:
+        result = create_shared_backup_bundle(
+            project_root=project_root,
+            database_path=main_db,
+            output_root=tmp_path / "backups",
+            timestamp=datetime(2026, 3, 13, 11, 10, 0),
+            include_logs=False,
+            sqlite_pages_per_step=1,
+            progress=lambda label, done, total: steps.append((label, done, total)),
+        )
+    finally:
+        writer.rollback()
+        writer.close()
+
+    assert result["summary"]["main_database"]["chunk_count"] == 4
+    assert result["summary"]["main_database"]["quick_check"] == "ok"
+    db_steps = [step for step in steps if step[0] == "database/hybridrag.sqlite3"]
+    assert len(db_steps) > 1 and db_steps[-1][1] == db_steps[-1][2]
+    assert verify_shared_backup_bundle(Path(result["bundle_dir"]))["ok"] is True
+
+
 def test_cli_create_verify_and_restore_drill_round_trip(tmp_path: Path) -> None:
     project_root, main_db, _history_db = _make_shared_project(tmp_path / "project_cli")
     repo_root = Path(__file__).resolve().parents[1]
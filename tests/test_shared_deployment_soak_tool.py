@@ -7,7 +7,9 @@ import pytest
 
 from src.tools.shared_deployment_soak import (
     JsonHttpResponse,
+    LatencySlo,
     build_request_headers,
+    evaluate_latency_slo,
     format_soak_console_summary,
     load_soak_questions,
     run_shared_deployment_soak,
@@ -122,6 +124,30 @@ def test_summarize_soak_results_computes_latency_and_queue_peaks():
     assert summary["queue"]["peak_total_rejected"] == 1
 
 
+def test_evaluate_latency_slo_reports_each_check_and_overall_verdict():
+    summary = {
+        "total_requests": 10,
+        "failed_requests": 1,
+        "client_latency_ms": {"count": 10.0, "p50": 80.0, "p95": 240.0, "p99": 400.0},
+        "ttft_ms": {"count": 0.0, "p95": 0.0},
+    }
+
+    assert evaluate_latency_slo(summary, None) == {"verdict": "not_configured", "checks": []}
+    verdict = evaluate_latency_slo(
+        summary,
+        LatencySlo(p95_ms=250.0, p99_ms=300.0, ttft_p95_ms=500.0, max_error_rate=0.2),
+    )
+
+    checks = {check["name"]: check for check in verdict["checks"]}
+    assert verdict["verdict"] == "fail"
+    assert checks["client_p95_ms"]["passed"] is True
+    assert checks["client_p99_ms"]["passed"] is False
+    assert checks["ttft_p95_ms"]["observed"] is None  # no streamed requests
+    assert checks["error_rate"] == {
+        "name": "error_rate", "threshold": 0.2, "observed": 0.1, "passed": True,
+    }
+
+
 def test_write_shared_soak_report_uses_timestamped_name(tmp_path):
     report = {
         "ok": True,
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.tools.shared_deployment_soak import LatencySlo, format_soak_console_summary
+from src.tools.shared_load_driver import (
+    LatencyHistogram,
+    LoadProfile,
+    StubQueryEngine,
+    poisson_arrivals,
+    run_shared_load_soak,
+    run_shared_load_soak_async,
+    stub_api_transport,
+)
+
+
+def test_latency_histogram_percentiles_stay_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000.0
+    assert summary["min"] == 1.0 and summary["max"] == 1000.0
+    assert summary["p50"] == pytest.approx(500.0, rel=0.011)
+    assert summary["p99"] == pytest.approx(990.0, rel=0.011)
+    assert LatencyHistogram().summary()["p95"] == 0.0
+
+
+def test_poisson_arrivals_are_seeded_and_match_the_rate():
+    arrivals = poisson_arrivals(50.0, duration_seconds=20.0, seed=7)
+    assert arrivals == poisson_arrivals(50.0, duration_seconds=20.0, seed=7)
+    assert all(later > earlier for earlier, later in zip(arrivals, arrivals[1:]))
+    assert len(arrivals) == pytest.approx(1000, rel=0.1)
+    assert len(poisson_arrivals(5.0, total_requests=12, seed=7)) == 12
+
+
+def _mock_api(stall_first_seconds: float = 0.0, sse_body: str = ""):
+    calls = {"query": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/query":
+            calls["query"] += 1
+            if calls["query"] == 1 and stall_first_seconds:
+                await asyncio.sleep(stall_first_seconds)
+            return httpx.Response(200, json={"answer": "ok", "latency_ms": 1.0, "mode": "online"})
+        if request.url.path == "/query/stream":
+            return httpx.Response(
+                200,
+                content=sse_body.encode("utf-8"),
+                headers={"content-type": "text/event-stream"},
+            )
+        return httpx.Response(200, json={"status": "ok"})
+
+    return httpx.MockTransport(handler), calls
+
+
+def test_closed_loop_pacing_charges_a_stall_to_every_request_it_delayed():
+    transport, calls = _mock_api(stall_first_seconds=0.3)
+
+    report = run_shared_load_soak(
+        base_url="http://soak.test",
+        questions=["one"],
+        profile=LoadProfile(mode="closed", concurrency=1, total_requests=6, pacing_seconds=0.05),
+        poll_interval_seconds=0.0,
+        slo=LatencySlo(p95_ms=100.0, max_error_rate=0.0),
+        transport=transport,
+    )
+
+    assert calls["query"] == 6
+    requests = report["requests"]
+    # Requests 2..6 were due every 50 ms while the first one hung for 300 ms:
+    # the server answered them quickly, but they waited on the schedule.
+    assert requests[1]["service_time_ms"] < 100.0
+    assert requests[1]["client_latency_ms"] > 200.0
+    assert report["summary"]["client_latency_ms"]["p50"] > report["summary"]["service_time_ms"]["p50"]
+    assert report["summary"]["coordinated_omission"].startswith("corrected")
+    assert report["slo"]["verdict"] == "fail"
+    assert report["ok"] is False
+    assert "SLO: fail (client_p95_ms)" in format_soak_console_summary(report)
+
+
+def test_stream_requests_parse_sse_and_record_time_to_first_token():
+    done = json.dumps({"answer": "a b", "latency_ms": 4.0, "mode": "online", "error": None})
+    body = "event: phase\ndata: searching\n\nevent: token\ndata: a\n\nevent: token\ndata: b\n\n" \
+           "event: done\ndata: {}\n\n".format(done)
+    transport, _calls = _mock_api(sse_body=body)
+
+    report = run_shared_load_soak(
+        base_url="http://soak.test",
+        questions=["one", "two"],
+        profile=LoadProfile(mode="open", rate_per_second=200.0, total_requests=8, stream_fraction=1.0),
+        poll_interval_seconds=0.0,
+        slo=LatencySlo(ttft_p95_ms=5000.0, max_error_rate=0.0),
+        transport=transport,
+    )
+
+    assert report["ok"] is True
+    assert report["summary"]["transports"] == {"stream": 8}
+    assert report["summary"]["ttft_ms"]["count"] == 8.0
+    assert all(item["server_latency_ms"] == 4.0 for item in report["requests"])
+    assert report["slo"]["verdict"] == "pass"
+
+
+def test_open_loop_against_live_api_with_stub_engine():
+    engine = StubQueryEngine(latency_seconds=0.04, first_token_seconds=0.01, tokens=4)
+
+    async def scenario():
+        async with stub_api_transport(engine) as transport:
+            return await run_shared_load_soak_async(
+                base_url="http://stub.test",
+                questions=["first question", "second question", "third question"],
+                profile=LoadProfile(
+                    mode="open",
+                    rate_per_second=40.0,
+                    total_requests=12,
+                    concurrency=8,
+                    stream_fraction=0.5,
+                ),
+                poll_interval_seconds=0.05,
+                slo=LatencySlo(p95_ms=10000.0, max_error_rate=0.0),
+                transport=transport,
+            )
+
+    report = asyncio.run(scenario())
+
+    assert report["ok"] is True, report["summary"]["errors"]
+    assert report["target"]["health"]["status_code"] == 200
+    assert report["summary"]["successful_requests"] == 12
+    assert set(report["summary"]["transports"]) == {"sync", "stream"}
+    streamed = [item for item in report["requests"] if item["transport"] == "stream"]
+    assert all(item["ttft_ms"] is not None for item in streamed)
+    assert all(item["ttft_ms"] < item["client_latency_ms"] for item in streamed)
+    assert report["queue_samples"]
+    assert engine.calls >= 1
@@ -0,0 +1,85 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies index-time source token IDs and the guard's token-overlap scoring built on them.
+# What to read first: Start at the scoring test, then the VectorStore round-trip.
+# Inputs: Small hand-written chunks and claims; a temporary SQLite/memmap store.
+# Outputs: Assertions on overlap, per-claim source attribution and stored token IDs.
+# Safety notes: Uses tmp_path only; no model or network required.
+# ============================
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.core.grounded_query_engine import _gqe_fallback_score, _gqe_source_index
+from src.core.source_tokens import (
+    SourceTokenIndex,
+    content_tokens,
+    pack_token_ids,
+    token_ids,
+    unpack_token_ids,
+)
+from src.core.vector_store import ChunkMetadata, VectorStore
+
+_SOURCES = [
+    "The pump is rated for 28VDC input and 4 A maximum current.",
+    "Maintenance interval for the filter is 500 operating hours.",
+]
+
+
+def test_token_ids_are_sorted_unique_and_round_trip():
+    ids = token_ids("28VDC 28 vdc input, input")
+    assert content_tokens("28VDC input") == ["28", "vdc", "input"]
+    assert ids.dtype == np.uint32 and list(ids) == sorted(set(ids.tolist()))
+    assert len(ids) == 3
+    assert np.array_equal(unpack_token_ids(pack_token_ids(ids)), ids)
+    assert unpack_token_ids(None) is None
+
+
+def test_fallback_score_matches_token_overlap_and_names_source():
+    claims = [
+        {"text": "The pump takes 28 VDC input.", "is_trivial": False},
+        {"text": "Replace the filter every 500 hours.", "is_trivial": False},
+        {"text": "The admin password is swordfish.", "is_trivial": False},
+    ]
+    score, details = _gqe_fallback_score(claims, _SOURCES, 0.8)
+
+    verdicts = [c["verdict"] for c in details["claims"]]
+    assert verdicts == ["SUPPORTED", "SUPPORTED", "UNSUPPORTED"]
+    assert [c["source_index"] for c in details["claims"]] == [0, 1, -1]
+    # "pump takes 28 vdc input": 4 of 5 tokens appear in the sources.
+    assert details["claims"][0]["hits"] == 4 and details["claims"][0]["tokens"] == 5
+    assert abs(score - 2 / 3) < 1e-9
+
+    index = SourceTokenIndex.from_texts(_SOURCES)
+    again, _ = _gqe_fallback_score(claims, [], 0.8, source_index=index)
+    assert again == score
+
+
+def test_vector_store_keeps_token_ids_for_the_guard(tmp_path):
+    store = VectorStore(db_path=str(tmp_path / "index.sqlite3"), embedding_dim=4)
+    store.connect()
+    try:
+        store.add_embeddings(
+            np.ones((2, 4), dtype=np.float32),
+            [
+                ChunkMetadata("/docs/pump.txt", i, len(t), "2026-01-01T00:00:00")
+                for i, t in enumerate(_SOURCES)
+            ],
+            _SOURCES,
+        )
+        stored = store.get_chunk_token_ids([("/docs/pump.txt", 1), ("/docs/none.txt", 0)])
+        assert list(stored) == [("/docs/pump.txt", 1)]
+        assert np.array_equal(stored[("/docs/pump.txt", 1)], token_ids(_SOURCES[1]))
+
+        # Hits use the stored IDs, not their (here deliberately wrong) text;
+        # hits the store does not know are tokenized from their text.
+        engine = SimpleNamespace(vector_store=store)
+        hits = [
+            SimpleNamespace(source_path="/docs/pump.txt", chunk_index=1, text="unrelated"),
+            SimpleNamespace(source_path="/docs/other.txt", chunk_index=0, text="swordfish"),
+        ]
+        index = _gqe_source_index(engine, hits)
+        assert np.array_equal(index.per_source[0], token_ids(_SOURCES[1]))
+        assert index.score_claim("swordfish")["source_index"] == 1
+    finally:
+        store.close()
@@ -0,0 +1,119 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies the per-directory source tree summary behind content freshness checks.
+# What to read first: Start at the incremental refresh test, then persistence and watcher tests.
+# Inputs: Small temp source trees with hand-set file and folder mtimes.
+# Outputs: Assertions on re-listed folder counts, rollups, digests and newer-file counts.
+# Safety notes: Uses temp directories only; does not touch the live indexed corpus.
+# ============================
+
+import os
+import time
+
+from src.core.source_tree_summary import SourceTreeSummary
+
+_OLD = time.time() - 7 * 86400
+
+
+def _file(path, when=_OLD):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("sample", encoding="utf-8")
+    os.utime(path, (when, when))
+
+
+def _age_dirs(root):
+    """Backdate folder mtimes so they are not 'racy' right after a scan."""
+    for dirpath, _dirs, _files in os.walk(root):
+        os.utime(dirpath, (_OLD, _OLD))
+
+
+def _tree(tmp_path):
+    root = tmp_path / "source"
+    _file(root / "a" / "one.md")
+    _file(root / "a" / "deep" / "two.md")
+    _file(root / "b" / "three.md")
+    _file(root / "b" / "skip.tmp")
+    _file(root / "archive" / "old.md")
+    _age_dirs(root)
+    return root
+
+
+def _summary(root, **kwargs):
+    return SourceTreeSummary(
+        str(root),
+        supported_extensions=[".md"],
+        excluded_dirs=["archive"],
+        **kwargs,
+    )
+
+
+def test_refresh_relists_only_changed_directories_and_rolls_up(tmp_path):
+    root = _tree(tmp_path)
+    summary = _summary(root)
+
+    assert summary.refresh()["dirs_rescanned"] == 4
+    assert summary.total_files == 3
+    b_digest = summary.digest("b")
+    root_digest = summary.digest()
+
+    stats = summary.refresh()
+    assert stats == {"dirs_checked": 4, "dirs_rescanned": 0, "full": False}
+
+    _file(root / "a" / "deep" / "new.md", when=time.time())
+    stats = summary.refresh()
+    assert stats["dirs_rescanned"] == 1
+    assert summary.total_files == 4
+    assert summary.newest()[1].endswith(os.path.join("deep", "new.md"))
+    assert summary.count_newer_than(int((_OLD + 60) * 1e9)) == 1
+    assert summary.count_newer_than(None) == 4
+    assert summary.digest("b") == b_digest
+    assert summary.digest() != root_digest
+
+    (root / "b" / "three.md").unlink()
+    summary.refresh()
+    assert summary.total_files == 3
+    assert summary.count_newer_than(int((_OLD + 60) * 1e9)) == 1
+
+
+def test_summary_persists_and_skips_rescan_after_restart(tmp_path):
+    root = _tree(tmp_path)
+    store = str(tmp_path / "data" / "tree.sqlite3")
+    first = _summary(root, store_path=store)
+    first.refresh()
+
+    again = _summary(root, store_path=store)
+    stats = again.refresh()
+    assert stats["dirs_rescanned"] == 0 and not stats["full"]
+    assert again.total_files == 3
+    assert again.digest() == first.digest()
+
+    other_filters = SourceTreeSummary(str(root), supported_extensions=[".md", ".tmp"], store_path=store)
+    assert other_filters.refresh()["full"] is True
+    assert other_filters.total_files == 5
+
+
+def test_watcher_notices_replace_the_stat_pass_and_catch_in_place_edits(tmp_path):
+    root = _tree(tmp_path)
+    summary = _summary(root)
+    summary.refresh()
+    summary.events_complete = True
+
+    # An in-place edit leaves the folder mtime alone ...
+    edited = root / "b" / "three.md"
+    now = time.time()
+    os.utime(edited, (now, now))
+    assert summary.refresh()["dirs_checked"] == 0
+    assert summary.count_newer_than(int((_OLD + 60) * 1e9)) == 0
+
+    # ... so the watcher reports it and only that folder is re-listed.
+    summary.mark_changed(str(edited))
+    stats = summary.refresh()
+    assert stats == {"dirs_checked": 1, "dirs_rescanned": 1, "full": False}
+    assert summary.count_newer_than(int((_OLD + 60) * 1e9)) == 1
+    assert summary.newest()[1] == str(edited)
+
+    # A file in a new folder is found by re-listing the nearest known one.
+    _file(root / "a" / "fresh" / "four.md", when=time.time())
+    summary.mark_changed(str(root / "a" / "fresh" / "four.md"))
+    stats = summary.refresh()
+    assert stats["dirs_rescanned"] == 2
+    assert summary.total_files == 4
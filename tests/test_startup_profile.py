@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+
+import pytest
+
+from src.core import startup_profile
+from src.core.startup_profile import StartupProfiler
+
+
+def _write_module(path, name, body):
+    (path / f"{name}.py").write_text(body, encoding="utf-8")
+
+
+@pytest.fixture
+def slow_modules(tmp_path, monkeypatch):
+    _write_module(tmp_path, "sp_slow_leaf", "import time\ntime.sleep(0.02)\n")
+    _write_module(tmp_path, "sp_slow_parent", "import time\nimport sp_slow_leaf\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in ("sp_slow_leaf", "sp_slow_parent"):
+        sys.modules.pop(name, None)
+
+
+def test_steps_are_timed_back_to_back_and_errors_are_marked():
+    profiler = StartupProfiler(capture_imports=False)
+
+    with profiler.phase("boot") as phase:
+        phase.step("config")
+        time.sleep(0.01)
+        phase.step("credentials")
+    with pytest.raises(RuntimeError):
+        with profiler.phase("api") as phase:
+            phase.step("vector_store")
+            raise RuntimeError("db locked")
+
+    snap = profiler.snapshot()
+    assert [(s["phase"], s["name"], s["status"]) for s in snap["steps"]] == [
+        ("boot", "config", "ok"), ("boot", "credentials", "ok"), ("api", "vector_store", "error"),
+    ]
+    assert snap["steps"][0]["duration_ms"] >= 10
+    assert snap["steps"][1]["start_ms"] >= snap["steps"][0]["start_ms"] + 10
+    assert all(p["complete"] for p in snap["phases"])
+
+
+def test_imports_are_attributed_to_the_running_step_cumulatively(slow_modules):
+    import builtins
+
+    original = builtins.__import__
+    profiler = StartupProfiler()
+
+    with profiler.phase("boot") as phase:
+        phase.step("config")
+        import sp_slow_parent  # noqa: F401
+
+    assert builtins.__import__ is original
+    imports = profiler.snapshot()["imports"]
+    assert [i["module"] for i in imports] == ["sp_slow_parent"]
+    assert imports[0]["step"] == "boot.config"
+    assert imports[0]["new_modules"] == 2
+    assert imports[0]["ms"] >= 30
+
+
+def test_boot_records_each_step(monkeypatch):
+    from src.core import boot
+
+    profiler = StartupProfiler(capture_imports=False)
+    monkeypatch.setattr(startup_profile, "_PROFILE", profiler)
+    monkeypatch.setattr(boot, "load_config", lambda path=None: {"mode": "offline"})
+
+    boot.boot_hybridrag()
+
+    names = [s["name"] for s in profiler.snapshot()["steps"] if s["phase"] == "boot"]
+    assert names == [
+        "config", "credentials", "network_gate", "api_client", "probe_wait",
+    ]
+
+
+def test_cold_start_boot_records_ordered_steps_and_removes_the_hook():
+    snap = startup_profile.measure_cold_start("boot")
+
+    assert [p["name"] for p in snap["phases"]] == ["cold_start", "boot"]
+    assert all(p["complete"] for p in snap["phases"])
+    steps = {(s["phase"], s["name"]): s for s in snap["steps"]}
+    boot_steps = [s for s in snap["steps"] if s["phase"] == "boot"]
+    assert [s["name"] for s in boot_steps][:2] == ["config", "credentials"]
+    starts = [s["start_ms"] for s in boot_steps]
+    assert starts == sorted(starts)
+    assert starts[0] >= steps[("cold_start", "boot_hybridrag")]["start_ms"]
+    assert all(s["status"] == "ok" for s in snap["steps"])
+    assert snap["imports"], "import timing missing from cold-start profile"
+    assert snap["import_hook_active"] is False
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RUN_LATENCY_TESTS"),
+    reason="Set RUN_LATENCY_TESTS=1 to run latency tests"
+)
+def test_cold_start_boot_stays_within_budget():
+    snap = startup_profile.measure_cold_start("boot")
+
+    assert not snap["over_budget"], (
+        f"cold start took {snap['process_ms']:.0f} ms (budget {snap['budget_ms']:.0f} ms)\n"
+        + startup_profile.format_snapshot(snap)
+    )
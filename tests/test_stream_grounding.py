@@ -0,0 +1,63 @@
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Verifies sentence segmentation and per-action release rules of the streaming grounding gate.
+# What to read first: Start at the split test, then one test per guard action.
+# Inputs: Hand-written token sequences and a fake "is supported" check.
+# Outputs: Assertions on released text and gate counters.
+# Safety notes: Pure string logic; no model, network, or index required.
+# ============================
+
+from src.core.stream_grounding import StreamingGroundingGate, split_complete_segments
+
+
+def _supported(sentence):
+    return "swordfish" not in sentence
+
+
+def _run(gate, tokens):
+    out = [gate.feed(t) for t in tokens]
+    out.append(gate.finish())
+    return "".join(out)
+
+
+def test_split_waits_for_next_sentence_and_keeps_abbreviations():
+    done, rest = split_complete_segments("Torque is 12 Nm. See Fig. 3 for the ")
+    assert done == ["Torque is 12 Nm. "]
+    assert rest == "See Fig. 3 for the "
+
+    done, rest = split_complete_segments("Voltage is 28 VDC.")
+    assert done == [] and rest == "Voltage is 28 VDC."
+
+    done, rest = split_complete_segments("- item one\n- item two")
+    assert done == ["- item one\n"] and rest == "- item two"
+
+
+def test_block_holds_unsupported_sentence_and_everything_after():
+    gate = StreamingGroundingGate(_supported, "block")
+    first = gate.feed("Serial is ABC123. Pass")
+    assert first == "Serial is ABC123. "
+
+    rest = _run(gate, ["word is swordfish. ", "Model is X1."])
+    assert rest == ""
+    assert gate.released_text == "Serial is ABC123. "
+    assert gate.stats()["held"] == 2
+
+
+def test_strip_redacts_and_flag_marks_unsupported_sentences():
+    tokens = ["Serial is ABC123. ", "Password is swordfish. ", "Model is X1."]
+
+    strip = StreamingGroundingGate(_supported, "strip")
+    assert _run(strip, tokens) == "Serial is ABC123. Model is X1."
+    assert strip.stats()["redacted"] == 1
+
+    flag = StreamingGroundingGate(_supported, "flag")
+    assert _run(flag, tokens) == (
+        "Serial is ABC123. [UNVERIFIED] Password is swordfish. Model is X1."
+    )
+    assert flag.stats()["flagged"] == 1
+
+
+def test_warn_releases_without_checking():
+    calls = []
+    gate = StreamingGroundingGate(lambda s: calls.append(s) or False, "warn")
+    assert _run(gate, ["Password is swordfish. ", "Done."]) == "Password is swordfish. Done."
+    assert calls == []
@@ -0,0 +1,234 @@
+import mailbox
+from email.message import EmailMessage
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.index_report import FileRecord, populate_from_parse_details
+from src.parsers.mbox_parser import MboxParser
+from src.parsers.registry import REGISTRY, TextSegment, iter_segments
+from tests.conftest import FakeConfig
+
+
+def _write_mbox(path, count):
+    box = mailbox.mbox(str(path))
+    for i in range(1, count + 1):
+        msg = EmailMessage()
+        msg["From"] = f"tech{i}@example.com"
+        msg["Subject"] = f"Calibration report {i}"
+        msg.set_content(f"Transmitter {i} calibrated to {i * 10} MHz. " * 20)
+        box.add(msg)
+    box.flush()
+    box.close()
+
+
+def test_mbox_segments_join_to_parse_with_details_text(tmp_path):
+    path = tmp_path / "archive.mbox"
+    _write_mbox(path, 3)
+    details = {}
+
+    segments = list(MboxParser().parse_iter(str(path), details))
+    text, full_details = MboxParser().parse_with_details(str(path))
+
+    assert [(s.kind, s.locator) for s in segments] == [
+        ("header", None), ("message", 1), ("message", 2), ("message", 3),
+    ]
+    assert "\n".join(s.text for s in segments).strip() == text
+    assert details["messages"] == full_details["messages"] == 3
+    assert segments[2].provenance() == "message=2"
+
+
+def test_xlsx_sheet_is_yielded_in_row_slices(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    from src.parsers import office_xlsx_parser
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Parts"
+    ws.append(["Part No", "Description"])
+    for i in range(1, 1201):
+        ws.append([f"P-{i:05d}", f"Antenna bracket {i}"])
+    path = tmp_path / "parts.xlsx"
+    wb.save(str(path))
+
+    parser = office_xlsx_parser.XlsxParser()
+    segments = list(parser.parse_iter(str(path)))
+    text, details = parser.parse_with_details(str(path))
+
+    assert len(segments) == 3
+    assert {(s.kind, s.locator) for s in segments} == {("sheet", "Parts")}
+    assert "\n".join(s.text for s in segments).strip() == text
+    assert details["rows_emitted"] == 1200
+
+
+def test_registry_reports_streaming_parsers_and_wraps_the_rest(tmp_path):
+    assert REGISTRY.supports_streaming(".pdf")
+    assert REGISTRY.supports_streaming(".mbox")
+    assert not REGISTRY.supports_streaming(".txt")
+
+    path = tmp_path / "notes.txt"
+    path.write_text("Plain notes about the radar.", encoding="utf-8")
+    details = {}
+    segments = list(iter_segments(REGISTRY.get(".txt").parser_cls(), str(path), details))
+
+    assert segments == [TextSegment("Plain notes about the radar.")]
+    assert details
+
+
+def _fake_mixed_pdf(monkeypatch, tmp_path, texts, extracted, ocr_calls):
+    import pypdf
+    from src.parsers import pdf_parser
+
+    class _Page:
+        def __init__(self, n, text):
+            self.n, self.text = n, text
+
+        def extract_text(self):
+            extracted.append(self.n)
+            return self.text
+
+    class _Reader:
+        is_encrypted = False
+
+        def __init__(self, path):
+            self.pages = [_Page(n, t) for n, t in enumerate(texts, start=1)]
+
+    def _fake_ocr(path, *, max_pages, dpi, timeout_s, lang, pages=None):
+        ocr_calls.append((list(pages), list(extracted)))
+        return "\n\n".join(f"[OCR_PAGE={n}]\nscanned {n}" for n in pages), {}
+
+    monkeypatch.setattr(pypdf, "PdfReader", _Reader)
+    monkeypatch.setattr(pdf_parser, "ocr_deps_available", lambda: (True, {}))
+    monkeypatch.setattr(pdf_parser, "ocr_pdf_pages", _fake_ocr)
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake")
+    return pdf
+
+
+def test_pdf_parse_iter_keeps_ocr_pages_in_page_order_within_hold_window(monkeypatch, tmp_path):
+    from src.parsers import pdf_parser
+
+    body = "Digital page with a proper text layer describing the radar. "
+    extracted, ocr_calls = [], []
+    monkeypatch.setenv("HYBRIDRAG_OCR_STREAM_HOLD_PAGES", "2")
+    pdf = _fake_mixed_pdf(
+        monkeypatch, tmp_path, [body, "", body, "", body, body, body], extracted, ocr_calls,
+    )
+    details = {}
+
+    segments = list(pdf_parser.PDFParser().parse_iter(str(pdf), details))
+
+    assert [s.locator for s in segments] == [1, 2, 3, 4, 5, 6, 7]
+    # Pages 2 and 4 are OCR'd in one batch once two text pages wait behind them.
+    assert ocr_calls == [([2, 4], [1, 2, 3, 4, 5])]
+    assert details["ocr_fallback"]["pages"]["needing_ocr"] == 2
+    assert details["ocr_fallback"]["pages"]["ocr_recovered"] == 2
+
+
+def test_pdf_parse_iter_streams_text_pages_and_ocr_pages_in_order(monkeypatch, tmp_path):
+    from src.parsers import pdf_parser
+
+    body = "Digital page with a proper text layer describing the radar. "
+    extracted, ocr_calls = [], []
+    pdf = _fake_mixed_pdf(monkeypatch, tmp_path, [body, "", body, body], extracted, ocr_calls)
+    details = {}
+
+    stream = pdf_parser.PDFParser().parse_iter(str(pdf), details)
+    first = next(stream)
+    assert (first.kind, first.locator) == ("page", 1)
+    assert extracted == [1]  # later pages not read yet
+
+    rest = list(stream)
+    assert [s.locator for s in rest] == [2, 3, 4]
+    assert rest[0].text == "[OCR_PAGE=2]\nscanned 2"
+    assert details["ocr_fallback"]["pages"]["ocr_recovered"] == 1
+    assert details["normal_extract"]["status"] == "OK"
+
+
+def _make_indexer(config):
+    from src.core.indexer import Indexer
+
+    vector_store = MagicMock()
+    vector_store.get_file_hash.return_value = None
+    vector_store.conn = None
+    embedder = MagicMock()
+    embedder.embed_documents.side_effect = lambda texts: [[0.0] * 8 for _ in texts]
+    chunker = MagicMock()
+    chunker.chunk_text.side_effect = lambda text: [
+        text[i:i + 200] for i in range(0, len(text), 200) if text[i:i + 200].strip()
+    ]
+    return Indexer(config, vector_store, embedder, chunker), vector_store
+
+
+def test_indexer_streams_blocks_and_stops_reading_at_clamp(tmp_path, monkeypatch):
+    config = FakeConfig()
+    config.indexing.block_chars = 1000
+    config.indexing.max_chars_per_file = 5000
+    indexer, vector_store = _make_indexer(config)
+    pulled = []
+
+    def _segments(self, file_path, details):
+        details["parser"] = "FakeStreamParser"
+        for n in range(1, 1000):
+            pulled.append(n)
+            yield TextSegment(f"Message {n}: the antenna gain is {n} dBi. " * 10,
+                              kind="message", locator=n)
+
+    monkeypatch.setattr(type(indexer), "_iter_file_segments", _segments)
+    path = tmp_path / "big.mbox"
+    path.write_text("From x\n", encoding="utf-8")
+
+    chunks, reason, _, details = indexer._process_single_file(path)
+
+    assert reason is None and chunks > 0
+    assert vector_store.add_embeddings.call_count >= 5
+    assert len(pulled) < 20
+    assert details["stream"]["clamped"] is True
+    assert details["stream"]["chars"] == 5000
+    assert details["chars_after_cleanup"] <= 5000
+
+
+def test_indexer_can_fall_back_to_whole_text_parsing(tmp_path, monkeypatch):
+    config = FakeConfig()
+    config.indexing.stream_parsers = False
+    indexer, _ = _make_indexer(config)
+    path = tmp_path / "archive.mbox"
+    _write_mbox(path, 2)
+    monkeypatch.setattr(
+        type(indexer), "_iter_file_segments",
+        lambda *a: pytest.fail("streaming path used"),
+    )
+
+    chunks, reason, _, details = indexer._process_single_file(path)
+
+    assert reason is None and chunks > 0
+    assert details["parser"] == "MboxParser"
+
+
+def test_indexer_keeps_partial_chunks_when_parser_fails_mid_stream(tmp_path, monkeypatch):
+    config = FakeConfig()
+    config.indexing.block_chars = 1000
+    indexer, vector_store = _make_indexer(config)
+
+    def _segments(self, file_path, details):
+        details["parser"] = "FakeStreamParser"
+        for n in range(1, 4):
+            yield TextSegment(f"Message {n}: the antenna gain is {n} dBi. " * 30,
+                              kind="message", locator=n)
+        details["error"] = "RUNTIME_ERROR: ValueError: truncated mailbox"
+
+    monkeypatch.setattr(type(indexer), "_iter_file_segments", _segments)
+    path = tmp_path / "broken.mbox"
+    path.write_text("From x\n", encoding="utf-8")
+
+    chunks, reason, _, details = indexer._process_single_file(path)
+
+    assert reason is None and chunks > 0
+    assert details["error"].startswith("RUNTIME_ERROR")
+    vector_store.delete_chunks_by_source.assert_not_called()
+    hashes = {c.kwargs["file_hash"] for c in vector_store.add_embeddings.call_args_list}
+    assert hashes == {indexer._compute_file_hash(path)}
+
+    record = FileRecord(str(path), ".mbox")
+    populate_from_parse_details(record, details, 0)
+    assert record.error_msg == details["error"]
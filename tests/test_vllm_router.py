@@ -250,3 +250,173 @@ class TestVLLMRouter:
         assert len(done_markers) == 1
         assert done_markers[0]["tokens_in"] == 10
         assert done_markers[0]["tokens_out"] == 3
+
+
+# ============================================================================
+# Micro-batching against a local OpenAI-compatible stub server
+# ============================================================================
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubVLLMServer:
+    """Minimal OpenAI-compatible /v1/chat/completions SSE server."""
+
+    def __init__(self, first_token_delay=0.05):
+        self.requests = []
+        self.lock = threading.Lock()
+        self.first_token_delay = first_token_delay
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.send_response(200)
+                self.end_headers()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", "0"))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with stub.lock:
+                    stub.requests.append((time.monotonic(), body))
+                user = body["messages"][-1]["content"]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                time.sleep(stub.first_token_delay)
+                for piece in ("echo:", user):
+                    chunk = {"choices": [{"delta": {"content": piece}}], "usage": None}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                usage = {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 2}}
+                self.wfile.write(f"data: {json.dumps(usage)}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestVLLMMicroBatching:
+    """VLLMRouter micro-batching window (config.vllm.batch_window_ms)."""
+
+    def _make_router(self, base_url, window_ms=100):
+        config = FakeConfig(mode="offline")
+        config.vllm = FakeVLLMConfig(enabled=True, base_url=base_url)
+        config.vllm.batch_window_ms = window_ms
+        config.vllm.max_batch_size = 8
+        with patch("src.core.vllm_router.get_app_logger") as mock_logger:
+            mock_logger.return_value = MagicMock()
+            from src.core.llm_router import VLLMRouter
+            return VLLMRouter(config)
+
+    def test_batching_disabled_by_default(self):
+        config = FakeConfig(mode="offline")
+        config.vllm = FakeVLLMConfig(enabled=True)
+        with patch("src.core.vllm_router.get_app_logger") as mock_logger:
+            mock_logger.return_value = MagicMock()
+            from src.core.llm_router import VLLMRouter
+            router = VLLMRouter(config)
+        assert router.batch_stats() is None
+        router.close()
+
+    def test_concurrent_queries_share_prefix_and_demultiplex(self):
+        """
+        WHAT: Concurrent prompts with the same system prefix are grouped;
+              the primer goes first, followers after its first token, and
+              every caller gets its own answer back.
+        WHY:  Followers reuse the primer's prefix KV cache on the server.
+        """
+        system = "You are a precise technical assistant. Cite [Source N]."
+        with _StubVLLMServer() as server:
+            router = self._make_router(server.base_url)
+            results = {}
+
+            def _ask(question):
+                prompt = f"{system}\n\nContext:\nchunk text\n\nUser Question:\n{question}"
+                results[question] = router.query(prompt)
+
+            threads = [
+                threading.Thread(target=_ask, args=(f"question {i}",))
+                for i in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+            router.close()
+
+        for i in range(3):
+            response = results[f"question {i}"]
+            assert response is not None
+            assert response.text.startswith("echo:")
+            assert f"question {i}" in response.text
+            assert response.tokens_in == 7
+            assert response.tokens_out == 2
+
+        assert len(server.requests) == 3
+        arrivals = sorted(t for t, _ in server.requests)
+        # Followers are held until the primer streams its first token.
+        assert arrivals[1] - arrivals[0] >= server.first_token_delay * 0.8
+        for _, body in server.requests:
+            assert body["messages"][0] == {"role": "system", "content": system}
+            assert body["stream_options"] == {"include_usage": True}
+
+        stats = router.batch_stats()
+        assert stats["requests"] == 3
+        assert stats["batches"] == 1
+        assert stats["prefix_groups"] == 1
+        assert stats["prefix_followers"] == 2
+
+    def test_batched_stream_yields_tokens_and_done(self):
+        with _StubVLLMServer(first_token_delay=0.0) as server:
+            router = self._make_router(server.base_url, window_ms=5)
+            chunks = list(router.query_stream("Plain prompt without context marker"))
+            router.close()
+
+        tokens = [c["token"] for c in chunks if "token" in c]
+        assert "".join(tokens) == "echo:Plain prompt without context marker"
+        done = [c for c in chunks if c.get("done")]
+        assert done and done[0]["tokens_in"] == 7
+
+    def test_prompt_is_split_the_same_way_with_and_without_batching(self):
+        system = "You are a precise technical assistant. Cite [Source N]."
+        prompt = f"{system}\n\nContext:\nchunk text\n\nUser Question:\nq"
+        with _StubVLLMServer(first_token_delay=0.0) as server:
+            for window_ms in (0, 5):
+                router = self._make_router(server.base_url, window_ms=window_ms)
+                list(router.query_stream(prompt))
+                router.close()
+
+        plain, batched = (body["messages"] for _, body in server.requests)
+        assert plain == batched
+        assert plain[0] == {"role": "system", "content": system}
+
+    def test_worker_stream_errors_stay_in_their_events(self):
+        router = self._make_router("http://127.0.0.1:9", window_ms=5)
+        router.last_error = "from another request"
+        chunks = list(router._stream_chat([{"role": "user", "content": "Hi"}]))
+        router.close()
+
+        assert chunks[-1]["error"]
+        assert router.last_error == "from another request"
+
+    def test_batched_query_reports_backend_error(self):
+        router = self._make_router("http://127.0.0.1:9", window_ms=5)
+        assert router.query("Hello") is None
+        assert router.last_error
+        router.close()
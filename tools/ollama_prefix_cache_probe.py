@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# === NON-PROGRAMMER GUIDE ===
+# Purpose: Measures how much of each offline query is prompt evaluation vs generation.
+# What to read first: Start at main(), then _run_query().
+# Inputs: Config filename and one or more query strings.
+# Outputs: JSON and Markdown reports under logs/ollama_prefix_cache/<timestamp>/.
+# Safety notes: Reads the live index and calls the local Ollama server (localhost only).
+# ============================
+"""
+HybridRAG Ollama prefix-cache probe
+
+What it does
+- Runs a query set through the offline engine against the local Ollama
+- Optionally pre-evaluates the engine's stable prompt prefix first (--warm)
+- Reports, per query, Ollama's prompt-eval vs generation time and token
+  counts taken from the response metrics (see OllamaRouter._ollama_metrics)
+- A reused KV-cache prefix shows up as a small prompt_eval_count compared
+  with the prompt's full token count
+
+Usage
+  python tools/ollama_prefix_cache_probe.py --warm
+  python tools/ollama_prefix_cache_probe.py --query "What is the operating frequency?" --repeat 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools.query_path_probe import (
+    _build_engine,
+    _close_engine,
+    _load_queries,
+    _now_stamp,
+    _runtime_config_filename,
+)
+
+
+def _run_query(engine, query: str) -> dict[str, Any]:
+    t0 = time.perf_counter()
+    result = engine.query(query)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    llm_trace = (getattr(result, "debug_trace", None) or {}).get("llm", {})
+    metrics = dict(llm_trace.get("backend_metrics") or {})
+    return {
+        "query": query,
+        "wall_ms": round(wall_ms, 2),
+        "tokens_in": int(getattr(result, "tokens_in", 0) or 0),
+        "tokens_out": int(getattr(result, "tokens_out", 0) or 0),
+        "error": getattr(result, "error", None),
+        "backend_metrics": metrics,
+    }
+
+
+def _summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    measured = [r["backend_metrics"] for r in rows if r["backend_metrics"]]
+    if not measured:
+        return {"queries_measured": 0}
+    prompt_ms = sum(m.get("prompt_eval_ms", 0.0) for m in measured)
+    eval_ms = sum(m.get("eval_ms", 0.0) for m in measured)
+    total = prompt_ms + eval_ms
+    return {
+        "queries_measured": len(measured),
+        "avg_prompt_eval_ms": round(prompt_ms / len(measured), 2),
+        "avg_eval_ms": round(eval_ms / len(measured), 2),
+        "prompt_eval_share": round(prompt_ms / total, 3) if total > 0 else 0.0,
+        "avg_prompt_eval_count": round(
+            sum(m.get("prompt_eval_count", 0) for m in measured) / len(measured), 1
+        ),
+    }
+
+
+def _write_markdown_summary(out_path: Path, report: dict[str, Any]) -> None:
+    lines = [
+        "# Ollama Prefix-Cache Probe",
+        "",
+        "- Timestamp: `{}`".format(report["timestamp"]),
+        "- Model: `{}`".format(report["model"]),
+        "- Stable prefix: {} chars".format(report["stable_prefix_chars"]),
+        "- Warm-up: `{}`".format(json.dumps(report["warmup"])),
+        "",
+        "| # | prompt tokens evaluated | prompt-eval ms | gen tokens | gen ms | wall ms |",
+        "|---|---|---|---|---|---|",
+    ]
+    for idx, row in enumerate(report["queries"], start=1):
+        m = row["backend_metrics"]
+        lines.append(
+            "| {} | {} | {} | {} | {} | {} |".format(
+                idx,
+                m.get("prompt_eval_count", "-"),
+                m.get("prompt_eval_ms", "-"),
+                m.get("eval_count", "-"),
+                m.get("eval_ms", "-"),
+                row["wall_ms"],
+            )
+        )
+    lines.extend(["", "Summary: `{}`".format(json.dumps(report["summary"])), ""])
+    out_path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Report Ollama prompt-eval vs generation time per query.")
+    ap.add_argument("--config", default="config/config.yaml", help="Config filename/path inside repo config/.")
+    ap.add_argument("--engine", choices=("grounded", "base"), default="grounded", help="Use the guarded query engine or the plain core query engine.")
+    ap.add_argument("--query", action="append", default=[], help="Query string to probe. Repeatable.")
+    ap.add_argument("--query-file", default="", help="Optional text file with one query per line.")
+    ap.add_argument("--repeat", type=int, default=1, help="Run the query set this many times.")
+    ap.add_argument("--warm", action="store_true", help="Pre-evaluate the stable prompt prefix before the first query.")
+    ap.add_argument("--offline-model", default="", help="Override cfg.ollama.model for probe runs.")
+    ap.add_argument("--offline-num-predict", type=int, default=0, help="Override cfg.ollama.num_predict for probe runs.")
+    ap.add_argument("--offline-context-window", type=int, default=0, help="Override cfg.ollama.context_window for probe runs.")
+    args = ap.parse_args()
+
+    config_filename = _runtime_config_filename(args.config)
+    queries = _load_queries(args)
+    timestamp = _now_stamp()
+    out_dir = PROJECT_ROOT / "logs" / "ollama_prefix_cache" / timestamp
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    bundle = _build_engine("offline", config_filename, args)
+    engine = bundle["engine"]
+    prefix = engine._stable_prompt_prefix()
+    warmup: dict[str, Any] = {"attempted": False}
+    rows: list[dict[str, Any]] = []
+    try:
+        if args.warm:
+            warmup = {"attempted": True, "metrics": bundle["router"].warm_prefix(prefix)}
+        for _ in range(max(1, int(args.repeat))):
+            for query in queries:
+                row = _run_query(engine, query)
+                rows.append(row)
+                m = row["backend_metrics"]
+                print(
+                    "prompt_eval={} tok/{}ms  gen={} tok/{}ms  wall={}ms  {}".format(
+                        m.get("prompt_eval_count", "?"),
+                        m.get("prompt_eval_ms", "?"),
+                        m.get("eval_count", "?"),
+                        m.get("eval_ms", "?"),
+                        row["wall_ms"],
+                        query[:60],
+                    )
+                )
+    finally:
+        _close_engine(bundle)
+
+    report = {
+        "timestamp": timestamp,
+        "config_filename": config_filename,
+        "engine": args.engine,
+        "model": bundle["config"].ollama.model,
+        "stable_prefix_chars": len(prefix),
+        "warmup": warmup,
+        "queries": rows,
+        "summary": _summarize(rows),
+    }
+    json_path = out_dir / "prefix_cache_report.json"
+    md_path = out_dir / "SUMMARY.md"
+    json_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    _write_markdown_summary(md_path, report)
+
+    print("")
+    print("Wrote:")
+    print("  {}".format(json_path))
+    print("  {}".format(md_path))
+
+
+if __name__ == "__main__":
+    main()
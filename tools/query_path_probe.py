@@ -37,6 +37,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.core.config import load_config
+from src.core.context_packer import estimate_tokens, resolve_context_model_name
 from src.core.embedder import Embedder
 from src.core.grounded_query_engine import GroundedQueryEngine
 from src.core.llm_router import LLMRouter
@@ -151,16 +152,16 @@ def _flag_source_paths(hits: list[Any], expected_source_root: str) -> dict[str,
 
 def _prompt_budget_snapshot(engine, query: str, trimmed_context: str) -> dict[str, Any]:
     ctx_window, output_budget = _qe_resolve_prompt_budget(engine)
-    prompt_overhead_tokens = 800 + (len(query) // 4) + output_budget
+    model_name = resolve_context_model_name(engine.config)
+    prompt_overhead_tokens = 800 + estimate_tokens(query, model_name) + output_budget
     max_context_tokens = max(ctx_window - prompt_overhead_tokens, 512)
-    max_context_chars = max_context_tokens * 4
     return {
         "context_window": ctx_window,
         "output_budget": output_budget,
         "prompt_overhead_tokens": prompt_overhead_tokens,
         "max_context_tokens": max_context_tokens,
-        "max_context_chars": max_context_chars,
         "trimmed_context_chars": len(trimmed_context),
+        "trimmed_context_tokens": estimate_tokens(trimmed_context, model_name),
     }
 
 
@@ -467,8 +468,9 @@ def _write_markdown_summary(out_path: Path, report: dict[str, Any]) -> None:
                 )
             )
             lines.append(
-                "- prompt budget chars: `{}`".format(
-                    manual["budget"]["max_context_chars"]
+                "- prompt budget tokens used/max: `{}/{}`".format(
+                    manual["budget"]["trimmed_context_tokens"],
+                    manual["budget"]["max_context_tokens"],
                 )
             )
             if manual["source_path_flags"]["suspicious_count"]:
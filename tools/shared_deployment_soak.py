@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 
 from src.tools.shared_deployment_soak import (
+    LatencySlo,
     format_soak_console_summary,
     load_soak_questions,
     run_shared_deployment_soak,
@@ -68,23 +69,148 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print the summary without writing a timestamped JSON report.",
     )
+    parser.add_argument(
+        "--driver",
+        choices=("threads", "async"),
+        default="threads",
+        help="threads replays the question list once per round; async runs the asyncio load driver.",
+    )
+    parser.add_argument(
+        "--load-mode",
+        choices=("closed", "open"),
+        default="closed",
+        help="Async driver only: closed-loop virtual users or open-loop Poisson arrivals.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=2.0,
+        help="Async open loop: mean arrivals per second.",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="Async driver: seconds to keep generating load.",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=0,
+        help="Async driver: stop after this many requests instead of after --duration.",
+    )
+    parser.add_argument(
+        "--pacing",
+        type=float,
+        default=0.0,
+        help="Async closed loop: seconds between one user's scheduled requests (0 = back to back).",
+    )
+    parser.add_argument(
+        "--stream-fraction",
+        type=float,
+        default=0.0,
+        help="Async driver: share of requests sent to /query/stream (0..1).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1337,
+        help="Async driver: seed for arrivals and the sync/stream mix.",
+    )
+    parser.add_argument(
+        "--stub-backend",
+        action="store_true",
+        help="Async driver: start the API in-process on a free port with a stub query engine (no LLM, no index).",
+    )
+    parser.add_argument(
+        "--stub-latency-ms",
+        type=float,
+        default=50.0,
+        help="Stub backend answer time in milliseconds.",
+    )
+    parser.add_argument("--slo-p50-ms", type=float, default=None, help="SLO: client p50 latency ceiling.")
+    parser.add_argument("--slo-p95-ms", type=float, default=None, help="SLO: client p95 latency ceiling.")
+    parser.add_argument("--slo-p99-ms", type=float, default=None, help="SLO: client p99 latency ceiling.")
+    parser.add_argument(
+        "--slo-ttft-p95-ms",
+        type=float,
+        default=None,
+        help="SLO: p95 time to first streamed token ceiling.",
+    )
+    parser.add_argument(
+        "--slo-max-error-rate",
+        type=float,
+        default=None,
+        help="SLO: highest allowed failed-request fraction, for example 0.01.",
+    )
     return parser
 
 
+def _run_async(args: argparse.Namespace, questions: list[str], slo: LatencySlo) -> dict:
+    from contextlib import nullcontext
+
+    from src.tools.shared_load_driver import (
+        LoadProfile,
+        StubQueryEngine,
+        run_shared_load_soak,
+        serve_stub_api,
+    )
+
+    profile = LoadProfile(
+        mode=args.load_mode,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        duration_seconds=args.duration,
+        total_requests=args.requests or None,
+        pacing_seconds=args.pacing,
+        stream_fraction=args.stream_fraction,
+        timeout_seconds=args.timeout,
+        seed=args.seed,
+    )
+    stub_latency = max(0.0, args.stub_latency_ms) / 1000.0
+    server = (
+        serve_stub_api(StubQueryEngine(latency_seconds=stub_latency, first_token_seconds=stub_latency / 4))
+        if args.stub_backend
+        else nullcontext(args.base_url)
+    )
+    with server as base_url:
+        return run_shared_load_soak(
+            base_url=base_url,
+            questions=questions,
+            profile=profile,
+            auth_token=args.auth_token,
+            proxy_user_header=args.proxy_user_header,
+            proxy_identity_secret=args.proxy_identity_secret,
+            poll_interval_seconds=args.poll_seconds,
+            slo=slo,
+        )
+
+
 def main() -> int:
     args = _build_parser().parse_args()
     questions = load_soak_questions(args.questions)
-    report = run_shared_deployment_soak(
-        base_url=args.base_url,
-        questions=questions,
-        concurrency=args.concurrency,
-        rounds=args.rounds,
-        timeout_seconds=args.timeout,
-        auth_token=args.auth_token,
-        proxy_user_header=args.proxy_user_header,
-        proxy_identity_secret=args.proxy_identity_secret,
-        poll_interval_seconds=args.poll_seconds,
+    slo = LatencySlo(
+        p50_ms=args.slo_p50_ms,
+        p95_ms=args.slo_p95_ms,
+        p99_ms=args.slo_p99_ms,
+        ttft_p95_ms=args.slo_ttft_p95_ms,
+        max_error_rate=args.slo_max_error_rate,
     )
+    if args.driver == "async" or args.stub_backend:
+        report = _run_async(args, questions, slo)
+    else:
+        report = run_shared_deployment_soak(
+            base_url=args.base_url,
+            questions=questions,
+            concurrency=args.concurrency,
+            rounds=args.rounds,
+            timeout_seconds=args.timeout,
+            auth_token=args.auth_token,
+            proxy_user_header=args.proxy_user_header,
+            proxy_identity_secret=args.proxy_identity_secret,
+            poll_interval_seconds=args.poll_seconds,
+            slo=slo,
+        )
     print(format_soak_console_summary(report))
     if not args.no_report:
         path = write_shared_soak_report(report)